@@ -3,7 +3,9 @@ Bot Package
 디스코드 봇의 핵심 기능들을 정의합니다.
 """
 
+from .channels import ChannelIndex
+from .command_sync import CommandSyncer
 from .client import WorkoutBot
 from .events import EventHandler
 
-__all__ = ["WorkoutBot", "EventHandler"]
+__all__ = ["ChannelIndex", "CommandSyncer", "WorkoutBot", "EventHandler"]
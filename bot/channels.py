@@ -0,0 +1,110 @@
+"""
+채널 ID 인덱스
+운동/리포트/환영 채널을 이름 대신 ID 집합으로 들고 있어, 메시지마다 해시 조회 한 번으로
+처리 대상인지 판단합니다. 봇 준비 시 전체 서버를 훑어 만들고, 서버 참가/탈퇴와
+채널 생성/수정/삭제 이벤트로 갱신합니다.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set
+
+import discord
+
+from config import REPORT_CHANNEL_NAME, WORKOUT_CHANNEL_NAME
+
+logger = logging.getLogger(__name__)
+
+# 환영 메시지를 보낼 채널 이름 (운동 채널도 포함)
+WELCOME_CHANNEL_NAMES = ("일반", "general")
+
+
+class ChannelIndex:
+    """서버별 역할 채널(workout/report/welcome) ID 인덱스"""
+
+    def __init__(
+        self,
+        workout_channel_name: str = WORKOUT_CHANNEL_NAME,
+        report_channel_name: str = REPORT_CHANNEL_NAME,
+        welcome_channel_names: Iterable[str] = WELCOME_CHANNEL_NAMES,
+    ):
+        # 종류 -> 채널 이름 집합
+        self.names: Dict[str, Set[str]] = {
+            "workout": {workout_channel_name},
+            "report": {report_channel_name},
+            "welcome": {*welcome_channel_names, workout_channel_name},
+        }
+        # 종류 -> guild_id -> 채널 ID 집합
+        self._by_guild: Dict[str, Dict[int, Set[int]]] = {
+            kind: defaultdict(set) for kind in self.names
+        }
+        # 메시지 필터용 평면 집합 (채널 ID는 서버와 관계없이 유일)
+        self.workout_channel_ids: Set[int] = set()
+
+    def rebuild(self, guilds: Iterable[discord.Guild]):
+        """전체 서버로 인덱스 다시 생성"""
+        for by_guild in self._by_guild.values():
+            by_guild.clear()
+        self.workout_channel_ids.clear()
+
+        guild_count = 0
+        for guild in guilds:
+            self.add_guild(guild)
+            guild_count += 1
+
+        logger.info(
+            f"채널 인덱스 생성: 서버 {guild_count}개, "
+            f"운동 채널 {len(self.workout_channel_ids)}개"
+        )
+
+    def add_guild(self, guild: discord.Guild):
+        """서버의 텍스트 채널 색인"""
+        for channel in guild.text_channels:
+            self.add_channel(channel)
+
+    def remove_guild(self, guild_id: int):
+        """서버 색인 삭제"""
+        for by_guild in self._by_guild.values():
+            by_guild.pop(guild_id, None)
+        self.workout_channel_ids = {
+            channel_id
+            for ids in self._by_guild["workout"].values()
+            for channel_id in ids
+        }
+
+    def add_channel(self, channel: discord.abc.GuildChannel):
+        """채널 색인 (이름/종류가 바뀐 경우 기존 항목은 먼저 제거)"""
+        self.remove_channel(channel)
+        if not isinstance(channel, discord.TextChannel):
+            return
+
+        for kind, names in self.names.items():
+            if channel.name in names:
+                self._by_guild[kind][channel.guild.id].add(channel.id)
+                if kind == "workout":
+                    self.workout_channel_ids.add(channel.id)
+
+    def remove_channel(self, channel: discord.abc.GuildChannel):
+        """채널 색인 삭제"""
+        for by_guild in self._by_guild.values():
+            ids = by_guild.get(channel.guild.id)
+            if ids:
+                ids.discard(channel.id)
+        self.workout_channel_ids.discard(channel.id)
+
+    def is_workout_channel(self, channel_id: int) -> bool:
+        """운동 채널 여부 (해시 조회 1회)"""
+        return channel_id in self.workout_channel_ids
+
+    def get_channel(
+        self, guild: discord.Guild, kind: str
+    ) -> Optional[discord.TextChannel]:
+        """서버의 해당 종류 채널 (여러 개면 채널 목록에서 가장 위)"""
+        channels = [
+            channel
+            for channel in map(
+                guild.get_channel, self._by_guild[kind].get(guild.id, ())
+            )
+            if channel is not None
+        ]
+        return min(channels, key=lambda channel: channel.position, default=None)
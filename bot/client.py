@@ -3,15 +3,26 @@
 """
 
 import logging
+from typing import Optional
+
 import discord
+from discord import app_commands
 from discord.ext import commands
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
 
-from database import Database
+from bot.channels import ChannelIndex
+from bot.command_sync import CommandSyncer
+from bot.scheduler import WEEKLY_REPORT_JOB_ID, create_scheduler, run_weekly_report
+from database import create_database
 from services import PenaltyService, WorkoutService, ReportService
+from utils.concurrency import WorkerPool
+from utils.metrics import begin_request, finish_request
 from config import (
+    COMMAND_SYNC_STATE_PATH,
+    GUILD_ID,
+    PHOTO_QUEUE_MAX_SIZE,
+    PHOTO_WORKER_CONCURRENCY,
     REPORT_DAY_OF_WEEK,
     REPORT_HOUR,
     REPORT_MINUTE,
@@ -21,6 +32,24 @@ from config import (
 logger = logging.getLogger(__name__)
 
 
+class WorkoutCommandTree(app_commands.CommandTree):
+    """슬래시 커맨드마다 요청 컨텍스트(DB 왕복 집계)를 여는 커맨드 트리"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is discord.InteractionType.application_command:
+            name = interaction.command.qualified_name if interaction.command else "?"
+            interaction.extras["request_context"] = begin_request(f"command:{name}")
+        return True
+
+    async def on_error(
+        self, interaction: discord.Interaction, error: app_commands.AppCommandError
+    ):
+        context = interaction.extras.pop("request_context", None)
+        if context is not None:
+            finish_request(context, error=True)
+        await super().on_error(interaction, error)
+
+
 class WorkoutBot(commands.Bot):
     """운동 벌금 계산 디스코드 봇"""
 
@@ -31,16 +60,32 @@ class WorkoutBot(commands.Bot):
         intents.guilds = True
         intents.guild_messages = True
 
-        super().__init__(command_prefix="!", intents=intents)
+        super().__init__(
+            command_prefix="!", intents=intents, tree_cls=WorkoutCommandTree
+        )
 
         # 의존성 초기화
-        self.db = Database()
+        self.db = create_database()
         self.penalty_service = PenaltyService()
         self.workout_service = WorkoutService(self.db, self.penalty_service)
         self.report_service = ReportService(self.db, self.penalty_service)
 
-        # 스케줄러 초기화
-        self.scheduler = AsyncIOScheduler()
+        # 운동/리포트/환영 채널 ID 인덱스 (on_ready에서 생성, 채널 이벤트로 갱신)
+        self.channels = ChannelIndex()
+
+        # 운동 사진 처리 작업자 풀 (setup_hook에서 시작)
+        self.photo_pool = WorkerPool(
+            "운동 사진", PHOTO_WORKER_CONCURRENCY, PHOTO_QUEUE_MAX_SIZE
+        )
+
+        # 슬래시 커맨드 동기화 (트리가 바뀐 경우에만, GUILD_ID가 있으면 해당 서버에만)
+        self.command_syncer = CommandSyncer(
+            self.tree, COMMAND_SYNC_STATE_PATH, int(GUILD_ID) if GUILD_ID else None
+        )
+
+        # 스케줄러 초기화 (on_ready에서 놓친 주를 정산한 뒤 시작)
+        self.scheduler = create_scheduler()
+        self._schedule_resumed = False
 
     async def setup_hook(self):
         """봇 시작 시 실행되는 설정"""
@@ -49,9 +94,12 @@ class WorkoutBot(commands.Bot):
             await self.db.init_db()
             logger.info("데이터베이스 초기화 완료")
 
-            # 스케줄러 시작
-            self.scheduler.start()
-            logger.info("스케줄러 시작")
+            # 사진 처리 작업자 시작
+            self.photo_pool.start()
+
+            # 스케줄러는 놓친 주 정산이 끝날 때까지 일시 정지
+            self.scheduler.start(paused=True)
+            logger.info("스케줄러 시작 (일시 정지)")
 
             # 주간 리포트 스케줄 설정
             await self._setup_weekly_report_schedule()
@@ -64,15 +112,19 @@ class WorkoutBot(commands.Bot):
         """주간 리포트 스케줄 설정"""
         try:
             report_tz = pytz.timezone(REPORT_TIMEZONE)
+            trigger = CronTrigger(
+                day_of_week=REPORT_DAY_OF_WEEK,
+                hour=REPORT_HOUR,
+                minute=REPORT_MINUTE,
+                timezone=report_tz,
+            )
+
             self.scheduler.add_job(
-                self.send_automated_weekly_report,
-                CronTrigger(
-                    day_of_week=REPORT_DAY_OF_WEEK,
-                    hour=REPORT_HOUR,
-                    minute=REPORT_MINUTE,
-                    timezone=report_tz,
-                ),
-                id="weekly_report",
+                run_weekly_report,
+                trigger,
+                id=WEEKLY_REPORT_JOB_ID,
+                kwargs={"bot": self},
+                replace_existing=True,
             )
 
             weekday_names = ["월", "화", "수", "목", "금", "토", "일"]
@@ -88,90 +140,135 @@ class WorkoutBot(commands.Bot):
         logger.info(f"{self.user}(ID: {self.user.id})로 로그인 완료!")
         logger.info(f"서버 수: {len(self.guilds)}")
 
-        # 슬래시 커맨드 동기화 (로그인 후에만 가능)
+        # 재연결 시에도 다시 호출되므로 매번 전체를 다시 색인
+        self.channels.rebuild(self.guilds)
+
+        # 슬래시 커맨드 동기화 (로그인 후에만 가능, 재연결 시에는 변경이 없으면 생략)
         try:
-            synced = await self.tree.sync()
-            logger.info(f"{len(synced)}개의 슬래시 커맨드 동기화 완료")
+            await self.command_syncer.sync()
         except Exception as e:
             logger.error(f"슬래시 커맨드 동기화 실패: {e}")
 
+        # 첫 준비 시에만: 놓친 주 정산 후 정기 스케줄 재개 (서버 목록이 필요)
+        await self._resume_weekly_schedule()
+
         # 현재 등록된 명령어 로그
         commands = [cmd.name for cmd in self.tree.get_commands()]
         logger.info(f"등록된 슬래시 커맨드: {', '.join(commands)}")
 
-    async def send_automated_weekly_report(self):
-        """자동 주간 리포트 전송"""
+    async def on_app_command_completion(
+        self, interaction: discord.Interaction, command: app_commands.Command
+    ):
+        """슬래시 커맨드 완료 시 요청 컨텍스트 기록"""
+        context = interaction.extras.pop("request_context", None)
+        if context is not None:
+            finish_request(context)
+
+    async def _resume_weekly_schedule(self):
+        """시작 시 점검: 마감되지 않은 지난 주를 따라잡은 뒤 정기 스케줄 재개"""
+        # 재연결로 on_ready가 다시 호출되어도 한 번만 실행
+        if self._schedule_resumed:
+            return
+        self._schedule_resumed = True
+
         try:
-            logger.info("자동 주간 리포트 생성 시작")
+            await self.send_automated_weekly_report()
+        except Exception as e:
+            logger.error(f"놓친 주간 정산 따라잡기 실패: {e}")
 
-            # 지난 주 데이터로 리포트 생성
-            last_week_date = self.report_service.get_last_week_date()
+        self.scheduler.resume()
+        job = self.scheduler.get_job(WEEKLY_REPORT_JOB_ID)
+        if job is not None:
+            logger.info(f"스케줄러 재개, 다음 주간 리포트: {job.next_run_time}")
 
-            # 벌금 기록 처리
-            penalty_result = await self.report_service.process_weekly_penalty_records(
-                last_week_date
-            )
+    async def send_automated_weekly_report(self):
+        """
+        자동 주간 마감 (서버마다 따로 정산/스냅샷/리포트 전송)
 
-            if penalty_result["success"]:
-                logger.info(
-                    f"벌금 기록 처리 완료: {penalty_result['processed_count']}건, "
-                    f"총 {penalty_result['total_penalty_added']}원"
-                )
+        서버마다 마감되지 않은 지난 주를 오래된 주부터 처리하므로, 봇이 꺼져 있어
+        놓친 주가 있으면 시작 시 점검이나 다음 실행에서 따라잡습니다.
+        단계별 완료가 마감 진행 기록에 남으므로, 중간에 실패한 주는 다음 실행에서
+        실패한 단계부터 이어서 처리하고 리포트는 중복 전송되지 않습니다.
+        """
+        due_week_date = self.report_service.get_due_week_date()
+        logger.info(f"자동 주간 마감 시작 (기준 주: {due_week_date.date()})")
 
-            # 리포트 데이터 생성
-            report_data = await self.report_service.generate_weekly_report_data(
-                last_week_date
-            )
+        sent_count = 0
+        for guild in self.guilds:
+            weeks = await self.report_service.get_open_weeks(guild.id, due_week_date)
+            if len(weeks) > 1:
+                logger.warning(
+                    f"놓친 주간 마감 따라잡기: {guild.name} - "
+                    f"{', '.join(str(week.date()) for week in weeks)}"
+                )
 
-            if not report_data["success"]:
-                logger.warning(f"주간 리포트 데이터 없음: {report_data['message']}")
-                return
+            for week_start_date in weeks:
+                result = await self._close_week_for_guild(guild, week_start_date)
+                # 마감되지 않은 주가 있으면 이후 주는 다음 실행에서 순서대로 다시 시도
+                if not result["success"]:
+                    break
+                if "broadcast" in result["stages"] and not result.get("empty"):
+                    sent_count += 1
 
-            # 리포트 전송
-            await self._send_report_to_channels(report_data)
+        logger.info(f"총 {sent_count}건의 주간 리포트 전송 완료")
 
+    async def _close_week_for_guild(
+        self, guild: discord.Guild, week_start_date
+    ) -> dict:
+        """서버 하나의 주간 마감 (실패해도 다른 서버는 계속)"""
+        try:
+            result = await self.report_service.close_week(
+                guild.id,
+                week_start_date,
+                lambda report_data: self._send_report_to_guild(guild, report_data),
+            )
         except Exception as e:
-            logger.error(f"자동 주간 리포트 전송 실패: {e}")
+            logger.error(f"주간 마감 실패: {guild.name} - {e}")
+            return {"success": False, "stages": [], "message": str(e)}
 
-    async def _send_report_to_channels(self, report_data: dict):
-        """채널에 리포트 전송"""
-        from config import REPORT_CHANNEL_NAME
+        if result["success"]:
+            logger.info(
+                f"주간 마감 완료: {guild.name} {week_start_date.date()} - "
+                f"{', '.join(result['stages']) or '이미 완료됨'}"
+            )
+        else:
+            logger.info(
+                f"주간 마감 중단: {guild.name} {week_start_date.date()} - "
+                f"{result['message']} (완료: {', '.join(result['stages']) or '없음'})"
+            )
+        return result
 
+    async def _send_report_to_guild(
+        self, guild: discord.Guild, report_data: dict
+    ) -> Optional[int]:
+        """서버의 리포트 채널에 리포트 전송 (전송한 메시지 ID, 실패하면 None)"""
         embed = self.report_service.create_weekly_report_embed(report_data)
 
-        # 모든 길드에서 리포트 채널 찾기
-        sent_count = 0
-        for guild in self.guilds:
-            target_channel = None
+        # 설정된 리포트 채널 찾기
+        target_channel = self.channels.get_channel(guild, "report")
 
-            # 설정된 리포트 채널 찾기
+        # 리포트 채널이 없으면 첫 번째 텍스트 채널 사용
+        if not target_channel:
             for channel in guild.text_channels:
-                if channel.name == REPORT_CHANNEL_NAME:
+                if channel.permissions_for(guild.me).send_messages:
                     target_channel = channel
                     break
 
-            # 리포트 채널이 없으면 첫 번째 텍스트 채널 사용
-            if not target_channel:
-                for channel in guild.text_channels:
-                    if channel.permissions_for(guild.me).send_messages:
-                        target_channel = channel
-                        break
+        if not target_channel:
+            logger.warning(f"리포트를 보낼 채널 없음: {guild.name}")
+            return None
 
-            if target_channel:
-                try:
-                    await target_channel.send(embed=embed)
-                    sent_count += 1
-                    logger.info(
-                        f"리포트 전송 완료: {guild.name} #{target_channel.name}"
-                    )
-                except discord.Forbidden:
-                    logger.warning(
-                        f"리포트 전송 권한 없음: {guild.name} #{target_channel.name}"
-                    )
-                except Exception as e:
-                    logger.error(f"리포트 전송 실패: {guild.name} - {e}")
-
-        logger.info(f"총 {sent_count}개 채널에 주간 리포트 전송 완료")
+        try:
+            message = await target_channel.send(embed=embed)
+            logger.info(f"리포트 전송 완료: {guild.name} #{target_channel.name}")
+            return message.id
+        except discord.Forbidden:
+            logger.warning(
+                f"리포트 전송 권한 없음: {guild.name} #{target_channel.name}"
+            )
+        except Exception as e:
+            logger.error(f"리포트 전송 실패: {guild.name} - {e}")
+        return None
 
     async def close(self):
         """봇 종료 시 정리 작업"""
@@ -179,5 +276,11 @@ class WorkoutBot(commands.Bot):
             self.scheduler.shutdown()
             logger.info("스케줄러 종료")
 
+        if hasattr(self, "photo_pool"):
+            await self.photo_pool.stop()
+
+        if hasattr(self, "db"):
+            await self.db.close()
+
         await super().close()
         logger.info("봇 종료 완료")
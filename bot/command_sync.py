@@ -0,0 +1,92 @@
+"""
+슬래시 커맨드 동기화
+커맨드 트리 정의의 해시를 마지막으로 동기화한 해시와 비교해, 바뀐 경우에만
+sync()를 호출합니다. 재연결마다 호출되는 on_ready에서 속도 제한이 걸린
+동기화 엔드포인트를 반복 호출하지 않기 위함입니다.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Optional
+
+import discord
+from discord import app_commands
+
+logger = logging.getLogger(__name__)
+
+
+def command_tree_hash(
+    tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None
+) -> str:
+    """커맨드 트리 정의의 안정적인 해시 (등록 순서와 무관)"""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command.get("type", 1), command["name"]),
+    )
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CommandSyncer:
+    """해시가 바뀐 경우에만 커맨드 트리를 동기화"""
+
+    def __init__(
+        self,
+        tree: app_commands.CommandTree,
+        state_path: str,
+        guild_id: Optional[int] = None,
+    ):
+        self.tree = tree
+        self.state_path = state_path
+        # 설정하면 해당 서버에만 동기화 (개발용, 즉시 반영)
+        self.guild = discord.Object(id=guild_id) if guild_id else None
+        self.scope = f"guild:{guild_id}" if guild_id else "global"
+        # 상태 파일을 쓸 수 없는 환경에서도 재연결 시 다시 동기화하지 않도록 보관
+        self.last_synced_hash: Optional[str] = None
+
+    def _load_state(self) -> Dict[str, str]:
+        """범위별 마지막 동기화 해시"""
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"커맨드 동기화 상태 읽기 실패: {e}")
+            return {}
+
+    def _save_state(self, state: Dict[str, str]):
+        try:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+        except Exception as e:
+            logger.error(f"커맨드 동기화 상태 저장 실패: {e}")
+
+    async def sync(self, force: bool = False) -> bool:
+        """
+        커맨드 트리 동기화
+
+        Args:
+            force: 해시가 같아도 동기화
+
+        Returns:
+            동기화 API를 호출했는지 여부
+        """
+        if self.guild is not None:
+            self.tree.copy_global_to(guild=self.guild)
+
+        tree_hash = command_tree_hash(self.tree, self.guild)
+        state = self._load_state()
+
+        if not force and tree_hash in (self.last_synced_hash, state.get(self.scope)):
+            logger.info(f"슬래시 커맨드 변경 없음, 동기화 생략 ({self.scope})")
+            return False
+
+        synced = await self.tree.sync(guild=self.guild)
+        logger.info(f"{len(synced)}개의 슬래시 커맨드 동기화 완료 ({self.scope})")
+
+        self.last_synced_hash = tree_hash
+        state[self.scope] = tree_hash
+        self._save_state(state)
+        return True
@@ -2,45 +2,114 @@
 디스코드 봇 이벤트 핸들러
 """
 
+import asyncio
 import logging
 import discord
-from typing import TYPE_CHECKING
-from config import WORKOUT_CHANNEL_NAME
+from typing import TYPE_CHECKING, Set
+from config import (
+    PHOTO_QUEUE_RETRY_DELAY,
+    PREFIX_COMMANDS_ENABLED,
+    WORKOUT_CHANNEL_NAME,
+)
 from utils.validation import is_image_file
 from utils.formatting import format_currency, create_progress_bar
+from utils.metrics import request_context
 
 if TYPE_CHECKING:
     from bot.client import WorkoutBot
 
 logger = logging.getLogger(__name__)
 
+# 사진 처리 대기열이 가득 찼을 때 표시하는 반응 (재시도 대기 중)
+BUSY_REACTION = "⏳"
+
 
 class EventHandler:
     """디스코드 이벤트 처리 클래스"""
 
     def __init__(self, bot: "WorkoutBot"):
         self.bot = bot
+        # 진행 중인 재시도 태스크 (가비지 컬렉션 방지)
+        self._retry_tasks: Set[asyncio.Task] = set()
 
     async def handle_message(self, message: discord.Message):
         """메시지 이벤트 처리"""
-        # 봇 자신의 메시지는 무시
-        if message.author.bot:
+        # 운동 채널이 아니면 해시 조회 한 번으로 종료 (DM 채널은 인덱스에 없음)
+        if not self.bot.channels.is_workout_channel(message.channel.id):
             return
 
-        # 운동 채널에서의 이미지 업로드만 처리
-        if message.channel.name != WORKOUT_CHANNEL_NAME:
+        # 봇 메시지는 무시
+        if message.author.bot:
             return
 
         # 첨부파일이 있는 경우만 처리
         if not message.attachments:
             return
 
-        # 이미지 첨부파일 처리
+        # 이미지 첨부파일 처리 (게이트웨이 디스패치를 막지 않도록 작업자 풀에서 처리)
         for attachment in message.attachments:
             if is_image_file(attachment.filename):
-                await self.handle_workout_photo(message, attachment)
+                await self.enqueue_workout_photo(message, attachment)
                 break  # 첫 번째 이미지만 처리
 
+    async def enqueue_workout_photo(
+        self, message: discord.Message, attachment: discord.Attachment
+    ):
+        """운동 사진을 처리 대기열에 등록 (가득 차면 반응 표시 후 재시도)"""
+        if self.bot.photo_pool.submit(
+            lambda: self._process_workout_photo(message, attachment)
+        ):
+            return
+
+        logger.warning(
+            f"사진 처리 대기열 포화, {PHOTO_QUEUE_RETRY_DELAY}초 후 재시도: "
+            f"{message.author.display_name}"
+        )
+        await self._set_busy_reaction(message, True)
+
+        task = asyncio.ensure_future(self._retry_workout_photo(message, attachment))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _retry_workout_photo(
+        self, message: discord.Message, attachment: discord.Attachment
+    ):
+        """잠시 후 한 번 더 등록하고, 그래도 가득 차면 다시 올려달라고 안내"""
+        await asyncio.sleep(PHOTO_QUEUE_RETRY_DELAY)
+
+        async def process():
+            await self._set_busy_reaction(message, False)
+            await self._process_workout_photo(message, attachment)
+
+        if self.bot.photo_pool.submit(process):
+            return
+
+        logger.warning(
+            f"사진 처리 대기열 포화로 요청 거절: {message.author.display_name}"
+        )
+        await self._set_busy_reaction(message, False)
+        await self._send_workout_error_message(
+            message,
+            "지금 처리 중인 요청이 많습니다. 잠시 후 사진을 다시 올려주세요.",
+        )
+
+    async def _process_workout_photo(
+        self, message: discord.Message, attachment: discord.Attachment
+    ):
+        """작업자에서 실행되는 사진 처리 (요청 단위로 DB 왕복 집계)"""
+        with request_context("message:workout_photo"):
+            await self.handle_workout_photo(message, attachment)
+
+    async def _set_busy_reaction(self, message: discord.Message, busy: bool):
+        """재시도 대기 반응 추가/제거 (권한이 없으면 무시)"""
+        try:
+            if busy:
+                await message.add_reaction(BUSY_REACTION)
+            else:
+                await message.remove_reaction(BUSY_REACTION, self.bot.user)
+        except discord.HTTPException as e:
+            logger.warning(f"대기 반응 처리 실패: {e}")
+
     async def handle_workout_photo(
         self, message: discord.Message, attachment: discord.Attachment
     ):
@@ -53,7 +122,7 @@ class EventHandler:
 
             # 운동 서비스를 통해 사진 업로드 처리
             result = await self.bot.workout_service.process_photo_upload(
-                user_id, username, attachment.filename
+                message.guild.id, user_id, username, attachment.filename
             )
 
             if result["success"]:
@@ -140,14 +209,8 @@ class EventHandler:
     async def handle_member_join(self, member: discord.Member):
         """새 멤버 참가 시 환영 메시지"""
         try:
-            # 환영 메시지용 채널 찾기
-            welcome_channel = None
-
             # 일반 채널 또는 운동 채널에 환영 메시지 전송
-            for channel in member.guild.text_channels:
-                if channel.name in ["일반", "general", WORKOUT_CHANNEL_NAME]:
-                    welcome_channel = channel
-                    break
+            welcome_channel = self.bot.channels.get_channel(member.guild, "welcome")
 
             if welcome_channel:
                 embed = discord.Embed(
@@ -179,8 +242,34 @@ class EventHandler:
         @self.bot.event
         async def on_message(message):
             await self.handle_message(message)
-            # 다른 명령어 처리를 위해 process_commands 호출
-            await self.bot.process_commands(message)
+            # 슬래시 커맨드만 사용하므로 접두사 명령어는 설정한 경우에만 처리
+            if PREFIX_COMMANDS_ENABLED:
+                await self.bot.process_commands(message)
+
+        # 채널 인덱스 갱신
+        @self.bot.event
+        async def on_guild_join(guild):
+            self.bot.channels.add_guild(guild)
+
+        @self.bot.event
+        async def on_guild_available(guild):
+            self.bot.channels.add_guild(guild)
+
+        @self.bot.event
+        async def on_guild_remove(guild):
+            self.bot.channels.remove_guild(guild.id)
+
+        @self.bot.event
+        async def on_guild_channel_create(channel):
+            self.bot.channels.add_channel(channel)
+
+        @self.bot.event
+        async def on_guild_channel_update(before, after):
+            self.bot.channels.add_channel(after)
+
+        @self.bot.event
+        async def on_guild_channel_delete(channel):
+            self.bot.channels.remove_channel(channel)
 
         @self.bot.event
         async def on_member_join(member):
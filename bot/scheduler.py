@@ -0,0 +1,42 @@
+"""
+주간 정산 스케줄러
+작업은 메모리에만 두고, 재시작 중 놓친 주는 시작 시 점검이 마감 진행 기록
+(weekly_close_runs)을 보고 따라잡습니다.
+"""
+
+import logging
+from typing import TYPE_CHECKING
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from config import REPORT_MISFIRE_GRACE_TIME, REPORT_TIMEZONE
+
+if TYPE_CHECKING:
+    from bot.client import WorkoutBot
+
+logger = logging.getLogger(__name__)
+
+WEEKLY_REPORT_JOB_ID = "weekly_report"
+
+
+async def run_weekly_report(bot: "WorkoutBot"):
+    """주간 정산/리포트 작업 (봇은 작업 kwargs로 전달)"""
+    await bot.send_automated_weekly_report()
+
+
+def create_scheduler() -> AsyncIOScheduler:
+    """
+    주간 정산 스케줄러 생성
+
+    예정 시각보다 늦게 실행되더라도 REPORT_MISFIRE_GRACE_TIME 안이면 한 번만
+    실행합니다 (여러 번 밀려도 합쳐서 1회). 봇이 꺼져 있어 놓친 주는
+    시작 시 점검(마감되지 않은 주 따라잡기)이 처리합니다.
+    """
+    return AsyncIOScheduler(
+        job_defaults={
+            "coalesce": True,
+            "misfire_grace_time": REPORT_MISFIRE_GRACE_TIME,
+            "max_instances": 1,
+        },
+        timezone=REPORT_TIMEZONE,
+    )
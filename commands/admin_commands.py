@@ -5,7 +5,15 @@
 import logging
 import discord
 from typing import TYPE_CHECKING
+from commands.deferral import (
+    ack_metrics,
+    complete_metrics,
+    defer_when_slow,
+    respond,
+    respond_public,
+)
 from utils.formatting import format_currency, create_progress_bar
+from utils.metrics import request_metrics
 from config import ADMIN_ROLE_NAME
 
 if TYPE_CHECKING:
@@ -13,6 +21,64 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# 임베드 필드 값 최대 길이 (디스코드 제한 1024자)
+MAX_FIELD_LENGTH = 1024
+
+
+def _code_block(lines: list) -> str:
+    """필드 길이 제한 안에서 코드 블록으로 묶기"""
+    body = []
+    length = len("```\n```")
+    for line in lines:
+        if length + len(line) + 1 > MAX_FIELD_LENGTH:
+            break
+        body.append(line)
+        length += len(line) + 1
+    return "```\n" + "\n".join(body) + "```"
+
+
+def format_latency_stats(stats: dict, limit: int = 12) -> str:
+    """메서드별 지연 시간 통계를 표로 변환"""
+    if not stats:
+        return "기록 없음"
+
+    lines = [f"{'method':<28}{'n':>6}{'p50':>7}{'p95':>7}{'p99':>7}{'err':>5}"]
+    for name, row in list(stats.items())[:limit]:
+        lines.append(
+            f"{name[:28]:<28}{row['count']:>6}{row['p50_ms']:>7.1f}"
+            f"{row['p95_ms']:>7.1f}{row['p99_ms']:>7.1f}{row['errors']:>5}"
+        )
+    return _code_block(lines)
+
+
+def format_request_stats(stats: dict, limit: int = 12) -> str:
+    """요청 종류별 처리 시간/왕복 수를 표로 변환"""
+    if not stats:
+        return "기록 없음"
+
+    lines = [f"{'request':<28}{'n':>6}{'rt':>6}{'p50':>7}{'p95':>7}"]
+    for name, row in list(stats.items())[:limit]:
+        lines.append(
+            f"{name[:28]:<28}{row['count']:>6}{row.get('avg_round_trips', 0):>6.1f}"
+            f"{row['p50_ms']:>7.0f}{row['p95_ms']:>7.0f}"
+        )
+    return _code_block(lines)
+
+
+def format_command_stats(ack: dict, complete: dict, limit: int = 12) -> str:
+    """커맨드별 응답 확인(ack)/완료 시간을 표로 변환"""
+    if not complete:
+        return "기록 없음"
+
+    lines = [f"{'command':<20}{'n':>6}{'ack95':>8}{'done95':>8}{'max':>7}"]
+    for name, row in list(complete.items())[:limit]:
+        ack_p95 = ack.get(name, {}).get("p95_ms", 0)
+        lines.append(
+            f"{name[:20]:<20}{row['count']:>6}{ack_p95:>8.0f}"
+            f"{row['p95_ms']:>8.0f}{row['max_ms']:>7.0f}"
+        )
+    return _code_block(lines)
+
 
 def setup_admin_commands(bot: "WorkoutBot"):
     """관리자용 슬래시 커맨드 설정"""
@@ -21,17 +87,20 @@ def setup_admin_commands(bot: "WorkoutBot"):
         name="add-workout",
         description="관리자가 특정 날짜에 운동 기록을 수동으로 추가합니다 (관리자 전용)",
     )
+    @discord.app_commands.guild_only()
     @discord.app_commands.describe(
         member="운동 기록을 추가할 사용자",
         date="운동한 날짜 (YYYY-MM-DD 형식, 기본값: 오늘)",
     )
+    @defer_when_slow(budget=1.2, ephemeral=False)
     async def add_workout(
         interaction: discord.Interaction, member: discord.Member, date: str = None
     ):
         """관리자용 운동 기록 수동 추가 슬래시 커맨드"""
         # 관리자 권한 확인
         if not any(role.name == ADMIN_ROLE_NAME for role in interaction.user.roles):
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 f"❌ 이 명령어는 {ADMIN_ROLE_NAME} 권한이 필요합니다.",
                 ephemeral=True,
             )
@@ -42,14 +111,16 @@ def setup_admin_commands(bot: "WorkoutBot"):
         if date:
             target_date = bot.workout_service.validate_workout_date(date)
             if not target_date:
-                await interaction.response.send_message(
-                    "❌ 날짜 형식이 올바르지 않습니다. (예: 2025-01-15)", ephemeral=True
+                await respond(
+                    interaction,
+                    "❌ 날짜 형식이 올바르지 않습니다. (예: 2025-01-15)",
+                    ephemeral=True,
                 )
                 return
 
         try:
             result = await bot.workout_service.add_workout_record(
-                member.id, member.display_name, target_date
+                interaction.guild_id, member.id, member.display_name, target_date
             )
 
             if result["success"]:
@@ -90,7 +161,7 @@ def setup_admin_commands(bot: "WorkoutBot"):
 
                 embed.set_footer(text="관리자 승인된 운동 기록")
 
-                await interaction.response.send_message(embed=embed)
+                await respond_public(interaction, embed=embed)
 
             else:
                 embed = discord.Embed(
@@ -98,7 +169,7 @@ def setup_admin_commands(bot: "WorkoutBot"):
                     description=result["message"],
                     color=0xFFFF00,
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await respond(interaction, embed=embed, ephemeral=True)
 
             logger.info(
                 f"운동 기록 수동 추가: {member.display_name} - {date or '오늘'} "
@@ -107,14 +178,17 @@ def setup_admin_commands(bot: "WorkoutBot"):
 
         except Exception as e:
             logger.error(f"운동 기록 수동 추가 중 오류: {e}")
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "운동 기록 추가 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
                 ephemeral=True,
             )
 
     @bot.tree.command(
-        name="test-report", description="주간 리포트를 채널에 전송합니다 (관리자 전용)"
+        name="test-report",
+        description="이 서버의 주간 리포트를 채널에 전송합니다 (관리자 전용)",
     )
+    @discord.app_commands.guild_only()
     async def test_report(interaction: discord.Interaction):
         """테스트용 주간 리포트 전송"""
         # 관리자 권한 확인
@@ -135,7 +209,7 @@ def setup_admin_commands(bot: "WorkoutBot"):
 
             # 리포트 데이터 생성
             report_data = await bot.report_service.generate_weekly_report_data(
-                last_week_date
+                interaction.guild_id, last_week_date
             )
 
             if not report_data["success"]:
@@ -144,8 +218,8 @@ def setup_admin_commands(bot: "WorkoutBot"):
                 )
                 return
 
-            # 리포트 전송
-            await bot._send_report_to_channels(report_data)
+            # 리포트 전송 (이 서버에만)
+            await bot._send_report_to_guild(interaction.guild, report_data)
 
             await interaction.followup.send(
                 "✅ 주간 리포트가 성공적으로 전송되었습니다!", ephemeral=True
@@ -161,8 +235,10 @@ def setup_admin_commands(bot: "WorkoutBot"):
             )
 
     @bot.tree.command(
-        name="reset-db", description="데이터베이스를 초기화합니다 (관리자 전용)"
+        name="reset-db",
+        description="이 서버의 데이터를 초기화합니다 (관리자 전용)",
     )
+    @discord.app_commands.guild_only()
     @discord.app_commands.describe(
         confirmation="데이터베이스를 초기화하려면 '초기화'를 입력하세요."
     )
@@ -188,20 +264,20 @@ def setup_admin_commands(bot: "WorkoutBot"):
             # 경고 메시지 먼저 전송
             embed = discord.Embed(
                 title="⚠️ 데이터베이스 초기화 중...",
-                description="**모든 데이터가 삭제됩니다!**\n잠시만 기다려주세요...",
+                description="**이 서버의 모든 데이터가 삭제됩니다!**\n잠시만 기다려주세요...",
                 color=0xFF0000,
             )
 
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
             # 데이터베이스 초기화 실행
-            success = await bot.db.reset_database()
+            success = await bot.db.reset_database(interaction.guild_id)
 
             if success:
                 embed = discord.Embed(
                     title="✅ 데이터베이스 초기화 완료",
                     description=(
-                        "모든 데이터가 성공적으로 삭제되었습니다.\n"
+                        "이 서버의 모든 데이터가 성공적으로 삭제되었습니다.\n"
                         "사용자들은 다시 `/set-goals` 명령어로 목표를 설정해야 합니다."
                     ),
                     color=0x00FF00,
@@ -226,3 +302,96 @@ def setup_admin_commands(bot: "WorkoutBot"):
                 "데이터베이스 초기화 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
                 ephemeral=True,
             )
+
+    @bot.tree.command(
+        name="db-stats",
+        description="데이터베이스 호출 지연 시간과 캐시 통계를 확인합니다 (관리자 전용)",
+    )
+    @discord.app_commands.guild_only()
+    async def db_stats(interaction: discord.Interaction):
+        """데이터베이스 계측 통계 조회"""
+        # 관리자 권한 확인
+        if not any(role.name == ADMIN_ROLE_NAME for role in interaction.user.roles):
+            await interaction.response.send_message(
+                f"❌ 이 명령어는 {ADMIN_ROLE_NAME} 권한이 필요합니다.",
+                ephemeral=True,
+            )
+            return
+
+        embed = discord.Embed(title="📊 데이터베이스 통계", color=0x4169E1)
+
+        # 저장소 백엔드에 따라 없는 통계는 건너뜀
+        metrics = getattr(bot.db, "metrics", None)
+        if metrics is not None:
+            embed.add_field(
+                name="⏱️ 메서드별 지연 시간 (ms)",
+                value=format_latency_stats(metrics.stats()),
+                inline=False,
+            )
+
+        embed.add_field(
+            name="🔁 요청별 DB 왕복",
+            value=format_request_stats(request_metrics.stats()),
+            inline=False,
+        )
+
+        settings_cache = getattr(bot.db, "settings_cache", None)
+        if settings_cache is not None:
+            cache = settings_cache.stats()
+            embed.add_field(
+                name="🗄️ 사용자 설정 캐시",
+                value=(
+                    f"적중률 {cache['hit_rate']:.1f}% "
+                    f"({cache['hits']}/{cache['hits'] + cache['misses']})\n"
+                    f"크기 {cache['size']}/{cache['max_size']}, "
+                    f"제거 {cache['evictions']}, 만료 {cache['expirations']}"
+                ),
+                inline=True,
+            )
+
+        single_flight = getattr(bot.db, "single_flight", None)
+        if single_flight is not None:
+            flight = single_flight.stats()
+            embed.add_field(
+                name="🤝 요청 합치기",
+                value=(
+                    f"호출 {flight['calls']}, 실행 {flight['executions']}, "
+                    f"합침 {flight['coalesced']}"
+                ),
+                inline=True,
+            )
+
+        embed.add_field(
+            name="⚡ 커맨드 응답 시간 (ms)",
+            value=format_command_stats(ack_metrics.stats(), complete_metrics.stats()),
+            inline=False,
+        )
+
+        lanes = bot.workout_service.write_lanes.stats()
+        embed.add_field(
+            name="🔒 사용자별 쓰기 레인",
+            value=(
+                f"활성 {lanes['lanes']}, 획득 {lanes['acquisitions']}, "
+                f"경합 {lanes['contended']} ({lanes['contention_rate']:.1f}%)\n"
+                f"최대 대기 {lanes['max_waiters']}, "
+                f"대기 p95 {lanes['wait_p95_ms']:.0f}ms"
+            ),
+            inline=True,
+        )
+
+        pool = bot.photo_pool.stats()
+        wait = pool["latency"].get("queue_wait", {})
+        process = pool["latency"].get("process", {})
+        embed.add_field(
+            name="📷 사진 처리 대기열",
+            value=(
+                f"대기 {pool['queued']}/{pool['queue_size']}, "
+                f"처리 중 {pool['active']}/{pool['concurrency']}\n"
+                f"등록 {pool['submitted']}, 거절 {pool['rejected']}\n"
+                f"대기 p95 {wait.get('p95_ms', 0):.0f}ms, "
+                f"처리 p95 {process.get('p95_ms', 0):.0f}ms"
+            ),
+            inline=True,
+        )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -0,0 +1,142 @@
+"""
+느린 슬래시 커맨드 응답 지연(defer) 처리
+예상 처리 시간이 임계값을 넘는 커맨드는 DB 호출 전에 먼저 응답을 보류(defer)하고,
+예상보다 느려진 커맨드는 임계값이 지나면 defer해 3초 인터랙션 기한을 지킵니다.
+defer한 뒤의 결과는 followup으로 전송합니다.
+커맨드별 응답 확인(ack)까지의 시간과 전체 완료 시간을 기록합니다.
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable
+
+import discord
+
+from config import COMMAND_DEFER_MIN_SAMPLES, COMMAND_DEFER_THRESHOLD
+from utils.metrics import LatencyRecorder
+
+# 커맨드별 응답 확인(defer 또는 첫 응답)까지의 시간
+ack_metrics = LatencyRecorder()
+# 커맨드별 전체 처리 시간
+complete_metrics = LatencyRecorder()
+
+
+def expected_latency(name: str, budget: float) -> float:
+    """예상 처리 시간 (충분히 기록되면 실제 p95, 아니면 지정한 예산)"""
+    histogram = complete_metrics.histograms.get(name)
+    if histogram is None or histogram.count < COMMAND_DEFER_MIN_SAMPLES:
+        return budget
+    return histogram.percentile(0.95)
+
+
+def _record_ack(interaction: discord.Interaction):
+    started_at = interaction.extras.pop("command_started_at", None)
+    if started_at is not None:
+        ack_metrics.record(
+            interaction.extras["command_name"], time.perf_counter() - started_at
+        )
+
+
+def _response_lock(interaction: discord.Interaction) -> asyncio.Lock:
+    """인터랙션 응답 잠금 (defer 타이머와 콜백의 첫 응답이 겹치지 않도록)"""
+    return interaction.extras.setdefault("response_lock", asyncio.Lock())
+
+
+async def _defer(interaction: discord.Interaction, ephemeral: bool):
+    """아직 응답하지 않았으면 defer"""
+    async with _response_lock(interaction):
+        if interaction.response.is_done():
+            return
+        await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+        interaction.extras["public_defer_pending"] = not ephemeral
+        _record_ack(interaction)
+
+
+async def _defer_after(interaction: discord.Interaction, delay: float, ephemeral: bool):
+    """delay초 안에 응답하지 않으면 defer (예상보다 느려진 경우의 대비)"""
+    await asyncio.sleep(delay)
+    await _defer(interaction, ephemeral)
+
+
+async def respond(interaction: discord.Interaction, *args, **kwargs):
+    """
+    응답 전송 (이미 defer했으면 followup으로 전송)
+
+    공개로 defer한 뒤 본인에게만 보일 응답을 보내면 대기 중인 공개 응답을 지우고
+    비공개 followup으로 보냅니다.
+    """
+    async with _response_lock(interaction):
+        if not interaction.response.is_done():
+            await interaction.response.send_message(*args, **kwargs)
+            _record_ack(interaction)
+            return None
+
+        if interaction.extras.pop("public_defer_pending", False) and kwargs.get(
+            "ephemeral"
+        ):
+            await interaction.delete_original_response()
+        return await interaction.followup.send(*args, **kwargs)
+
+
+async def respond_public(interaction: discord.Interaction, *args, **kwargs):
+    """
+    채널에 공개 응답
+
+    defer한 경우 followup으로 보내므로, 공개 결과를 보내는 커맨드는
+    defer_when_slow(ephemeral=False)로 공개 defer해야 합니다.
+    """
+    return await respond(interaction, *args, ephemeral=False, **kwargs)
+
+
+def defer_when_slow(budget: float, ephemeral: bool = True):
+    """
+    커맨드 응답 지연 데코레이터
+
+    예상 처리 시간이 COMMAND_DEFER_THRESHOLD를 넘으면 콜백 실행 전에 defer하고,
+    그렇지 않아도 COMMAND_DEFER_THRESHOLD 안에 응답하지 않으면 그때 defer합니다.
+    defer한 경우 응답의 공개 여부는 ephemeral로 정해지므로, 콜백은 respond()로 응답해야 합니다.
+    성공 결과를 공개하는 커맨드는 ephemeral=False로 defer하고 결과는 respond_public()으로,
+    거절/오류는 respond(..., ephemeral=True)로 보내면 본인에게만 표시됩니다.
+
+    Args:
+        budget: 기록이 충분하지 않을 때 사용할 예상 처리 시간 (초)
+        ephemeral: defer 응답을 본인에게만 표시할지 여부
+    """
+
+    def decorator(
+        callback: Callable[..., Awaitable[Any]],
+    ) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(callback)
+        async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+            name = (
+                interaction.command.qualified_name
+                if interaction.command
+                else callback.__name__
+            )
+            started_at = time.perf_counter()
+            interaction.extras["command_name"] = name
+            interaction.extras["command_started_at"] = started_at
+
+            fallback = None
+            if expected_latency(name, budget) > COMMAND_DEFER_THRESHOLD:
+                await _defer(interaction, ephemeral)
+            else:
+                fallback = asyncio.create_task(
+                    _defer_after(interaction, COMMAND_DEFER_THRESHOLD, ephemeral)
+                )
+
+            error = False
+            try:
+                return await callback(interaction, *args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                if fallback is not None:
+                    fallback.cancel()
+                complete_metrics.record(name, time.perf_counter() - started_at, error)
+
+        return wrapper
+
+    return decorator
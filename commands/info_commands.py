@@ -7,6 +7,7 @@ import discord
 from typing import TYPE_CHECKING
 from datetime import datetime, timedelta
 import pytz
+from commands.deferral import defer_when_slow, respond
 from utils.formatting import format_currency, create_progress_bar, format_date_korean
 from config import REPORT_TIMEZONE
 
@@ -22,12 +23,14 @@ def setup_info_commands(bot: "WorkoutBot"):
     @bot.tree.command(
         name="get-info", description="이번 주 운동 현황과 벌금을 조회합니다"
     )
+    @discord.app_commands.guild_only()
+    @defer_when_slow(budget=1.5)
     async def get_info(interaction: discord.Interaction):
         """운동 현황 조회 슬래시 커맨드"""
         try:
             # 사용자 주간 요약 정보 가져오기
             summary = await bot.report_service.get_user_weekly_summary(
-                interaction.user.id
+                interaction.guild_id, interaction.user.id
             )
 
             if not summary["success"]:
@@ -41,7 +44,7 @@ def setup_info_commands(bot: "WorkoutBot"):
                     value="`/set-goals [횟수]` - 4~7회 사이에서 설정 가능",
                     inline=False,
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await respond(interaction, embed=embed, ephemeral=True)
                 return
 
             # 상태에 따른 색상 및 이모지 결정
@@ -128,7 +131,7 @@ def setup_info_commands(bot: "WorkoutBot"):
                 text=f"기간: {week_start_str} ~ {week_end_str} | 💪 화이팅!"
             )
 
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await respond(interaction, embed=embed, ephemeral=True)
 
             logger.info(
                 f"현황 조회: {interaction.user.display_name} - {current_count}/{weekly_goal}회"
@@ -136,12 +139,84 @@ def setup_info_commands(bot: "WorkoutBot"):
 
         except Exception as e:
             logger.error(f"현황 조회 중 오류: {e}")
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "현황 조회 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
                 ephemeral=True,
             )
 
+    @bot.tree.command(
+        name="history", description="최근 몇 주간의 운동 기록과 벌금을 조회합니다"
+    )
+    @discord.app_commands.guild_only()
+    @discord.app_commands.describe(weeks="조회할 주 수 (1~52주, 기본 12주)")
+    async def history(interaction: discord.Interaction, weeks: int = 12):
+        """주간 이력 조회 슬래시 커맨드 (지난 주까지, 범위 조회 1회)"""
+        try:
+            if not 1 <= weeks <= 52:
+                await interaction.response.send_message(
+                    "❌ 조회할 주 수는 1주 이상 52주 이하여야 합니다.", ephemeral=True
+                )
+                return
+
+            history_data = await bot.report_service.get_recent_weekly_history(
+                interaction.guild_id, weeks, interaction.user.id
+            )
+
+            if not history_data["success"]:
+                await interaction.response.send_message(
+                    "먼저 `/set-goals` 명령어로 주간 운동 목표를 설정해주세요!",
+                    ephemeral=True,
+                )
+                return
+
+            user_id = interaction.user.id
+            lines = []
+            achieved_count = 0
+            for week in reversed(history_data["weeks"]):
+                result = history_data["matrix"][week].get(user_id)
+                if not result:
+                    continue
+                if result["actual"] >= result["goal"]:
+                    achieved_count += 1
+                    status_emoji = "🎉"
+                else:
+                    status_emoji = "😭"
+                lines.append(
+                    f"{status_emoji} {format_date_korean(week)} 주: "
+                    f"{result['actual']}/{result['goal']}회 · "
+                    f"{format_currency(result['weekly_penalty'])}"
+                )
+
+            embed = discord.Embed(
+                title=f"📅 {interaction.user.display_name}님의 최근 {weeks}주 기록",
+                description="\n".join(lines),
+                color=0x4169E1,
+            )
+            embed.add_field(
+                name="🎯 목표 달성",
+                value=f"{achieved_count}/{len(lines)}주",
+                inline=True,
+            )
+            embed.add_field(
+                name="💸 기간 벌금",
+                value=format_currency(sum(history_data["weekly_totals"].values())),
+                inline=True,
+            )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+            logger.info(f"주간 이력 조회: {interaction.user.display_name} - {weeks}주")
+
+        except Exception as e:
+            logger.error(f"주간 이력 조회 중 오류: {e}")
+            await interaction.response.send_message(
+                "주간 이력 조회 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
+                ephemeral=True,
+            )
+
     @bot.tree.command(name="weekly-report", description="주간 운동 리포트를 조회합니다")
+    @discord.app_commands.guild_only()
     @discord.app_commands.describe(
         week_offset="몇 주 전 리포트를 볼지 설정 (0=지난주, 1=지지난주, ...)"
     )
@@ -161,9 +236,9 @@ def setup_info_commands(bot: "WorkoutBot"):
                 hour=0, minute=0, second=0, microsecond=0
             )
 
-            # 리포트 데이터 생성
-            report_data = await bot.report_service.generate_weekly_report_data(
-                target_week_start
+            # 리포트 데이터 조회 (정산된 주는 스냅샷 1행)
+            report_data = await bot.report_service.get_weekly_report_data(
+                interaction.guild_id, target_week_start
             )
 
             if not report_data["success"]:
@@ -5,6 +5,7 @@
 import logging
 import discord
 from typing import TYPE_CHECKING
+from commands.deferral import defer_when_slow, respond, respond_public
 from utils.formatting import format_currency, create_progress_bar
 from config import WORKOUT_CHANNEL_NAME
 
@@ -20,11 +21,16 @@ def setup_workout_commands(bot: "WorkoutBot"):
     @bot.tree.command(
         name="set-goals", description="주간 운동 목표를 설정합니다 (4~7회)"
     )
+    @discord.app_commands.guild_only()
+    @defer_when_slow(budget=1.5)
     async def set_goals(interaction: discord.Interaction, count: int):
         """주간 목표 설정 슬래시 커맨드"""
         try:
             result = await bot.workout_service.set_user_goal(
-                interaction.user.id, interaction.user.display_name, count
+                interaction.guild_id,
+                interaction.user.id,
+                interaction.user.display_name,
+                count,
             )
 
             if result["success"]:
@@ -36,7 +42,7 @@ def setup_workout_commands(bot: "WorkoutBot"):
 
                 # 현재 주차 진행 상황 표시
                 progress = await bot.workout_service.get_weekly_progress(
-                    interaction.user.id
+                    interaction.guild_id, interaction.user.id
                 )
                 if progress:
                     progress_bar = create_progress_bar(
@@ -62,7 +68,7 @@ def setup_workout_commands(bot: "WorkoutBot"):
                     inline=False,
                 )
 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await respond(interaction, embed=embed, ephemeral=True)
 
             else:
                 embed = discord.Embed(
@@ -70,7 +76,7 @@ def setup_workout_commands(bot: "WorkoutBot"):
                     description=result["message"],
                     color=0xFF0000,
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await respond(interaction, embed=embed, ephemeral=True)
 
             logger.info(
                 f"목표 설정 시도: {interaction.user.display_name} - {count}회 "
@@ -79,16 +85,19 @@ def setup_workout_commands(bot: "WorkoutBot"):
 
         except Exception as e:
             logger.error(f"목표 설정 중 오류: {e}")
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "목표 설정 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
                 ephemeral=True,
             )
 
     @bot.tree.command(name="revoke", description="잘못된 운동 기록을 취소합니다")
+    @discord.app_commands.guild_only()
     @discord.app_commands.describe(
         member="기록을 취소할 사용자",
         date="운동한 날짜 (YYYY-MM-DD 형식, 기본값: 오늘)",
     )
+    @defer_when_slow(budget=1.2, ephemeral=False)
     async def revoke(
         interaction: discord.Interaction, member: discord.Member, date: str = None
     ):
@@ -98,7 +107,8 @@ def setup_workout_commands(bot: "WorkoutBot"):
             interaction.user.id != member.id
             and not interaction.user.guild_permissions.manage_messages
         ):
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "❌ 본인의 기록이거나 관리자 권한이 있어야 기록을 취소할 수 있습니다.",
                 ephemeral=True,
             )
@@ -109,14 +119,16 @@ def setup_workout_commands(bot: "WorkoutBot"):
         if date:
             target_date = bot.workout_service.validate_workout_date(date)
             if not target_date:
-                await interaction.response.send_message(
-                    "❌ 날짜 형식이 올바르지 않습니다. (예: 2025-01-15)", ephemeral=True
+                await respond(
+                    interaction,
+                    "❌ 날짜 형식이 올바르지 않습니다. (예: 2025-01-15)",
+                    ephemeral=True,
                 )
                 return
 
         try:
             result = await bot.workout_service.revoke_workout_record(
-                member.id, target_date
+                interaction.guild_id, member.id, target_date
             )
 
             if result["success"]:
@@ -155,7 +167,7 @@ def setup_workout_commands(bot: "WorkoutBot"):
                     name="👤 취소 요청자", value=interaction.user.mention, inline=True
                 )
 
-                await interaction.response.send_message(embed=embed)
+                await respond_public(interaction, embed=embed)
 
             else:
                 embed = discord.Embed(
@@ -163,7 +175,7 @@ def setup_workout_commands(bot: "WorkoutBot"):
                     description=result["message"],
                     color=0xFFFF00,
                 )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await respond(interaction, embed=embed, ephemeral=True)
 
             logger.info(
                 f"운동 기록 취소: {member.display_name} - {date or '오늘'} "
@@ -172,7 +184,8 @@ def setup_workout_commands(bot: "WorkoutBot"):
 
         except Exception as e:
             logger.error(f"운동 기록 취소 중 오류: {e}")
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "운동 기록 취소 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
                 ephemeral=True,
             )
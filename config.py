@@ -6,13 +6,55 @@ load_dotenv()
 
 # Discord 설정
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-GUILD_ID = os.getenv("GUILD_ID")
+GUILD_ID = os.getenv("GUILD_ID")  # 설정하면 슬래시 커맨드를 이 서버에만 동기화 (개발용)
+# 마지막으로 동기화한 커맨드 트리 해시 저장 위치 (바뀐 경우에만 동기화)
+COMMAND_SYNC_STATE_PATH = os.getenv("COMMAND_SYNC_STATE_PATH", ".command_sync.json")
 WORKOUT_CHANNEL_NAME = os.getenv("WORKOUT_CHANNEL_NAME", "workout-debugging")
+# 접두사(!) 명령어 처리 여부 (슬래시 커맨드만 사용하므로 기본 비활성)
+PREFIX_COMMANDS_ENABLED = (
+    os.getenv("PREFIX_COMMANDS_ENABLED", "false").lower() == "true"
+)
 
 # Supabase 설정
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# 저장소 설정
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")  # supabase | sqlite | memory
+SQLITE_PATH = os.getenv("SQLITE_PATH", "workout_bot.db")
+# 인메모리 저장소 호출당 주입 지연 (초, 벤치마크용)
+MEMORY_STORAGE_LATENCY = float(os.getenv("MEMORY_STORAGE_LATENCY", "0"))
+# 스키마 마이그레이션용 Postgres 직접 연결 URL (python migrate.py)
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# 데이터베이스 클라이언트 설정 (STORAGE_BACKEND=supabase일 때)
+DATABASE_CLIENT_MODE = os.getenv("DATABASE_CLIENT_MODE", "async")  # async | sync
+DATABASE_POOL_MAX_CONNECTIONS = int(os.getenv("DATABASE_POOL_MAX_CONNECTIONS", "20"))
+DATABASE_POOL_MAX_KEEPALIVE = int(os.getenv("DATABASE_POOL_MAX_KEEPALIVE", "10"))
+DATABASE_TIMEOUT = float(os.getenv("DATABASE_TIMEOUT", "10"))  # 초
+# 전체 스캔 페이지 크기 (PostgREST max-rows 이하로 설정)
+DATABASE_SCAN_PAGE_SIZE = int(os.getenv("DATABASE_SCAN_PAGE_SIZE", "500"))
+# 연산별 응답 크기(바이트) 측정 (응답마다 JSON 직렬화가 한 번 더 필요하므로 기본 비활성)
+DATABASE_PAYLOAD_STATS = os.getenv("DATABASE_PAYLOAD_STATS", "false").lower() == "true"
+
+# 사용자 설정 캐시 (LRU + TTL)
+USER_SETTINGS_CACHE_SIZE = int(os.getenv("USER_SETTINGS_CACHE_SIZE", "1024"))
+USER_SETTINGS_CACHE_TTL = float(os.getenv("USER_SETTINGS_CACHE_TTL", "300"))  # 초
+# 서버별 집계 캐시 (서버 누적 벌금 등, 벌금 기록 시 무효화)
+AGGREGATE_CACHE_SIZE = int(os.getenv("AGGREGATE_CACHE_SIZE", "256"))
+AGGREGATE_CACHE_TTL = float(os.getenv("AGGREGATE_CACHE_TTL", "3600"))  # 초
+
+# 운동 사진 처리 작업자 풀 (대기열이 가득 차면 잠시 후 재시도)
+PHOTO_WORKER_CONCURRENCY = int(os.getenv("PHOTO_WORKER_CONCURRENCY", "4"))
+PHOTO_QUEUE_MAX_SIZE = int(os.getenv("PHOTO_QUEUE_MAX_SIZE", "100"))
+PHOTO_QUEUE_RETRY_DELAY = float(os.getenv("PHOTO_QUEUE_RETRY_DELAY", "5"))  # 초
+
+# 느린 슬래시 커맨드 응답 지연 (예상 처리 시간이 임계값을 넘으면 먼저 defer,
+# 아니어도 임계값 안에 응답하지 않으면 defer하므로 3초보다 충분히 짧게)
+COMMAND_DEFER_THRESHOLD = float(os.getenv("COMMAND_DEFER_THRESHOLD", "1.0"))  # 초
+# 예상 처리 시간을 실제 p95로 대체하기 위한 최소 기록 수
+COMMAND_DEFER_MIN_SAMPLES = int(os.getenv("COMMAND_DEFER_MIN_SAMPLES", "20"))
+
 # 벌금 설정
 BASE_PENALTY = 10080.0  # 기본 벌금 10,080원
 
@@ -43,6 +85,10 @@ REPORT_DAY_OF_WEEK = int(
 REPORT_HOUR = int(os.getenv("REPORT_HOUR", "0"))  # 시간 (0-23)
 REPORT_MINUTE = int(os.getenv("REPORT_MINUTE", "0"))  # 분 (0-59)
 REPORT_TIMEZONE = os.getenv("REPORT_TIMEZONE", "Asia/Seoul")  # 시간대
+# 주간 리포트 작업이 예정 시각보다 늦어져도 이 시간(초) 안이면 실행
+REPORT_MISFIRE_GRACE_TIME = int(os.getenv("REPORT_MISFIRE_GRACE_TIME", "21600"))
+# 시작 시 마감되지 않은 지난 주를 최대 몇 주까지 거슬러 마감할지
+REPORT_CATCHUP_MAX_WEEKS = int(os.getenv("REPORT_CATCHUP_MAX_WEEKS", "4"))
 
 # 리포트 전송 채널 설정 (기본값: WORKOUT_CHANNEL_NAME과 동일)
 REPORT_CHANNEL_NAME = os.getenv("REPORT_CHANNEL_NAME", WORKOUT_CHANNEL_NAME)
@@ -1,54 +1,230 @@
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
-from supabase import create_client, Client
-from config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
+import time
+from collections import defaultdict
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Any, AsyncIterator, Callable, Iterable, Tuple
+import httpx
+from postgrest import ReturnMethod
+from supabase import create_client, Client, AsyncClient, AsyncClientOptions
+from config import (
+    SUPABASE_URL,
+    SUPABASE_SERVICE_ROLE_KEY,
+    DATABASE_CLIENT_MODE,
+    DATABASE_POOL_MAX_CONNECTIONS,
+    DATABASE_POOL_MAX_KEEPALIVE,
+    DATABASE_TIMEOUT,
+    DATABASE_SCAN_PAGE_SIZE,
+    DATABASE_PAYLOAD_STATS,
+    USER_SETTINGS_CACHE_SIZE,
+    USER_SETTINGS_CACHE_TTL,
+    AGGREGATE_CACHE_SIZE,
+    AGGREGATE_CACHE_TTL,
+    STORAGE_BACKEND,
+    SQLITE_PATH,
+    MEMORY_STORAGE_LATENCY,
+)
+from models import (
+    WEEKLY_CLOSE_STAGES,
+    UserSettings,
+    WeeklyCloseRun,
+    WeeklyProgress,
+    WeeklyResult,
+    WorkoutRecord,
+    map_user_settings,
+    map_weekly_close_run,
+    map_weekly_progress,
+    map_weekly_result,
+    map_workout_record,
+)
+from storage.base import StorageBackend
+from utils.cache import TTLCache
+from utils.concurrency import SingleFlight
+from utils.metrics import LatencyRecorder, current_request, mark_call_failed, timed
 
 logger = logging.getLogger(__name__)
 
+USER_SETTINGS_COLUMNS = (
+    "guild_id, user_id, username, weekly_goal, total_penalty, created_at, updated_at"
+)
+WORKOUT_RECORD_COLUMNS = (
+    "id, guild_id, user_id, username, workout_date, week_start_date, "
+    "created_at, is_revoked"
+)
+WEEKLY_CLOSE_RUN_COLUMNS = (
+    "guild_id, week_start_date, settled_at, snapshot_at, broadcast_at, "
+    "report_message_id"
+)
+
+# 연산별 (테이블, 조회 컬럼): 필요한 컬럼만 받아 응답 크기를 줄임
+QUERY_PROJECTIONS = {
+    "user_settings.ping": ("user_settings", "user_id"),
+    "user_settings.get": ("user_settings", USER_SETTINGS_COLUMNS),
+    "user_settings.exists": ("user_settings", "user_id"),
+    "user_settings.scan": ("user_settings", USER_SETTINGS_COLUMNS),
+    "workout_records.scan": ("workout_records", WORKOUT_RECORD_COLUMNS),
+    "weekly_progress.count": ("weekly_progress", "active_count"),
+    "weekly_close_runs.get": ("weekly_close_runs", WEEKLY_CLOSE_RUN_COLUMNS),
+    "weekly_close_runs.last": ("weekly_close_runs", "week_start_date"),
+    "weekly_close_runs.unclosed": ("weekly_close_runs", "week_start_date"),
+    "weekly_report_snapshots.get": ("weekly_report_snapshots", "report"),
+}
+
+
+class Database(StorageBackend):
+    """동기 Supabase 클라이언트 기반 데이터베이스"""
 
-class Database:
     def __init__(self):
         """Supabase 클라이언트 초기화"""
         if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
             raise ValueError("Supabase URL과 Service Role Key가 필요합니다.")
 
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+        self.supabase = self._create_client()
+        # user_settings 조회 캐시 {(guild_id, user_id): UserSettings} (쓰기 시 갱신/무효화)
+        self.settings_cache = TTLCache(
+            max_size=USER_SETTINGS_CACHE_SIZE, ttl=USER_SETTINGS_CACHE_TTL
+        )
+        # 서버별 집계 결과 캐시 {(이름, guild_id): 값} (벌금 기록 시 무효화, TTL은 외부 변경 대비)
+        self.aggregate_cache = TTLCache(
+            max_size=AGGREGATE_CACHE_SIZE, ttl=AGGREGATE_CACHE_TTL
+        )
+        # 동시에 들어온 같은 조회 요청 합치기
+        self.single_flight = SingleFlight()
+        # 쓰기마다 증가 (쓰기 이전에 시작된 조회 결과가 캐시를 덮어쓰지 않도록)
+        self._write_generation = 0
+        # 메서드별 지연 시간 히스토그램
+        self.metrics = LatencyRecorder()
+        # 연산별 응답 크기 통계 {operation: {"calls", "rows", "bytes"}}
+        self.payload_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "rows": 0, "bytes": 0}
+        )
         logger.info("Supabase 클라이언트 초기화 완료")
 
+    def _create_client(self) -> Client:
+        """Supabase 클라이언트 생성"""
+        return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+
+    async def _run(self, query) -> Any:
+        """쿼리 실행 (동기 클라이언트)"""
+        return query.execute()
+
+    async def _execute(self, query, operation: str = "query") -> Any:
+        """쿼리 실행 (모든 PostgREST 호출의 단일 진입점, 왕복/응답 크기 기록)"""
+        start = time.perf_counter()
+        try:
+            response = await self._run(query)
+        except Exception:
+            mark_call_failed()
+            raise
+        finally:
+            request = current_request()
+            if request is not None:
+                request.add_round_trip(time.perf_counter() - start)
+
+        self._record_payload(operation, response)
+        return response
+
+    def _record_payload(self, operation: str, response: Any):
+        """연산별 호출 수/행 수 기록 (응답 크기는 DATABASE_PAYLOAD_STATS일 때만)"""
+        data = getattr(response, "data", None)
+        rows = len(data) if isinstance(data, list) else 0
+
+        stats = self.payload_stats[operation]
+        stats["calls"] += 1
+        stats["rows"] += rows
+        if not DATABASE_PAYLOAD_STATS:
+            return
+
+        # 원본 응답 본문은 남지 않으므로 JSON 직렬화 크기로 추정
+        try:
+            size = len(json.dumps(data, default=str).encode())
+        except (TypeError, ValueError):
+            size = 0
+        stats["bytes"] += size
+        logger.debug(f"{operation}: {rows}행, {size}B")
+
+    def _select(self, operation: str, **filters):
+        """연산에 선언된 컬럼만 조회하는 쿼리 생성 (filters는 eq 조건)"""
+        table, columns = QUERY_PROJECTIONS[operation]
+        query = self.supabase.table(table).select(columns)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        return query
+
+    async def close(self):
+        """연결 정리 (동기 클라이언트는 정리할 자원이 없음)"""
+        pass
+
+    async def _scan(
+        self,
+        operation: str,
+        key: str,
+        mapper: Callable[[Dict], Any],
+        filters: Iterable[Tuple[str, Any]] = (),
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        키셋 페이지네이션 스캔 (key > 마지막 값 ORDER BY key LIMIT page_size)
+
+        OFFSET과 달리 페이지가 뒤로 갈수록 느려지지 않고, PostgREST max-rows에
+        잘리지 않습니다. 한 번에 한 페이지만 메모리에 올리고, 행은 mapper로 변환합니다.
+        """
+        page_size = page_size or DATABASE_SCAN_PAGE_SIZE
+        last_key = None
+
+        while True:
+            query = self._select(operation, **dict(filters))
+            if last_key is not None:
+                query = query.gt(key, last_key)
+
+            response = await self._execute(query.order(key).limit(page_size), operation)
+            rows = response.data or []
+            for row in rows:
+                yield mapper(row)
+
+            if len(rows) < page_size:
+                return
+            last_key = rows[-1][key]
+
+    def _detach_in_flight_reads(self):
+        """쓰기 후 호출: 이후 조회가 쓰기 이전에 시작된 요청에 합류하지 않도록 함"""
+        self._write_generation += 1
+        self.single_flight.forget_all()
+
+    @timed
     async def init_db(self):
         """데이터베이스 테이블 확인 및 초기화"""
         try:
             # 테이블이 이미 존재하는지 확인 (스키마 체크)
             # Supabase에서는 테이블을 웹 인터페이스나 SQL 에디터에서 미리 생성해야 합니다.
             # 여기서는 연결만 확인합니다.
-            response = (
-                self.supabase.table("user_settings")
-                .select("count", count="exact")
-                .limit(1)
-                .execute()
+            await self._execute(
+                self._select("user_settings.ping").limit(1), "user_settings.ping"
             )
             logger.info("Supabase 데이터베이스 연결 확인 완료")
         except Exception as e:
             logger.error(f"데이터베이스 초기화 실패: {e}")
             raise
 
+    @timed
     async def set_user_goal(
-        self, user_id: int, username: str, weekly_goal: int
+        self, guild_id: int, user_id: int, username: str, weekly_goal: int
     ) -> bool:
         """사용자의 주간 운동 목표 설정"""
+        cache_key = (guild_id, user_id)
         try:
             # 기존 사용자 확인
-            existing_user = (
-                self.supabase.table("user_settings")
-                .select("*")
-                .eq("user_id", user_id)
-                .execute()
+            existing_user = await self._execute(
+                self._select(
+                    "user_settings.exists", guild_id=guild_id, user_id=user_id
+                ).limit(1),
+                "user_settings.exists",
             )
 
             if existing_user.data:
                 # 기존 사용자 업데이트
-                response = (
+                response = await self._execute(
                     self.supabase.table("user_settings")
                     .update(
                         {
@@ -57,15 +233,16 @@ class Database:
                             "updated_at": datetime.now().isoformat(),
                         }
                     )
-                    .eq("user_id", user_id)
-                    .execute()
+                    .eq("guild_id", guild_id)
+                    .eq("user_id", user_id),
+                    "user_settings.update",
                 )
             else:
                 # 새 사용자 생성
-                response = (
-                    self.supabase.table("user_settings")
-                    .insert(
+                response = await self._execute(
+                    self.supabase.table("user_settings").insert(
                         {
+                            "guild_id": guild_id,
                             "user_id": user_id,
                             "username": username,
                             "weekly_goal": weekly_goal,
@@ -73,313 +250,693 @@ class Database:
                             "created_at": datetime.now().isoformat(),
                             "updated_at": datetime.now().isoformat(),
                         }
-                    )
-                    .execute()
+                    ),
+                    "user_settings.insert",
                 )
 
+            # 캐시 갱신 (응답에 전체 행이 없으면 무효화)
+            if response.data:
+                self.settings_cache.set(cache_key, map_user_settings(response.data[0]))
+            else:
+                self.settings_cache.invalidate(cache_key)
+
             logger.info(
                 f"사용자 {username}(ID: {user_id})의 목표를 {weekly_goal}회로 설정"
             )
             return True
         except Exception as e:
+            self.settings_cache.invalidate(cache_key)
             logger.error(f"목표 설정 실패: {e}")
             return False
-
-    async def get_user_settings(self, user_id: int) -> Optional[Dict]:
-        """사용자 설정 조회"""
+        finally:
+            self._detach_in_flight_reads()
+
+    @timed
+    async def get_user_settings(
+        self, guild_id: int, user_id: int
+    ) -> Optional[UserSettings]:
+        """사용자 설정 조회 (캐시 우선)"""
+        # 캐시/합류한 호출자끼리 같은 객체를 공유하지 않도록 복사
+        cached = self.settings_cache.get((guild_id, user_id))
+        if cached is not None:
+            return replace(cached)
+
+        settings = await self.single_flight.do(
+            "get_user_settings",
+            (guild_id, user_id),
+            lambda: self._fetch_user_settings(guild_id, user_id),
+        )
+        return replace(settings) if settings else None
+
+    async def _fetch_user_settings(
+        self, guild_id: int, user_id: int
+    ) -> Optional[UserSettings]:
         try:
-            response = (
-                self.supabase.table("user_settings")
-                .select("*")
-                .eq("user_id", user_id)
-                .execute()
+            generation = self._write_generation
+            response = await self._execute(
+                self._select("user_settings.get", guild_id=guild_id, user_id=user_id),
+                "user_settings.get",
             )
 
             if response.data:
-                return response.data[0]
+                settings = map_user_settings(response.data[0])
+                if generation == self._write_generation:
+                    self.settings_cache.set((guild_id, user_id), settings)
+                return settings
             return None
         except Exception as e:
             logger.error(f"사용자 설정 조회 실패: {e}")
             return None
 
-    async def add_workout_record(
+    @timed
+    async def add_workout_with_progress(
         self,
+        guild_id: int,
         user_id: int,
         username: str,
         workout_date: datetime,
         week_start_date: datetime,
-    ) -> bool:
-        """운동 기록 추가 (하루 1회 제한)"""
+    ) -> Optional[Dict]:
+        """
+        운동 기록 추가 + 주간 진행 상황 조회 (RPC 1회)
+
+        Returns:
+            {"status", "current_count", "weekly_goal"} 또는 None (오류)
+            status: added | revived | duplicate | no_settings
+        """
         try:
             workout_date_str = workout_date.date().isoformat()
-            week_start_str = week_start_date.date().isoformat()
-
-            # 이미 해당 날짜에 기록이 있는지 확인 (취소되지 않은 기록만)
-            existing_record = (
-                self.supabase.table("workout_records")
-                .select("id, is_revoked")
-                .eq("user_id", user_id)
-                .eq("workout_date", workout_date_str)
-                .eq("is_revoked", False)
-                .execute()
-            )
 
-            if existing_record.data:
-                logger.info(
-                    f"이미 기록된 운동 (취소되지 않음): {username} - {workout_date_str}"
-                )
-                return False
-
-            # 새 운동 기록 추가
-            response = (
-                self.supabase.table("workout_records")
-                .insert(
+            response = await self._execute(
+                self.supabase.rpc(
+                    "add_workout_with_progress",
                     {
-                        "user_id": user_id,
-                        "username": username,
-                        "workout_date": workout_date_str,
-                        "week_start_date": week_start_str,
-                        "created_at": datetime.now().isoformat(),
-                        "is_revoked": False,
-                    }
-                )
-                .execute()
+                        "p_guild_id": guild_id,
+                        "p_user_id": user_id,
+                        "p_username": username,
+                        "p_workout_date": workout_date_str,
+                        "p_week_start_date": week_start_date.date().isoformat(),
+                    },
+                ),
+                "rpc.add_workout_with_progress",
             )
 
-            if response.data:
-                logger.info(
-                    f"운동 기록 추가 성공: {username} - {workout_date_str} - ID: {response.data[0].get('id')}"
-                )
-                return True
-            else:
+            if not response.data:
                 logger.error(
                     f"운동 기록 추가 실패 (응답 데이터 없음): {username} - {workout_date_str}"
                 )
-                return False
+                return None
+
+            snapshot = response.data[0]
+            logger.info(
+                f"운동 기록 추가 ({snapshot['status']}): {username} - {workout_date_str} "
+                f"- {snapshot['current_count']}/{snapshot['weekly_goal']}회"
+            )
+            return snapshot
         except Exception as e:
             logger.error(f"운동 기록 추가 실패: {e}")
-            return False
-
-    async def revoke_workout_record(self, user_id: int, workout_date: datetime) -> bool:
-        """운동 기록 취소"""
+            return None
+        finally:
+            self._detach_in_flight_reads()
+
+    @timed
+    async def revoke_workout_with_progress(
+        self, guild_id: int, user_id: int, workout_date: datetime
+    ) -> Optional[Dict]:
+        """
+        운동 기록 취소 + 주간 진행 상황 조회 (RPC 1회)
+
+        Returns:
+            {"status", "current_count", "weekly_goal"} 또는 None (오류)
+            status: revoked | not_found
+        """
         try:
             workout_date_str = workout_date.date().isoformat()
 
-            # 취소할 기록 확인 (취소되지 않은 기록만)
-            existing_record = (
-                self.supabase.table("workout_records")
-                .select("id, is_revoked, created_at")
-                .eq("user_id", user_id)
-                .eq("workout_date", workout_date_str)
-                .eq("is_revoked", False)
-                .execute()
-            )
-
-            if not existing_record.data:
-                # 추가 디버깅: 해당 날짜의 모든 기록 확인
-                all_records = (
-                    self.supabase.table("workout_records")
-                    .select("id, is_revoked, created_at")
-                    .eq("user_id", user_id)
-                    .eq("workout_date", workout_date_str)
-                    .execute()
-                )
-
-                if all_records.data:
-                    logger.info(
-                        f"취소할 운동 기록 없음 (이미 취소된 기록 존재): 사용자 {user_id} - {workout_date_str} - 기록 수: {len(all_records.data)}"
-                    )
-                else:
-                    logger.info(
-                        f"취소할 운동 기록 없음 (기록 자체가 없음): 사용자 {user_id} - {workout_date_str}"
-                    )
-                return False
-
-            # 기록 취소 (is_revoked를 True로 설정)
-            response = (
-                self.supabase.table("workout_records")
-                .update({"is_revoked": True})
-                .eq("user_id", user_id)
-                .eq("workout_date", workout_date_str)
-                .eq("is_revoked", False)  # 이미 취소된 기록은 다시 취소할 수 없음
-                .execute()
+            response = await self._execute(
+                self.supabase.rpc(
+                    "revoke_workout_with_progress",
+                    {
+                        "p_guild_id": guild_id,
+                        "p_user_id": user_id,
+                        "p_workout_date": workout_date_str,
+                    },
+                ),
+                "rpc.revoke_workout_with_progress",
             )
 
-            # 실제로 업데이트된 행이 있는지 확인
             if not response.data:
-                logger.info(
-                    f"취소할 운동 기록 없음 (이미 취소됨): 사용자 {user_id} - {workout_date_str}"
+                logger.error(
+                    f"운동 기록 취소 실패 (응답 데이터 없음): 사용자 {user_id} - {workout_date_str}"
                 )
-                return False
+                return None
 
-            logger.info(f"운동 기록 취소: 사용자 {user_id} - {workout_date_str}")
-            return True
+            snapshot = response.data[0]
+            logger.info(
+                f"운동 기록 취소 ({snapshot['status']}): 사용자 {user_id} - {workout_date_str}"
+            )
+            return snapshot
         except Exception as e:
             logger.error(f"운동 기록 취소 실패: {e}")
-            return False
+            return None
+        finally:
+            self._detach_in_flight_reads()
 
+    @timed
     async def get_weekly_workout_count(
-        self, user_id: int, week_start_date: datetime
+        self, guild_id: int, user_id: int, week_start_date: datetime
+    ) -> int:
+        """특정 주의 운동 횟수 조회 (weekly_progress 기본키 조회)"""
+        week_start_str = week_start_date.date().isoformat()
+        return await self.single_flight.do(
+            "get_weekly_workout_count",
+            (guild_id, user_id, week_start_str),
+            lambda: self._fetch_weekly_workout_count(guild_id, user_id, week_start_str),
+        )
+
+    async def _fetch_weekly_workout_count(
+        self, guild_id: int, user_id: int, week_start_str: str
     ) -> int:
-        """특정 주의 운동 횟수 조회"""
         try:
-            week_start_str = week_start_date.date().isoformat()
-
-            response = (
-                self.supabase.table("workout_records")
-                .select("*", count="exact")
-                .eq("user_id", user_id)
-                .eq("week_start_date", week_start_str)
-                .eq("is_revoked", False)
-                .execute()
+            response = await self._execute(
+                self._select(
+                    "weekly_progress.count",
+                    guild_id=guild_id,
+                    user_id=user_id,
+                    week_start_date=week_start_str,
+                ).limit(1),
+                "weekly_progress.count",
             )
 
-            return response.count if response.count else 0
+            if response.data:
+                return response.data[0]["active_count"]
+            return 0
         except Exception as e:
             logger.error(f"주간 운동 횟수 조회 실패: {e}")
             return 0
 
-    async def get_all_users_weekly_data(self, week_start_date: datetime) -> List[Dict]:
-        """모든 사용자의 주간 데이터 조회"""
-        try:
-            week_start_str = week_start_date.date().isoformat()
+    @timed
+    async def reconcile_weekly_progress(
+        self, guild_id: int, week_start_date: Optional[datetime] = None
+    ) -> Optional[List[Dict]]:
+        """
+        주간 카운터 검증 및 보정
 
-            # 모든 사용자 설정 가져오기
-            users_response = self.supabase.table("user_settings").select("*").execute()
+        서버의 workout_records 원본으로 활성 기록 수를 다시 계산해 weekly_progress와
+        어긋난 행을 고치고, 어긋났던 행 목록을 반환합니다.
 
-            if not users_response.data:
-                return []
+        Args:
+            guild_id: 검사할 서버
+            week_start_date: 검사할 주 시작일 (None이면 전체)
 
-            result = []
-            for user in users_response.data:
-                user_id = user["user_id"]
+        Returns:
+            [{"guild_id", "user_id", "week_start_date", "stored_count", "actual_count"}, ...]
+            또는 None (오류)
+        """
+        try:
+            params = {
+                "p_guild_id": guild_id,
+                "p_week_start_date": (
+                    week_start_date.date().isoformat() if week_start_date else None
+                ),
+            }
+
+            response = await self._execute(
+                self.supabase.rpc("reconcile_weekly_progress", params),
+                "rpc.reconcile_weekly_progress",
+            )
 
-                # 해당 주의 운동 횟수 조회
-                workout_count_response = (
-                    self.supabase.table("workout_records")
-                    .select("*", count="exact")
-                    .eq("user_id", user_id)
-                    .eq("week_start_date", week_start_str)
-                    .eq("is_revoked", False)
-                    .execute()
-                )
+            drift = response.data or []
+            if drift:
+                logger.warning(f"주간 카운터 불일치 {len(drift)}건 보정: {drift}")
+            else:
+                logger.info("주간 카운터 검증 완료 (불일치 없음)")
+            return drift
+        except Exception as e:
+            logger.error(f"주간 카운터 검증 실패: {e}")
+            return None
+        finally:
+            self._detach_in_flight_reads()
+
+    @timed
+    async def get_all_users_weekly_data(
+        self, guild_id: int, week_start_date: datetime
+    ) -> List[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터 조회 (페이지당 RPC 1회)"""
+        week_start_str = week_start_date.date().isoformat()
+        rows = await self.single_flight.do(
+            "get_all_users_weekly_data",
+            (guild_id, week_start_str),
+            lambda: self._fetch_all_users_weekly_data(guild_id, week_start_date),
+        )
+        # 합류한 호출자끼리 같은 객체를 공유하지 않도록 복사
+        return [replace(row) for row in rows]
+
+    async def _fetch_all_users_weekly_data(
+        self, guild_id: int, week_start_date: datetime
+    ) -> List[WeeklyProgress]:
+        try:
+            return [
+                row
+                async for row in self.iter_users_weekly_data(guild_id, week_start_date)
+            ]
+        except Exception as e:
+            logger.error(f"모든 사용자 주간 데이터 조회 실패: {e}")
+            return []
+
+    @timed
+    async def get_weekly_history(
+        self,
+        guild_id: int,
+        start_week: datetime,
+        end_week: datetime,
+        user_id: Optional[int] = None,
+    ) -> List[WeeklyResult]:
+        """
+        여러 주 이력 조회 (주 범위 × 사용자, 페이지당 RPC 1회)
+
+        한 페이지는 최대 (사용자 수 × 주 수) 행이므로 PostgREST 최대 행 수 안에 들도록
+        사용자 단위로 키셋 페이지를 자릅니다. 12~52주 × 소규모 서버는 RPC 1회로 끝납니다.
+        가입 전 주와 범위 이후에 가입한 사용자는 반환하지 않으며, 정산된 주에 벌금 기록이
+        없으면 0원입니다.
+        """
+        week_count = (end_week.date() - start_week.date()).days // 7 + 1
+        if week_count <= 0:
+            return []
+        user_limit = max(1, DATABASE_SCAN_PAGE_SIZE // week_count)
+        last_user_id = None
+        results = []
 
-                workout_count = (
-                    workout_count_response.count if workout_count_response.count else 0
+        try:
+            while True:
+                response = await self._execute(
+                    self.supabase.rpc(
+                        "get_weekly_history",
+                        {
+                            "p_guild_id": guild_id,
+                            "p_start_week": start_week.date().isoformat(),
+                            "p_end_week": end_week.date().isoformat(),
+                            "p_user_id": user_id,
+                            "p_after_user_id": last_user_id,
+                            "p_user_limit": user_limit,
+                        },
+                    ),
+                    "rpc.get_weekly_history",
                 )
 
-                result.append(
-                    {
-                        "user_id": user_id,
-                        "username": user["username"],
-                        "weekly_goal": user["weekly_goal"],
-                        "workout_count": workout_count,
-                        "total_penalty": user["total_penalty"],
-                    }
+                rows = response.data or []
+                results.extend(
+                    map_weekly_result(row, guild_id=guild_id) for row in rows
                 )
 
-            return result
+                # 가입 전 주는 빠지므로 행 수가 아니라 사용자 수로 마지막 페이지 판단
+                page_users = len({row["user_id"] for row in rows})
+                if user_id is not None or page_users < user_limit:
+                    return results
+                last_user_id = rows[-1]["user_id"]
         except Exception as e:
-            logger.error(f"모든 사용자 주간 데이터 조회 실패: {e}")
+            logger.error(f"주간 이력 조회 실패: {e}")
             return []
 
-    async def add_weekly_penalty_record(
+    async def iter_users_weekly_data(
         self,
-        user_id: int,
-        username: str,
+        guild_id: int,
         week_start_date: datetime,
-        goal_count: int,
-        actual_count: int,
-        penalty_amount: float,
-    ) -> bool:
-        """주간 벌금 기록 추가 (중복 방지)"""
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터 스트리밍 (페이지당 RPC 1회)"""
+        page_size = page_size or DATABASE_SCAN_PAGE_SIZE
+        week_start = week_start_date.date()
+        week_start_str = week_start.isoformat()
+        last_user_id = None
+
+        while True:
+            response = await self._execute(
+                self.supabase.rpc(
+                    "get_all_users_weekly_data",
+                    {
+                        "p_guild_id": guild_id,
+                        "p_week_start_date": week_start_str,
+                        "p_after_user_id": last_user_id,
+                        "p_limit": page_size,
+                    },
+                ),
+                "rpc.get_all_users_weekly_data",
+            )
+
+            rows = response.data or []
+            for row in rows:
+                yield map_weekly_progress(
+                    row, week_start_date=week_start, guild_id=guild_id
+                )
+
+            if len(rows) < page_size:
+                return
+            last_user_id = rows[-1]["user_id"]
+
+    def iter_user_settings(
+        self, guild_id: int, page_size: Optional[int] = None
+    ) -> AsyncIterator[UserSettings]:
+        """서버 사용자 설정 스트리밍 (user_id 키셋)"""
+        return self._scan(
+            "user_settings.scan",
+            "user_id",
+            map_user_settings,
+            filters=[("guild_id", guild_id)],
+            page_size=page_size,
+        )
+
+    def iter_workout_records(
+        self,
+        guild_id: int,
+        user_id: Optional[int] = None,
+        include_revoked: bool = False,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WorkoutRecord]:
+        """서버 운동 기록 스트리밍 (id 키셋)"""
+        filters = [("guild_id", guild_id)]
+        if user_id is not None:
+            filters.append(("user_id", user_id))
+        if not include_revoked:
+            filters.append(("is_revoked", False))
+        return self._scan(
+            "workout_records.scan",
+            "id",
+            map_workout_record,
+            filters=filters,
+            page_size=page_size,
+        )
+
+    @timed
+    async def settle_weekly_penalties(
+        self, guild_id: int, week_start_date: datetime, penalties: List[Dict]
+    ) -> Optional[Dict]:
+        """
+        서버 주간 벌금 일괄 정산 (RPC 1회, 단일 트랜잭션)
+
+        이미 정산된 (guild_id, user_id, week_start_date)는 건너뛰고, 새로 추가된
+        기록에 대해서만 누적 벌금을 증가시킵니다.
+
+        Args:
+            guild_id: 정산할 서버
+            week_start_date: 주 시작일
+            penalties: user_id, username, goal_count, actual_count, penalty_amount 목록
+
+        Returns:
+            {"processed_count", "total_penalty_added", "settled_user_ids"} 또는 None (오류)
+        """
+        if not penalties:
+            return {
+                "processed_count": 0,
+                "total_penalty_added": 0.0,
+                "settled_user_ids": [],
+            }
+
         try:
             week_start_str = week_start_date.date().isoformat()
 
-            # 이미 해당 주에 벌금 기록이 있는지 확인
-            existing_penalty = (
-                self.supabase.table("weekly_penalties")
-                .select("*")
-                .eq("user_id", user_id)
-                .eq("week_start_date", week_start_str)
-                .execute()
+            response = await self._execute(
+                self.supabase.rpc(
+                    "settle_weekly_penalties",
+                    {
+                        "p_guild_id": guild_id,
+                        "p_week_start_date": week_start_str,
+                        "p_penalties": penalties,
+                    },
+                ),
+                "rpc.settle_weekly_penalties",
             )
 
-            if existing_penalty.data:
-                logger.info(f"이미 벌금 기록 존재: {username} - {week_start_str}")
-                return False
+            # 누적 벌금이 바뀌었으므로 해당 사용자 캐시 무효화
+            for penalty in penalties:
+                self.settings_cache.invalidate((guild_id, penalty["user_id"]))
+
+            row = response.data[0] if response.data else {}
+            result = {
+                "processed_count": row.get("processed_count") or 0,
+                "total_penalty_added": float(row.get("total_penalty_added") or 0),
+                "settled_user_ids": row.get("settled_user_ids") or [],
+            }
+            # 이미 정산된 주를 다시 실행한 경우에는 합계가 그대로이므로 캐시 유지
+            if result["processed_count"]:
+                self.aggregate_cache.invalidate(("total_accumulated_penalty", guild_id))
+            logger.info(
+                f"주간 벌금 일괄 정산: 서버 {guild_id} {week_start_str} - {result['processed_count']}건, "
+                f"{result['total_penalty_added']}원"
+            )
+            return result
+        except Exception as e:
+            for penalty in penalties:
+                self.settings_cache.invalidate((guild_id, penalty["user_id"]))
+            self.aggregate_cache.invalidate(("total_accumulated_penalty", guild_id))
+            logger.error(f"주간 벌금 일괄 정산 실패: {e}")
+            return None
+        finally:
+            self._detach_in_flight_reads()
+
+    @timed
+    async def get_total_accumulated_penalty(self, guild_id: int) -> float:
+        """서버 누적 벌금 조회 (캐시 우선, 없으면 서버 합계 RPC 1회)"""
+        cached = self.aggregate_cache.get(("total_accumulated_penalty", guild_id))
+        if cached is not None:
+            return cached
+
+        return await self.single_flight.do(
+            "get_total_accumulated_penalty",
+            guild_id,
+            lambda: self._fetch_total_accumulated_penalty(guild_id),
+        )
+
+    async def _fetch_total_accumulated_penalty(self, guild_id: int) -> float:
+        try:
+            generation = self._write_generation
+            response = await self._execute(
+                self.supabase.rpc(
+                    "get_total_accumulated_penalty", {"p_guild_id": guild_id}
+                ),
+                "rpc.get_total_accumulated_penalty",
+            )
 
-            # 새 벌금 기록 추가
-            penalty_response = (
-                self.supabase.table("weekly_penalties")
-                .insert(
-                    {
-                        "user_id": user_id,
-                        "username": username,
-                        "week_start_date": week_start_str,
-                        "goal_count": goal_count,
-                        "actual_count": actual_count,
-                        "penalty_amount": penalty_amount,
-                        "created_at": datetime.now().isoformat(),
-                    }
+            total_penalty = float(response.data or 0)
+            if generation == self._write_generation:
+                self.aggregate_cache.set(
+                    ("total_accumulated_penalty", guild_id), total_penalty
                 )
-                .execute()
+            return total_penalty
+        except Exception as e:
+            logger.error(f"서버 누적 벌금 조회 실패: {e}")
+            return 0.0
+
+    @timed
+    async def get_weekly_close_run(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[WeeklyCloseRun]:
+        """서버 한 주의 마감 진행 기록 (기본키 1행)"""
+        try:
+            response = await self._execute(
+                self._select(
+                    "weekly_close_runs.get",
+                    guild_id=guild_id,
+                    week_start_date=week_start_date.date().isoformat(),
+                ).limit(1),
+                "weekly_close_runs.get",
             )
+            if not response.data:
+                return None
+            return map_weekly_close_run(response.data[0])
+        except Exception as e:
+            logger.error(f"주간 마감 기록 조회 실패: {e}")
+            return None
 
-            # 사용자의 총 벌금 업데이트
-            user_settings = await self.get_user_settings(user_id)
-            if user_settings:
-                new_total_penalty = user_settings["total_penalty"] + penalty_amount
-                update_response = (
-                    self.supabase.table("user_settings")
-                    .update(
-                        {
-                            "total_penalty": new_total_penalty,
-                            "updated_at": datetime.now().isoformat(),
-                        }
-                    )
-                    .eq("user_id", user_id)
-                    .execute()
-                )
+    @timed
+    async def record_weekly_close_stage(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        stage: str,
+        report_message_id: Optional[int] = None,
+    ) -> bool:
+        """주간 마감 단계 완료 기록 (RPC 1회, 이미 기록된 단계는 처음 시각 유지)"""
+        if stage not in WEEKLY_CLOSE_STAGES:
+            logger.error(f"알 수 없는 주간 마감 단계: {stage}")
+            return False
 
-            logger.info(f"주간 벌금 기록 추가: {username} - {penalty_amount}원")
+        try:
+            await self._execute(
+                self.supabase.rpc(
+                    "record_weekly_close_stage",
+                    {
+                        "p_guild_id": guild_id,
+                        "p_week_start_date": week_start_date.date().isoformat(),
+                        "p_stage": stage,
+                        "p_report_message_id": report_message_id,
+                    },
+                ),
+                "rpc.record_weekly_close_stage",
+            )
             return True
         except Exception as e:
-            logger.error(f"주간 벌금 기록 추가 실패: {e}")
+            logger.error(f"주간 마감 단계 기록 실패: {e}")
             return False
 
-    async def get_total_accumulated_penalty(self) -> float:
-        """전체 누적 벌금 조회"""
+    @timed
+    async def get_last_closed_week(self, guild_id: int) -> Optional[date]:
+        """서버에서 마지막으로 마감이 끝난 주의 시작일 (기본키 역순 1행)"""
         try:
-            response = (
-                self.supabase.table("user_settings").select("total_penalty").execute()
+            response = await self._execute(
+                self._select("weekly_close_runs.last", guild_id=guild_id)
+                .not_.is_("broadcast_at", "null")
+                .order("week_start_date", desc=True)
+                .limit(1),
+                "weekly_close_runs.last",
             )
+            if not response.data:
+                return None
+            return date.fromisoformat(response.data[0]["week_start_date"])
+        except Exception as e:
+            logger.error(f"마지막 마감 주 조회 실패: {e}")
+            return None
 
-            if response.data:
-                total_penalty = sum(user["total_penalty"] for user in response.data)
-                return total_penalty
-            return 0.0
+    @timed
+    async def get_unclosed_weeks(self, guild_id: int) -> List[date]:
+        """리포트 전송까지 끝나지 않은 주의 시작일 목록 (주 시작일 순)"""
+        try:
+            response = await self._execute(
+                self._select("weekly_close_runs.unclosed", guild_id=guild_id)
+                .is_("broadcast_at", "null")
+                .order("week_start_date"),
+                "weekly_close_runs.unclosed",
+            )
+            return [date.fromisoformat(row["week_start_date"]) for row in response.data]
         except Exception as e:
-            logger.error(f"전체 누적 벌금 조회 실패: {e}")
-            return 0.0
+            logger.error(f"마감되지 않은 주 조회 실패: {e}")
+            return []
 
-    async def reset_database(self) -> bool:
-        """데이터베이스 초기화 (모든 데이터 삭제)"""
+    @timed
+    async def save_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime, report: Dict
+    ) -> bool:
+        """주간 리포트 스냅샷 저장 (같은 주는 교체, 응답 본문 없음)"""
         try:
-            # 테이블 순서대로 데이터 삭제
-            # 먼저 외래키 참조가 있는 테이블부터 삭제
+            await self._execute(
+                self.supabase.table("weekly_report_snapshots").upsert(
+                    {
+                        "guild_id": guild_id,
+                        "week_start_date": week_start_date.date().isoformat(),
+                        "report": report,
+                        "created_at": datetime.now().isoformat(),
+                    },
+                    on_conflict="guild_id,week_start_date",
+                    returning=ReturnMethod.minimal,
+                ),
+                "weekly_report_snapshots.upsert",
+            )
+            return True
+        except Exception as e:
+            logger.error(f"주간 리포트 스냅샷 저장 실패: {e}")
+            return False
 
-            # 1. weekly_penalties 테이블 모든 데이터 삭제
-            self.supabase.table("weekly_penalties").delete().neq("id", 0).execute()
+    @timed
+    async def get_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[Dict]:
+        """주간 리포트 스냅샷 조회 (기본키 1행)"""
+        try:
+            response = await self._execute(
+                self._select(
+                    "weekly_report_snapshots.get",
+                    guild_id=guild_id,
+                    week_start_date=week_start_date.date().isoformat(),
+                ).limit(1),
+                "weekly_report_snapshots.get",
+            )
+            return response.data[0]["report"] if response.data else None
+        except Exception as e:
+            logger.error(f"주간 리포트 스냅샷 조회 실패: {e}")
+            return None
 
-            # 2. workout_records 테이블 모든 데이터 삭제
-            self.supabase.table("workout_records").delete().neq("id", 0).execute()
+    @timed
+    async def reset_database(self, guild_id: int) -> bool:
+        """서버 데이터 초기화 (해당 서버의 모든 데이터 삭제)"""
+        try:
+            # 외래키 참조가 있는 테이블부터 삭제
+            for table in (
+                "weekly_close_runs",
+                "weekly_report_snapshots",
+                "weekly_penalties",
+                "workout_records",
+                "weekly_progress",
+                "user_settings",
+            ):
+                await self._execute(
+                    self.supabase.table(table)
+                    .delete(returning=ReturnMethod.minimal)
+                    .eq("guild_id", guild_id),
+                    f"{table}.delete",
+                )
 
-            # 3. user_settings 테이블 모든 데이터 삭제
-            self.supabase.table("user_settings").delete().neq("user_id", 0).execute()
+            # 캐시 키가 서버별로 흩어져 있으므로 전체를 비움 (다른 서버는 다시 채워짐)
+            self.settings_cache.clear()
+            self.aggregate_cache.clear()
 
-            logger.warning("데이터베이스가 완전히 초기화되었습니다")
+            logger.warning(f"서버 {guild_id}의 데이터가 완전히 초기화되었습니다")
             return True
         except Exception as e:
             logger.error(f"데이터베이스 초기화 실패: {e}")
             return False
+        finally:
+            self._detach_in_flight_reads()
+
+
+class AsyncDatabase(Database):
+    """비동기 Supabase 클라이언트 기반 데이터베이스
+
+    httpx.AsyncClient 커넥션 풀 하나를 공유하므로 PostgREST 호출이
+    이벤트 루프를 막지 않습니다.
+    """
+
+    def _create_client(self) -> AsyncClient:
+        """공유 커넥션 풀을 사용하는 비동기 Supabase 클라이언트 생성"""
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=DATABASE_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=DATABASE_POOL_MAX_KEEPALIVE,
+            ),
+            timeout=DATABASE_TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+        )
+        return AsyncClient(
+            SUPABASE_URL,
+            SUPABASE_SERVICE_ROLE_KEY,
+            AsyncClientOptions(httpx_client=self.http_client),
+        )
+
+    async def _run(self, query) -> Any:
+        """쿼리 비동기 실행"""
+        return await query.execute()
+
+    async def close(self):
+        """커넥션 풀 종료"""
+        await self.http_client.aclose()
+        logger.info("Supabase 커넥션 풀 종료")
+
+
+def create_database() -> StorageBackend:
+    """설정(STORAGE_BACKEND, DATABASE_CLIENT_MODE)에 맞는 저장소 인스턴스 생성"""
+    if STORAGE_BACKEND == "sqlite":
+        from storage.sqlite import SQLiteDatabase
+
+        return SQLiteDatabase(SQLITE_PATH)
+    if STORAGE_BACKEND == "memory":
+        from storage.memory import InMemoryDatabase
+
+        return InMemoryDatabase(latency=MEMORY_STORAGE_LATENCY)
+    if STORAGE_BACKEND != "supabase":
+        raise ValueError(f"알 수 없는 STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+    if DATABASE_CLIENT_MODE == "async":
+        return AsyncDatabase()
+    if DATABASE_CLIENT_MODE == "sync":
+        return Database()
+    raise ValueError(f"알 수 없는 DATABASE_CLIENT_MODE: {DATABASE_CLIENT_MODE}")
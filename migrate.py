@@ -0,0 +1,77 @@
+"""
+스키마 마이그레이션 CLI
+migrations/ 아래의 SQL 파일을 Postgres(DATABASE_URL) 또는 SQLite 파일에 적용합니다.
+"""
+
+import argparse
+import logging
+import sqlite3
+from typing import List, Optional
+
+from config import DATABASE_URL
+from storage.migrations import (
+    ASSIGN_GUILD_SQL,
+    MigrationError,
+    MigrationRunner,
+    connect_postgres,
+)
+
+logger = logging.getLogger(__name__)
+
+EPILOG = f"""
+서버 분리 마이그레이션(Postgres 0006, SQLite 0004)은 기존 행을 guild_id = 0으로 옮깁니다.
+기존 서버로 이어서 쓰려면 적용 후 한 번 실행하세요 (하위 테이블은 외래키로 함께 이동):
+
+    {ASSIGN_GUILD_SQL}
+"""
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """마이그레이션 CLI"""
+    parser = argparse.ArgumentParser(
+        description="스키마 마이그레이션 적용",
+        epilog=EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--database-url", default=DATABASE_URL, help="Postgres URL")
+    parser.add_argument("--sqlite", metavar="PATH", help="SQLite 파일 경로")
+    parser.add_argument("--target", type=int, help="이 버전까지만 적용")
+    parser.add_argument("--status", action="store_true", help="적용/대기 목록만 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    if args.sqlite:
+        conn = sqlite3.connect(args.sqlite)
+        runner = MigrationRunner(conn, "sqlite")
+    elif args.database_url:
+        conn = connect_postgres(args.database_url)
+        runner = MigrationRunner(conn, "postgres")
+    else:
+        parser.error("DATABASE_URL 환경변수나 --database-url/--sqlite가 필요합니다")
+
+    try:
+        if args.status:
+            applied = runner.applied()
+            for migration in runner.migrations:
+                mark = "적용됨" if migration.version in applied else "대기"
+                print(f"{migration.version:04d}_{migration.name}: {mark}")
+        else:
+            runner.migrate(args.target)
+
+        unassigned = runner.unassigned_users()
+        if unassigned:
+            logger.warning(
+                f"서버에 배정되지 않은 기존 사용자 {unassigned}명 (guild_id = 0). "
+                f"기존 서버로 옮기려면 한 번 실행하세요: {ASSIGN_GUILD_SQL}"
+            )
+        return 0
+    except MigrationError as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,4 @@
--- Workout Discord Bot - Supabase Schema
--- 이 파일을 Supabase SQL Editor에서 실행하여 테이블을 생성하세요.
+-- 0001: 기본 테이블과 초기 인덱스
 
 -- 1. 사용자 설정 테이블
 CREATE TABLE IF NOT EXISTS user_settings (
@@ -23,11 +22,6 @@ CREATE TABLE IF NOT EXISTS workout_records (
     FOREIGN KEY (user_id) REFERENCES user_settings (user_id) ON DELETE CASCADE
 );
 
--- 부분 UNIQUE 제약조건: is_revoked=FALSE인 기록만 하나씩 허용
-CREATE UNIQUE INDEX IF NOT EXISTS unique_active_workout_per_user_date 
-ON workout_records(user_id, workout_date) 
-WHERE is_revoked = FALSE;
-
 -- 3. 주간 벌금 기록 테이블
 CREATE TABLE IF NOT EXISTS weekly_penalties (
     id SERIAL PRIMARY KEY,
@@ -46,21 +40,3 @@ CREATE TABLE IF NOT EXISTS weekly_penalties (
 CREATE INDEX IF NOT EXISTS idx_workout_records_user_week ON workout_records(user_id, week_start_date);
 CREATE INDEX IF NOT EXISTS idx_workout_records_date ON workout_records(workout_date);
 CREATE INDEX IF NOT EXISTS idx_weekly_penalties_user_week ON weekly_penalties(user_id, week_start_date);
-
--- Row Level Security 활성화 (선택사항)
--- ALTER TABLE user_settings ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE workout_records ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE weekly_penalties ENABLE ROW LEVEL SECURITY;
-
--- RLS 정책 생성 예시 (필요시 수정하여 사용)
--- CREATE POLICY "Enable read access for service role" ON user_settings
---     FOR SELECT USING (true);
--- CREATE POLICY "Enable insert access for service role" ON user_settings
---     FOR INSERT WITH CHECK (true);
--- CREATE POLICY "Enable update access for service role" ON user_settings
---     FOR UPDATE USING (true);
--- CREATE POLICY "Enable delete access for service role" ON user_settings
---     FOR DELETE USING (true);
-
--- 테이블 생성 완료 메시지
-SELECT 'Workout Discord Bot 테이블들이 성공적으로 생성되었습니다!' as message; 
\ No newline at end of file
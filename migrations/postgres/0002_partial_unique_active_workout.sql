@@ -0,0 +1,10 @@
+-- 0002: 같은 날짜 중복 방지를 활성 기록(is_revoked=FALSE)에만 적용
+-- 취소된 기록이 남아 있어도 같은 날짜에 다시 기록할 수 있도록 합니다.
+
+-- 기존 UNIQUE 제약조건 제거 (초기 README 스키마로 만든 DB)
+ALTER TABLE workout_records DROP CONSTRAINT IF EXISTS workout_records_user_id_workout_date_key;
+
+-- 부분 UNIQUE 인덱스: is_revoked=FALSE인 기록만 하나씩 허용
+CREATE UNIQUE INDEX IF NOT EXISTS unique_active_workout_per_user_date
+ON workout_records(user_id, workout_date)
+WHERE is_revoked = FALSE;
@@ -0,0 +1,98 @@
+-- 0003: 주간 진행 카운터 테이블과 동기화 트리거
+
+-- 주간 운동 횟수 조회를 기본키 조회 한 번으로 처리합니다.
+CREATE TABLE IF NOT EXISTS weekly_progress (
+    user_id BIGINT NOT NULL,
+    week_start_date DATE NOT NULL,
+    active_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, week_start_date),
+    FOREIGN KEY (user_id) REFERENCES user_settings (user_id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION apply_weekly_progress_delta(
+    p_user_id BIGINT,
+    p_week_start_date DATE,
+    p_delta INTEGER
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO weekly_progress (user_id, week_start_date, active_count)
+    VALUES (p_user_id, p_week_start_date, GREATEST(p_delta, 0))
+    ON CONFLICT (user_id, week_start_date) DO UPDATE
+    SET active_count = GREATEST(weekly_progress.active_count + p_delta, 0),
+        updated_at = NOW();
+$$;
+
+-- 추가/재활성화/취소/삭제 시 활성 기록 수를 증감
+CREATE OR REPLACE FUNCTION sync_weekly_progress()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_revoked = FALSE THEN
+        PERFORM apply_weekly_progress_delta(OLD.user_id, OLD.week_start_date, -1);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_revoked = FALSE THEN
+        PERFORM apply_weekly_progress_delta(NEW.user_id, NEW.week_start_date, 1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_sync_weekly_progress ON workout_records;
+CREATE TRIGGER trg_sync_weekly_progress
+AFTER INSERT OR UPDATE OF is_revoked, user_id, week_start_date OR DELETE
+ON workout_records
+FOR EACH ROW EXECUTE FUNCTION sync_weekly_progress();
+
+-- 카운터 검증: 원본 기록으로 다시 계산해 어긋난 행을 고치고 반환
+-- p_week_start_date가 NULL이면 전체 주를 검사
+CREATE OR REPLACE FUNCTION reconcile_weekly_progress(p_week_start_date DATE DEFAULT NULL)
+RETURNS TABLE (
+    user_id BIGINT,
+    week_start_date DATE,
+    stored_count INTEGER,
+    actual_count INTEGER
+)
+LANGUAGE sql
+AS $$
+    WITH actual AS (
+        SELECT wr.user_id, wr.week_start_date, COUNT(*)::INTEGER AS active_count
+        FROM workout_records wr
+        WHERE wr.is_revoked = FALSE
+          AND (p_week_start_date IS NULL OR wr.week_start_date = p_week_start_date)
+        GROUP BY wr.user_id, wr.week_start_date
+    ),
+    stored AS (
+        SELECT wp.user_id, wp.week_start_date, wp.active_count
+        FROM weekly_progress wp
+        WHERE p_week_start_date IS NULL OR wp.week_start_date = p_week_start_date
+    ),
+    drift AS (
+        SELECT
+            COALESCE(a.user_id, s.user_id) AS user_id,
+            COALESCE(a.week_start_date, s.week_start_date) AS week_start_date,
+            COALESCE(s.active_count, 0) AS stored_count,
+            COALESCE(a.active_count, 0) AS actual_count
+        FROM actual a
+        FULL OUTER JOIN stored s
+            ON s.user_id = a.user_id AND s.week_start_date = a.week_start_date
+        WHERE COALESCE(s.active_count, 0) <> COALESCE(a.active_count, 0)
+    ),
+    fixed AS (
+        INSERT INTO weekly_progress (user_id, week_start_date, active_count)
+        SELECT d.user_id, d.week_start_date, d.actual_count FROM drift d
+        ON CONFLICT (user_id, week_start_date) DO UPDATE
+        SET active_count = EXCLUDED.active_count, updated_at = NOW()
+    )
+    SELECT d.user_id, d.week_start_date, d.stored_count, d.actual_count
+    FROM drift d
+    ORDER BY d.week_start_date, d.user_id;
+$$;
+
+-- 기존 기록으로 카운터 채우기 (재실행해도 안전)
+SELECT COUNT(*) AS backfilled_weeks FROM reconcile_weekly_progress();
@@ -0,0 +1,201 @@
+-- 0004: RPC 함수 (한 번의 왕복으로 기록/취소/집계/정산)
+
+-- 운동 기록 추가: 중복 확인, 취소된 기록 재활성화 또는 신규 추가 후
+-- 해당 주의 활성 기록 수와 주간 목표를 함께 반환
+CREATE OR REPLACE FUNCTION add_workout_with_progress(
+    p_user_id BIGINT,
+    p_username TEXT,
+    p_workout_date DATE,
+    p_week_start_date DATE
+)
+RETURNS TABLE (status TEXT, current_count INTEGER, weekly_goal INTEGER)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_goal INTEGER;
+    v_status TEXT;
+BEGIN
+    SELECT us.weekly_goal INTO v_goal
+    FROM user_settings us
+    WHERE us.user_id = p_user_id;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'no_settings'::TEXT, 0, 0;
+        RETURN;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM workout_records wr
+        WHERE wr.user_id = p_user_id
+          AND wr.workout_date = p_workout_date
+          AND wr.is_revoked = FALSE
+    ) THEN
+        v_status := 'duplicate';
+    ELSE
+        BEGIN
+            -- 취소된 기록이 있으면 다시 활성화
+            UPDATE workout_records wr
+            SET is_revoked = FALSE,
+                username = p_username,
+                week_start_date = p_week_start_date,
+                created_at = NOW()
+            WHERE wr.id = (
+                SELECT r.id FROM workout_records r
+                WHERE r.user_id = p_user_id
+                  AND r.workout_date = p_workout_date
+                  AND r.is_revoked = TRUE
+                ORDER BY r.id DESC
+                LIMIT 1
+            )
+              AND wr.is_revoked = TRUE;
+
+            IF FOUND THEN
+                v_status := 'revived';
+            ELSE
+                INSERT INTO workout_records
+                    (user_id, username, workout_date, week_start_date, is_revoked)
+                VALUES
+                    (p_user_id, p_username, p_workout_date, p_week_start_date, FALSE);
+                v_status := 'added';
+            END IF;
+        EXCEPTION WHEN unique_violation THEN
+            -- 동시에 들어온 같은 날짜 기록은 부분 UNIQUE 인덱스가 막아줌
+            v_status := 'duplicate';
+        END;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        v_status,
+        COALESCE(
+            (
+                SELECT wp.active_count FROM weekly_progress wp
+                WHERE wp.user_id = p_user_id
+                  AND wp.week_start_date = p_week_start_date
+            ),
+            0
+        ),
+        v_goal;
+END;
+$$;
+
+-- 운동 기록 취소: 활성 기록을 취소하고 해당 주의 활성 기록 수와 주간 목표 반환
+CREATE OR REPLACE FUNCTION revoke_workout_with_progress(
+    p_user_id BIGINT,
+    p_workout_date DATE
+)
+RETURNS TABLE (status TEXT, current_count INTEGER, weekly_goal INTEGER)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_week_start DATE;
+BEGIN
+    UPDATE workout_records wr
+    SET is_revoked = TRUE
+    WHERE wr.user_id = p_user_id
+      AND wr.workout_date = p_workout_date
+      AND wr.is_revoked = FALSE
+    RETURNING wr.week_start_date INTO v_week_start;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'not_found'::TEXT, 0, 0;
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        'revoked'::TEXT,
+        COALESCE(
+            (
+                SELECT wp.active_count FROM weekly_progress wp
+                WHERE wp.user_id = p_user_id
+                  AND wp.week_start_date = v_week_start
+            ),
+            0
+        ),
+        COALESCE(
+            (SELECT us.weekly_goal FROM user_settings us WHERE us.user_id = p_user_id),
+            0
+        );
+END;
+$$;
+
+-- 모든 사용자의 주간 데이터: 사용자별 주간 카운터를 한 번에 조인
+-- p_after_user_id/p_limit: user_id 기준 키셋 페이지네이션 (PostgREST max-rows 절단 방지)
+DROP FUNCTION IF EXISTS get_all_users_weekly_data(DATE);
+CREATE OR REPLACE FUNCTION get_all_users_weekly_data(
+    p_week_start_date DATE,
+    p_after_user_id BIGINT DEFAULT NULL,
+    p_limit INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    user_id BIGINT,
+    username TEXT,
+    weekly_goal INTEGER,
+    workout_count INTEGER,
+    total_penalty DECIMAL(10,2)
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        us.user_id,
+        us.username,
+        us.weekly_goal,
+        COALESCE(wp.active_count, 0),
+        us.total_penalty
+    FROM user_settings us
+    LEFT JOIN weekly_progress wp
+        ON wp.user_id = us.user_id
+       AND wp.week_start_date = p_week_start_date
+    WHERE p_after_user_id IS NULL OR us.user_id > p_after_user_id
+    ORDER BY us.user_id
+    LIMIT p_limit;
+$$;
+
+-- 주간 벌금 일괄 정산: 한 트랜잭션에서 벌금 기록을 일괄 추가하고
+-- 실제로 추가된 행에 대해서만 누적 벌금을 서버에서 증가시킴
+-- p_penalties: [{"user_id", "username", "goal_count", "actual_count", "penalty_amount"}, ...]
+CREATE OR REPLACE FUNCTION settle_weekly_penalties(
+    p_week_start_date DATE,
+    p_penalties JSONB
+)
+RETURNS TABLE (processed_count INTEGER, total_penalty_added DECIMAL(12,2))
+LANGUAGE sql
+AS $$
+    WITH inserted AS (
+        INSERT INTO weekly_penalties
+            (user_id, username, week_start_date, goal_count, actual_count, penalty_amount)
+        SELECT
+            p.user_id, p.username, p_week_start_date,
+            p.goal_count, p.actual_count, p.penalty_amount
+        FROM jsonb_to_recordset(p_penalties) AS p(
+            user_id BIGINT,
+            username TEXT,
+            goal_count INTEGER,
+            actual_count INTEGER,
+            penalty_amount DECIMAL(10,2)
+        )
+        ON CONFLICT (user_id, week_start_date) DO NOTHING
+        RETURNING user_id, penalty_amount
+    ),
+    updated AS (
+        UPDATE user_settings us
+        SET total_penalty = us.total_penalty + i.penalty_amount,
+            updated_at = NOW()
+        FROM inserted i
+        WHERE us.user_id = i.user_id
+        RETURNING i.penalty_amount
+    )
+    SELECT COUNT(*)::INTEGER, COALESCE(SUM(penalty_amount), 0)::DECIMAL(12,2)
+    FROM updated;
+$$;
+
+-- 전체 누적 벌금: 서버에서 합계만 계산해 숫자 하나를 반환
+CREATE OR REPLACE FUNCTION get_total_accumulated_penalty()
+RETURNS DECIMAL(12,2)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(SUM(total_penalty), 0)::DECIMAL(12,2) FROM user_settings;
+$$;
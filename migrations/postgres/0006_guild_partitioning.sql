@@ -0,0 +1,383 @@
+-- 0006: 서버(guild)별 파티션
+-- 모든 테이블에 guild_id를 추가하고 키/인덱스가 guild_id로 시작하도록 바꿔
+-- 서버별 리포트/정산/집계가 해당 서버의 행만 읽도록 합니다.
+-- 기존 행은 guild_id = 0으로 남습니다. 서버 하나에서 쓰던 DB라면 아래 한 줄로 옮깁니다
+-- (하위 테이블은 ON UPDATE CASCADE로 함께 이동):
+--     UPDATE user_settings SET guild_id = <서버 ID> WHERE guild_id = 0;
+
+-- 1. guild_id 컬럼
+ALTER TABLE user_settings ADD COLUMN IF NOT EXISTS guild_id BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE workout_records ADD COLUMN IF NOT EXISTS guild_id BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE weekly_penalties ADD COLUMN IF NOT EXISTS guild_id BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE weekly_progress ADD COLUMN IF NOT EXISTS guild_id BIGINT NOT NULL DEFAULT 0;
+
+-- 2. 키 재구성: 외래키를 먼저 풀고 (guild_id, user_id) 기준으로 다시 연결
+ALTER TABLE workout_records DROP CONSTRAINT IF EXISTS workout_records_user_id_fkey;
+ALTER TABLE weekly_penalties DROP CONSTRAINT IF EXISTS weekly_penalties_user_id_fkey;
+ALTER TABLE weekly_progress DROP CONSTRAINT IF EXISTS weekly_progress_user_id_fkey;
+ALTER TABLE workout_records DROP CONSTRAINT IF EXISTS workout_records_guild_user_fkey;
+ALTER TABLE weekly_penalties DROP CONSTRAINT IF EXISTS weekly_penalties_guild_user_fkey;
+ALTER TABLE weekly_progress DROP CONSTRAINT IF EXISTS weekly_progress_guild_user_fkey;
+
+ALTER TABLE user_settings DROP CONSTRAINT IF EXISTS user_settings_pkey;
+ALTER TABLE user_settings ADD CONSTRAINT user_settings_pkey PRIMARY KEY (guild_id, user_id);
+
+ALTER TABLE weekly_progress DROP CONSTRAINT IF EXISTS weekly_progress_pkey;
+ALTER TABLE weekly_progress
+    ADD CONSTRAINT weekly_progress_pkey PRIMARY KEY (guild_id, user_id, week_start_date);
+
+ALTER TABLE weekly_penalties DROP CONSTRAINT IF EXISTS weekly_penalties_user_id_week_start_date_key;
+ALTER TABLE weekly_penalties DROP CONSTRAINT IF EXISTS weekly_penalties_guild_user_week_key;
+ALTER TABLE weekly_penalties
+    ADD CONSTRAINT weekly_penalties_guild_user_week_key UNIQUE (guild_id, user_id, week_start_date);
+
+ALTER TABLE workout_records
+    ADD CONSTRAINT workout_records_guild_user_fkey FOREIGN KEY (guild_id, user_id)
+    REFERENCES user_settings (guild_id, user_id) ON UPDATE CASCADE ON DELETE CASCADE;
+ALTER TABLE weekly_penalties
+    ADD CONSTRAINT weekly_penalties_guild_user_fkey FOREIGN KEY (guild_id, user_id)
+    REFERENCES user_settings (guild_id, user_id) ON UPDATE CASCADE ON DELETE CASCADE;
+ALTER TABLE weekly_progress
+    ADD CONSTRAINT weekly_progress_guild_user_fkey FOREIGN KEY (guild_id, user_id)
+    REFERENCES user_settings (guild_id, user_id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+-- 3. 인덱스: guild_id로 시작
+DROP INDEX IF EXISTS unique_active_workout_per_user_date;
+DROP INDEX IF EXISTS idx_workout_records_active_user_week;
+DROP INDEX IF EXISTS idx_workout_records_revoked_user_date;
+
+-- 서버/사용자/날짜당 활성 기록 하나
+CREATE UNIQUE INDEX IF NOT EXISTS unique_active_workout_per_guild_user_date
+ON workout_records(guild_id, user_id, workout_date)
+WHERE is_revoked = FALSE;
+
+-- 활성 기록의 서버/사용자/주별 집계 (카운터 검증, 활성 기록 수 조회)
+CREATE INDEX IF NOT EXISTS idx_workout_records_active_guild_user_week
+ON workout_records(guild_id, user_id, week_start_date)
+WHERE is_revoked = FALSE;
+
+-- 취소된 기록 재활성화 시 조회
+CREATE INDEX IF NOT EXISTS idx_workout_records_revoked_guild_user_date
+ON workout_records(guild_id, user_id, workout_date)
+WHERE is_revoked = TRUE;
+
+-- 서버별 운동 기록 스캔 (id 키셋)
+CREATE INDEX IF NOT EXISTS idx_workout_records_guild_id
+ON workout_records(guild_id, id);
+
+-- 4. 카운터 트리거
+-- guild_id/user_id는 user_settings 키가 바뀔 때 외래키로 카운터와 함께 바뀌므로 트리거 대상에서 제외
+DROP FUNCTION IF EXISTS apply_weekly_progress_delta(BIGINT, DATE, INTEGER);
+CREATE OR REPLACE FUNCTION apply_weekly_progress_delta(
+    p_guild_id BIGINT,
+    p_user_id BIGINT,
+    p_week_start_date DATE,
+    p_delta INTEGER
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO weekly_progress (guild_id, user_id, week_start_date, active_count)
+    VALUES (p_guild_id, p_user_id, p_week_start_date, GREATEST(p_delta, 0))
+    ON CONFLICT (guild_id, user_id, week_start_date) DO UPDATE
+    SET active_count = GREATEST(weekly_progress.active_count + p_delta, 0),
+        updated_at = NOW();
+$$;
+
+CREATE OR REPLACE FUNCTION sync_weekly_progress()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_revoked = FALSE THEN
+        PERFORM apply_weekly_progress_delta(
+            OLD.guild_id, OLD.user_id, OLD.week_start_date, -1
+        );
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_revoked = FALSE THEN
+        PERFORM apply_weekly_progress_delta(
+            NEW.guild_id, NEW.user_id, NEW.week_start_date, 1
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_sync_weekly_progress ON workout_records;
+CREATE TRIGGER trg_sync_weekly_progress
+AFTER INSERT OR UPDATE OF is_revoked, week_start_date OR DELETE
+ON workout_records
+FOR EACH ROW EXECUTE FUNCTION sync_weekly_progress();
+
+-- 5. RPC 함수: 모두 p_guild_id를 첫 인자로 받아 해당 서버의 행만 조회/변경
+DROP FUNCTION IF EXISTS reconcile_weekly_progress(DATE);
+DROP FUNCTION IF EXISTS add_workout_with_progress(BIGINT, TEXT, DATE, DATE);
+DROP FUNCTION IF EXISTS revoke_workout_with_progress(BIGINT, DATE);
+DROP FUNCTION IF EXISTS get_all_users_weekly_data(DATE, BIGINT, INTEGER);
+DROP FUNCTION IF EXISTS settle_weekly_penalties(DATE, JSONB);
+DROP FUNCTION IF EXISTS get_total_accumulated_penalty();
+
+-- 카운터 검증 (p_guild_id/p_week_start_date가 NULL이면 전체)
+CREATE OR REPLACE FUNCTION reconcile_weekly_progress(
+    p_guild_id BIGINT DEFAULT NULL,
+    p_week_start_date DATE DEFAULT NULL
+)
+RETURNS TABLE (
+    guild_id BIGINT,
+    user_id BIGINT,
+    week_start_date DATE,
+    stored_count INTEGER,
+    actual_count INTEGER
+)
+LANGUAGE sql
+AS $$
+    WITH actual AS (
+        SELECT wr.guild_id, wr.user_id, wr.week_start_date, COUNT(*)::INTEGER AS active_count
+        FROM workout_records wr
+        WHERE wr.is_revoked = FALSE
+          AND (p_guild_id IS NULL OR wr.guild_id = p_guild_id)
+          AND (p_week_start_date IS NULL OR wr.week_start_date = p_week_start_date)
+        GROUP BY wr.guild_id, wr.user_id, wr.week_start_date
+    ),
+    stored AS (
+        SELECT wp.guild_id, wp.user_id, wp.week_start_date, wp.active_count
+        FROM weekly_progress wp
+        WHERE (p_guild_id IS NULL OR wp.guild_id = p_guild_id)
+          AND (p_week_start_date IS NULL OR wp.week_start_date = p_week_start_date)
+    ),
+    drift AS (
+        SELECT
+            COALESCE(a.guild_id, s.guild_id) AS guild_id,
+            COALESCE(a.user_id, s.user_id) AS user_id,
+            COALESCE(a.week_start_date, s.week_start_date) AS week_start_date,
+            COALESCE(s.active_count, 0) AS stored_count,
+            COALESCE(a.active_count, 0) AS actual_count
+        FROM actual a
+        FULL OUTER JOIN stored s
+            ON s.guild_id = a.guild_id
+           AND s.user_id = a.user_id
+           AND s.week_start_date = a.week_start_date
+        WHERE COALESCE(s.active_count, 0) <> COALESCE(a.active_count, 0)
+    ),
+    fixed AS (
+        INSERT INTO weekly_progress (guild_id, user_id, week_start_date, active_count)
+        SELECT d.guild_id, d.user_id, d.week_start_date, d.actual_count FROM drift d
+        ON CONFLICT (guild_id, user_id, week_start_date) DO UPDATE
+        SET active_count = EXCLUDED.active_count, updated_at = NOW()
+    )
+    SELECT d.guild_id, d.user_id, d.week_start_date, d.stored_count, d.actual_count
+    FROM drift d
+    ORDER BY d.guild_id, d.week_start_date, d.user_id;
+$$;
+
+CREATE OR REPLACE FUNCTION add_workout_with_progress(
+    p_guild_id BIGINT,
+    p_user_id BIGINT,
+    p_username TEXT,
+    p_workout_date DATE,
+    p_week_start_date DATE
+)
+RETURNS TABLE (status TEXT, current_count INTEGER, weekly_goal INTEGER)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_goal INTEGER;
+    v_status TEXT;
+BEGIN
+    SELECT us.weekly_goal INTO v_goal
+    FROM user_settings us
+    WHERE us.guild_id = p_guild_id AND us.user_id = p_user_id;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'no_settings'::TEXT, 0, 0;
+        RETURN;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM workout_records wr
+        WHERE wr.guild_id = p_guild_id
+          AND wr.user_id = p_user_id
+          AND wr.workout_date = p_workout_date
+          AND wr.is_revoked = FALSE
+    ) THEN
+        v_status := 'duplicate';
+    ELSE
+        BEGIN
+            -- 취소된 기록이 있으면 다시 활성화
+            UPDATE workout_records wr
+            SET is_revoked = FALSE,
+                username = p_username,
+                week_start_date = p_week_start_date,
+                created_at = NOW()
+            WHERE wr.id = (
+                SELECT r.id FROM workout_records r
+                WHERE r.guild_id = p_guild_id
+                  AND r.user_id = p_user_id
+                  AND r.workout_date = p_workout_date
+                  AND r.is_revoked = TRUE
+                ORDER BY r.id DESC
+                LIMIT 1
+            )
+              AND wr.is_revoked = TRUE;
+
+            IF FOUND THEN
+                v_status := 'revived';
+            ELSE
+                INSERT INTO workout_records
+                    (guild_id, user_id, username, workout_date, week_start_date, is_revoked)
+                VALUES
+                    (p_guild_id, p_user_id, p_username, p_workout_date, p_week_start_date, FALSE);
+                v_status := 'added';
+            END IF;
+        EXCEPTION WHEN unique_violation THEN
+            -- 동시에 들어온 같은 날짜 기록은 부분 UNIQUE 인덱스가 막아줌
+            v_status := 'duplicate';
+        END;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        v_status,
+        COALESCE(
+            (
+                SELECT wp.active_count FROM weekly_progress wp
+                WHERE wp.guild_id = p_guild_id
+                  AND wp.user_id = p_user_id
+                  AND wp.week_start_date = p_week_start_date
+            ),
+            0
+        ),
+        v_goal;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION revoke_workout_with_progress(
+    p_guild_id BIGINT,
+    p_user_id BIGINT,
+    p_workout_date DATE
+)
+RETURNS TABLE (status TEXT, current_count INTEGER, weekly_goal INTEGER)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_week_start DATE;
+BEGIN
+    UPDATE workout_records wr
+    SET is_revoked = TRUE
+    WHERE wr.guild_id = p_guild_id
+      AND wr.user_id = p_user_id
+      AND wr.workout_date = p_workout_date
+      AND wr.is_revoked = FALSE
+    RETURNING wr.week_start_date INTO v_week_start;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'not_found'::TEXT, 0, 0;
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        'revoked'::TEXT,
+        COALESCE(
+            (
+                SELECT wp.active_count FROM weekly_progress wp
+                WHERE wp.guild_id = p_guild_id
+                  AND wp.user_id = p_user_id
+                  AND wp.week_start_date = v_week_start
+            ),
+            0
+        ),
+        COALESCE(
+            (
+                SELECT us.weekly_goal FROM user_settings us
+                WHERE us.guild_id = p_guild_id AND us.user_id = p_user_id
+            ),
+            0
+        );
+END;
+$$;
+
+-- 서버 사용자들의 주간 데이터 (user_id 키셋 페이지네이션, 기본키 범위 스캔)
+CREATE OR REPLACE FUNCTION get_all_users_weekly_data(
+    p_guild_id BIGINT,
+    p_week_start_date DATE,
+    p_after_user_id BIGINT DEFAULT NULL,
+    p_limit INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    user_id BIGINT,
+    username TEXT,
+    weekly_goal INTEGER,
+    workout_count INTEGER,
+    total_penalty DECIMAL(10,2)
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        us.user_id,
+        us.username,
+        us.weekly_goal,
+        COALESCE(wp.active_count, 0),
+        us.total_penalty
+    FROM user_settings us
+    LEFT JOIN weekly_progress wp
+        ON wp.guild_id = us.guild_id
+       AND wp.user_id = us.user_id
+       AND wp.week_start_date = p_week_start_date
+    WHERE us.guild_id = p_guild_id
+      AND (p_after_user_id IS NULL OR us.user_id > p_after_user_id)
+    ORDER BY us.user_id
+    LIMIT p_limit;
+$$;
+
+-- 서버 주간 벌금 일괄 정산
+CREATE OR REPLACE FUNCTION settle_weekly_penalties(
+    p_guild_id BIGINT,
+    p_week_start_date DATE,
+    p_penalties JSONB
+)
+RETURNS TABLE (processed_count INTEGER, total_penalty_added DECIMAL(12,2))
+LANGUAGE sql
+AS $$
+    WITH inserted AS (
+        INSERT INTO weekly_penalties
+            (guild_id, user_id, username, week_start_date,
+             goal_count, actual_count, penalty_amount)
+        SELECT
+            p_guild_id, p.user_id, p.username, p_week_start_date,
+            p.goal_count, p.actual_count, p.penalty_amount
+        FROM jsonb_to_recordset(p_penalties) AS p(
+            user_id BIGINT,
+            username TEXT,
+            goal_count INTEGER,
+            actual_count INTEGER,
+            penalty_amount DECIMAL(10,2)
+        )
+        ON CONFLICT (guild_id, user_id, week_start_date) DO NOTHING
+        RETURNING user_id, penalty_amount
+    ),
+    updated AS (
+        UPDATE user_settings us
+        SET total_penalty = us.total_penalty + i.penalty_amount,
+            updated_at = NOW()
+        FROM inserted i
+        WHERE us.guild_id = p_guild_id AND us.user_id = i.user_id
+        RETURNING i.penalty_amount
+    )
+    SELECT COUNT(*)::INTEGER, COALESCE(SUM(penalty_amount), 0)::DECIMAL(12,2)
+    FROM updated;
+$$;
+
+-- 서버 누적 벌금 합계
+CREATE OR REPLACE FUNCTION get_total_accumulated_penalty(p_guild_id BIGINT)
+RETURNS DECIMAL(12,2)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(SUM(total_penalty), 0)::DECIMAL(12,2)
+    FROM user_settings
+    WHERE guild_id = p_guild_id;
+$$;
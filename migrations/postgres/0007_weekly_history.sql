@@ -0,0 +1,58 @@
+-- 0007: 여러 주 이력 조회 RPC
+-- 주 범위 × 사용자 행렬을 한 번의 쿼리로 반환합니다. 사용자별로 weekly_progress 기본키와
+-- weekly_penalties (guild_id, user_id, week_start_date) 유니크 인덱스를 주 범위로 읽습니다.
+
+-- 서버(또는 한 사용자)의 주별 목표/운동 횟수/정산 벌금
+-- 정산된 주는 정산 당시 목표를, 정산 전인 주는 현재 목표를 사용합니다.
+-- 행 수가 사용자 수 × 주 수이므로 user_id 키셋 페이지네이션은 사용자 단위로 자릅니다.
+CREATE OR REPLACE FUNCTION get_weekly_history(
+    p_guild_id BIGINT,
+    p_start_week DATE,
+    p_end_week DATE,
+    p_user_id BIGINT DEFAULT NULL,
+    p_after_user_id BIGINT DEFAULT NULL,
+    p_user_limit INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    user_id BIGINT,
+    username TEXT,
+    week_start_date DATE,
+    goal_count INTEGER,
+    actual_count INTEGER,
+    penalty_amount DECIMAL(10,2)
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH users AS (
+        SELECT us.user_id, us.username, us.weekly_goal
+        FROM user_settings us
+        WHERE us.guild_id = p_guild_id
+          AND (p_user_id IS NULL OR us.user_id = p_user_id)
+          AND (p_after_user_id IS NULL OR us.user_id > p_after_user_id)
+        ORDER BY us.user_id
+        LIMIT p_user_limit
+    ),
+    weeks AS (
+        SELECT generate_series(p_start_week, p_end_week, INTERVAL '7 days')::DATE
+            AS week_start_date
+    )
+    SELECT
+        u.user_id,
+        u.username,
+        w.week_start_date,
+        COALESCE(wpen.goal_count, u.weekly_goal),
+        COALESCE(wp.active_count, 0),
+        wpen.penalty_amount
+    FROM users u
+    CROSS JOIN weeks w
+    LEFT JOIN weekly_progress wp
+        ON wp.guild_id = p_guild_id
+       AND wp.user_id = u.user_id
+       AND wp.week_start_date = w.week_start_date
+    LEFT JOIN weekly_penalties wpen
+        ON wpen.guild_id = p_guild_id
+       AND wpen.user_id = u.user_id
+       AND wpen.week_start_date = w.week_start_date
+    ORDER BY u.user_id, w.week_start_date;
+$$;
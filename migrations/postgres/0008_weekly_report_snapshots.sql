@@ -0,0 +1,35 @@
+-- 0008: 주간 리포트 스냅샷
+-- 정산 작업이 닫힌 주의 리포트(사용자별 목표/실제/벌금, 합계)를 한 행으로 저장해 두고,
+-- 지난 주 /weekly-report 조회는 집계 없이 이 행만 읽습니다.
+-- 해당 주의 운동 기록이 바뀌면 (관리자의 지난 날짜 추가/취소) 트리거가 스냅샷을 지우고,
+-- 다음 조회 때 다시 만들어집니다.
+
+CREATE TABLE IF NOT EXISTS weekly_report_snapshots (
+    guild_id BIGINT NOT NULL,
+    week_start_date DATE NOT NULL,
+    report JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (guild_id, week_start_date)
+);
+
+CREATE OR REPLACE FUNCTION invalidate_weekly_report_snapshot()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM weekly_report_snapshots
+        WHERE guild_id = OLD.guild_id AND week_start_date = OLD.week_start_date;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        DELETE FROM weekly_report_snapshots
+        WHERE guild_id = NEW.guild_id AND week_start_date = NEW.week_start_date;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_weekly_report_snapshot_invalidate ON workout_records;
+CREATE TRIGGER trg_weekly_report_snapshot_invalidate
+AFTER INSERT OR UPDATE OF is_revoked, week_start_date OR DELETE ON workout_records
+FOR EACH ROW EXECUTE FUNCTION invalidate_weekly_report_snapshot();
@@ -0,0 +1,16 @@
+-- 0009: 주간 정산 완료 기록
+-- 벌금이 없는 주는 weekly_penalties에 행이 남지 않으므로, 정산이 끝난 주를 따로 기록해
+-- 봇 재시작 시 놓친 주(정산되지 않은 지난 주)를 찾는 기준으로 사용합니다.
+
+CREATE TABLE IF NOT EXISTS weekly_settlements (
+    guild_id BIGINT NOT NULL,
+    week_start_date DATE NOT NULL,
+    settled_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (guild_id, week_start_date)
+);
+
+-- 기존 정산 기록으로 채우기 (벌금이 있었던 주만 알 수 있음)
+INSERT INTO weekly_settlements (guild_id, week_start_date)
+SELECT DISTINCT guild_id, week_start_date
+FROM weekly_penalties
+ON CONFLICT DO NOTHING;
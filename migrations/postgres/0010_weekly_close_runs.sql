@@ -0,0 +1,63 @@
+-- 0010: 주간 마감 진행 기록 (run ledger)
+-- 주간 마감은 정산 -> 스냅샷 -> 리포트 전송 순서로 진행되며, 단계마다 완료 시각을 남겨
+-- 중간에 실패한 주를 다시 실행하면 끝나지 않은 단계부터 이어서 처리합니다.
+
+ALTER TABLE weekly_settlements RENAME TO weekly_close_runs;
+
+ALTER TABLE weekly_close_runs
+    ADD COLUMN IF NOT EXISTS snapshot_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS broadcast_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS report_message_id BIGINT;
+
+-- 기존 정산 기록은 리포트까지 전송된 주로 간주 (다시 전송하지 않도록)
+UPDATE weekly_close_runs
+SET snapshot_at = settled_at, broadcast_at = settled_at
+WHERE broadcast_at IS NULL;
+
+-- 정산 결과에 이번 호출에서 새로 정산된 사용자 목록 추가
+-- (한 번 읽은 누적 벌금에 이번 주 벌금을 더해 리포트를 만들기 위함)
+DROP FUNCTION IF EXISTS settle_weekly_penalties(BIGINT, DATE, JSONB);
+
+CREATE OR REPLACE FUNCTION settle_weekly_penalties(
+    p_guild_id BIGINT,
+    p_week_start_date DATE,
+    p_penalties JSONB
+)
+RETURNS TABLE (
+    processed_count INTEGER,
+    total_penalty_added DECIMAL(12,2),
+    settled_user_ids BIGINT[]
+)
+LANGUAGE sql
+AS $$
+    WITH inserted AS (
+        INSERT INTO weekly_penalties
+            (guild_id, user_id, username, week_start_date,
+             goal_count, actual_count, penalty_amount)
+        SELECT
+            p_guild_id, p.user_id, p.username, p_week_start_date,
+            p.goal_count, p.actual_count, p.penalty_amount
+        FROM jsonb_to_recordset(p_penalties) AS p(
+            user_id BIGINT,
+            username TEXT,
+            goal_count INTEGER,
+            actual_count INTEGER,
+            penalty_amount DECIMAL(10,2)
+        )
+        ON CONFLICT (guild_id, user_id, week_start_date) DO NOTHING
+        RETURNING user_id, penalty_amount
+    ),
+    updated AS (
+        UPDATE user_settings us
+        SET total_penalty = us.total_penalty + i.penalty_amount,
+            updated_at = NOW()
+        FROM inserted i
+        WHERE us.guild_id = p_guild_id AND us.user_id = i.user_id
+        RETURNING i.user_id, i.penalty_amount
+    )
+    SELECT
+        COUNT(*)::INTEGER,
+        COALESCE(SUM(penalty_amount), 0)::DECIMAL(12,2),
+        COALESCE(ARRAY_AGG(user_id), ARRAY[]::BIGINT[])
+    FROM updated;
+$$;
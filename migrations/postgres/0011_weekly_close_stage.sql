@@ -0,0 +1,33 @@
+-- 0011: 주간 마감 단계 기록 함수
+-- 단계 시각은 record_weekly_close_stage로만 채우므로 settled_at 기본값을 없앱니다
+-- (다른 단계만 기록된 행이 정산된 주로 보이지 않도록).
+
+ALTER TABLE weekly_close_runs ALTER COLUMN settled_at DROP DEFAULT;
+
+-- 주간 마감 단계 완료 기록 (이미 기록된 단계 시각과 메시지 ID는 처음 값 유지)
+CREATE OR REPLACE FUNCTION record_weekly_close_stage(
+    p_guild_id BIGINT,
+    p_week_start_date DATE,
+    p_stage TEXT,
+    p_report_message_id BIGINT DEFAULT NULL
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO weekly_close_runs AS r
+        (guild_id, week_start_date, settled_at, snapshot_at, broadcast_at,
+         report_message_id)
+    VALUES (
+        p_guild_id,
+        p_week_start_date,
+        CASE WHEN p_stage = 'settled' THEN NOW() END,
+        CASE WHEN p_stage = 'snapshot' THEN NOW() END,
+        CASE WHEN p_stage = 'broadcast' THEN NOW() END,
+        p_report_message_id
+    )
+    ON CONFLICT (guild_id, week_start_date) DO UPDATE
+    SET settled_at = COALESCE(r.settled_at, EXCLUDED.settled_at),
+        snapshot_at = COALESCE(r.snapshot_at, EXCLUDED.snapshot_at),
+        broadcast_at = COALESCE(r.broadcast_at, EXCLUDED.broadcast_at),
+        report_message_id = COALESCE(r.report_message_id, EXCLUDED.report_message_id);
+$$;
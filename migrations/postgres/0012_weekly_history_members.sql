@@ -0,0 +1,65 @@
+-- 0012: 여러 주 이력 조회 RPC 수정 (0007 대체)
+-- 가입(user_settings.created_at) 전 주는 반환하지 않습니다 (새 사용자에게 지난 주 벌금이
+-- 매겨지지 않도록). 정산 여부는 weekly_close_runs.settled_at으로 판단하며, 벌금이 없어
+-- weekly_penalties 행이 없는 정산된 주는 0원입니다. 정산된 주는 정산 당시 횟수를 사용합니다.
+-- 범위 안에 가입한 사용자만 페이지에 넣으므로 페이지의 사용자마다 한 행 이상 반환됩니다.
+CREATE OR REPLACE FUNCTION get_weekly_history(
+    p_guild_id BIGINT,
+    p_start_week DATE,
+    p_end_week DATE,
+    p_user_id BIGINT DEFAULT NULL,
+    p_after_user_id BIGINT DEFAULT NULL,
+    p_user_limit INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    user_id BIGINT,
+    username TEXT,
+    week_start_date DATE,
+    goal_count INTEGER,
+    actual_count INTEGER,
+    penalty_amount DECIMAL(10,2)
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH users AS (
+        SELECT us.user_id, us.username, us.weekly_goal, us.created_at
+        FROM user_settings us
+        WHERE us.guild_id = p_guild_id
+          AND (p_user_id IS NULL OR us.user_id = p_user_id)
+          AND (p_after_user_id IS NULL OR us.user_id > p_after_user_id)
+          AND us.created_at::DATE <= p_end_week + 6
+        ORDER BY us.user_id
+        LIMIT p_user_limit
+    ),
+    weeks AS (
+        SELECT generate_series(p_start_week, p_end_week, INTERVAL '7 days')::DATE
+            AS week_start_date
+    )
+    SELECT
+        u.user_id,
+        u.username,
+        w.week_start_date,
+        COALESCE(wpen.goal_count, u.weekly_goal),
+        COALESCE(wpen.actual_count, wp.active_count, 0),
+        COALESCE(
+            wpen.penalty_amount,
+            CASE WHEN r.settled_at IS NOT NULL THEN 0 END
+        )
+    FROM users u
+    CROSS JOIN weeks w
+    LEFT JOIN weekly_progress wp
+        ON wp.guild_id = p_guild_id
+       AND wp.user_id = u.user_id
+       AND wp.week_start_date = w.week_start_date
+    LEFT JOIN weekly_penalties wpen
+        ON wpen.guild_id = p_guild_id
+       AND wpen.user_id = u.user_id
+       AND wpen.week_start_date = w.week_start_date
+    LEFT JOIN weekly_close_runs r
+        ON r.guild_id = p_guild_id
+       AND r.week_start_date = w.week_start_date
+    WHERE w.week_start_date + 6 >= u.created_at::DATE
+       OR wpen.user_id IS NOT NULL
+    ORDER BY u.user_id, w.week_start_date;
+$$;
@@ -0,0 +1,47 @@
+-- 0001: 기본 테이블과 초기 인덱스 (postgres 0001~0002와 같은 구조)
+
+-- 1. 사용자 설정 테이블
+CREATE TABLE IF NOT EXISTS user_settings (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    weekly_goal INTEGER NOT NULL DEFAULT 4,
+    total_penalty REAL NOT NULL DEFAULT 0.0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 2. 운동 기록 테이블
+CREATE TABLE IF NOT EXISTS workout_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    workout_date TEXT NOT NULL,
+    week_start_date TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    is_revoked INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES user_settings (user_id) ON DELETE CASCADE
+);
+
+-- 부분 UNIQUE 제약조건: is_revoked=0인 기록만 하나씩 허용
+CREATE UNIQUE INDEX IF NOT EXISTS unique_active_workout_per_user_date
+ON workout_records(user_id, workout_date)
+WHERE is_revoked = 0;
+
+-- 3. 주간 벌금 기록 테이블
+CREATE TABLE IF NOT EXISTS weekly_penalties (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    week_start_date TEXT NOT NULL,
+    goal_count INTEGER NOT NULL,
+    actual_count INTEGER NOT NULL,
+    penalty_amount REAL NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES user_settings (user_id) ON DELETE CASCADE,
+    UNIQUE(user_id, week_start_date)
+);
+
+-- 인덱스 생성 (성능 최적화)
+CREATE INDEX IF NOT EXISTS idx_workout_records_user_week ON workout_records(user_id, week_start_date);
+CREATE INDEX IF NOT EXISTS idx_workout_records_date ON workout_records(workout_date);
+CREATE INDEX IF NOT EXISTS idx_weekly_penalties_user_week ON weekly_penalties(user_id, week_start_date);
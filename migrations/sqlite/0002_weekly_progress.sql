@@ -0,0 +1,55 @@
+-- 0002: 주간 진행 카운터 테이블과 동기화 트리거 (postgres 0003과 같은 구조)
+
+CREATE TABLE IF NOT EXISTS weekly_progress (
+    user_id INTEGER NOT NULL,
+    week_start_date TEXT NOT NULL,
+    active_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, week_start_date),
+    FOREIGN KEY (user_id) REFERENCES user_settings (user_id) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_progress_insert
+AFTER INSERT ON workout_records
+WHEN NEW.is_revoked = 0
+BEGIN
+    INSERT INTO weekly_progress (user_id, week_start_date, active_count)
+    VALUES (NEW.user_id, NEW.week_start_date, 1)
+    ON CONFLICT (user_id, week_start_date) DO UPDATE
+    SET active_count = active_count + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_progress_update
+AFTER UPDATE OF is_revoked, user_id, week_start_date ON workout_records
+BEGIN
+    UPDATE weekly_progress
+    SET active_count = MAX(active_count - 1, 0), updated_at = CURRENT_TIMESTAMP
+    WHERE OLD.is_revoked = 0
+      AND user_id = OLD.user_id
+      AND week_start_date = OLD.week_start_date;
+
+    INSERT INTO weekly_progress (user_id, week_start_date, active_count)
+    SELECT NEW.user_id, NEW.week_start_date, 1
+    WHERE NEW.is_revoked = 0
+    ON CONFLICT (user_id, week_start_date) DO UPDATE
+    SET active_count = active_count + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_progress_delete
+AFTER DELETE ON workout_records
+WHEN OLD.is_revoked = 0
+BEGIN
+    UPDATE weekly_progress
+    SET active_count = MAX(active_count - 1, 0), updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = OLD.user_id
+      AND week_start_date = OLD.week_start_date;
+END;
+
+-- 기존 기록으로 카운터 채우기 (재실행해도 안전)
+INSERT INTO weekly_progress (user_id, week_start_date, active_count)
+SELECT user_id, week_start_date, COUNT(*)
+FROM workout_records
+WHERE is_revoked = 0
+GROUP BY user_id, week_start_date
+ON CONFLICT (user_id, week_start_date) DO UPDATE
+SET active_count = excluded.active_count;
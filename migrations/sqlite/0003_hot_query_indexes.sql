@@ -0,0 +1,19 @@
+-- 0003: 자주 실행되는 쿼리에 맞춘 인덱스 정리 (postgres 0005와 같은 구성)
+
+-- 활성 기록의 사용자/주별 집계 (카운터 검증, 활성 기록 수 조회)
+-- 취소된 기록을 제외한 부분 인덱스라 인덱스만으로 COUNT를 처리합니다.
+CREATE INDEX IF NOT EXISTS idx_workout_records_active_user_week
+ON workout_records(user_id, week_start_date)
+WHERE is_revoked = 0;
+
+-- 취소된 기록 재활성화 시 조회 (활성 기록은 unique_active_workout_per_user_date가 담당)
+CREATE INDEX IF NOT EXISTS idx_workout_records_revoked_user_date
+ON workout_records(user_id, workout_date)
+WHERE is_revoked = 1;
+
+-- 위 부분 인덱스로 대체됨
+DROP INDEX IF EXISTS idx_workout_records_user_week;
+-- workout_date만으로 조회하는 쿼리 없음
+DROP INDEX IF EXISTS idx_workout_records_date;
+-- UNIQUE(user_id, week_start_date) 제약조건의 인덱스와 중복
+DROP INDEX IF EXISTS idx_weekly_penalties_user_week;
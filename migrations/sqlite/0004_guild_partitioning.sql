@@ -0,0 +1,150 @@
+-- 0004: 서버(guild)별 파티션 (postgres 0006과 같은 구조)
+-- SQLite는 기본키/제약조건을 바꿀 수 없으므로 테이블을 다시 만들어 옮깁니다.
+-- 기존 행은 guild_id = 0으로 옮겨지며, 아래 한 줄로 서버에 배정합니다
+-- (하위 테이블은 ON UPDATE CASCADE로 함께 이동):
+--     UPDATE user_settings SET guild_id = <서버 ID> WHERE guild_id = 0;
+
+-- 1. 기존 트리거 제거 후 테이블 이름 변경 (인덱스는 기존 테이블과 함께 삭제됨)
+DROP TRIGGER IF EXISTS trg_weekly_progress_insert;
+DROP TRIGGER IF EXISTS trg_weekly_progress_update;
+DROP TRIGGER IF EXISTS trg_weekly_progress_delete;
+
+ALTER TABLE user_settings RENAME TO user_settings_old;
+ALTER TABLE workout_records RENAME TO workout_records_old;
+ALTER TABLE weekly_penalties RENAME TO weekly_penalties_old;
+ALTER TABLE weekly_progress RENAME TO weekly_progress_old;
+
+-- 2. guild_id로 시작하는 키로 새 테이블 생성
+CREATE TABLE user_settings (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    weekly_goal INTEGER NOT NULL DEFAULT 4,
+    total_penalty REAL NOT NULL DEFAULT 0.0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (guild_id, user_id)
+);
+
+CREATE TABLE workout_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    workout_date TEXT NOT NULL,
+    week_start_date TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    is_revoked INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (guild_id, user_id) REFERENCES user_settings (guild_id, user_id)
+        ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+CREATE TABLE weekly_penalties (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    week_start_date TEXT NOT NULL,
+    goal_count INTEGER NOT NULL,
+    actual_count INTEGER NOT NULL,
+    penalty_amount REAL NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (guild_id, user_id) REFERENCES user_settings (guild_id, user_id)
+        ON UPDATE CASCADE ON DELETE CASCADE,
+    UNIQUE(guild_id, user_id, week_start_date)
+);
+
+CREATE TABLE weekly_progress (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    user_id INTEGER NOT NULL,
+    week_start_date TEXT NOT NULL,
+    active_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (guild_id, user_id, week_start_date),
+    FOREIGN KEY (guild_id, user_id) REFERENCES user_settings (guild_id, user_id)
+        ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+-- 3. 데이터 이동 (id 유지)
+INSERT INTO user_settings
+    (guild_id, user_id, username, weekly_goal, total_penalty, created_at, updated_at)
+SELECT 0, user_id, username, weekly_goal, total_penalty, created_at, updated_at
+FROM user_settings_old;
+
+INSERT INTO workout_records
+    (id, guild_id, user_id, username, workout_date, week_start_date, created_at, is_revoked)
+SELECT id, 0, user_id, username, workout_date, week_start_date, created_at, is_revoked
+FROM workout_records_old;
+
+INSERT INTO weekly_penalties
+    (id, guild_id, user_id, username, week_start_date, goal_count,
+     actual_count, penalty_amount, created_at)
+SELECT id, 0, user_id, username, week_start_date, goal_count,
+       actual_count, penalty_amount, created_at
+FROM weekly_penalties_old;
+
+INSERT INTO weekly_progress (guild_id, user_id, week_start_date, active_count, updated_at)
+SELECT 0, user_id, week_start_date, active_count, updated_at
+FROM weekly_progress_old;
+
+-- 하위 테이블부터 삭제 (새 테이블은 기존 user_settings를 참조하지 않음)
+DROP TABLE workout_records_old;
+DROP TABLE weekly_penalties_old;
+DROP TABLE weekly_progress_old;
+DROP TABLE user_settings_old;
+
+-- 4. 인덱스: guild_id로 시작
+CREATE UNIQUE INDEX IF NOT EXISTS unique_active_workout_per_guild_user_date
+ON workout_records(guild_id, user_id, workout_date)
+WHERE is_revoked = 0;
+
+CREATE INDEX IF NOT EXISTS idx_workout_records_active_guild_user_week
+ON workout_records(guild_id, user_id, week_start_date)
+WHERE is_revoked = 0;
+
+CREATE INDEX IF NOT EXISTS idx_workout_records_revoked_guild_user_date
+ON workout_records(guild_id, user_id, workout_date)
+WHERE is_revoked = 1;
+
+CREATE INDEX IF NOT EXISTS idx_workout_records_guild_id
+ON workout_records(guild_id, id);
+
+-- 5. 카운터 트리거
+-- guild_id/user_id는 user_settings 키가 바뀔 때 외래키로 카운터와 함께 바뀌므로 트리거 대상에서 제외
+CREATE TRIGGER IF NOT EXISTS trg_weekly_progress_insert
+AFTER INSERT ON workout_records
+WHEN NEW.is_revoked = 0
+BEGIN
+    INSERT INTO weekly_progress (guild_id, user_id, week_start_date, active_count)
+    VALUES (NEW.guild_id, NEW.user_id, NEW.week_start_date, 1)
+    ON CONFLICT (guild_id, user_id, week_start_date) DO UPDATE
+    SET active_count = active_count + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_progress_update
+AFTER UPDATE OF is_revoked, week_start_date ON workout_records
+BEGIN
+    UPDATE weekly_progress
+    SET active_count = MAX(active_count - 1, 0), updated_at = CURRENT_TIMESTAMP
+    WHERE OLD.is_revoked = 0
+      AND guild_id = OLD.guild_id
+      AND user_id = OLD.user_id
+      AND week_start_date = OLD.week_start_date;
+
+    INSERT INTO weekly_progress (guild_id, user_id, week_start_date, active_count)
+    SELECT NEW.guild_id, NEW.user_id, NEW.week_start_date, 1
+    WHERE NEW.is_revoked = 0
+    ON CONFLICT (guild_id, user_id, week_start_date) DO UPDATE
+    SET active_count = active_count + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_progress_delete
+AFTER DELETE ON workout_records
+WHEN OLD.is_revoked = 0
+BEGIN
+    UPDATE weekly_progress
+    SET active_count = MAX(active_count - 1, 0), updated_at = CURRENT_TIMESTAMP
+    WHERE guild_id = OLD.guild_id
+      AND user_id = OLD.user_id
+      AND week_start_date = OLD.week_start_date;
+END;
@@ -0,0 +1,33 @@
+-- 0005: 주간 리포트 스냅샷 (postgres 0008과 같은 구조, report는 JSON 문자열)
+-- 해당 주의 운동 기록이 바뀌면 트리거가 스냅샷을 지우고 다음 조회 때 다시 만들어집니다.
+
+CREATE TABLE IF NOT EXISTS weekly_report_snapshots (
+    guild_id INTEGER NOT NULL,
+    week_start_date TEXT NOT NULL,
+    report TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (guild_id, week_start_date)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_report_snapshot_insert
+AFTER INSERT ON workout_records
+BEGIN
+    DELETE FROM weekly_report_snapshots
+    WHERE guild_id = NEW.guild_id AND week_start_date = NEW.week_start_date;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_report_snapshot_update
+AFTER UPDATE OF is_revoked, week_start_date ON workout_records
+BEGIN
+    DELETE FROM weekly_report_snapshots
+    WHERE guild_id = OLD.guild_id AND week_start_date = OLD.week_start_date;
+    DELETE FROM weekly_report_snapshots
+    WHERE guild_id = NEW.guild_id AND week_start_date = NEW.week_start_date;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weekly_report_snapshot_delete
+AFTER DELETE ON workout_records
+BEGIN
+    DELETE FROM weekly_report_snapshots
+    WHERE guild_id = OLD.guild_id AND week_start_date = OLD.week_start_date;
+END;
@@ -0,0 +1,12 @@
+-- 0006: 주간 정산 완료 기록 (postgres 0009와 같은 구조)
+
+CREATE TABLE IF NOT EXISTS weekly_settlements (
+    guild_id INTEGER NOT NULL,
+    week_start_date TEXT NOT NULL,
+    settled_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (guild_id, week_start_date)
+);
+
+INSERT OR IGNORE INTO weekly_settlements (guild_id, week_start_date)
+SELECT DISTINCT guild_id, week_start_date
+FROM weekly_penalties;
@@ -0,0 +1,11 @@
+-- 0007: 주간 마감 진행 기록 (postgres 0010과 같은 구조)
+
+ALTER TABLE weekly_settlements RENAME TO weekly_close_runs;
+
+ALTER TABLE weekly_close_runs ADD COLUMN snapshot_at TEXT;
+ALTER TABLE weekly_close_runs ADD COLUMN broadcast_at TEXT;
+ALTER TABLE weekly_close_runs ADD COLUMN report_message_id INTEGER;
+
+UPDATE weekly_close_runs
+SET snapshot_at = settled_at, broadcast_at = settled_at
+WHERE broadcast_at IS NULL;
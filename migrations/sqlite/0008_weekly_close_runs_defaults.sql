@@ -0,0 +1,24 @@
+-- 0008: 주간 마감 단계 시각 기본값 제거 (postgres 0011과 같은 구조)
+-- SQLite는 기본값을 바꿀 수 없으므로 테이블을 다시 만들어 옮깁니다.
+-- 옮긴 뒤 다시 실행해도 같은 테이블을 한 번 더 옮길 뿐입니다.
+
+CREATE TABLE IF NOT EXISTS weekly_close_runs_new (
+    guild_id INTEGER NOT NULL,
+    week_start_date TEXT NOT NULL,
+    settled_at TEXT,
+    snapshot_at TEXT,
+    broadcast_at TEXT,
+    report_message_id INTEGER,
+    PRIMARY KEY (guild_id, week_start_date)
+);
+
+INSERT OR IGNORE INTO weekly_close_runs_new
+    (guild_id, week_start_date, settled_at, snapshot_at, broadcast_at,
+     report_message_id)
+SELECT guild_id, week_start_date, settled_at, snapshot_at, broadcast_at,
+       report_message_id
+FROM weekly_close_runs;
+
+DROP TABLE weekly_close_runs;
+
+ALTER TABLE weekly_close_runs_new RENAME TO weekly_close_runs;
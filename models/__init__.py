@@ -4,6 +4,38 @@ Domain Models
 """
 
 from .user import User, UserSettings
-from .workout import WorkoutRecord, WeeklyPenalty, WeeklyProgress
+from .workout import (
+    WEEKLY_CLOSE_STAGES,
+    WorkoutRecord,
+    WeeklyCloseRun,
+    WeeklyPenalty,
+    WeeklyProgress,
+    WeeklyResult,
+)
+from .mappers import (
+    compile_row_mapper,
+    map_user_settings,
+    map_workout_record,
+    map_weekly_penalty,
+    map_weekly_progress,
+    map_weekly_close_run,
+    map_weekly_result,
+)
 
-__all__ = ["User", "UserSettings", "WorkoutRecord", "WeeklyPenalty", "WeeklyProgress"]
+__all__ = [
+    "User",
+    "UserSettings",
+    "WorkoutRecord",
+    "WeeklyPenalty",
+    "WeeklyProgress",
+    "WeeklyResult",
+    "WeeklyCloseRun",
+    "WEEKLY_CLOSE_STAGES",
+    "compile_row_mapper",
+    "map_user_settings",
+    "map_workout_record",
+    "map_weekly_penalty",
+    "map_weekly_progress",
+    "map_weekly_result",
+    "map_weekly_close_run",
+]
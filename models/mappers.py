@@ -0,0 +1,187 @@
+"""
+행 -> 도메인 모델 변환
+저장소가 돌려주는 행(dict, sqlite3.Row 등 키로 조회 가능한 객체)을 모델로 바꾸는
+변환 함수를 모델별로 한 번만 생성해 둡니다. 행마다 필드 목록을 순회하지 않고
+생성된 함수 하나가 생성자를 바로 호출합니다.
+"""
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .user import UserSettings
+from .workout import (
+    WeeklyCloseRun,
+    WeeklyPenalty,
+    WeeklyProgress,
+    WeeklyResult,
+    WorkoutRecord,
+)
+
+T = TypeVar("T")
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """'YYYY-MM-DD' 문자열/datetime -> date"""
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(value[:10])
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """ISO 8601 문자열 (Postgres 'Z' 표기, SQLite 공백 구분 포함) -> datetime"""
+    if value is None or isinstance(value, datetime):
+        return value
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def parse_decimal(value: Any) -> float:
+    """DECIMAL 컬럼 (PostgREST는 숫자 또는 문자열로 반환) -> float"""
+    return float(value) if value is not None else 0.0
+
+
+def parse_bool(value: Any) -> bool:
+    """BOOLEAN 컬럼 (SQLite는 0/1) -> bool"""
+    return bool(value)
+
+
+def compile_row_mapper(
+    model: Callable[..., T],
+    columns: Dict[str, str],
+    converters: Optional[Dict[str, Callable[[Any], Any]]] = None,
+) -> Callable[..., T]:
+    """
+    행 변환 함수 생성
+
+    Args:
+        model: 생성할 모델 클래스
+        columns: 모델 필드 -> 행의 키
+        converters: 모델 필드 -> 값 변환 함수 (없으면 값을 그대로 사용)
+
+    Returns:
+        mapper(row, **extra) -> model. extra는 행에 없는 필드 (예: 조회한 주 시작일)
+    """
+    converters = converters or {}
+    namespace: Dict[str, Any] = {"_model": model}
+    arguments = []
+    for field, key in columns.items():
+        value = f"row[{key!r}]"
+        if field in converters:
+            namespace[f"_convert_{field}"] = converters[field]
+            value = f"_convert_{field}({value})"
+        arguments.append(f"{field}={value}")
+    arguments.append("**extra")
+
+    source = f"def map_row(row, **extra):\n    return _model({', '.join(arguments)})\n"
+    exec(compile(source, f"<row mapper {model.__name__}>", "exec"), namespace)
+    return namespace["map_row"]
+
+
+map_user_settings = compile_row_mapper(
+    UserSettings,
+    {
+        "guild_id": "guild_id",
+        "user_id": "user_id",
+        "username": "username",
+        "weekly_goal": "weekly_goal",
+        "total_penalty": "total_penalty",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+    {
+        "total_penalty": parse_decimal,
+        "created_at": parse_datetime,
+        "updated_at": parse_datetime,
+    },
+)
+
+map_workout_record = compile_row_mapper(
+    WorkoutRecord,
+    {
+        "id": "id",
+        "guild_id": "guild_id",
+        "user_id": "user_id",
+        "username": "username",
+        "workout_date": "workout_date",
+        "week_start_date": "week_start_date",
+        "created_at": "created_at",
+        "is_revoked": "is_revoked",
+    },
+    {
+        "workout_date": parse_date,
+        "week_start_date": parse_date,
+        "created_at": parse_datetime,
+        "is_revoked": parse_bool,
+    },
+)
+
+map_weekly_penalty = compile_row_mapper(
+    WeeklyPenalty,
+    {
+        "id": "id",
+        "guild_id": "guild_id",
+        "user_id": "user_id",
+        "username": "username",
+        "week_start_date": "week_start_date",
+        "goal_count": "goal_count",
+        "actual_count": "actual_count",
+        "penalty_amount": "penalty_amount",
+        "created_at": "created_at",
+    },
+    {
+        "week_start_date": parse_date,
+        "penalty_amount": parse_decimal,
+        "created_at": parse_datetime,
+    },
+)
+
+# get_all_users_weekly_data 행: guild_id/week_start_date는 조회 인자로 전달
+map_weekly_progress = compile_row_mapper(
+    WeeklyProgress,
+    {
+        "user_id": "user_id",
+        "username": "username",
+        "weekly_goal": "weekly_goal",
+        "current_count": "workout_count",
+        "total_penalty": "total_penalty",
+    },
+    {"current_count": lambda value: value or 0, "total_penalty": parse_decimal},
+)
+
+# get_weekly_history 행: guild_id는 조회 인자로 전달
+map_weekly_result = compile_row_mapper(
+    WeeklyResult,
+    {
+        "user_id": "user_id",
+        "username": "username",
+        "week_start_date": "week_start_date",
+        "goal_count": "goal_count",
+        "actual_count": "actual_count",
+        "penalty_amount": "penalty_amount",
+    },
+    {
+        "week_start_date": parse_date,
+        "penalty_amount": lambda value: float(value) if value is not None else None,
+    },
+)
+
+map_weekly_close_run = compile_row_mapper(
+    WeeklyCloseRun,
+    {
+        "guild_id": "guild_id",
+        "week_start_date": "week_start_date",
+        "settled_at": "settled_at",
+        "snapshot_at": "snapshot_at",
+        "broadcast_at": "broadcast_at",
+        "report_message_id": "report_message_id",
+    },
+    {
+        "week_start_date": parse_date,
+        "settled_at": parse_datetime,
+        "snapshot_at": parse_datetime,
+        "broadcast_at": parse_datetime,
+    },
+)
@@ -7,7 +7,7 @@ from typing import Optional
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """디스코드 사용자 정보"""
 
@@ -16,7 +16,7 @@ class User:
     display_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class UserSettings:
     """사용자 운동 설정"""
 
@@ -26,6 +26,7 @@ class UserSettings:
     total_penalty: float
     created_at: datetime
     updated_at: datetime
+    guild_id: int = 0
 
     @property
     def is_goal_valid(self) -> bool:
@@ -7,7 +7,7 @@ from typing import Optional
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkoutRecord:
     """운동 기록"""
 
@@ -18,6 +18,7 @@ class WorkoutRecord:
     week_start_date: date
     created_at: datetime
     is_revoked: bool = False
+    guild_id: int = 0
 
     @property
     def is_active(self) -> bool:
@@ -29,7 +30,7 @@ class WorkoutRecord:
         self.is_revoked = True
 
 
-@dataclass
+@dataclass(slots=True)
 class WeeklyPenalty:
     """주간 벌금 기록"""
 
@@ -41,6 +42,7 @@ class WeeklyPenalty:
     actual_count: int
     penalty_amount: float
     created_at: datetime
+    guild_id: int = 0
 
     @property
     def achievement_rate(self) -> float:
@@ -55,7 +57,7 @@ class WeeklyPenalty:
         return self.actual_count >= self.goal_count
 
 
-@dataclass
+@dataclass(slots=True)
 class WeeklyProgress:
     """주간 진행 상황"""
 
@@ -64,6 +66,8 @@ class WeeklyProgress:
     weekly_goal: int
     current_count: int
     week_start_date: date
+    total_penalty: float = 0.0
+    guild_id: int = 0
 
     @property
     def remaining_count(self) -> int:
@@ -81,3 +85,59 @@ class WeeklyProgress:
     def is_completed(self) -> bool:
         """목표 완료 여부"""
         return self.current_count >= self.weekly_goal
+
+
+@dataclass(slots=True)
+class WeeklyResult:
+    """사용자 한 명의 한 주 결과 (여러 주 이력 조회의 한 칸)"""
+
+    user_id: int
+    username: str
+    week_start_date: date
+    goal_count: int
+    actual_count: int
+    penalty_amount: Optional[float] = None  # 정산된 벌금 (정산 전인 주는 None)
+    guild_id: int = 0
+
+    @property
+    def is_settled(self) -> bool:
+        """정산된 주인지 여부 (벌금 없이 정산된 주는 0원)"""
+        return self.penalty_amount is not None
+
+    @property
+    def is_goal_achieved(self) -> bool:
+        """목표 달성 여부"""
+        return self.actual_count >= self.goal_count
+
+
+# 주간 마감 단계 (순서대로 실행, 기록 컬럼은 "{단계}_at")
+WEEKLY_CLOSE_STAGES = ("settled", "snapshot", "broadcast")
+
+
+@dataclass(slots=True)
+class WeeklyCloseRun:
+    """서버 한 주의 마감 진행 기록 (단계별 완료 시각)"""
+
+    guild_id: int
+    week_start_date: date
+    settled_at: Optional[datetime] = None
+    snapshot_at: Optional[datetime] = None
+    broadcast_at: Optional[datetime] = None
+    report_message_id: Optional[int] = None
+
+    def is_done(self, stage: str) -> bool:
+        """단계 완료 여부"""
+        return getattr(self, f"{stage}_at") is not None
+
+    @property
+    def next_stage(self) -> Optional[str]:
+        """다음에 실행할 단계 (모두 끝났으면 None)"""
+        for stage in WEEKLY_CLOSE_STAGES:
+            if not self.is_done(stage):
+                return stage
+        return None
+
+    @property
+    def is_closed(self) -> bool:
+        """리포트 전송까지 끝났는지 여부"""
+        return self.next_stage is None
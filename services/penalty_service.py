@@ -3,7 +3,7 @@
 벌금 계산과 관련된 모든 비즈니스 로직을 처리합니다.
 """
 
-from typing import List, Dict
+from typing import Dict, Iterable, List
 from datetime import datetime
 from config import BASE_PENALTY
 from models.workout import WeeklyPenalty, WeeklyProgress
@@ -35,12 +35,14 @@ class PenaltyService:
 
         return total_penalty
 
-    def calculate_weekly_penalties(self, weekly_data: List[Dict]) -> List[Dict]:
+    def calculate_weekly_penalties(
+        self, weekly_data: Iterable[WeeklyProgress]
+    ) -> List[Dict]:
         """
         여러 사용자의 주간 벌금을 일괄 계산
 
         Args:
-            weekly_data: 사용자별 주간 데이터 리스트
+            weekly_data: 사용자별 주간 진행 상황
 
         Returns:
             벌금이 계산된 데이터 리스트
@@ -49,17 +51,17 @@ class PenaltyService:
 
         for user_data in weekly_data:
             weekly_penalty = self.calculate_penalty(
-                user_data["weekly_goal"], user_data["workout_count"]
+                user_data.weekly_goal, user_data.current_count
             )
 
             result.append(
                 {
-                    "username": user_data["username"],
-                    "user_id": user_data["user_id"],
-                    "goal": user_data["weekly_goal"],
-                    "actual": user_data["workout_count"],
+                    "username": user_data.username,
+                    "user_id": user_data.user_id,
+                    "goal": user_data.weekly_goal,
+                    "actual": user_data.current_count,
                     "weekly_penalty": weekly_penalty,
-                    "total_penalty": user_data["total_penalty"],
+                    "total_penalty": user_data.total_penalty,
                 }
             )
 
@@ -3,58 +3,223 @@
 주간 리포트 생성과 관련된 모든 비즈니스 로직을 처리합니다.
 """
 
+import logging
 import discord
-from typing import List, Dict, Optional
+from collections import defaultdict
+from typing import Awaitable, Callable, List, Dict, Optional
 from datetime import datetime, timedelta
 import pytz
-from database import Database
+from models import WEEKLY_CLOSE_STAGES, WeeklyCloseRun
+from storage.base import StorageBackend
 from services.penalty_service import PenaltyService
 from utils.formatting import format_currency, create_progress_bar, format_date_korean
-from config import REPORT_TIMEZONE
+from config import (
+    DATABASE_SCAN_PAGE_SIZE,
+    REPORT_CATCHUP_MAX_WEEKS,
+    REPORT_DAY_OF_WEEK,
+    REPORT_HOUR,
+    REPORT_MINUTE,
+    REPORT_TIMEZONE,
+)
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷에 저장하는 리포트 필드 (주 시작/끝일은 조회 인자로 복원)
+SNAPSHOT_FIELDS = (
+    "report_data",
+    "total_weekly_penalty",
+    "total_accumulated_penalty",
+    "participant_count",
+)
 
 
 class ReportService:
     """리포트 생성 서비스"""
 
-    def __init__(self, database: Database, penalty_service: PenaltyService):
+    def __init__(self, database: StorageBackend, penalty_service: PenaltyService):
         self.db = database
         self.penalty_service = penalty_service
 
     async def generate_weekly_report_data(
-        self, week_start_date: datetime
+        self, guild_id: int, week_start_date: datetime
     ) -> Dict[str, any]:
         """
-        주간 리포트 데이터 생성
+        서버 주간 리포트 데이터 생성
 
         Args:
+            guild_id: 서버 ID
             week_start_date: 주 시작일
 
         Returns:
             리포트 데이터
         """
-        # 해당 주의 모든 사용자 데이터 조회
-        users_data = await self.db.get_all_users_weekly_data(week_start_date)
-
-        if not users_data:
+        report_rows = await self._load_report_rows(guild_id, week_start_date)
+        if report_rows is None:
+            return {"success": False, "message": "리포트 데이터 조회에 실패했습니다."}
+        if not report_rows:
             return {"success": False, "message": "해당 기간에 운동 데이터가 없습니다."}
 
-        # 벌금 계산
-        report_data = self.penalty_service.calculate_weekly_penalties(users_data)
+        return await self._build_report_data(guild_id, week_start_date, report_rows)
+
+    async def _load_report_rows(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[List[Dict]]:
+        """해당 주의 서버 사용자 데이터를 페이지 단위로 받아 바로 벌금 계산 (실패하면 None)"""
+        report_rows = []
+        try:
+            async for user_data in self.db.iter_users_weekly_data(
+                guild_id, week_start_date
+            ):
+                report_rows.extend(
+                    self.penalty_service.calculate_weekly_penalties([user_data])
+                )
+        except Exception as e:
+            logger.error(f"주간 리포트 데이터 조회 실패: {e}")
+            return None
+        return report_rows
 
+    async def _build_report_data(
+        self, guild_id: int, week_start_date: datetime, report_rows: List[Dict]
+    ) -> Dict[str, any]:
+        """벌금이 계산된 사용자 행으로 리포트 데이터 구성"""
         # 총합 계산
-        total_weekly_penalty = sum(item["weekly_penalty"] for item in report_data)
-        total_accumulated_penalty = await self.db.get_total_accumulated_penalty()
+        total_weekly_penalty = sum(item["weekly_penalty"] for item in report_rows)
+        total_accumulated_penalty = await self.db.get_total_accumulated_penalty(
+            guild_id
+        )
 
         return {
             "success": True,
+            "guild_id": guild_id,
             "week_start": week_start_date,
             "week_end": week_start_date + timedelta(days=6),
-            "report_data": report_data,
+            "report_data": report_rows,
             "total_weekly_penalty": total_weekly_penalty,
             "total_accumulated_penalty": total_accumulated_penalty,
-            "participant_count": len(report_data),
+            "participant_count": len(report_rows),
+        }
+
+    async def get_weekly_report_data(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Dict[str, any]:
+        """
+        서버 주간 리포트 데이터 조회 (스냅샷 우선)
+
+        정산 때 저장한 스냅샷이 있으면 그 1행만 읽습니다. 정산이 끝났는데 스냅샷이 없으면
+        (지난 날짜 기록 변경으로 무효화된 경우) 정산 기록으로 다시 구성해 저장합니다.
+        정산 전인 주는 현재 기록으로 집계만 하고 저장하지 않습니다 (정산 때 저장).
+
+        Args:
+            guild_id: 서버 ID
+            week_start_date: 주 시작일
+
+        Returns:
+            generate_weekly_report_data와 같은 형식의 리포트 데이터
+        """
+        snapshot = await self.db.get_weekly_report_snapshot(guild_id, week_start_date)
+        if snapshot is not None:
+            return {
+                "success": True,
+                "guild_id": guild_id,
+                "week_start": week_start_date,
+                "week_end": week_start_date + timedelta(days=6),
+                **snapshot,
+            }
+
+        run = await self.db.get_weekly_close_run(guild_id, week_start_date)
+        if run is None or not run.is_done("settled"):
+            return await self.generate_weekly_report_data(guild_id, week_start_date)
+
+        report_data = await self._build_settled_report_data(guild_id, week_start_date)
+        if report_data["success"]:
+            await self.save_weekly_report_snapshot(
+                guild_id, week_start_date, report_data
+            )
+        return report_data
+
+    async def _build_settled_report_data(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Dict[str, any]:
+        """
+        정산이 끝난 주의 리포트를 정산 기록(weekly_penalties)으로 다시 구성
+
+        목표/횟수/벌금은 정산 당시 값(벌금 기록이 없는 사용자는 현재 목표와 0원)을 사용하고,
+        그 주에 가입해 있던 사용자만 포함합니다 (get_weekly_history). 누적 벌금은 live 리포트와
+        같은 기준(사용자별 누적, 서버 전체 누적)에서 그 주 이후에 정산된 벌금을 빼
+        해당 주 정산 직후 값으로 맞춥니다.
+        """
+        weeks_after = max(
+            0, (self.get_last_week_date().date() - week_start_date.date()).days // 7
+        )
+        results = await self.db.get_weekly_history(
+            guild_id, week_start_date, week_start_date + timedelta(weeks=weeks_after)
+        )
+
+        week_results = []
+        later_penalties = defaultdict(float)
+        for result in results:
+            if result.week_start_date == week_start_date.date():
+                week_results.append(result)
+            elif result.is_settled:
+                later_penalties[result.user_id] += result.penalty_amount
+
+        if not week_results:
+            return {"success": False, "message": "해당 기간에 운동 데이터가 없습니다."}
+
+        total_penalties = {}
+        try:
+            async for user_settings in self.db.iter_user_settings(guild_id):
+                total_penalties[user_settings.user_id] = user_settings.total_penalty
+        except Exception as e:
+            logger.error(f"누적 벌금 조회 실패: {e}")
+            return {"success": False, "message": "리포트 데이터 조회에 실패했습니다."}
+        total_accumulated_penalty = await self.db.get_total_accumulated_penalty(
+            guild_id
+        ) - sum(later_penalties.values())
+
+        report_rows = [
+            {
+                "username": result.username,
+                "user_id": result.user_id,
+                "goal": result.goal_count,
+                "actual": result.actual_count,
+                "weekly_penalty": result.penalty_amount or 0.0,
+                "total_penalty": total_penalties.get(result.user_id, 0.0)
+                - later_penalties[result.user_id],
+            }
+            for result in week_results
+        ]
+
+        return {
+            "success": True,
+            "guild_id": guild_id,
+            "week_start": week_start_date,
+            "week_end": week_start_date + timedelta(days=6),
+            "report_data": report_rows,
+            "total_weekly_penalty": sum(row["weekly_penalty"] for row in report_rows),
+            "total_accumulated_penalty": total_accumulated_penalty,
+            "participant_count": len(report_rows),
         }
 
+    async def save_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime, report_data: Dict[str, any]
+    ) -> bool:
+        """
+        리포트 데이터를 주간 스냅샷으로 저장
+
+        Args:
+            guild_id: 서버 ID
+            week_start_date: 주 시작일
+            report_data: generate_weekly_report_data 결과
+
+        Returns:
+            저장 성공 여부
+        """
+        snapshot = {field: report_data[field] for field in SNAPSHOT_FIELDS}
+        return await self.db.save_weekly_report_snapshot(
+            guild_id, week_start_date, snapshot
+        )
+
     def create_weekly_report_embed(self, report_data: Dict[str, any]) -> discord.Embed:
         """
         주간 리포트 Discord Embed 생성
@@ -125,7 +290,7 @@ class ReportService:
             value=(
                 f"총 참가자: {report_data['participant_count']}명\n"
                 f"이번 주 총 벌금: **{format_currency(report_data['total_weekly_penalty'])}**\n"
-                f"전체 누적 벌금: **{format_currency(report_data['total_accumulated_penalty'])}**"
+                f"서버 누적 벌금: **{format_currency(report_data['total_accumulated_penalty'])}**"
             ),
             inline=False,
         )
@@ -135,64 +300,206 @@ class ReportService:
         return embed
 
     async def process_weekly_penalty_records(
-        self, week_start_date: datetime
+        self, guild_id: int, week_start_date: datetime
     ) -> Dict[str, any]:
         """
-        주간 벌금 기록 처리 (벌금 DB 저장 및 누적)
+        서버 주간 벌금 기록 처리 (벌금 DB 저장 및 누적)
 
         Args:
+            guild_id: 서버 ID
             week_start_date: 주 시작일
 
         Returns:
             처리 결과
         """
-        users_data = await self.db.get_all_users_weekly_data(week_start_date)
-
-        if not users_data:
+        report_rows = await self._load_report_rows(guild_id, week_start_date)
+        if report_rows is None:
+            return {"success": False, "message": "벌금 정산에 실패했습니다."}
+        if not report_rows:
             return {"success": False, "message": "처리할 사용자 데이터가 없습니다."}
 
-        processed_count = 0
-        total_penalty_added = 0
+        settlement = await self._settle_report_rows(
+            guild_id, week_start_date, report_rows
+        )
+        if settlement is None:
+            return {"success": False, "message": "벌금 정산에 실패했습니다."}
 
-        for user_data in users_data:
-            user_id = user_data["user_id"]
-            username = user_data["username"]
-            weekly_goal = user_data["weekly_goal"]
-            workout_count = user_data["workout_count"]
+        # 모든 배치가 끝난 뒤에만 정산 단계 완료로 기록
+        await self.db.record_weekly_close_stage(guild_id, week_start_date, "settled")
 
-            # 벌금 계산
-            weekly_penalty = self.penalty_service.calculate_penalty(
-                weekly_goal, workout_count
-            )
+        return {
+            "success": True,
+            "processed_count": settlement["processed_count"],
+            "total_penalty_added": settlement["total_penalty_added"],
+        }
 
-            # 벌금 기록 저장 및 누적 (원자적 처리)
-            if weekly_penalty > 0:
-                was_penalty_added = await self.db.add_weekly_penalty_record(
-                    user_id,
-                    username,
-                    week_start_date,
-                    weekly_goal,
-                    workout_count,
-                    weekly_penalty,
-                )
+    async def _settle_report_rows(
+        self, guild_id: int, week_start_date: datetime, report_rows: List[Dict]
+    ) -> Optional[Dict[str, any]]:
+        """
+        벌금 대상자만 배치로 나누어 정산 (배치 단위 원자적 처리, 이미 정산된 사용자는 건너뜀)
 
-                if was_penalty_added:
-                    processed_count += 1
-                    total_penalty_added += weekly_penalty
+        정산은 멱등이므로 중간 배치가 실패해도 다시 실행하면 나머지만 처리됩니다.
+
+        Returns:
+            {"processed_count", "total_penalty_added", "settled_user_ids"(집합)} 또는 None (실패)
+        """
+        penalties = [
+            {
+                "user_id": row["user_id"],
+                "username": row["username"],
+                "goal_count": row["goal"],
+                "actual_count": row["actual"],
+                "penalty_amount": row["weekly_penalty"],
+            }
+            for row in report_rows
+            if row["weekly_penalty"] > 0
+        ]
+
+        processed_count = 0
+        total_penalty_added = 0.0
+        settled_user_ids = set()
+        # 벌금 대상자가 없어도 한 번은 호출 (저장소가 빈 목록을 처리)
+        for start in range(0, max(len(penalties), 1), DATABASE_SCAN_PAGE_SIZE):
+            settlement = await self.db.settle_weekly_penalties(
+                guild_id,
+                week_start_date,
+                penalties[start : start + DATABASE_SCAN_PAGE_SIZE],
+            )
+            if settlement is None:
+                return None
+            processed_count += settlement["processed_count"]
+            total_penalty_added += settlement["total_penalty_added"]
+            settled_user_ids.update(settlement.get("settled_user_ids", ()))
 
         return {
-            "success": True,
             "processed_count": processed_count,
             "total_penalty_added": total_penalty_added,
+            "settled_user_ids": settled_user_ids,
         }
 
+    async def close_week(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        broadcast: Callable[[Dict[str, any]], Awaitable[Optional[int]]],
+    ) -> Dict[str, any]:
+        """
+        서버 한 주 마감 (정산 -> 스냅샷 -> 리포트 전송)
+
+        사용자 데이터는 한 번만 읽어 정산과 리포트에 함께 사용합니다. 단계가 끝날 때마다
+        마감 진행 기록(weekly_close_runs)에 남기므로, 중간에 실패한 주를 다시 실행하면
+        끝난 단계는 건너뛰고 실패한 단계부터 이어서 처리합니다 (리포트는 한 번만 전송).
+
+        Args:
+            guild_id: 서버 ID
+            week_start_date: 주 시작일
+            broadcast: 리포트 전송 함수 (전송한 메시지 ID, 실패하면 None)
+
+        Returns:
+            {"success", "stages": 이번 실행에서 끝낸 단계 목록, "message": 실패 사유,
+             "empty": 사용자가 없어 전송 없이 마감한 경우 True}
+        """
+        run = await self.db.get_weekly_close_run(guild_id, week_start_date)
+        if run is None:
+            run = WeeklyCloseRun(guild_id, week_start_date.date())
+        stages = []
+
+        def failed(message: str) -> Dict[str, any]:
+            return {"success": False, "stages": stages, "message": message}
+
+        if run.is_closed:
+            return {"success": True, "stages": stages}
+
+        if run.is_done("snapshot"):
+            # 전송만 남은 주는 저장한 스냅샷 1행으로 전송 (무효화됐으면 정산 기록으로 다시 구성)
+            report_data = await self.get_weekly_report_data(guild_id, week_start_date)
+            if not report_data["success"]:
+                return failed(report_data["message"])
+        else:
+            if run.is_done("settled"):
+                # 이전 실행에서 정산까지 끝난 주는 정산 기록으로 리포트 구성
+                report_data = await self._build_settled_report_data(
+                    guild_id, week_start_date
+                )
+                if not report_data["success"]:
+                    return failed(report_data["message"])
+            else:
+                # 정산 전에 해당 주 카운터를 원본 기록과 대조해 보정
+                if (
+                    await self.db.reconcile_weekly_progress(guild_id, week_start_date)
+                    is None
+                ):
+                    return failed("주간 카운터 보정에 실패했습니다.")
+
+                report_rows = await self._load_report_rows(guild_id, week_start_date)
+                if report_rows is None:
+                    return failed("리포트 데이터 조회에 실패했습니다.")
+                if not report_rows:
+                    # 정산/전송할 것이 없는 주는 마감된 것으로 기록 (이후 주가 막히지 않도록)
+                    for stage in WEEKLY_CLOSE_STAGES:
+                        if not await self.db.record_weekly_close_stage(
+                            guild_id, week_start_date, stage
+                        ):
+                            return failed("마감 기록 저장에 실패했습니다.")
+                        stages.append(stage)
+                    return {"success": True, "stages": stages, "empty": True}
+
+                settlement = await self._settle_report_rows(
+                    guild_id, week_start_date, report_rows
+                )
+                if settlement is None:
+                    return failed("벌금 정산에 실패했습니다.")
+
+                # 읽어 둔 누적 벌금에는 방금 정산한 이번 주 벌금이 빠져 있으므로 더함
+                # (이전 호출에서 이미 정산된 사용자는 읽은 값에 포함되어 있음)
+                for row in report_rows:
+                    if row["user_id"] in settlement["settled_user_ids"]:
+                        row["total_penalty"] += row["weekly_penalty"]
+
+                if not await self.db.record_weekly_close_stage(
+                    guild_id, week_start_date, "settled"
+                ):
+                    return failed("마감 기록 저장에 실패했습니다.")
+                stages.append("settled")
+
+                report_data = await self._build_report_data(
+                    guild_id, week_start_date, report_rows
+                )
+
+            if not await self.save_weekly_report_snapshot(
+                guild_id, week_start_date, report_data
+            ) or not await self.db.record_weekly_close_stage(
+                guild_id, week_start_date, "snapshot"
+            ):
+                return failed("리포트 스냅샷 저장에 실패했습니다.")
+            stages.append("snapshot")
+
+        message_id = await broadcast(report_data)
+        if message_id is None:
+            return failed("리포트 전송에 실패했습니다.")
+
+        # 기록에 실패하면 다음 실행에서 다시 전송될 수 있으므로 크게 남김
+        if not await self.db.record_weekly_close_stage(
+            guild_id, week_start_date, "broadcast", report_message_id=message_id
+        ):
+            logger.error(
+                f"리포트 전송 기록 실패 (재실행 시 중복 전송 가능): "
+                f"서버 {guild_id} {week_start_date.date()}"
+            )
+            return failed("마감 기록 저장에 실패했습니다.")
+        stages.append("broadcast")
+
+        return {"success": True, "stages": stages}
+
     async def get_user_weekly_summary(
-        self, user_id: int, week_start_date: datetime = None
+        self, guild_id: int, user_id: int, week_start_date: datetime = None
     ) -> Dict[str, any]:
         """
         특정 사용자의 주간 요약 정보
 
         Args:
+            guild_id: 서버 ID
             user_id: 사용자 ID
             week_start_date: 주 시작일 (None이면 이번 주)
 
@@ -204,13 +511,15 @@ class ReportService:
 
             week_start_date, _ = get_week_start_end()
 
-        user_settings = await self.db.get_user_settings(user_id)
+        user_settings = await self.db.get_user_settings(guild_id, user_id)
         if not user_settings:
             return {"success": False, "message": "사용자 설정을 찾을 수 없습니다."}
 
-        current_count = await self.db.get_weekly_workout_count(user_id, week_start_date)
-        weekly_goal = user_settings["weekly_goal"]
-        total_penalty = user_settings["total_penalty"]
+        current_count = await self.db.get_weekly_workout_count(
+            guild_id, user_id, week_start_date
+        )
+        weekly_goal = user_settings.weekly_goal
+        total_penalty = user_settings.total_penalty
 
         # 벌금 계산
         weekly_penalty = self.penalty_service.calculate_penalty(
@@ -222,7 +531,7 @@ class ReportService:
 
         return {
             "success": True,
-            "username": user_settings["username"],
+            "username": user_settings.username,
             "current_count": current_count,
             "weekly_goal": weekly_goal,
             "weekly_penalty": weekly_penalty,
@@ -234,6 +543,158 @@ class ReportService:
             "is_goal_achieved": current_count >= weekly_goal,
         }
 
+    async def get_weekly_history(
+        self,
+        guild_id: int,
+        start_week: datetime,
+        end_week: datetime,
+        user_id: int = None,
+    ) -> Dict[str, any]:
+        """
+        여러 주 이력을 주 × 사용자 행렬로 조회 (저장소 범위 조회 1회)
+
+        정산된 주는 저장된 벌금을, 정산 전인 주는 현재 규칙으로 계산한 벌금을 사용합니다.
+        가입 전 주는 포함하지 않습니다.
+
+        Args:
+            guild_id: 서버 ID
+            start_week: 첫 주 시작일
+            end_week: 마지막 주 시작일 (포함)
+            user_id: 사용자 ID (None이면 서버 전체)
+
+        Returns:
+            {"weeks": [주 시작일], "users": {user_id: username},
+             "matrix": {주 시작일: {user_id: 결과}}, "weekly_totals": {주 시작일: 벌금 합계}}
+        """
+        results = await self.db.get_weekly_history(
+            guild_id, start_week, end_week, user_id
+        )
+        if not results:
+            return {"success": False, "message": "해당 기간에 운동 데이터가 없습니다."}
+
+        weeks = sorted({result.week_start_date for result in results})
+        users = {}
+        matrix = {week: {} for week in weeks}
+        weekly_totals = dict.fromkeys(weeks, 0.0)
+        for result in results:
+            weekly_penalty = (
+                result.penalty_amount
+                if result.is_settled
+                else self.penalty_service.calculate_penalty(
+                    result.goal_count, result.actual_count
+                )
+            )
+            users[result.user_id] = result.username
+            matrix[result.week_start_date][result.user_id] = {
+                "goal": result.goal_count,
+                "actual": result.actual_count,
+                "weekly_penalty": weekly_penalty,
+                "is_settled": result.is_settled,
+            }
+            weekly_totals[result.week_start_date] += weekly_penalty
+
+        return {
+            "success": True,
+            "guild_id": guild_id,
+            "weeks": weeks,
+            "users": users,
+            "matrix": matrix,
+            "weekly_totals": weekly_totals,
+        }
+
+    async def get_recent_weekly_history(
+        self, guild_id: int, week_count: int, user_id: int = None
+    ) -> Dict[str, any]:
+        """
+        지난 주까지 최근 week_count주 이력 조회
+
+        Args:
+            guild_id: 서버 ID
+            week_count: 조회할 주 수
+            user_id: 사용자 ID (None이면 서버 전체)
+
+        Returns:
+            get_weekly_history와 같은 형식
+        """
+        end_week = self.get_last_week_date()
+        start_week = end_week - timedelta(weeks=week_count - 1)
+        return await self.get_weekly_history(guild_id, start_week, end_week, user_id)
+
+    def get_due_week_date(self, now: datetime = None) -> datetime:
+        """
+        리포트 시각이 지난 가장 최근 주의 월요일
+
+        이번 주 리포트 시각(REPORT_DAY_OF_WEEK/HOUR/MINUTE) 전이면 지지난 주 월요일입니다.
+
+        Args:
+            now: 기준 시각 (None이면 현재)
+
+        Returns:
+            정산 대상 주의 월요일 datetime
+        """
+        if now is None:
+            now = datetime.now(pytz.timezone(REPORT_TIMEZONE))
+        shifted = now - timedelta(
+            days=REPORT_DAY_OF_WEEK, hours=REPORT_HOUR, minutes=REPORT_MINUTE
+        )
+        due_week_start = shifted - timedelta(days=shifted.weekday() + 7)
+        return due_week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    async def get_open_weeks(
+        self,
+        guild_id: int,
+        due_week_date: datetime,
+        max_weeks: int = REPORT_CATCHUP_MAX_WEEKS,
+    ) -> List[datetime]:
+        """
+        마감이 필요한 주 목록 (오래된 주부터)
+
+        마감 진행 기록에서 리포트 전송이 끝나지 않은 주(중간에 실패한 주)는 모두 다시
+        처리하고, 마지막으로 마감이 끝난 주의 다음 주부터 due_week_date까지 아직 시작하지
+        않은 주는 최근 max_weeks주만 마감합니다 (넘는 주는 경고 로그로 남기고 건너뜀).
+        마감 기록이 없는 서버는 due_week_date만 마감합니다 (봇을 처음 들인 서버의 지난
+        주들에 벌금을 매기지 않도록).
+
+        Args:
+            guild_id: 서버 ID
+            due_week_date: 마감 대상 주의 월요일 (get_due_week_date)
+            max_weeks: 새로 마감을 시작할 최대 주 수
+
+        Returns:
+            마감할 주의 월요일 목록
+        """
+        due_week = due_week_date.date()
+        unclosed = [
+            week
+            for week in await self.db.get_unclosed_weeks(guild_id)
+            if week <= due_week
+        ]
+        last_closed = await self.db.get_last_closed_week(guild_id)
+        if last_closed is not None:
+            first_week = last_closed + timedelta(weeks=1)
+        elif unclosed:
+            first_week = unclosed[0]
+        else:
+            first_week = due_week
+
+        not_started = [
+            due_week_date - timedelta(weeks=offset)
+            for offset in reversed(range((due_week - first_week).days // 7 + 1))
+            if due_week - timedelta(weeks=offset) not in unclosed
+        ]
+        keep = max(1, max_weeks)
+        dropped, not_started = not_started[:-keep], not_started[-keep:]
+        if dropped:
+            logger.warning(
+                f"따라잡기 한도({keep}주)를 넘어 마감하지 않는 주 (서버 {guild_id}): "
+                f"{', '.join(str(week.date()) for week in dropped)}"
+            )
+
+        return sorted(
+            not_started
+            + [datetime.combine(week, datetime.min.time()) for week in unclosed]
+        )
+
     def get_last_week_date(self) -> datetime:
         """
         지난 주 월요일 날짜 계산
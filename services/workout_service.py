@@ -5,9 +5,10 @@
 
 from typing import Optional, Dict, List
 from datetime import datetime, date
-from database import Database
+from storage.base import StorageBackend
 from models.user import UserSettings
 from models.workout import WorkoutRecord, WeeklyProgress
+from utils.concurrency import KeyedLock
 from utils.date_utils import get_week_start_end, get_today_date
 from utils.validation import validate_goal_range, validate_date_format, is_image_file
 from services.penalty_service import PenaltyService
@@ -16,17 +17,20 @@ from services.penalty_service import PenaltyService
 class WorkoutService:
     """운동 관련 비즈니스 로직 서비스"""
 
-    def __init__(self, database: Database, penalty_service: PenaltyService):
+    def __init__(self, database: StorageBackend, penalty_service: PenaltyService):
         self.db = database
         self.penalty_service = penalty_service
+        # 사용자별 쓰기 레인: 같은 사용자의 쓰기는 순서대로, 다른 사용자는 병렬로 처리
+        self.write_lanes = KeyedLock()
 
     async def set_user_goal(
-        self, user_id: int, username: str, weekly_goal: int
+        self, guild_id: int, user_id: int, username: str, weekly_goal: int
     ) -> Dict[str, any]:
         """
         사용자 목표 설정
 
         Args:
+            guild_id: 서버 ID
             user_id: 사용자 ID
             username: 사용자명
             weekly_goal: 주간 목표
@@ -40,7 +44,10 @@ class WorkoutService:
                 "message": f"목표는 4-7회 사이여야 합니다. (입력값: {weekly_goal})",
             }
 
-        success = await self.db.set_user_goal(user_id, username, weekly_goal)
+        async with self.write_lanes.hold((guild_id, user_id)):
+            success = await self.db.set_user_goal(
+                guild_id, user_id, username, weekly_goal
+            )
 
         if success:
             return {
@@ -55,12 +62,17 @@ class WorkoutService:
             }
 
     async def add_workout_record(
-        self, user_id: int, username: str, workout_date: datetime = None
+        self,
+        guild_id: int,
+        user_id: int,
+        username: str,
+        workout_date: datetime = None,
     ) -> Dict[str, any]:
         """
         운동 기록 추가
 
         Args:
+            guild_id: 서버 ID
             user_id: 사용자 ID
             username: 사용자명
             workout_date: 운동 날짜 (None이면 오늘)
@@ -71,47 +83,53 @@ class WorkoutService:
         if workout_date is None:
             workout_date = get_today_date()
 
-        # 사용자 설정 확인
-        user_settings = await self.db.get_user_settings(user_id)
-        if not user_settings:
-            return {
-                "success": False,
-                "message": "먼저 `/set-goals` 명령어로 목표를 설정해주세요.",
-            }
-
         # 주차 정보 계산
         week_start, _ = get_week_start_end(workout_date)
 
-        # 기록 추가 시도
-        success = await self.db.add_workout_record(
-            user_id, username, workout_date, week_start
-        )
+        # 목표 확인, 기록 추가(또는 재활성화), 주간 횟수 조회를 한 번에 처리
+        # (같은 사용자의 다른 쓰기가 끝난 뒤 실행되므로 중복 확인과 횟수가 최신 상태)
+        async with self.write_lanes.hold((guild_id, user_id)):
+            snapshot = await self.db.add_workout_with_progress(
+                guild_id, user_id, username, workout_date, week_start
+            )
 
-        if success:
-            # 현재 진행 상황 조회
-            current_count = await self.db.get_weekly_workout_count(user_id, week_start)
-            weekly_goal = user_settings["weekly_goal"]
+        if snapshot is None:
+            return {
+                "success": False,
+                "message": "운동 기록 처리 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
+            }
 
+        if snapshot["status"] == "no_settings":
             return {
-                "success": True,
-                "message": f"{workout_date.strftime('%m월 %d일')} 운동 기록이 추가되었습니다!",
-                "current_count": current_count,
-                "weekly_goal": weekly_goal,
-                "is_goal_achieved": current_count >= weekly_goal,
+                "success": False,
+                "message": "먼저 `/set-goals` 명령어로 목표를 설정해주세요.",
             }
-        else:
+
+        if snapshot["status"] == "duplicate":
             return {
                 "success": False,
                 "message": f"{workout_date.strftime('%m월 %d일')}에 이미 운동 기록이 있습니다.",
             }
 
+        current_count = snapshot["current_count"]
+        weekly_goal = snapshot["weekly_goal"]
+
+        return {
+            "success": True,
+            "message": f"{workout_date.strftime('%m월 %d일')} 운동 기록이 추가되었습니다!",
+            "current_count": current_count,
+            "weekly_goal": weekly_goal,
+            "is_goal_achieved": current_count >= weekly_goal,
+        }
+
     async def revoke_workout_record(
-        self, user_id: int, workout_date: datetime = None
+        self, guild_id: int, user_id: int, workout_date: datetime = None
     ) -> Dict[str, any]:
         """
         운동 기록 취소
 
         Args:
+            guild_id: 서버 ID
             user_id: 사용자 ID
             workout_date: 운동 날짜 (None이면 오늘)
 
@@ -121,33 +139,39 @@ class WorkoutService:
         if workout_date is None:
             workout_date = get_today_date()
 
-        success = await self.db.revoke_workout_record(user_id, workout_date)
-
-        if success:
-            # 사용자 설정 및 현재 진행 상황 조회
-            user_settings = await self.db.get_user_settings(user_id)
-            week_start, _ = get_week_start_end(workout_date)
-            current_count = await self.db.get_weekly_workout_count(user_id, week_start)
+        # 기록 취소와 주간 횟수 조회를 한 번에 처리
+        async with self.write_lanes.hold((guild_id, user_id)):
+            snapshot = await self.db.revoke_workout_with_progress(
+                guild_id, user_id, workout_date
+            )
 
+        if snapshot is None:
             return {
-                "success": True,
-                "message": f"{workout_date.strftime('%m월 %d일')} 운동 기록이 취소되었습니다.",
-                "current_count": current_count,
-                "weekly_goal": user_settings["weekly_goal"] if user_settings else 0,
+                "success": False,
+                "message": "운동 기록 처리 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
             }
-        else:
+
+        if snapshot["status"] != "revoked":
             return {
                 "success": False,
                 "message": f"{workout_date.strftime('%m월 %d일')}에 취소할 운동 기록이 없습니다.",
             }
 
+        return {
+            "success": True,
+            "message": f"{workout_date.strftime('%m월 %d일')} 운동 기록이 취소되었습니다.",
+            "current_count": snapshot["current_count"],
+            "weekly_goal": snapshot["weekly_goal"],
+        }
+
     async def get_weekly_progress(
-        self, user_id: int, week_start_date: datetime = None
+        self, guild_id: int, user_id: int, week_start_date: datetime = None
     ) -> Optional[WeeklyProgress]:
         """
         주간 진행 상황 조회
 
         Args:
+            guild_id: 서버 ID
             user_id: 사용자 ID
             week_start_date: 주 시작일 (None이면 이번 주)
 
@@ -157,27 +181,31 @@ class WorkoutService:
         if week_start_date is None:
             week_start_date, _ = get_week_start_end()
 
-        user_settings = await self.db.get_user_settings(user_id)
+        user_settings = await self.db.get_user_settings(guild_id, user_id)
         if not user_settings:
             return None
 
-        current_count = await self.db.get_weekly_workout_count(user_id, week_start_date)
+        current_count = await self.db.get_weekly_workout_count(
+            guild_id, user_id, week_start_date
+        )
 
         return WeeklyProgress(
             user_id=user_id,
-            username=user_settings["username"],
-            weekly_goal=user_settings["weekly_goal"],
+            username=user_settings.username,
+            weekly_goal=user_settings.weekly_goal,
             current_count=current_count,
             week_start_date=week_start_date.date(),
+            guild_id=guild_id,
         )
 
     async def process_photo_upload(
-        self, user_id: int, username: str, filename: str
+        self, guild_id: int, user_id: int, username: str, filename: str
     ) -> Dict[str, any]:
         """
         사진 업로드 처리
 
         Args:
+            guild_id: 서버 ID
             user_id: 사용자 ID
             username: 사용자명
             filename: 파일명
@@ -190,7 +218,7 @@ class WorkoutService:
             return {"success": False, "message": "지원되지 않는 파일 형식입니다."}
 
         # 운동 기록 추가 시도
-        result = await self.add_workout_record(user_id, username)
+        result = await self.add_workout_record(guild_id, user_id, username)
 
         if result["success"]:
             # 진행 상황 정보 추가
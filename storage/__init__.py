@@ -0,0 +1,17 @@
+"""
+Storage Package
+저장소 인터페이스와 Supabase 외의 저장소 구현들을 정의합니다.
+"""
+
+from .base import StorageBackend
+from .memory import InMemoryDatabase
+from .migrations import MigrationError, MigrationRunner
+from .sqlite import SQLiteDatabase
+
+__all__ = [
+    "StorageBackend",
+    "InMemoryDatabase",
+    "SQLiteDatabase",
+    "MigrationRunner",
+    "MigrationError",
+]
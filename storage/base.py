@@ -0,0 +1,198 @@
+"""
+저장소 인터페이스
+서비스 레이어가 의존하는 저장소 연산을 정의합니다.
+모든 데이터는 서버(guild_id)별로 나뉘며, 서버 단위 연산은 guild_id를 첫 인자로 받습니다.
+모든 날짜 인자는 datetime입니다. 테이블 행은 도메인 모델(models)로, 연산 결과는 dict로 반환합니다.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from models import (
+    UserSettings,
+    WeeklyCloseRun,
+    WeeklyProgress,
+    WeeklyResult,
+    WorkoutRecord,
+)
+
+
+class StorageBackend(ABC):
+    """저장소 백엔드 인터페이스"""
+
+    @abstractmethod
+    async def init_db(self):
+        """저장소 연결 확인 및 초기화"""
+
+    async def close(self):
+        """연결 정리"""
+
+    @abstractmethod
+    async def set_user_goal(
+        self, guild_id: int, user_id: int, username: str, weekly_goal: int
+    ) -> bool:
+        """사용자의 주간 운동 목표 설정"""
+
+    @abstractmethod
+    async def get_user_settings(
+        self, guild_id: int, user_id: int
+    ) -> Optional[UserSettings]:
+        """사용자 설정 조회"""
+
+    @abstractmethod
+    async def add_workout_with_progress(
+        self,
+        guild_id: int,
+        user_id: int,
+        username: str,
+        workout_date: datetime,
+        week_start_date: datetime,
+    ) -> Optional[Dict]:
+        """
+        운동 기록 추가 + 주간 진행 상황 조회
+
+        Returns:
+            {"status", "current_count", "weekly_goal"} 또는 None (오류)
+            status: added | revived | duplicate | no_settings
+        """
+
+    @abstractmethod
+    async def revoke_workout_with_progress(
+        self, guild_id: int, user_id: int, workout_date: datetime
+    ) -> Optional[Dict]:
+        """
+        운동 기록 취소 + 주간 진행 상황 조회
+
+        Returns:
+            {"status", "current_count", "weekly_goal"} 또는 None (오류)
+            status: revoked | not_found
+        """
+
+    @abstractmethod
+    async def get_weekly_workout_count(
+        self, guild_id: int, user_id: int, week_start_date: datetime
+    ) -> int:
+        """특정 주의 운동 횟수 조회"""
+
+    @abstractmethod
+    async def reconcile_weekly_progress(
+        self, guild_id: int, week_start_date: Optional[datetime] = None
+    ) -> Optional[List[Dict]]:
+        """주간 카운터 검증 및 보정 (어긋났던 행 목록 반환)"""
+
+    @abstractmethod
+    async def get_all_users_weekly_data(
+        self, guild_id: int, week_start_date: datetime
+    ) -> List[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터 조회"""
+
+    @abstractmethod
+    async def get_weekly_history(
+        self,
+        guild_id: int,
+        start_week: datetime,
+        end_week: datetime,
+        user_id: Optional[int] = None,
+    ) -> List[WeeklyResult]:
+        """
+        여러 주 이력 조회 (주 범위 × 사용자, 단일 범위 쿼리)
+
+        start_week부터 end_week까지 (둘 다 주 시작일, 포함) 사용자가 가입한 주부터 한 행씩
+        (user_id, week_start_date) 순으로 반환합니다. 운동 기록이 없는 주는 0회입니다.
+        정산 여부는 마감 기록(settled_at)으로 판단하며, 정산된 주는 정산 당시 목표/횟수와
+        벌금(벌금 기록이 없으면 0원)을, 정산 전인 주는 penalty_amount None을 반환합니다.
+        """
+
+    @abstractmethod
+    def iter_users_weekly_data(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터를 user_id 순으로 페이지 단위 스트리밍"""
+
+    @abstractmethod
+    def iter_user_settings(
+        self, guild_id: int, page_size: Optional[int] = None
+    ) -> AsyncIterator[UserSettings]:
+        """서버 사용자 설정을 user_id 순으로 페이지 단위 스트리밍"""
+
+    @abstractmethod
+    def iter_workout_records(
+        self,
+        guild_id: int,
+        user_id: Optional[int] = None,
+        include_revoked: bool = False,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WorkoutRecord]:
+        """서버 운동 기록을 id 순으로 페이지 단위 스트리밍"""
+
+    @abstractmethod
+    async def settle_weekly_penalties(
+        self, guild_id: int, week_start_date: datetime, penalties: List[Dict]
+    ) -> Optional[Dict]:
+        """
+        서버 주간 벌금 일괄 정산 (단일 트랜잭션)
+
+        Returns:
+            {"processed_count", "total_penalty_added", "settled_user_ids"} 또는 None (오류).
+            settled_user_ids는 이번 호출에서 새로 정산된 사용자 ID 목록
+        """
+
+    @abstractmethod
+    async def get_total_accumulated_penalty(self, guild_id: int) -> float:
+        """서버 누적 벌금 조회"""
+
+    @abstractmethod
+    async def get_weekly_close_run(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[WeeklyCloseRun]:
+        """서버 한 주의 마감 진행 기록 (시작 전이면 None)"""
+
+    @abstractmethod
+    async def record_weekly_close_stage(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        stage: str,
+        report_message_id: Optional[int] = None,
+    ) -> bool:
+        """
+        주간 마감 단계 완료 기록 (이미 기록된 단계 시각과 메시지 ID는 처음 값 유지)
+
+        Args:
+            guild_id: 서버 ID
+            week_start_date: 주 시작일
+            stage: WEEKLY_CLOSE_STAGES 중 하나
+            report_message_id: 전송한 리포트 메시지 ID (broadcast 단계)
+        """
+
+    @abstractmethod
+    async def get_last_closed_week(self, guild_id: int) -> Optional[date]:
+        """서버에서 마지막으로 마감(리포트 전송까지)이 끝난 주의 시작일 (없으면 None)"""
+
+    @abstractmethod
+    async def get_unclosed_weeks(self, guild_id: int) -> List[date]:
+        """마감을 시작했지만 리포트 전송까지 끝나지 않은 주의 시작일 목록 (오래된 주부터)"""
+
+    @abstractmethod
+    async def save_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime, report: Dict
+    ) -> bool:
+        """주간 리포트 스냅샷 저장 (JSON으로 직렬화 가능한 dict, 같은 주는 교체)"""
+
+    @abstractmethod
+    async def get_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[Dict]:
+        """
+        주간 리포트 스냅샷 조회 (기본키 1행)
+
+        해당 주의 운동 기록이 추가/취소/삭제되면 스냅샷은 지워지므로 None을 반환합니다.
+        """
+
+    @abstractmethod
+    async def reset_database(self, guild_id: int) -> bool:
+        """서버 데이터 초기화 (해당 서버의 모든 데이터 삭제)"""
@@ -0,0 +1,606 @@
+"""
+인메모리 저장소
+벤치마크/부하 테스트용 참조 구현입니다. Supabase 스키마와 같은 제약조건
+(사용자/날짜당 활성 기록 1개, 사용자/주당 벌금 기록 1개, user_settings 외래키)을
+지키고, 호출마다 지연 시간을 주입해 네트워크 왕복을 흉내낼 수 있습니다.
+테이블은 서버(guild_id)별로 나눠 두어 서버 단위 조회가 해당 서버의 행만 훑습니다.
+"""
+
+import asyncio
+import json
+import logging
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from config import DATABASE_SCAN_PAGE_SIZE
+from models import (
+    WEEKLY_CLOSE_STAGES,
+    UserSettings,
+    WeeklyCloseRun,
+    WeeklyProgress,
+    WeeklyResult,
+    WorkoutRecord,
+    map_user_settings,
+    map_weekly_close_run,
+    map_weekly_progress,
+    map_weekly_result,
+    map_workout_record,
+)
+
+from storage.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryDatabase(StorageBackend):
+    """
+    인메모리 저장소
+
+    Args:
+        latency: 모든 호출에 주입할 지연 시간 (초)
+        method_latency: 메서드별 지연 시간 (초, latency보다 우선)
+    """
+
+    def __init__(
+        self, latency: float = 0.0, method_latency: Optional[Dict[str, float]] = None
+    ):
+        self.latency = latency
+        self.method_latency = method_latency or {}
+        # 메서드별 호출 횟수 (왕복 수 측정용)
+        self.calls: Counter = Counter()
+        self._reset_tables()
+
+    def _reset_tables(self):
+        # 모든 테이블은 guild_id -> 서버 파티션
+        self.user_settings: Dict[int, Dict[int, Dict]] = defaultdict(dict)
+        self.workout_records: Dict[int, List[Dict]] = defaultdict(list)
+        self.weekly_penalties: Dict[int, Dict[Tuple[int, str], Dict]] = defaultdict(
+            dict
+        )
+        self.weekly_progress: Dict[int, Dict[Tuple[int, str], int]] = defaultdict(dict)
+        # week_start_date -> JSON 문자열 (Supabase JSONB처럼 조회마다 새 객체로 복원)
+        self.weekly_report_snapshots: Dict[int, Dict[str, str]] = defaultdict(dict)
+        # week_start_date -> 주간 마감 진행 기록 행
+        self.weekly_close_runs: Dict[int, Dict[str, Dict]] = defaultdict(dict)
+        # 부분 UNIQUE 인덱스 (guild_id, user_id, workout_date) WHERE is_revoked = FALSE
+        self._active_records: Dict[Tuple[int, int, str], Dict] = {}
+        self._next_record_id = 1
+        self._next_penalty_id = 1
+
+    def _drop_guild(self, guild_id: int):
+        """서버 파티션 삭제"""
+        for table in (
+            self.user_settings,
+            self.workout_records,
+            self.weekly_penalties,
+            self.weekly_progress,
+            self.weekly_report_snapshots,
+            self.weekly_close_runs,
+        ):
+            table.pop(guild_id, None)
+        self._active_records = {
+            key: record
+            for key, record in self._active_records.items()
+            if key[0] != guild_id
+        }
+
+    async def _round_trip(self, method: str):
+        """호출 기록 및 지연 주입"""
+        self.calls[method] += 1
+        delay = self.method_latency.get(method, self.latency)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _apply_progress_delta(
+        self, guild_id: int, user_id: int, week_start_str: str, delta: int
+    ):
+        progress = self.weekly_progress[guild_id]
+        key = (user_id, week_start_str)
+        progress[key] = max(progress.get(key, 0) + delta, 0)
+        # 스냅샷 무효화 트리거: 해당 주의 기록이 바뀌면 다음 조회 때 다시 생성
+        self.weekly_report_snapshots.get(guild_id, {}).pop(week_start_str, None)
+
+    def _insert_record(
+        self,
+        guild_id: int,
+        user_id: int,
+        username: str,
+        workout_date_str: str,
+        week_start_str: str,
+    ) -> Dict:
+        """제약조건을 검사하며 기록 삽입 (위반 시 ValueError)"""
+        if user_id not in self.user_settings.get(guild_id, {}):
+            raise ValueError(
+                f"외래키 위반: user_settings에 ({guild_id}, {user_id}) 없음"
+            )
+        if (guild_id, user_id, workout_date_str) in self._active_records:
+            raise ValueError(
+                "UNIQUE 위반: unique_active_workout_per_guild_user_date "
+                f"({guild_id}, {user_id}, {workout_date_str})"
+            )
+
+        record = {
+            "id": self._next_record_id,
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "username": username,
+            "workout_date": workout_date_str,
+            "week_start_date": week_start_str,
+            "created_at": datetime.now().isoformat(),
+            "is_revoked": False,
+        }
+        self._next_record_id += 1
+        self.workout_records[guild_id].append(record)
+        self._active_records[(guild_id, user_id, workout_date_str)] = record
+        self._apply_progress_delta(guild_id, user_id, week_start_str, 1)
+        return record
+
+    def _revoke_record(
+        self, guild_id: int, user_id: int, workout_date_str: str
+    ) -> Optional[Dict]:
+        record = self._active_records.pop((guild_id, user_id, workout_date_str), None)
+        if record is None:
+            return None
+        record["is_revoked"] = True
+        self._apply_progress_delta(guild_id, user_id, record["week_start_date"], -1)
+        return record
+
+    async def init_db(self):
+        """초기화할 스키마가 없음"""
+        await self._round_trip("init_db")
+        logger.info("인메모리 저장소 준비 완료")
+
+    async def set_user_goal(
+        self, guild_id: int, user_id: int, username: str, weekly_goal: int
+    ) -> bool:
+        """사용자의 주간 운동 목표 설정"""
+        await self._round_trip("set_user_goal")
+        now = datetime.now().isoformat()
+
+        guild_settings = self.user_settings[guild_id]
+        settings = guild_settings.get(user_id)
+        if settings:
+            settings.update(
+                {"username": username, "weekly_goal": weekly_goal, "updated_at": now}
+            )
+        else:
+            guild_settings[user_id] = {
+                "guild_id": guild_id,
+                "user_id": user_id,
+                "username": username,
+                "weekly_goal": weekly_goal,
+                "total_penalty": 0.0,
+                "created_at": now,
+                "updated_at": now,
+            }
+
+        logger.info(f"사용자 {username}(ID: {user_id})의 목표를 {weekly_goal}회로 설정")
+        return True
+
+    async def get_user_settings(
+        self, guild_id: int, user_id: int
+    ) -> Optional[UserSettings]:
+        """사용자 설정 조회"""
+        await self._round_trip("get_user_settings")
+        settings = self.user_settings.get(guild_id, {}).get(user_id)
+        return map_user_settings(settings) if settings else None
+
+    async def add_workout_with_progress(
+        self,
+        guild_id: int,
+        user_id: int,
+        username: str,
+        workout_date: datetime,
+        week_start_date: datetime,
+    ) -> Optional[Dict]:
+        """운동 기록 추가 + 주간 진행 상황 조회"""
+        await self._round_trip("add_workout_with_progress")
+        workout_date_str = workout_date.date().isoformat()
+        week_start_str = week_start_date.date().isoformat()
+
+        settings = self.user_settings.get(guild_id, {}).get(user_id)
+        if settings is None:
+            return {"status": "no_settings", "current_count": 0, "weekly_goal": 0}
+
+        if (guild_id, user_id, workout_date_str) in self._active_records:
+            status = "duplicate"
+        else:
+            revoked = [
+                record
+                for record in self.workout_records[guild_id]
+                if record["user_id"] == user_id
+                and record["workout_date"] == workout_date_str
+                and record["is_revoked"]
+            ]
+            if revoked:
+                # 취소된 기록 중 가장 최근 것을 다시 활성화
+                record = max(revoked, key=lambda r: r["id"])
+                record.update(
+                    {
+                        "is_revoked": False,
+                        "username": username,
+                        "week_start_date": week_start_str,
+                        "created_at": datetime.now().isoformat(),
+                    }
+                )
+                self._active_records[(guild_id, user_id, workout_date_str)] = record
+                self._apply_progress_delta(guild_id, user_id, week_start_str, 1)
+                status = "revived"
+            else:
+                self._insert_record(
+                    guild_id, user_id, username, workout_date_str, week_start_str
+                )
+                status = "added"
+
+        return {
+            "status": status,
+            "current_count": self.weekly_progress[guild_id].get(
+                (user_id, week_start_str), 0
+            ),
+            "weekly_goal": settings["weekly_goal"],
+        }
+
+    async def revoke_workout_with_progress(
+        self, guild_id: int, user_id: int, workout_date: datetime
+    ) -> Optional[Dict]:
+        """운동 기록 취소 + 주간 진행 상황 조회"""
+        await self._round_trip("revoke_workout_with_progress")
+        record = self._revoke_record(guild_id, user_id, workout_date.date().isoformat())
+        if record is None:
+            return {"status": "not_found", "current_count": 0, "weekly_goal": 0}
+
+        settings = self.user_settings[guild_id].get(user_id)
+        return {
+            "status": "revoked",
+            "current_count": self.weekly_progress[guild_id].get(
+                (user_id, record["week_start_date"]), 0
+            ),
+            "weekly_goal": settings["weekly_goal"] if settings else 0,
+        }
+
+    async def get_weekly_workout_count(
+        self, guild_id: int, user_id: int, week_start_date: datetime
+    ) -> int:
+        """특정 주의 운동 횟수 조회"""
+        await self._round_trip("get_weekly_workout_count")
+        return self.weekly_progress.get(guild_id, {}).get(
+            (user_id, week_start_date.date().isoformat()), 0
+        )
+
+    async def reconcile_weekly_progress(
+        self, guild_id: int, week_start_date: Optional[datetime] = None
+    ) -> Optional[List[Dict]]:
+        """주간 카운터 검증 및 보정"""
+        await self._round_trip("reconcile_weekly_progress")
+        week_start_str = week_start_date.date().isoformat() if week_start_date else None
+        progress = self.weekly_progress[guild_id]
+
+        actual: Counter = Counter(
+            (record["user_id"], record["week_start_date"])
+            for record in self.workout_records[guild_id]
+            if not record["is_revoked"]
+            and (week_start_str is None or record["week_start_date"] == week_start_str)
+        )
+        stored = {
+            key: count
+            for key, count in progress.items()
+            if week_start_str is None or key[1] == week_start_str
+        }
+
+        drift = []
+        for key in sorted(actual.keys() | stored.keys(), key=lambda k: (k[1], k[0])):
+            stored_count = stored.get(key, 0)
+            actual_count = actual.get(key, 0)
+            if stored_count == actual_count:
+                continue
+
+            progress[key] = actual_count
+            drift.append(
+                {
+                    "guild_id": guild_id,
+                    "user_id": key[0],
+                    "week_start_date": key[1],
+                    "stored_count": stored_count,
+                    "actual_count": actual_count,
+                }
+            )
+
+        if drift:
+            logger.warning(f"주간 카운터 불일치 {len(drift)}건 보정: {drift}")
+        return drift
+
+    def _weekly_rows(self, guild_id: int, week_start_str: str) -> List[Dict]:
+        """user_id 순 서버 사용자별 주간 데이터 행 (Supabase RPC 결과와 같은 형태)"""
+        progress = self.weekly_progress.get(guild_id, {})
+        return [
+            {
+                "user_id": user_id,
+                "username": settings["username"],
+                "weekly_goal": settings["weekly_goal"],
+                "workout_count": progress.get((user_id, week_start_str), 0),
+                "total_penalty": settings["total_penalty"],
+            }
+            for user_id, settings in sorted(
+                self.user_settings.get(guild_id, {}).items()
+            )
+        ]
+
+    async def get_all_users_weekly_data(
+        self, guild_id: int, week_start_date: datetime
+    ) -> List[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터 조회"""
+        await self._round_trip("get_all_users_weekly_data")
+        week_start = week_start_date.date()
+        return [
+            map_weekly_progress(row, week_start_date=week_start, guild_id=guild_id)
+            for row in self._weekly_rows(guild_id, week_start.isoformat())
+        ]
+
+    async def get_weekly_history(
+        self,
+        guild_id: int,
+        start_week: datetime,
+        end_week: datetime,
+        user_id: Optional[int] = None,
+    ) -> List[WeeklyResult]:
+        """여러 주 이력 조회 (주 범위 × 사용자, 가입 전 주 제외)"""
+        await self._round_trip("get_weekly_history")
+        weeks = []
+        week = start_week.date()
+        while week <= end_week.date():
+            weeks.append(week.isoformat())
+            week += timedelta(days=7)
+
+        progress = self.weekly_progress.get(guild_id, {})
+        penalties = self.weekly_penalties.get(guild_id, {})
+        runs = self.weekly_close_runs.get(guild_id, {})
+        rows = []
+        for settings_user_id, settings in sorted(
+            self.user_settings.get(guild_id, {}).items()
+        ):
+            if user_id is not None and settings_user_id != user_id:
+                continue
+            joined = settings["created_at"][:10]
+            for week_start_str in weeks:
+                penalty = penalties.get((settings_user_id, week_start_str))
+                week_end = date.fromisoformat(week_start_str) + timedelta(days=6)
+                if penalty is None and week_end.isoformat() < joined:
+                    continue
+
+                if penalty:
+                    goal_count = penalty["goal_count"]
+                    actual_count = penalty["actual_count"]
+                    penalty_amount = penalty["penalty_amount"]
+                else:
+                    goal_count = settings["weekly_goal"]
+                    actual_count = progress.get((settings_user_id, week_start_str), 0)
+                    run = runs.get(week_start_str)
+                    penalty_amount = 0.0 if run and run["settled_at"] else None
+                rows.append(
+                    {
+                        "user_id": settings_user_id,
+                        "username": settings["username"],
+                        "week_start_date": week_start_str,
+                        "goal_count": goal_count,
+                        "actual_count": actual_count,
+                        "penalty_amount": penalty_amount,
+                    }
+                )
+        return [map_weekly_result(row, guild_id=guild_id) for row in rows]
+
+    async def _scan(
+        self,
+        method: str,
+        rows: List[Dict],
+        mapper: Callable[[Dict], Any],
+        page_size: Optional[int],
+    ) -> AsyncIterator[Any]:
+        """페이지마다 왕복 1회를 흉내내며 스트리밍 (행은 mapper로 변환)"""
+        page_size = page_size or DATABASE_SCAN_PAGE_SIZE
+        for start in range(0, len(rows), page_size):
+            await self._round_trip(method)
+            for row in rows[start : start + page_size]:
+                yield mapper(row)
+
+    def iter_users_weekly_data(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터 스트리밍"""
+        week_start = week_start_date.date()
+        return self._scan(
+            "iter_users_weekly_data",
+            self._weekly_rows(guild_id, week_start.isoformat()),
+            partial(map_weekly_progress, week_start_date=week_start, guild_id=guild_id),
+            page_size,
+        )
+
+    def iter_user_settings(
+        self, guild_id: int, page_size: Optional[int] = None
+    ) -> AsyncIterator[UserSettings]:
+        """서버 사용자 설정 스트리밍"""
+        rows = [
+            settings
+            for _, settings in sorted(self.user_settings.get(guild_id, {}).items())
+        ]
+        return self._scan("iter_user_settings", rows, map_user_settings, page_size)
+
+    def iter_workout_records(
+        self,
+        guild_id: int,
+        user_id: Optional[int] = None,
+        include_revoked: bool = False,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WorkoutRecord]:
+        """서버 운동 기록 스트리밍"""
+        rows = [
+            record
+            for record in self.workout_records.get(guild_id, [])
+            if (user_id is None or record["user_id"] == user_id)
+            and (include_revoked or not record["is_revoked"])
+        ]
+        return self._scan("iter_workout_records", rows, map_workout_record, page_size)
+
+    def _settle(
+        self, guild_id: int, week_start_str: str, penalties: List[Dict]
+    ) -> Dict:
+        """벌금 정산 (제약조건 위반 시 아무것도 반영하지 않음)"""
+        guild_settings = self.user_settings.get(guild_id, {})
+        for penalty in penalties:
+            if penalty["user_id"] not in guild_settings:
+                raise ValueError(
+                    f"외래키 위반: user_settings에 ({guild_id}, {penalty['user_id']}) 없음"
+                )
+
+        processed_count = 0
+        total_penalty_added = 0.0
+        settled_user_ids = []
+        now = datetime.now().isoformat()
+
+        for penalty in penalties:
+            guild_penalties = self.weekly_penalties[guild_id]
+            key = (penalty["user_id"], week_start_str)
+            if key in guild_penalties:
+                continue
+
+            guild_penalties[key] = {
+                "id": self._next_penalty_id,
+                "guild_id": guild_id,
+                "user_id": penalty["user_id"],
+                "username": penalty["username"],
+                "week_start_date": week_start_str,
+                "goal_count": penalty["goal_count"],
+                "actual_count": penalty["actual_count"],
+                "penalty_amount": penalty["penalty_amount"],
+                "created_at": now,
+            }
+            self._next_penalty_id += 1
+
+            settings = guild_settings[penalty["user_id"]]
+            settings["total_penalty"] += penalty["penalty_amount"]
+            settings["updated_at"] = now
+            processed_count += 1
+            total_penalty_added += penalty["penalty_amount"]
+            settled_user_ids.append(penalty["user_id"])
+
+        return {
+            "processed_count": processed_count,
+            "total_penalty_added": total_penalty_added,
+            "settled_user_ids": settled_user_ids,
+        }
+
+    async def settle_weekly_penalties(
+        self, guild_id: int, week_start_date: datetime, penalties: List[Dict]
+    ) -> Optional[Dict]:
+        """서버 주간 벌금 일괄 정산"""
+        await self._round_trip("settle_weekly_penalties")
+        try:
+            return self._settle(guild_id, week_start_date.date().isoformat(), penalties)
+        except ValueError as e:
+            logger.error(f"주간 벌금 일괄 정산 실패: {e}")
+            return None
+
+    async def get_total_accumulated_penalty(self, guild_id: int) -> float:
+        """서버 누적 벌금 조회"""
+        await self._round_trip("get_total_accumulated_penalty")
+        return float(
+            sum(
+                settings["total_penalty"]
+                for settings in self.user_settings.get(guild_id, {}).values()
+            )
+        )
+
+    async def get_weekly_close_run(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[WeeklyCloseRun]:
+        """서버 한 주의 마감 진행 기록"""
+        await self._round_trip("get_weekly_close_run")
+        row = self.weekly_close_runs.get(guild_id, {}).get(
+            week_start_date.date().isoformat()
+        )
+        return map_weekly_close_run(row) if row else None
+
+    async def record_weekly_close_stage(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        stage: str,
+        report_message_id: Optional[int] = None,
+    ) -> bool:
+        """주간 마감 단계 완료 기록"""
+        await self._round_trip("record_weekly_close_stage")
+        if stage not in WEEKLY_CLOSE_STAGES:
+            logger.error(f"알 수 없는 주간 마감 단계: {stage}")
+            return False
+
+        week_start_str = week_start_date.date().isoformat()
+        row = self.weekly_close_runs[guild_id].setdefault(
+            week_start_str,
+            {
+                "guild_id": guild_id,
+                "week_start_date": week_start_str,
+                **{f"{name}_at": None for name in WEEKLY_CLOSE_STAGES},
+                "report_message_id": None,
+            },
+        )
+        if row[f"{stage}_at"] is None:
+            row[f"{stage}_at"] = datetime.now().isoformat()
+        if row["report_message_id"] is None:
+            row["report_message_id"] = report_message_id
+        return True
+
+    async def get_last_closed_week(self, guild_id: int) -> Optional[date]:
+        """서버에서 마지막으로 마감이 끝난 주의 시작일"""
+        await self._round_trip("get_last_closed_week")
+        weeks = [
+            week_start_str
+            for week_start_str, row in self.weekly_close_runs.get(guild_id, {}).items()
+            if row["broadcast_at"] is not None
+        ]
+        return date.fromisoformat(max(weeks)) if weeks else None
+
+    async def get_unclosed_weeks(self, guild_id: int) -> List[date]:
+        """리포트 전송까지 끝나지 않은 주의 시작일 목록"""
+        await self._round_trip("get_unclosed_weeks")
+        return [
+            date.fromisoformat(week_start_str)
+            for week_start_str, row in sorted(
+                self.weekly_close_runs.get(guild_id, {}).items()
+            )
+            if row["broadcast_at"] is None
+        ]
+
+    async def save_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime, report: Dict
+    ) -> bool:
+        """주간 리포트 스냅샷 저장"""
+        await self._round_trip("save_weekly_report_snapshot")
+        try:
+            self.weekly_report_snapshots[guild_id][
+                week_start_date.date().isoformat()
+            ] = json.dumps(report)
+            return True
+        except (TypeError, ValueError) as e:
+            logger.error(f"주간 리포트 스냅샷 저장 실패: {e}")
+            return False
+
+    async def get_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[Dict]:
+        """주간 리포트 스냅샷 조회"""
+        await self._round_trip("get_weekly_report_snapshot")
+        report = self.weekly_report_snapshots.get(guild_id, {}).get(
+            week_start_date.date().isoformat()
+        )
+        return json.loads(report) if report is not None else None
+
+    async def reset_database(self, guild_id: int) -> bool:
+        """서버 데이터 초기화 (해당 서버의 모든 데이터 삭제)"""
+        await self._round_trip("reset_database")
+        self._drop_guild(guild_id)
+        logger.warning(f"서버 {guild_id}의 데이터가 완전히 초기화되었습니다")
+        return True
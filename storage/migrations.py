@@ -0,0 +1,232 @@
+"""
+버전 관리 스키마 마이그레이션
+migrations/<dialect>/NNNN_name.sql 파일을 번호 순서대로 적용하고,
+적용한 버전을 schema_migrations 테이블에 기록합니다.
+
+    python migrate.py                  # DATABASE_URL(Postgres)에 적용
+    python migrate.py --sqlite bot.db  # SQLite 파일에 적용
+    python migrate.py --status         # 적용/대기 목록만 출력
+
+마이그레이션은 대부분 다시 실행해도 안전하게 작성합니다
+(IF NOT EXISTS, CREATE OR REPLACE, DROP ... IF EXISTS). 테이블 이름을 바꾸거나
+다시 만들어 옮기는 Postgres 0010, SQLite 0004/0007은 한 번만 실행할 수 있습니다.
+적용 여부는 schema_migrations 기록으로만 판단하니 기록을 임의로 지우지 마세요.
+적용한 파일은 체크섬으로 검사하므로 고치지 말고 새 버전을 추가합니다.
+
+서버 분리(Postgres 0006, SQLite 0004) 이전에 쌓인 행은 guild_id = 0으로 옮겨지며,
+기존 서버로 이어서 쓰려면 한 번 배정해야 합니다 (unassigned_users 참고):
+
+    UPDATE user_settings SET guild_id = <서버 ID> WHERE guild_id = 0;
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_ROOT = Path(__file__).resolve().parent.parent / "migrations"
+DIALECTS = ("postgres", "sqlite")
+
+_FILENAME_PATTERN = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+# 기존 행을 guild_id = 0으로 옮기는 서버 분리 마이그레이션 버전
+GUILD_PARTITION_VERSIONS = {"postgres": 6, "sqlite": 4}
+ASSIGN_GUILD_SQL = "UPDATE user_settings SET guild_id = <서버 ID> WHERE guild_id = 0;"
+
+
+class MigrationError(Exception):
+    """마이그레이션 파일/적용 오류"""
+
+
+class Migration:
+    """SQL 마이그레이션 파일 하나"""
+
+    def __init__(self, version: int, name: str, path: Path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self.sql = path.read_text(encoding="utf-8")
+        self.checksum = hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"Migration({self.version:04d}_{self.name})"
+
+
+def load_migrations(dialect: str, directory: Optional[Path] = None) -> List[Migration]:
+    """방언별 마이그레이션 파일을 버전 순으로 로드"""
+    if dialect not in DIALECTS:
+        raise MigrationError(f"지원하지 않는 방언: {dialect}")
+
+    directory = directory or MIGRATIONS_ROOT / dialect
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME_PATTERN.match(path.name)
+        if not match:
+            raise MigrationError(f"마이그레이션 파일 이름 형식 오류: {path.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f"중복된 마이그레이션 버전: {directory}")
+    return migrations
+
+
+class MigrationRunner:
+    """
+    DB-API 연결에 마이그레이션 적용
+
+    sqlite3 연결 또는 psycopg 연결을 받습니다. 마이그레이션 하나와 버전 기록을
+    한 트랜잭션에서 실행하므로, 실패하면 해당 버전은 적용되지 않은 상태로 남습니다.
+    """
+
+    def __init__(self, conn, dialect: str, directory: Optional[Path] = None):
+        self.conn = conn
+        self.dialect = dialect
+        self.migrations = load_migrations(dialect, directory)
+
+    def _ensure_table(self):
+        """버전 기록 테이블 생성"""
+        sql = """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        if self.dialect == "sqlite":
+            self.conn.execute(sql)
+        else:
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql)
+            self.conn.commit()
+
+    def _fetch_applied(self) -> Dict[int, Dict[str, Any]]:
+        query = "SELECT version, name, checksum FROM schema_migrations"
+        if self.dialect == "sqlite":
+            rows = self.conn.execute(query).fetchall()
+        else:
+            with self.conn.cursor() as cursor:
+                cursor.execute(query)
+                rows = cursor.fetchall()
+            self.conn.commit()
+        return {
+            row[0]: {"version": row[0], "name": row[1], "checksum": row[2]}
+            for row in rows
+        }
+
+    def applied(self) -> Dict[int, Dict[str, Any]]:
+        """적용된 버전 목록 (버전 -> 이름/체크섬)"""
+        self._ensure_table()
+        applied = self._fetch_applied()
+
+        # 적용 후 수정된 파일은 다시 실행하지 않고 경고만 남김
+        for migration in self.migrations:
+            record = applied.get(migration.version)
+            if record and record["checksum"] != migration.checksum:
+                logger.warning(f"적용 후 변경된 마이그레이션: {migration}")
+        return applied
+
+    def pending(self) -> List[Migration]:
+        """아직 적용되지 않은 마이그레이션"""
+        applied = self.applied()
+        return [m for m in self.migrations if m.version not in applied]
+
+    def unassigned_users(self) -> int:
+        """서버 분리 이전에 쌓여 아직 서버에 배정되지 않은 (guild_id = 0) 사용자 수"""
+        if GUILD_PARTITION_VERSIONS[self.dialect] not in self.applied():
+            return 0
+
+        query = "SELECT COUNT(*) FROM user_settings WHERE guild_id = 0"
+        if self.dialect == "sqlite":
+            row = self.conn.execute(query).fetchone()
+        else:
+            with self.conn.cursor() as cursor:
+                cursor.execute(query)
+                row = cursor.fetchone()
+            self.conn.commit()
+        return row[0] if row else 0
+
+    def migrate(self, target: Optional[int] = None) -> List[Migration]:
+        """
+        대기 중인 마이그레이션을 순서대로 적용
+
+        Args:
+            target: 이 버전까지만 적용 (None이면 전부)
+
+        Returns:
+            이번에 적용한 마이그레이션 목록
+        """
+        applied = []
+        for migration in self.pending():
+            if target is not None and migration.version > target:
+                break
+            if self.dialect == "sqlite":
+                self._apply_sqlite(migration)
+            else:
+                if not self._apply_postgres(migration):
+                    continue
+            logger.info(f"마이그레이션 적용 완료: {migration}")
+            applied.append(migration)
+
+        if not applied:
+            logger.info("적용할 마이그레이션 없음")
+        return applied
+
+    def _apply_sqlite(self, migration: Migration):
+        # executescript는 파라미터를 받지 않으므로 기록 값을 직접 포함
+        # (버전/이름은 파일 이름 형식 검사를 통과한 값, 체크섬은 16진수)
+        script = (
+            "BEGIN IMMEDIATE;\n"
+            f"{migration.sql}\n;\n"
+            "INSERT INTO schema_migrations (version, name, checksum) "
+            f"VALUES ({migration.version}, '{migration.name}', '{migration.checksum}');\n"
+            "COMMIT;"
+        )
+        try:
+            self.conn.executescript(script)
+        except Exception as e:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            raise MigrationError(f"{migration} 적용 실패: {e}") from e
+
+    def _apply_postgres(self, migration: Migration) -> bool:
+        """적용하면 True, 다른 인스턴스가 먼저 적용했으면 False"""
+        try:
+            with self.conn.cursor() as cursor:
+                # 여러 인스턴스가 동시에 시작해도 한 번만 적용
+                cursor.execute("LOCK TABLE schema_migrations IN EXCLUSIVE MODE")
+                cursor.execute(
+                    "SELECT 1 FROM schema_migrations WHERE version = %s",
+                    (migration.version,),
+                )
+                if cursor.fetchone():
+                    self.conn.rollback()
+                    return False
+
+                cursor.execute(migration.sql)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) "
+                    "VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum),
+                )
+            self.conn.commit()
+            return True
+        except Exception as e:
+            self.conn.rollback()
+            raise MigrationError(f"{migration} 적용 실패: {e}") from e
+
+
+def connect_postgres(database_url: str):
+    """Postgres 직접 연결 (psycopg 필요)"""
+    try:
+        import psycopg
+    except ImportError as e:
+        raise MigrationError(
+            "Postgres 마이그레이션에는 psycopg가 필요합니다: "
+            'pip install "psycopg[binary]"'
+        ) from e
+    return psycopg.connect(database_url)
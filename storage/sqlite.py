@@ -0,0 +1,748 @@
+"""
+SQLite 저장소
+네트워크 왕복 없이 로컬 파일(WAL 모드)에 저장하는 소규모 배포/오프라인 테스트용 백엔드입니다.
+쿼리가 1ms 미만으로 끝나므로 이벤트 루프에서 바로 실행합니다.
+"""
+
+import json
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from config import DATABASE_SCAN_PAGE_SIZE
+from models import (
+    WEEKLY_CLOSE_STAGES,
+    UserSettings,
+    WeeklyCloseRun,
+    WeeklyProgress,
+    WeeklyResult,
+    WorkoutRecord,
+    map_user_settings,
+    map_weekly_close_run,
+    map_weekly_progress,
+    map_weekly_result,
+    map_workout_record,
+)
+
+from storage.base import StorageBackend
+from storage.migrations import ASSIGN_GUILD_SQL, MigrationRunner
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteDatabase(StorageBackend):
+    """SQLite 기반 저장소"""
+
+    def __init__(self, path: str):
+        """SQLite 연결 초기화"""
+        self.path = path
+        # 트랜잭션은 _transaction()에서 직접 관리
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        logger.info(f"SQLite 연결 초기화 완료: {path}")
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 (예외 시 롤백)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+
+    def _weekly_count(self, guild_id: int, user_id: int, week_start_str: str) -> int:
+        """weekly_progress 카운터 조회"""
+        row = self.conn.execute(
+            "SELECT active_count FROM weekly_progress "
+            "WHERE guild_id = ? AND user_id = ? AND week_start_date = ?",
+            (guild_id, user_id, week_start_str),
+        ).fetchone()
+        return row["active_count"] if row else 0
+
+    async def init_db(self):
+        """스키마 마이그레이션 적용"""
+        try:
+            runner = MigrationRunner(self.conn, "sqlite")
+            runner.migrate()
+            logger.info("SQLite 스키마 확인 완료")
+
+            unassigned = runner.unassigned_users()
+            if unassigned:
+                logger.warning(
+                    f"서버에 배정되지 않은 기존 사용자 {unassigned}명 (guild_id = 0): "
+                    f"{ASSIGN_GUILD_SQL}"
+                )
+        except Exception as e:
+            logger.error(f"데이터베이스 초기화 실패: {e}")
+            raise
+
+    async def close(self):
+        """연결 종료"""
+        self.conn.close()
+
+    async def set_user_goal(
+        self, guild_id: int, user_id: int, username: str, weekly_goal: int
+    ) -> bool:
+        """사용자의 주간 운동 목표 설정"""
+        try:
+            now = datetime.now().isoformat()
+            with self._transaction() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO user_settings
+                        (guild_id, user_id, username, weekly_goal, total_penalty,
+                         created_at, updated_at)
+                    VALUES (?, ?, ?, ?, 0.0, ?, ?)
+                    ON CONFLICT (guild_id, user_id) DO UPDATE
+                    SET username = excluded.username,
+                        weekly_goal = excluded.weekly_goal,
+                        updated_at = excluded.updated_at
+                    """,
+                    (guild_id, user_id, username, weekly_goal, now, now),
+                )
+
+            logger.info(
+                f"사용자 {username}(ID: {user_id})의 목표를 {weekly_goal}회로 설정"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"목표 설정 실패: {e}")
+            return False
+
+    async def get_user_settings(
+        self, guild_id: int, user_id: int
+    ) -> Optional[UserSettings]:
+        """사용자 설정 조회"""
+        try:
+            row = self.conn.execute(
+                "SELECT * FROM user_settings WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id),
+            ).fetchone()
+            return map_user_settings(row) if row else None
+        except Exception as e:
+            logger.error(f"사용자 설정 조회 실패: {e}")
+            return None
+
+    async def add_workout_with_progress(
+        self,
+        guild_id: int,
+        user_id: int,
+        username: str,
+        workout_date: datetime,
+        week_start_date: datetime,
+    ) -> Optional[Dict]:
+        """운동 기록 추가 + 주간 진행 상황 조회 (단일 트랜잭션)"""
+        try:
+            workout_date_str = workout_date.date().isoformat()
+            week_start_str = week_start_date.date().isoformat()
+
+            with self._transaction() as conn:
+                settings = conn.execute(
+                    "SELECT weekly_goal FROM user_settings "
+                    "WHERE guild_id = ? AND user_id = ?",
+                    (guild_id, user_id),
+                ).fetchone()
+                if settings is None:
+                    return {
+                        "status": "no_settings",
+                        "current_count": 0,
+                        "weekly_goal": 0,
+                    }
+
+                active = conn.execute(
+                    "SELECT 1 FROM workout_records "
+                    "WHERE guild_id = ? AND user_id = ? AND workout_date = ? "
+                    "AND is_revoked = 0",
+                    (guild_id, user_id, workout_date_str),
+                ).fetchone()
+
+                if active:
+                    status = "duplicate"
+                else:
+                    # 취소된 기록이 있으면 다시 활성화
+                    cursor = conn.execute(
+                        """
+                        UPDATE workout_records
+                        SET is_revoked = 0, username = ?, week_start_date = ?, created_at = ?
+                        WHERE id = (
+                            SELECT id FROM workout_records
+                            WHERE guild_id = ? AND user_id = ? AND workout_date = ?
+                              AND is_revoked = 1
+                            ORDER BY id DESC
+                            LIMIT 1
+                        )
+                        """,
+                        (
+                            username,
+                            week_start_str,
+                            datetime.now().isoformat(),
+                            guild_id,
+                            user_id,
+                            workout_date_str,
+                        ),
+                    )
+
+                    if cursor.rowcount:
+                        status = "revived"
+                    else:
+                        conn.execute(
+                            """
+                            INSERT INTO workout_records
+                                (guild_id, user_id, username, workout_date,
+                                 week_start_date, created_at, is_revoked)
+                            VALUES (?, ?, ?, ?, ?, ?, 0)
+                            """,
+                            (
+                                guild_id,
+                                user_id,
+                                username,
+                                workout_date_str,
+                                week_start_str,
+                                datetime.now().isoformat(),
+                            ),
+                        )
+                        status = "added"
+
+                snapshot = {
+                    "status": status,
+                    "current_count": self._weekly_count(
+                        guild_id, user_id, week_start_str
+                    ),
+                    "weekly_goal": settings["weekly_goal"],
+                }
+
+            logger.info(
+                f"운동 기록 추가 ({status}): {username} - {workout_date_str} "
+                f"- {snapshot['current_count']}/{snapshot['weekly_goal']}회"
+            )
+            return snapshot
+        except Exception as e:
+            logger.error(f"운동 기록 추가 실패: {e}")
+            return None
+
+    async def revoke_workout_with_progress(
+        self, guild_id: int, user_id: int, workout_date: datetime
+    ) -> Optional[Dict]:
+        """운동 기록 취소 + 주간 진행 상황 조회 (단일 트랜잭션)"""
+        try:
+            workout_date_str = workout_date.date().isoformat()
+
+            with self._transaction() as conn:
+                revoked = conn.execute(
+                    "UPDATE workout_records SET is_revoked = 1 "
+                    "WHERE guild_id = ? AND user_id = ? AND workout_date = ? "
+                    "AND is_revoked = 0 RETURNING week_start_date",
+                    (guild_id, user_id, workout_date_str),
+                ).fetchone()
+
+                if revoked is None:
+                    return {"status": "not_found", "current_count": 0, "weekly_goal": 0}
+
+                settings = conn.execute(
+                    "SELECT weekly_goal FROM user_settings "
+                    "WHERE guild_id = ? AND user_id = ?",
+                    (guild_id, user_id),
+                ).fetchone()
+                snapshot = {
+                    "status": "revoked",
+                    "current_count": self._weekly_count(
+                        guild_id, user_id, revoked["week_start_date"]
+                    ),
+                    "weekly_goal": settings["weekly_goal"] if settings else 0,
+                }
+
+            logger.info(f"운동 기록 취소: 사용자 {user_id} - {workout_date_str}")
+            return snapshot
+        except Exception as e:
+            logger.error(f"운동 기록 취소 실패: {e}")
+            return None
+
+    async def get_weekly_workout_count(
+        self, guild_id: int, user_id: int, week_start_date: datetime
+    ) -> int:
+        """특정 주의 운동 횟수 조회 (weekly_progress 기본키 조회)"""
+        try:
+            return self._weekly_count(
+                guild_id, user_id, week_start_date.date().isoformat()
+            )
+        except Exception as e:
+            logger.error(f"주간 운동 횟수 조회 실패: {e}")
+            return 0
+
+    async def reconcile_weekly_progress(
+        self, guild_id: int, week_start_date: Optional[datetime] = None
+    ) -> Optional[List[Dict]]:
+        """주간 카운터 검증 및 보정"""
+        try:
+            week_start_str = (
+                week_start_date.date().isoformat() if week_start_date else None
+            )
+
+            with self._transaction() as conn:
+                actual = {
+                    (row["user_id"], row["week_start_date"]): row["active_count"]
+                    for row in conn.execute(
+                        """
+                        SELECT user_id, week_start_date, COUNT(*) AS active_count
+                        FROM workout_records
+                        WHERE guild_id = ?
+                          AND is_revoked = 0
+                          AND (? IS NULL OR week_start_date = ?)
+                        GROUP BY user_id, week_start_date
+                        """,
+                        (guild_id, week_start_str, week_start_str),
+                    )
+                }
+                stored = {
+                    (row["user_id"], row["week_start_date"]): row["active_count"]
+                    for row in conn.execute(
+                        "SELECT user_id, week_start_date, active_count FROM weekly_progress "
+                        "WHERE guild_id = ? AND (? IS NULL OR week_start_date = ?)",
+                        (guild_id, week_start_str, week_start_str),
+                    )
+                }
+
+                drift = []
+                for key in sorted(
+                    actual.keys() | stored.keys(), key=lambda k: (k[1], k[0])
+                ):
+                    stored_count = stored.get(key, 0)
+                    actual_count = actual.get(key, 0)
+                    if stored_count == actual_count:
+                        continue
+
+                    conn.execute(
+                        """
+                        INSERT INTO weekly_progress
+                            (guild_id, user_id, week_start_date, active_count)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT (guild_id, user_id, week_start_date) DO UPDATE
+                        SET active_count = excluded.active_count,
+                            updated_at = CURRENT_TIMESTAMP
+                        """,
+                        (guild_id, key[0], key[1], actual_count),
+                    )
+                    drift.append(
+                        {
+                            "guild_id": guild_id,
+                            "user_id": key[0],
+                            "week_start_date": key[1],
+                            "stored_count": stored_count,
+                            "actual_count": actual_count,
+                        }
+                    )
+
+            if drift:
+                logger.warning(f"주간 카운터 불일치 {len(drift)}건 보정: {drift}")
+            else:
+                logger.info("주간 카운터 검증 완료 (불일치 없음)")
+            return drift
+        except Exception as e:
+            logger.error(f"주간 카운터 검증 실패: {e}")
+            return None
+
+    async def get_all_users_weekly_data(
+        self, guild_id: int, week_start_date: datetime
+    ) -> List[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터 조회 (단일 조인 쿼리)"""
+        try:
+            rows = self.conn.execute(
+                """
+                SELECT
+                    us.user_id,
+                    us.username,
+                    us.weekly_goal,
+                    COALESCE(wp.active_count, 0) AS workout_count,
+                    us.total_penalty
+                FROM user_settings us
+                LEFT JOIN weekly_progress wp
+                    ON wp.guild_id = us.guild_id
+                   AND wp.user_id = us.user_id
+                   AND wp.week_start_date = ?
+                WHERE us.guild_id = ?
+                ORDER BY us.user_id
+                """,
+                (week_start_date.date().isoformat(), guild_id),
+            ).fetchall()
+            week_start = week_start_date.date()
+            return [
+                map_weekly_progress(row, week_start_date=week_start, guild_id=guild_id)
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error(f"모든 사용자 주간 데이터 조회 실패: {e}")
+            return []
+
+    async def get_weekly_history(
+        self,
+        guild_id: int,
+        start_week: datetime,
+        end_week: datetime,
+        user_id: Optional[int] = None,
+    ) -> List[WeeklyResult]:
+        """여러 주 이력 조회 (주 범위 × 사용자, 단일 조인 쿼리, 가입 전 주 제외)"""
+        try:
+            rows = self.conn.execute(
+                """
+                WITH RECURSIVE weeks(week_start_date) AS (
+                    SELECT :start_week WHERE :start_week <= :end_week
+                    UNION ALL
+                    SELECT date(week_start_date, '+7 days') FROM weeks
+                    WHERE date(week_start_date, '+7 days') <= :end_week
+                )
+                SELECT
+                    us.user_id,
+                    us.username,
+                    w.week_start_date,
+                    COALESCE(wpen.goal_count, us.weekly_goal) AS goal_count,
+                    COALESCE(wpen.actual_count, wp.active_count, 0) AS actual_count,
+                    COALESCE(
+                        wpen.penalty_amount,
+                        CASE WHEN r.settled_at IS NOT NULL THEN 0.0 END
+                    ) AS penalty_amount
+                FROM user_settings us
+                CROSS JOIN weeks w
+                LEFT JOIN weekly_progress wp
+                    ON wp.guild_id = us.guild_id
+                   AND wp.user_id = us.user_id
+                   AND wp.week_start_date = w.week_start_date
+                LEFT JOIN weekly_penalties wpen
+                    ON wpen.guild_id = us.guild_id
+                   AND wpen.user_id = us.user_id
+                   AND wpen.week_start_date = w.week_start_date
+                LEFT JOIN weekly_close_runs r
+                    ON r.guild_id = us.guild_id
+                   AND r.week_start_date = w.week_start_date
+                WHERE us.guild_id = :guild_id
+                  AND (:user_id IS NULL OR us.user_id = :user_id)
+                  AND (
+                      date(w.week_start_date, '+6 days') >= date(us.created_at)
+                      OR wpen.user_id IS NOT NULL
+                  )
+                ORDER BY us.user_id, w.week_start_date
+                """,
+                {
+                    "guild_id": guild_id,
+                    "user_id": user_id,
+                    "start_week": start_week.date().isoformat(),
+                    "end_week": end_week.date().isoformat(),
+                },
+            ).fetchall()
+            return [map_weekly_result(row, guild_id=guild_id) for row in rows]
+        except Exception as e:
+            logger.error(f"주간 이력 조회 실패: {e}")
+            return []
+
+    async def _scan(
+        self,
+        select: str,
+        key: str,
+        mapper: Callable[[sqlite3.Row], Any],
+        where: str = "1 = 1",
+        params: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """키셋 페이지네이션 스캔 (한 번에 한 페이지만 메모리에 올림, 행은 mapper로 변환)"""
+        page_size = page_size or DATABASE_SCAN_PAGE_SIZE
+        params = dict(params or {}, after=None, limit=page_size)
+        sql = (
+            f"{select} WHERE {where} AND (:after IS NULL OR {key} > :after) "
+            f"ORDER BY {key} LIMIT :limit"
+        )
+
+        while True:
+            rows = self.conn.execute(sql, params).fetchall()
+            for row in rows:
+                yield mapper(row)
+
+            if len(rows) < page_size:
+                return
+            params["after"] = rows[-1][key.split(".")[-1]]
+
+    def iter_users_weekly_data(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WeeklyProgress]:
+        """서버 모든 사용자의 주간 데이터 스트리밍"""
+        return self._scan(
+            """
+            SELECT
+                us.user_id,
+                us.username,
+                us.weekly_goal,
+                COALESCE(wp.active_count, 0) AS workout_count,
+                us.total_penalty
+            FROM user_settings us
+            LEFT JOIN weekly_progress wp
+                ON wp.guild_id = us.guild_id
+               AND wp.user_id = us.user_id
+               AND wp.week_start_date = :week_start_date
+            """,
+            "us.user_id",
+            partial(
+                map_weekly_progress,
+                week_start_date=week_start_date.date(),
+                guild_id=guild_id,
+            ),
+            where="us.guild_id = :guild_id",
+            params={
+                "guild_id": guild_id,
+                "week_start_date": week_start_date.date().isoformat(),
+            },
+            page_size=page_size,
+        )
+
+    def iter_user_settings(
+        self, guild_id: int, page_size: Optional[int] = None
+    ) -> AsyncIterator[UserSettings]:
+        """서버 사용자 설정 스트리밍"""
+        return self._scan(
+            "SELECT * FROM user_settings",
+            "user_id",
+            map_user_settings,
+            where="guild_id = :guild_id",
+            params={"guild_id": guild_id},
+            page_size=page_size,
+        )
+
+    def iter_workout_records(
+        self,
+        guild_id: int,
+        user_id: Optional[int] = None,
+        include_revoked: bool = False,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[WorkoutRecord]:
+        """서버 운동 기록 스트리밍"""
+        conditions = ["guild_id = :guild_id"]
+        if user_id is not None:
+            conditions.append("user_id = :user_id")
+        if not include_revoked:
+            conditions.append("is_revoked = 0")
+        return self._scan(
+            "SELECT * FROM workout_records",
+            "id",
+            map_workout_record,
+            where=" AND ".join(conditions),
+            params={"guild_id": guild_id, "user_id": user_id},
+            page_size=page_size,
+        )
+
+    async def settle_weekly_penalties(
+        self, guild_id: int, week_start_date: datetime, penalties: List[Dict]
+    ) -> Optional[Dict]:
+        """서버 주간 벌금 일괄 정산 (단일 트랜잭션)"""
+        try:
+            week_start_str = week_start_date.date().isoformat()
+            now = datetime.now().isoformat()
+            processed_count = 0
+            total_penalty_added = 0.0
+            settled_user_ids = []
+
+            with self._transaction() as conn:
+                for penalty in penalties:
+                    cursor = conn.execute(
+                        """
+                        INSERT INTO weekly_penalties
+                            (guild_id, user_id, username, week_start_date, goal_count,
+                             actual_count, penalty_amount, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (guild_id, user_id, week_start_date) DO NOTHING
+                        """,
+                        (
+                            guild_id,
+                            penalty["user_id"],
+                            penalty["username"],
+                            week_start_str,
+                            penalty["goal_count"],
+                            penalty["actual_count"],
+                            penalty["penalty_amount"],
+                            now,
+                        ),
+                    )
+                    if not cursor.rowcount:
+                        continue
+
+                    conn.execute(
+                        "UPDATE user_settings "
+                        "SET total_penalty = total_penalty + ?, updated_at = ? "
+                        "WHERE guild_id = ? AND user_id = ?",
+                        (penalty["penalty_amount"], now, guild_id, penalty["user_id"]),
+                    )
+                    processed_count += 1
+                    total_penalty_added += penalty["penalty_amount"]
+                    settled_user_ids.append(penalty["user_id"])
+
+            logger.info(
+                f"주간 벌금 일괄 정산: 서버 {guild_id} {week_start_str} - {processed_count}건, "
+                f"{total_penalty_added}원"
+            )
+            return {
+                "processed_count": processed_count,
+                "total_penalty_added": total_penalty_added,
+                "settled_user_ids": settled_user_ids,
+            }
+        except Exception as e:
+            logger.error(f"주간 벌금 일괄 정산 실패: {e}")
+            return None
+
+    async def get_total_accumulated_penalty(self, guild_id: int) -> float:
+        """서버 누적 벌금 조회"""
+        try:
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(total_penalty), 0) AS total FROM user_settings "
+                "WHERE guild_id = ?",
+                (guild_id,),
+            ).fetchone()
+            return float(row["total"])
+        except Exception as e:
+            logger.error(f"서버 누적 벌금 조회 실패: {e}")
+            return 0.0
+
+    async def get_weekly_close_run(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[WeeklyCloseRun]:
+        """서버 한 주의 마감 진행 기록"""
+        try:
+            row = self.conn.execute(
+                "SELECT * FROM weekly_close_runs "
+                "WHERE guild_id = ? AND week_start_date = ?",
+                (guild_id, week_start_date.date().isoformat()),
+            ).fetchone()
+            return map_weekly_close_run(row) if row else None
+        except Exception as e:
+            logger.error(f"주간 마감 기록 조회 실패: {e}")
+            return None
+
+    async def record_weekly_close_stage(
+        self,
+        guild_id: int,
+        week_start_date: datetime,
+        stage: str,
+        report_message_id: Optional[int] = None,
+    ) -> bool:
+        """주간 마감 단계 완료 기록 (이미 기록된 단계 시각과 메시지 ID는 처음 값 유지)"""
+        if stage not in WEEKLY_CLOSE_STAGES:
+            logger.error(f"알 수 없는 주간 마감 단계: {stage}")
+            return False
+
+        column = f"{stage}_at"
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    f"""
+                    INSERT INTO weekly_close_runs
+                        (guild_id, week_start_date, {column}, report_message_id)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (guild_id, week_start_date) DO UPDATE SET
+                        {column} = COALESCE(weekly_close_runs.{column}, excluded.{column}),
+                        report_message_id = COALESCE(
+                            weekly_close_runs.report_message_id, excluded.report_message_id
+                        )
+                    """,
+                    (
+                        guild_id,
+                        week_start_date.date().isoformat(),
+                        datetime.now().isoformat(),
+                        report_message_id,
+                    ),
+                )
+            return True
+        except Exception as e:
+            logger.error(f"주간 마감 단계 기록 실패: {e}")
+            return False
+
+    async def get_last_closed_week(self, guild_id: int) -> Optional[date]:
+        """서버에서 마지막으로 마감이 끝난 주의 시작일"""
+        try:
+            row = self.conn.execute(
+                "SELECT MAX(week_start_date) AS week_start_date "
+                "FROM weekly_close_runs WHERE guild_id = ? AND broadcast_at IS NOT NULL",
+                (guild_id,),
+            ).fetchone()
+            if row["week_start_date"] is None:
+                return None
+            return date.fromisoformat(row["week_start_date"])
+        except Exception as e:
+            logger.error(f"마지막 마감 주 조회 실패: {e}")
+            return None
+
+    async def get_unclosed_weeks(self, guild_id: int) -> List[date]:
+        """리포트 전송까지 끝나지 않은 주의 시작일 목록"""
+        try:
+            rows = self.conn.execute(
+                "SELECT week_start_date FROM weekly_close_runs "
+                "WHERE guild_id = ? AND broadcast_at IS NULL "
+                "ORDER BY week_start_date",
+                (guild_id,),
+            ).fetchall()
+            return [date.fromisoformat(row["week_start_date"]) for row in rows]
+        except Exception as e:
+            logger.error(f"마감되지 않은 주 조회 실패: {e}")
+            return []
+
+    async def save_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime, report: Dict
+    ) -> bool:
+        """주간 리포트 스냅샷 저장 (같은 주는 교체)"""
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO weekly_report_snapshots
+                        (guild_id, week_start_date, report)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (guild_id, week_start_date) DO UPDATE
+                    SET report = excluded.report, created_at = CURRENT_TIMESTAMP
+                    """,
+                    (guild_id, week_start_date.date().isoformat(), json.dumps(report)),
+                )
+            return True
+        except Exception as e:
+            logger.error(f"주간 리포트 스냅샷 저장 실패: {e}")
+            return False
+
+    async def get_weekly_report_snapshot(
+        self, guild_id: int, week_start_date: datetime
+    ) -> Optional[Dict]:
+        """주간 리포트 스냅샷 조회 (기본키 1행)"""
+        try:
+            row = self.conn.execute(
+                "SELECT report FROM weekly_report_snapshots "
+                "WHERE guild_id = ? AND week_start_date = ?",
+                (guild_id, week_start_date.date().isoformat()),
+            ).fetchone()
+            return json.loads(row["report"]) if row else None
+        except Exception as e:
+            logger.error(f"주간 리포트 스냅샷 조회 실패: {e}")
+            return None
+
+    async def reset_database(self, guild_id: int) -> bool:
+        """서버 데이터 초기화 (해당 서버의 모든 데이터 삭제)"""
+        try:
+            with self._transaction() as conn:
+                for table in (
+                    "weekly_close_runs",
+                    "weekly_report_snapshots",
+                    "weekly_penalties",
+                    "workout_records",
+                    "weekly_progress",
+                    "user_settings",
+                ):
+                    conn.execute(f"DELETE FROM {table} WHERE guild_id = ?", (guild_id,))
+
+            logger.warning(f"서버 {guild_id}의 데이터가 완전히 초기화되었습니다")
+            return True
+        except Exception as e:
+            logger.error(f"데이터베이스 초기화 실패: {e}")
+            return False
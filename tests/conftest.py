@@ -129,6 +129,32 @@ def mock_supabase_response():
     return _create_response
 
 
+@pytest.fixture
+def user_settings_row():
+    """Supabase user_settings 응답 행 생성 헬퍼"""
+
+    def _create_row(
+        user_id=123,
+        username="테스트유저",
+        weekly_goal=5,
+        guild_id=987654321,
+        **overrides
+    ):
+        row = {
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "username": username,
+            "weekly_goal": weekly_goal,
+            "total_penalty": 0.0,
+            "created_at": "2025-01-13T09:00:00+00:00",
+            "updated_at": "2025-01-13T09:00:00+00:00",
+        }
+        row.update(overrides)
+        return row
+
+    return _create_row
+
+
 @pytest.fixture
 def current_week_dates():
     """현재 주의 시작/끝 날짜"""
@@ -0,0 +1,83 @@
+"""
+채널 ID 인덱스 테스트
+"""
+
+from unittest.mock import Mock
+
+import discord
+
+from bot.channels import ChannelIndex
+
+GUILD_ID = 987654321
+
+
+def make_channel(channel_id, name, position=0, guild_id=GUILD_ID, kind=None):
+    """테스트용 채널 생성"""
+    channel = Mock(spec=kind or discord.TextChannel)
+    channel.id = channel_id
+    channel.name = name
+    channel.position = position
+    channel.guild = Mock(id=guild_id)
+    return channel
+
+
+def make_guild(channels, guild_id=GUILD_ID):
+    """테스트용 서버 생성"""
+    by_id = {channel.id: channel for channel in channels}
+    guild = Mock(id=guild_id, text_channels=channels)
+    guild.get_channel = by_id.get
+    return guild
+
+
+def test_rebuild_indexes_role_channels():
+    """역할 채널이 서버별 ID로 색인됨"""
+    index = ChannelIndex("workout", "report")
+    workout = make_channel(1, "workout", position=2)
+    report = make_channel(2, "report")
+    general = make_channel(3, "general", position=0)
+    guild = make_guild([workout, report, general, make_channel(4, "random")])
+
+    index.rebuild([guild])
+
+    assert index.workout_channel_ids == {1}
+    assert index.is_workout_channel(1)
+    assert not index.is_workout_channel(4)
+    assert index.get_channel(guild, "report") is report
+    # 여러 개면 채널 목록에서 가장 위의 채널
+    assert index.get_channel(guild, "welcome") is general
+
+
+def test_channel_events_keep_index_current():
+    """채널 생성/이름 변경/삭제가 인덱스에 반영됨"""
+    index = ChannelIndex("workout", "report")
+    guild = make_guild([])
+    index.rebuild([guild])
+
+    channel = make_channel(10, "workout")
+    index.add_channel(channel)
+    assert index.is_workout_channel(10)
+
+    renamed = make_channel(10, "chat")
+    index.add_channel(renamed)
+    assert not index.is_workout_channel(10)
+
+    index.add_channel(channel)
+    index.remove_channel(channel)
+    assert not index.is_workout_channel(10)
+
+    # 텍스트 채널이 아니면 색인하지 않음
+    index.add_channel(make_channel(11, "workout", kind=discord.VoiceChannel))
+    assert not index.is_workout_channel(11)
+
+
+def test_remove_guild_drops_only_that_guild():
+    """서버 탈퇴 시 해당 서버 채널만 제거"""
+    index = ChannelIndex("workout", "report")
+    guild = make_guild([make_channel(1, "workout")])
+    other = make_guild([make_channel(2, "workout", guild_id=1)], guild_id=1)
+    index.rebuild([guild, other])
+
+    index.remove_guild(GUILD_ID)
+
+    assert index.workout_channel_ids == {2}
+    assert index.get_channel(guild, "workout") is None
@@ -0,0 +1,67 @@
+"""
+슬래시 커맨드 동기화 테스트
+"""
+
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+from discord import app_commands
+
+from bot.command_sync import CommandSyncer, command_tree_hash
+
+GUILD_ID = 987654321
+
+
+def make_tree(*names):
+    """테스트용 커맨드 트리 (동기화 API는 모의 객체)"""
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+    for name in names:
+
+        async def callback(interaction: discord.Interaction):
+            pass
+
+        tree.add_command(
+            app_commands.Command(name=name, description=name, callback=callback)
+        )
+    tree.sync = AsyncMock(return_value=[])
+    return tree
+
+
+def test_hash_ignores_registration_order():
+    """등록 순서가 달라도 같은 정의면 같은 해시"""
+    assert command_tree_hash(make_tree("a", "b")) == command_tree_hash(
+        make_tree("b", "a")
+    )
+    assert command_tree_hash(make_tree("a")) != command_tree_hash(make_tree("a", "b"))
+
+
+@pytest.mark.asyncio
+async def test_sync_only_when_tree_changes(tmp_path):
+    """해시가 같으면 재시작 후에도 동기화 생략, 바뀌면 동기화"""
+    state_path = str(tmp_path / "sync.json")
+
+    tree = make_tree("a")
+    assert await CommandSyncer(tree, state_path).sync()
+    assert not await CommandSyncer(tree, state_path).sync()
+    assert tree.sync.await_count == 1
+
+    changed = make_tree("a", "b")
+    assert await CommandSyncer(changed, state_path).sync()
+    changed.sync.assert_awaited_once_with(guild=None)
+
+
+@pytest.mark.asyncio
+async def test_guild_scoped_sync(tmp_path):
+    """GUILD_ID가 있으면 전역 커맨드를 복사해 해당 서버에만 동기화"""
+    tree = make_tree("a")
+    syncer = CommandSyncer(tree, str(tmp_path / "sync.json"), GUILD_ID)
+
+    assert await syncer.sync()
+    assert not await syncer.sync()
+
+    (call,) = tree.sync.await_args_list
+    assert call.kwargs["guild"].id == GUILD_ID
+    assert [
+        command.name for command in tree.get_commands(guild=call.kwargs["guild"])
+    ] == ["a"]
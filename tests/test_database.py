@@ -0,0 +1,944 @@
+"""데이터베이스 레이어 테스트"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from datetime import date, datetime
+
+
+from database import Database, AsyncDatabase, create_database
+from utils.metrics import request_context
+
+GUILD_ID = 987654321
+
+
+class TestAsyncDatabase:
+    """AsyncDatabase 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_execute_awaits_query(self, mock_supabase_response):
+        """비동기 백엔드는 쿼리 실행을 await 해야 함"""
+        db = AsyncDatabase()
+        response = mock_supabase_response(data=[{"user_id": 123}])
+        query = Mock()
+        query.execute = AsyncMock(return_value=response)
+
+        result = await db._execute(query)
+
+        assert result is response
+        query.execute.assert_awaited_once()
+        await db.close()
+
+    @pytest.mark.asyncio
+    async def test_get_user_settings_uses_async_client(
+        self, mock_supabase_response, user_settings_row
+    ):
+        """기존 메서드 시그니처 그대로 비동기 클라이언트로 동작"""
+        db = AsyncDatabase()
+        mock_table = Mock()
+        mock_table.select.return_value = mock_table
+        mock_table.eq.return_value = mock_table
+        mock_table.execute = AsyncMock(
+            return_value=mock_supabase_response(data=[user_settings_row()])
+        )
+        db.supabase = Mock()
+        db.supabase.table.return_value = mock_table
+
+        settings = await db.get_user_settings(GUILD_ID, 123)
+
+        assert settings.weekly_goal == 5
+        await db.close()
+
+    @pytest.mark.asyncio
+    async def test_shared_connection_pool(self):
+        """PostgREST 클라이언트가 공유 커넥션 풀을 사용"""
+        db = AsyncDatabase()
+        assert db.supabase.postgrest.session is db.http_client
+        await db.close()
+
+
+class TestWorkoutRpc:
+    """기록/취소 RPC 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_add_workout_with_progress(
+        self, mock_database, mock_supabase_response
+    ):
+        """RPC 한 번으로 기록 추가 결과와 진행 상황을 반환"""
+        snapshot = {"status": "added", "current_count": 2, "weekly_goal": 5}
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(data=[snapshot])
+        )
+
+        result = await mock_database.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", datetime(2025, 1, 15), datetime(2025, 1, 13)
+        )
+
+        assert result == snapshot
+        mock_database.supabase.rpc.assert_called_once_with(
+            "add_workout_with_progress",
+            {
+                "p_guild_id": GUILD_ID,
+                "p_user_id": 123,
+                "p_username": "테스트유저",
+                "p_workout_date": "2025-01-15",
+                "p_week_start_date": "2025-01-13",
+            },
+        )
+        mock_database.supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_revoke_workout_with_progress_error(self, mock_database):
+        """RPC 오류 시 None 반환"""
+        mock_database.supabase.rpc.side_effect = Exception("connection reset")
+
+        result = await mock_database.revoke_workout_with_progress(
+            GUILD_ID, 123, datetime(2025, 1, 15)
+        )
+
+        assert result is None
+
+
+class TestWeeklyAggregation:
+    """주간 집계 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_get_all_users_weekly_data_single_call(
+        self, mock_database, mock_supabase_response
+    ):
+        """사용자 수와 무관하게 집계 RPC 한 번만 호출"""
+        rows = [
+            {
+                "user_id": user_id,
+                "username": f"유저{user_id}",
+                "weekly_goal": 5,
+                "workout_count": user_id % 6,
+                "total_penalty": 0.0,
+            }
+            for user_id in range(1, 51)
+        ]
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(data=rows)
+        )
+
+        result = await mock_database.get_all_users_weekly_data(
+            GUILD_ID, datetime(2025, 1, 13)
+        )
+
+        assert len(result) == 50
+        assert result[6].current_count == 1
+        mock_database.supabase.rpc.assert_called_once_with(
+            "get_all_users_weekly_data",
+            {
+                "p_guild_id": GUILD_ID,
+                "p_week_start_date": "2025-01-13",
+                "p_after_user_id": None,
+                "p_limit": 500,
+            },
+        )
+        mock_database.supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_iter_users_weekly_data_keyset_pages(
+        self, mock_database, mock_supabase_response
+    ):
+        """마지막 user_id 이후부터 다음 페이지를 요청"""
+        rows = [
+            {
+                "user_id": user_id,
+                "username": f"유저{user_id}",
+                "weekly_goal": 5,
+                "workout_count": None,
+                "total_penalty": 0.0,
+            }
+            for user_id in (10, 20, 30)
+        ]
+        mock_database.supabase.rpc.return_value.execute.side_effect = [
+            mock_supabase_response(data=rows[:2]),
+            mock_supabase_response(data=rows[2:]),
+        ]
+
+        result = [
+            row
+            async for row in mock_database.iter_users_weekly_data(
+                GUILD_ID, datetime(2025, 1, 13), page_size=2
+            )
+        ]
+
+        assert [row.user_id for row in result] == [10, 20, 30]
+        assert result[0].current_count == 0
+        assert result[0].week_start_date == date(2025, 1, 13)
+        assert [
+            call.args[1]["p_after_user_id"]
+            for call in mock_database.supabase.rpc.call_args_list
+        ] == [None, 20]
+
+    @pytest.mark.asyncio
+    async def test_scan_workout_records_keyset(
+        self, mock_database, mock_supabase_response
+    ):
+        """운동 기록 스캔은 id 키셋으로 페이지를 넘김"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.order.return_value = mock_table
+        mock_table.gt.return_value = mock_table
+        rows = [
+            {
+                "id": record_id,
+                "guild_id": GUILD_ID,
+                "user_id": 123,
+                "username": "테스트유저",
+                "workout_date": f"2025-01-1{record_id}",
+                "week_start_date": "2025-01-13",
+                "created_at": "2025-01-13T09:00:00.123456+00:00",
+                "is_revoked": False,
+            }
+            for record_id in (3, 4)
+        ]
+        mock_table.execute.side_effect = [
+            mock_supabase_response(data=rows),
+            mock_supabase_response(data=[]),
+        ]
+
+        result = [
+            row
+            async for row in mock_database.iter_workout_records(
+                GUILD_ID, user_id=123, page_size=2
+            )
+        ]
+
+        assert [record.id for record in result] == [3, 4]
+        assert result[0].workout_date == date(2025, 1, 13)
+        assert result[0].created_at.tzinfo is not None
+        mock_table.gt.assert_called_once_with("id", 4)
+        mock_table.eq.assert_any_call("guild_id", GUILD_ID)
+        mock_table.eq.assert_any_call("user_id", 123)
+        mock_table.eq.assert_any_call("is_revoked", False)
+        mock_table.limit.assert_called_with(2)
+
+
+class TestWeeklyHistory:
+    """여러 주 이력 조회 테스트"""
+
+    @staticmethod
+    def history_rows(user_ids, weeks):
+        return [
+            {
+                "user_id": user_id,
+                "username": f"유저{user_id}",
+                "week_start_date": week,
+                "goal_count": 5,
+                "actual_count": 3,
+                "penalty_amount": "4032.00" if week == weeks[0] else None,
+            }
+            for user_id in user_ids
+            for week in weeks
+        ]
+
+    @pytest.mark.asyncio
+    async def test_single_rpc_for_range(self, mock_database, mock_supabase_response):
+        """12주 범위를 RPC 한 번으로 조회"""
+        weeks = [f"2025-{month:02d}-01" for month in range(1, 13)]
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(data=self.history_rows([123], weeks))
+        )
+
+        result = await mock_database.get_weekly_history(
+            GUILD_ID, datetime(2025, 1, 6), datetime(2025, 3, 24), user_id=123
+        )
+
+        assert len(result) == 12
+        assert result[0].penalty_amount == 4032.0
+        assert result[1].penalty_amount is None
+        assert result[0].guild_id == GUILD_ID
+        mock_database.supabase.rpc.assert_called_once_with(
+            "get_weekly_history",
+            {
+                "p_guild_id": GUILD_ID,
+                "p_start_week": "2025-01-06",
+                "p_end_week": "2025-03-24",
+                "p_user_id": 123,
+                "p_after_user_id": None,
+                "p_user_limit": 41,  # 500 // 12
+            },
+        )
+        mock_database.supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pages_by_user(self, mock_database, mock_supabase_response):
+        """응답 행 수 제한에 맞춰 사용자 단위로 다음 페이지를 요청"""
+        weeks = ["2025-01-06", "2025-01-13"]
+        mock_database.supabase.rpc.return_value.execute.side_effect = [
+            mock_supabase_response(data=self.history_rows([1, 2], weeks)),
+            mock_supabase_response(data=self.history_rows([3], weeks)),
+        ]
+
+        with patch("database.DATABASE_SCAN_PAGE_SIZE", 4):
+            result = await mock_database.get_weekly_history(
+                GUILD_ID, datetime(2025, 1, 6), datetime(2025, 1, 13)
+            )
+
+        assert [row.user_id for row in result] == [1, 1, 2, 2, 3, 3]
+        assert [
+            call.args[1]["p_after_user_id"]
+            for call in mock_database.supabase.rpc.call_args_list
+        ] == [None, 2]
+
+    @pytest.mark.asyncio
+    async def test_pages_by_user_with_partial_history(
+        self, mock_database, mock_supabase_response
+    ):
+        """가입 전 주가 빠져 행 수가 적어도 사용자 수가 차면 다음 페이지 요청"""
+        weeks = ["2025-01-06", "2025-01-13"]
+        first_page = self.history_rows([1], weeks) + self.history_rows([2], weeks[1:])
+        mock_database.supabase.rpc.return_value.execute.side_effect = [
+            mock_supabase_response(data=first_page),
+            mock_supabase_response(data=self.history_rows([3], weeks)),
+        ]
+
+        with patch("database.DATABASE_SCAN_PAGE_SIZE", 4):
+            result = await mock_database.get_weekly_history(
+                GUILD_ID, datetime(2025, 1, 6), datetime(2025, 1, 13)
+            )
+
+        assert [row.user_id for row in result] == [1, 1, 2, 3, 3]
+        assert mock_database.supabase.rpc.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_error_returns_empty(self, mock_database):
+        """RPC 오류 시 빈 목록"""
+        mock_database.supabase.rpc.side_effect = Exception("connection reset")
+
+        result = await mock_database.get_weekly_history(
+            GUILD_ID, datetime(2025, 1, 6), datetime(2025, 1, 13)
+        )
+
+        assert result == []
+
+
+class TestWeeklyReportSnapshot:
+    """주간 리포트 스냅샷 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_get_reads_single_row(self, mock_database, mock_supabase_response):
+        """스냅샷 조회는 report 컬럼 한 행만 요청"""
+        report = {"report_data": [], "participant_count": 0}
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[{"report": report}]
+        )
+
+        result = await mock_database.get_weekly_report_snapshot(
+            GUILD_ID, datetime(2025, 1, 13)
+        )
+
+        assert result == report
+        mock_database.supabase.table.assert_called_once_with("weekly_report_snapshots")
+        mock_table.select.assert_called_once_with("report")
+        mock_table.eq.assert_any_call("week_start_date", "2025-01-13")
+        mock_table.limit.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_save_upserts_without_body(self, mock_database):
+        """같은 주는 교체하고 응답 본문은 받지 않음"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.upsert.return_value = mock_table
+
+        assert await mock_database.save_weekly_report_snapshot(
+            GUILD_ID, datetime(2025, 1, 13), {"participant_count": 0}
+        )
+
+        payload = mock_table.upsert.call_args.args[0]
+        assert payload["guild_id"] == GUILD_ID
+        assert payload["week_start_date"] == "2025-01-13"
+        assert payload["report"] == {"participant_count": 0}
+        assert mock_table.upsert.call_args.kwargs["on_conflict"] == (
+            "guild_id,week_start_date"
+        )
+
+
+class TestWeeklyCloseRuns:
+    """주간 마감 진행 기록 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_last_closed_week_reads_one_row(
+        self, mock_database, mock_supabase_response
+    ):
+        """전송까지 끝난 주만 주 시작일 역순으로 한 행 요청"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.not_.is_.return_value = mock_table
+        mock_table.order.return_value = mock_table
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[{"week_start_date": "2025-01-13"}]
+        )
+
+        result = await mock_database.get_last_closed_week(GUILD_ID)
+
+        assert result == date(2025, 1, 13)
+        mock_database.supabase.table.assert_called_once_with("weekly_close_runs")
+        mock_table.not_.is_.assert_called_once_with("broadcast_at", "null")
+        mock_table.order.assert_called_once_with("week_start_date", desc=True)
+        mock_table.limit.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_unclosed_weeks_in_order(self, mock_database, mock_supabase_response):
+        """전송이 끝나지 않은 주만 주 시작일 순으로 요청"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.is_.return_value = mock_table
+        mock_table.order.return_value = mock_table
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[{"week_start_date": "2024-12-02"}, {"week_start_date": "2025-01-13"}]
+        )
+
+        result = await mock_database.get_unclosed_weeks(GUILD_ID)
+
+        assert result == [date(2024, 12, 2), date(2025, 1, 13)]
+        mock_table.select.assert_called_once_with("week_start_date")
+        mock_table.is_.assert_called_once_with("broadcast_at", "null")
+        mock_table.order.assert_called_once_with("week_start_date")
+
+    @pytest.mark.asyncio
+    async def test_get_run_maps_stages(self, mock_database, mock_supabase_response):
+        """기본키 1행을 단계별 완료 기록으로 변환"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[
+                {
+                    "guild_id": GUILD_ID,
+                    "week_start_date": "2025-01-13",
+                    "settled_at": "2025-01-20T09:00:01+00:00",
+                    "snapshot_at": None,
+                    "broadcast_at": None,
+                    "report_message_id": None,
+                }
+            ]
+        )
+
+        run = await mock_database.get_weekly_close_run(GUILD_ID, datetime(2025, 1, 13))
+
+        assert run.week_start_date == date(2025, 1, 13)
+        assert run.is_done("settled")
+        assert run.next_stage == "snapshot"
+
+    @pytest.mark.asyncio
+    async def test_record_stage_uses_rpc(self, mock_database):
+        """단계 기록은 처음 값을 유지하는 RPC 1회, 알 수 없는 단계는 호출하지 않음"""
+        assert await mock_database.record_weekly_close_stage(
+            GUILD_ID, datetime(2025, 1, 13), "broadcast", report_message_id=555
+        )
+        assert not await mock_database.record_weekly_close_stage(
+            GUILD_ID, datetime(2025, 1, 13), "unknown"
+        )
+
+        mock_database.supabase.rpc.assert_called_once_with(
+            "record_weekly_close_stage",
+            {
+                "p_guild_id": GUILD_ID,
+                "p_week_start_date": "2025-01-13",
+                "p_stage": "broadcast",
+                "p_report_message_id": 555,
+            },
+        )
+
+
+class TestPenaltySettlement:
+    """주간 벌금 일괄 정산 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_settle_weekly_penalties(self, mock_database, mock_supabase_response):
+        """정산 결과를 한 번의 RPC로 반환"""
+        penalties = [
+            {
+                "user_id": 123,
+                "username": "유저1",
+                "goal_count": 5,
+                "actual_count": 3,
+                "penalty_amount": 4032.0,
+            }
+        ]
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(
+                data=[
+                    {
+                        "processed_count": 1,
+                        "total_penalty_added": "4032.00",
+                        "settled_user_ids": [123],
+                    }
+                ]
+            )
+        )
+
+        result = await mock_database.settle_weekly_penalties(
+            GUILD_ID, datetime(2025, 1, 13), penalties
+        )
+
+        assert result == {
+            "processed_count": 1,
+            "total_penalty_added": 4032.0,
+            "settled_user_ids": [123],
+        }
+        mock_database.supabase.rpc.assert_called_once_with(
+            "settle_weekly_penalties",
+            {
+                "p_guild_id": GUILD_ID,
+                "p_week_start_date": "2025-01-13",
+                "p_penalties": penalties,
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_settle_weekly_penalties_empty(self, mock_database):
+        """정산 대상이 없으면 호출하지 않음"""
+        result = await mock_database.settle_weekly_penalties(
+            GUILD_ID, datetime(2025, 1, 13), []
+        )
+
+        assert result == {
+            "processed_count": 0,
+            "total_penalty_added": 0.0,
+            "settled_user_ids": [],
+        }
+        mock_database.supabase.rpc.assert_not_called()
+
+
+class TestUserSettingsCache:
+    """사용자 설정 캐시 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_get_user_settings_cached(
+        self, mock_database, mock_supabase_response, user_settings_row
+    ):
+        """두 번째 조회는 캐시에서 응답"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[user_settings_row()]
+        )
+
+        first = await mock_database.get_user_settings(GUILD_ID, 123)
+        second = await mock_database.get_user_settings(GUILD_ID, 123)
+
+        assert first == second
+        assert mock_table.execute.call_count == 1
+        assert mock_database.settings_cache.hits == 1
+        assert mock_database.settings_cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_set_user_goal_writes_through(
+        self, mock_database, mock_supabase_response, user_settings_row
+    ):
+        """목표 설정 결과가 캐시에 반영됨"""
+        row = user_settings_row(weekly_goal=6)
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.side_effect = [
+            mock_supabase_response(data=[{"user_id": 123}]),  # 기존 사용자 확인
+            mock_supabase_response(data=[row]),  # 업데이트
+        ]
+
+        assert await mock_database.set_user_goal(GUILD_ID, 123, "테스트유저", 6) is True
+
+        settings = await mock_database.get_user_settings(GUILD_ID, 123)
+        assert settings.weekly_goal == 6
+        assert mock_table.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_settlement_invalidates_cache(
+        self, mock_database, mock_supabase_response
+    ):
+        """벌금 정산 시 해당 사용자 캐시 무효화"""
+        mock_database.settings_cache.set((GUILD_ID, 123), object())
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(
+                data=[{"processed_count": 1, "total_penalty_added": 4032}]
+            )
+        )
+
+        await mock_database.settle_weekly_penalties(
+            GUILD_ID,
+            datetime(2025, 1, 13),
+            [
+                {
+                    "user_id": 123,
+                    "username": "유저1",
+                    "goal_count": 5,
+                    "actual_count": 3,
+                    "penalty_amount": 4032.0,
+                }
+            ],
+        )
+
+        assert mock_database.settings_cache.get((GUILD_ID, 123)) is None
+
+
+class TestTotalPenaltyAggregate:
+    """전체 누적 벌금 집계 테스트"""
+
+    PENALTY = {
+        "user_id": 123,
+        "username": "유저1",
+        "goal_count": 5,
+        "actual_count": 3,
+        "penalty_amount": 4032.0,
+    }
+
+    @pytest.mark.asyncio
+    async def test_server_side_sum_cached(self, mock_database, mock_supabase_response):
+        """합계는 RPC 한 번으로 받고 이후에는 캐시에서 응답"""
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(data=12096.5)
+        )
+
+        first = await mock_database.get_total_accumulated_penalty(GUILD_ID)
+        second = await mock_database.get_total_accumulated_penalty(GUILD_ID)
+
+        assert first == second == 12096.5
+        mock_database.supabase.rpc.assert_called_once_with(
+            "get_total_accumulated_penalty", {"p_guild_id": GUILD_ID}
+        )
+        mock_database.supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_settlement_invalidates_total(
+        self, mock_database, mock_supabase_response
+    ):
+        """새 벌금이 정산되면 합계 캐시 무효화"""
+        mock_database.aggregate_cache.set(
+            ("total_accumulated_penalty", GUILD_ID), 100.0
+        )
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(
+                data=[{"processed_count": 1, "total_penalty_added": 4032}]
+            )
+        )
+
+        await mock_database.settle_weekly_penalties(
+            GUILD_ID, datetime(2025, 1, 13), [self.PENALTY]
+        )
+
+        assert (
+            mock_database.aggregate_cache.get(("total_accumulated_penalty", GUILD_ID))
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_settlement_keeps_total(
+        self, mock_database, mock_supabase_response
+    ):
+        """이미 정산된 주를 다시 정산해도 합계 캐시 유지"""
+        mock_database.aggregate_cache.set(
+            ("total_accumulated_penalty", GUILD_ID), 100.0
+        )
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(
+                data=[{"processed_count": 0, "total_penalty_added": 0}]
+            )
+        )
+
+        await mock_database.settle_weekly_penalties(
+            GUILD_ID, datetime(2025, 1, 13), [self.PENALTY]
+        )
+
+        assert (
+            mock_database.aggregate_cache.get(("total_accumulated_penalty", GUILD_ID))
+            == 100.0
+        )
+
+
+class TestQueryProjections:
+    """연산별 조회 컬럼/응답 크기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_existence_checks_fetch_key_only(
+        self, mock_database, mock_supabase_response
+    ):
+        """존재 확인은 키 컬럼 한 행만 조회"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.side_effect = [
+            mock_supabase_response(data=[]),  # 기존 사용자 없음
+            mock_supabase_response(data=[{"user_id": 123}]),  # 생성
+        ]
+
+        await mock_database.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+
+        mock_table.select.assert_called_once_with("user_id")
+        mock_table.limit.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_payload_stats_recorded(self, mock_database, mock_supabase_response):
+        """연산별 호출 수/행 수/응답 크기 기록"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[{"active_count": 3}]
+        )
+
+        with patch("database.DATABASE_PAYLOAD_STATS", True):
+            await mock_database.get_weekly_workout_count(
+                GUILD_ID, 123, datetime(2025, 1, 13)
+            )
+
+        stats = mock_database.payload_stats["weekly_progress.count"]
+        assert stats["calls"] == 1
+        assert stats["rows"] == 1
+        assert stats["bytes"] == len('[{"active_count": 3}]')
+
+    @pytest.mark.asyncio
+    async def test_payload_size_skipped_by_default(
+        self, mock_database, mock_supabase_response
+    ):
+        """응답 크기 측정이 꺼져 있으면 응답을 직렬화하지 않음"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[{"active_count": 3}]
+        )
+
+        with patch("database.DATABASE_PAYLOAD_STATS", False), patch(
+            "database.json.dumps"
+        ) as mock_dumps:
+            await mock_database.get_weekly_workout_count(
+                GUILD_ID, 123, datetime(2025, 1, 13)
+            )
+
+        stats = mock_database.payload_stats["weekly_progress.count"]
+        assert stats["calls"] == 1
+        assert stats["rows"] == 1
+        assert stats["bytes"] == 0
+        mock_dumps.assert_not_called()
+
+
+class TestInstrumentation:
+    """메서드별 지연 시간/요청별 왕복 계측 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_method_latency_recorded(
+        self, mock_database, mock_supabase_response, user_settings_row
+    ):
+        """메서드 호출마다 히스토그램에 기록 (캐시 적중 포함)"""
+        mock_database.supabase.table.return_value.execute.return_value = (
+            mock_supabase_response(data=[user_settings_row()])
+        )
+
+        await mock_database.get_user_settings(GUILD_ID, 123)
+        await mock_database.get_user_settings(GUILD_ID, 123)
+
+        stats = mock_database.metrics.stats()["get_user_settings"]
+        assert stats["count"] == 2
+        assert stats["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_round_trip_counted_as_error(self, mock_database):
+        """내부에서 처리된 쿼리 실패도 오류로 집계"""
+        mock_database.supabase.table.return_value.execute.side_effect = Exception(
+            "connection reset"
+        )
+
+        assert (
+            await mock_database.get_weekly_workout_count(
+                GUILD_ID, 123, datetime(2025, 1, 13)
+            )
+            == 0
+        )
+        assert mock_database.metrics.stats()["get_weekly_workout_count"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_round_trips_per_request(
+        self, mock_database, mock_supabase_response, user_settings_row
+    ):
+        """요청 컨텍스트 안의 PostgREST 호출 수 집계"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.side_effect = [
+            mock_supabase_response(data=[]),  # 기존 사용자 없음
+            mock_supabase_response(data=[user_settings_row()]),
+        ]
+
+        with request_context("command:set-goals") as context:
+            await mock_database.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+            await mock_database.get_user_settings(GUILD_ID, 123)  # 캐시 적중
+
+        assert context.round_trips == 2
+
+
+class TestRequestCoalescing:
+    """동시 조회 합치기 테스트"""
+
+    def _slow_table(self, db, response):
+        """응답이 늦게 오는 비동기 테이블 mock"""
+
+        async def execute():
+            await asyncio.sleep(0.01)
+            return response
+
+        mock_table = Mock()
+        mock_table.select.return_value = mock_table
+        mock_table.eq.return_value = mock_table
+        mock_table.limit.return_value = mock_table
+        mock_table.update.return_value = mock_table
+        mock_table.execute = AsyncMock(side_effect=execute)
+        db.supabase = Mock()
+        db.supabase.table.return_value = mock_table
+        return mock_table
+
+    @pytest.mark.asyncio
+    async def test_concurrent_weekly_count_coalesced(self, mock_supabase_response):
+        """같은 인자의 동시 조회는 요청 1회로 처리"""
+        db = AsyncDatabase()
+        mock_table = self._slow_table(
+            db, mock_supabase_response(data=[{"active_count": 3}])
+        )
+
+        counts = await asyncio.gather(
+            *(
+                db.get_weekly_workout_count(GUILD_ID, 123, datetime(2025, 1, 13))
+                for _ in range(5)
+            )
+        )
+
+        assert counts == [3] * 5
+        assert mock_table.execute.await_count == 1
+        assert db.single_flight.coalesced_by_method == {"get_weekly_workout_count": 4}
+        await db.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_settings_return_copies(
+        self, mock_supabase_response, user_settings_row
+    ):
+        """합류한 호출자는 서로 다른 복사본을 받음"""
+        db = AsyncDatabase()
+        mock_table = self._slow_table(
+            db,
+            mock_supabase_response(data=[user_settings_row()]),
+        )
+
+        first, second = await asyncio.gather(
+            db.get_user_settings(GUILD_ID, 123), db.get_user_settings(GUILD_ID, 123)
+        )
+
+        assert first == second
+        assert first is not second
+        assert mock_table.execute.await_count == 1
+        await db.close()
+
+    @pytest.mark.asyncio
+    async def test_write_detaches_in_flight_reads(
+        self, mock_supabase_response, user_settings_row
+    ):
+        """쓰기 이전에 시작된 조회는 새 호출자와 캐시에 영향을 주지 않음"""
+        db = AsyncDatabase()
+        old_row = user_settings_row()
+        new_row = user_settings_row(weekly_goal=6)
+        responses = [
+            (0.05, [old_row]),  # 쓰기보다 늦게 끝나는 조회
+            (0.0, [old_row]),  # 기존 사용자 확인
+            (0.0, [new_row]),  # 업데이트
+        ]
+
+        async def execute():
+            delay, data = responses.pop(0)
+            await asyncio.sleep(delay)
+            return mock_supabase_response(data=data)
+
+        mock_table = self._slow_table(db, None)
+        mock_table.execute = AsyncMock(side_effect=execute)
+
+        stale_read = asyncio.ensure_future(db.get_user_settings(GUILD_ID, 123))
+        await asyncio.sleep(0)
+        await db.set_user_goal(GUILD_ID, 123, "테스트유저", 6)
+
+        assert db.single_flight.in_flight == 0
+        assert (await stale_read).weekly_goal == 5
+        assert (await db.get_user_settings(GUILD_ID, 123)).weekly_goal == 6
+        assert mock_table.execute.await_count == 3
+        await db.close()
+
+
+class TestWeeklyProgress:
+    """주간 카운터 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_get_weekly_workout_count_reads_counter(
+        self, mock_database, mock_supabase_response
+    ):
+        """주간 운동 횟수는 weekly_progress에서 조회"""
+        mock_table = mock_database.supabase.table.return_value
+        mock_table.execute.return_value = mock_supabase_response(
+            data=[{"active_count": 4}]
+        )
+
+        count = await mock_database.get_weekly_workout_count(
+            GUILD_ID, 123, datetime(2025, 1, 13)
+        )
+
+        assert count == 4
+        mock_database.supabase.table.assert_called_once_with("weekly_progress")
+
+    @pytest.mark.asyncio
+    async def test_get_weekly_workout_count_no_row(self, mock_database):
+        """카운터 행이 없으면 0회"""
+        count = await mock_database.get_weekly_workout_count(
+            GUILD_ID, 123, datetime(2025, 1, 13)
+        )
+
+        assert count == 0
+
+    @pytest.mark.asyncio
+    async def test_reconcile_weekly_progress_reports_drift(
+        self, mock_database, mock_supabase_response
+    ):
+        """카운터 불일치 행을 반환"""
+        drift = [
+            {
+                "guild_id": GUILD_ID,
+                "user_id": 123,
+                "week_start_date": "2025-01-13",
+                "stored_count": 2,
+                "actual_count": 3,
+            }
+        ]
+        mock_database.supabase.rpc.return_value.execute.return_value = (
+            mock_supabase_response(data=drift)
+        )
+
+        result = await mock_database.reconcile_weekly_progress(
+            GUILD_ID, datetime(2025, 1, 13)
+        )
+
+        assert result == drift
+        mock_database.supabase.rpc.assert_called_once_with(
+            "reconcile_weekly_progress",
+            {"p_guild_id": GUILD_ID, "p_week_start_date": "2025-01-13"},
+        )
+
+
+class TestCreateDatabase:
+    """create_database 팩토리 테스트"""
+
+    def test_sync_mode(self):
+        with patch("database.DATABASE_CLIENT_MODE", "sync"):
+            db = create_database()
+        assert type(db) is Database
+
+    def test_async_mode(self):
+        with patch("database.DATABASE_CLIENT_MODE", "async"):
+            db = create_database()
+        assert isinstance(db, AsyncDatabase)
+
+    def test_sqlite_backend(self, tmp_path):
+        from storage import SQLiteDatabase
+
+        with patch("database.STORAGE_BACKEND", "sqlite"), patch(
+            "database.SQLITE_PATH", str(tmp_path / "workout_bot.db")
+        ):
+            db = create_database()
+        assert isinstance(db, SQLiteDatabase)
+
+    def test_memory_backend(self):
+        from storage import InMemoryDatabase
+
+        with patch("database.STORAGE_BACKEND", "memory"), patch(
+            "database.MEMORY_STORAGE_LATENCY", 0.01
+        ):
+            db = create_database()
+        assert isinstance(db, InMemoryDatabase)
+        assert db.latency == 0.01
+
+    def test_unknown_mode(self):
+        with patch("database.DATABASE_CLIENT_MODE", "threaded"):
+            with pytest.raises(ValueError):
+                create_database()
@@ -0,0 +1,170 @@
+"""
+느린 커맨드 응답 지연(defer) 테스트
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from commands.admin_commands import setup_admin_commands
+from commands.deferral import (
+    ack_metrics,
+    complete_metrics,
+    defer_when_slow,
+    respond,
+)
+from commands.workout_commands import setup_workout_commands
+
+
+def make_interaction(name):
+    """테스트용 인터랙션 (defer 후에는 응답 완료 상태)"""
+    interaction = Mock()
+    interaction.command.qualified_name = name
+    interaction.extras = {}
+    done = {"value": False}
+
+    async def defer(**kwargs):
+        done["value"] = True
+
+    async def send_message(*args, **kwargs):
+        done["value"] = True
+
+    interaction.response.is_done = lambda: done["value"]
+    interaction.response.defer = AsyncMock(side_effect=defer)
+    interaction.response.send_message = AsyncMock(side_effect=send_message)
+    interaction.followup.send = AsyncMock()
+    interaction.delete_original_response = AsyncMock()
+    interaction.channel.send = AsyncMock()
+    return interaction
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    ack_metrics.reset()
+    complete_metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_slow_command_defers_and_uses_followup():
+    """예상 처리 시간이 임계값을 넘으면 먼저 defer하고 followup으로 응답"""
+
+    @defer_when_slow(budget=5.0)
+    async def command(interaction):
+        await respond(interaction, "done", ephemeral=True)
+
+    interaction = make_interaction("slow")
+    await command(interaction)
+
+    interaction.response.defer.assert_awaited_once_with(ephemeral=True, thinking=True)
+    interaction.followup.send.assert_awaited_once_with("done", ephemeral=True)
+    interaction.response.send_message.assert_not_called()
+    interaction.delete_original_response.assert_not_called()
+    assert ack_metrics.stats()["slow"]["count"] == 1
+    assert complete_metrics.stats()["slow"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_command_responds_directly():
+    """예상 처리 시간이 짧으면 defer 없이 바로 응답"""
+
+    @defer_when_slow(budget=0.1)
+    async def command(interaction):
+        await respond(interaction, "done", ephemeral=True)
+
+    interaction = make_interaction("fast")
+    await command(interaction)
+
+    interaction.response.defer.assert_not_called()
+    interaction.response.send_message.assert_awaited_once_with("done", ephemeral=True)
+    assert ack_metrics.stats()["fast"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unexpectedly_slow_command_deferred_by_timer():
+    """예상보다 느려지면 임계값이 지난 시점에 defer하고 followup으로 응답"""
+
+    @defer_when_slow(budget=0.001)
+    async def command(interaction):
+        await asyncio.sleep(0.05)
+        await respond(interaction, "done", ephemeral=True)
+
+    interaction = make_interaction("stalled")
+    with patch("commands.deferral.COMMAND_DEFER_THRESHOLD", 0.01):
+        await command(interaction)
+
+    interaction.response.defer.assert_awaited_once_with(ephemeral=True, thinking=True)
+    interaction.followup.send.assert_awaited_once_with("done", ephemeral=True)
+    interaction.response.send_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_command_recorded_as_error():
+    """예외가 나면 완료 시간을 실패로 기록하고 예외는 그대로 전달"""
+
+    @defer_when_slow(budget=0.1)
+    async def command(interaction):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await command(make_interaction("broken"))
+
+    assert complete_metrics.stats()["broken"]["errors"] == 1
+
+
+def register_commands(setup):
+    """슬래시 커맨드 콜백을 이름별로 수집"""
+    callbacks = {}
+    bot = Mock()
+
+    def command(name, **kwargs):
+        def register(callback):
+            callbacks[name] = callback
+            return callback
+
+        return register
+
+    bot.tree.command = command
+    setup(bot)
+    return bot, callbacks
+
+
+@pytest.mark.asyncio
+async def test_rejected_admin_command_stays_ephemeral():
+    """권한 없는 호출은 공개로 defer해도 대기 응답을 지우고 본인에게만 거절 메시지 표시"""
+    _, callbacks = register_commands(setup_admin_commands)
+    interaction = make_interaction("add-workout")
+    interaction.user.roles = []
+
+    await callbacks["add-workout"](interaction, Mock(), None)
+
+    interaction.response.defer.assert_awaited_once_with(ephemeral=False, thinking=True)
+    interaction.delete_original_response.assert_awaited_once()
+    assert interaction.followup.send.await_args.kwargs["ephemeral"] is True
+    interaction.channel.send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_successful_revoke_posts_publicly():
+    """공개로 defer한 뒤 성공 결과는 followup으로 공개 (채널 전송 권한 불필요)"""
+    bot, callbacks = register_commands(setup_workout_commands)
+    bot.workout_service.revoke_workout_record = AsyncMock(
+        return_value={
+            "success": True,
+            "message": "운동 기록이 취소되었습니다.",
+            "current_count": 0,
+            "weekly_goal": 0,
+        }
+    )
+    interaction = make_interaction("revoke")
+    member = Mock()
+    interaction.user.id = member.id
+
+    await callbacks["revoke"](interaction, member, None)
+
+    interaction.response.defer.assert_awaited_once_with(ephemeral=False, thinking=True)
+    interaction.followup.send.assert_awaited_once()
+    assert "embed" in interaction.followup.send.await_args.kwargs
+    assert interaction.followup.send.await_args.kwargs["ephemeral"] is False
+    interaction.delete_original_response.assert_not_called()
+    interaction.channel.send.assert_not_called()
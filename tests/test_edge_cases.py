@@ -8,6 +8,8 @@ from unittest.mock import AsyncMock, MagicMock
 from services.workout_service import WorkoutService
 from services.penalty_service import PenaltyService
 
+GUILD_ID = 987654321
+
 
 @pytest.mark.unit
 class TestWorkoutEdgeCases:
@@ -23,48 +25,46 @@ class TestWorkoutEdgeCases:
         username = "테스트유저"
         today = datetime.now()
 
-        # 1. 사용자 설정이 있다고 가정
-        mock_database.get_user_settings = AsyncMock(
-            return_value={"user_id": user_id, "username": username, "weekly_goal": 5}
+        # 1. 첫 번째 운동 기록 추가 성공
+        mock_database.add_workout_with_progress = AsyncMock(
+            return_value={"status": "added", "current_count": 1, "weekly_goal": 5}
         )
 
-        # 2. 첫 번째 운동 기록 추가 성공
-        mock_database.add_workout_record = AsyncMock(return_value=True)
-        mock_database.get_weekly_workout_count = AsyncMock(return_value=1)
-
-        result1 = await workout_service.add_workout_record(user_id, username, today)
+        result1 = await workout_service.add_workout_record(
+            GUILD_ID, user_id, username, today
+        )
 
         assert result1["success"] is True
         assert "운동 기록이 추가되었습니다" in result1["message"]
         assert result1["current_count"] == 1
 
-        # 3. 운동 기록 취소 성공
-        mock_database.revoke_workout_record = AsyncMock(return_value=True)
-        mock_database.get_weekly_workout_count = AsyncMock(
-            return_value=0
+        # 2. 운동 기록 취소 성공
+        mock_database.revoke_workout_with_progress = AsyncMock(
+            return_value={"status": "revoked", "current_count": 0, "weekly_goal": 5}
         )  # 취소 후 0개
 
-        result2 = await workout_service.revoke_workout_record(user_id, today)
+        result2 = await workout_service.revoke_workout_record(GUILD_ID, user_id, today)
 
         assert result2["success"] is True
         assert "운동 기록이 취소되었습니다" in result2["message"]
         assert result2["current_count"] == 0
 
-        # 4. 다시 같은 날짜에 운동 기록 추가 시도 (성공해야 함)
-        mock_database.add_workout_record = AsyncMock(
-            return_value=True
-        )  # 이번에는 성공해야 함
-        mock_database.get_weekly_workout_count = AsyncMock(return_value=1)
+        # 3. 다시 같은 날짜에 운동 기록 추가 시도 (취소된 기록 재활성화로 성공)
+        mock_database.add_workout_with_progress = AsyncMock(
+            return_value={"status": "revived", "current_count": 1, "weekly_goal": 5}
+        )
 
-        result3 = await workout_service.add_workout_record(user_id, username, today)
+        result3 = await workout_service.add_workout_record(
+            GUILD_ID, user_id, username, today
+        )
 
         assert result3["success"] is True
         assert "운동 기록이 추가되었습니다" in result3["message"]
         assert result3["current_count"] == 1
 
         # 호출 검증
-        assert mock_database.add_workout_record.call_count == 2
-        assert mock_database.revoke_workout_record.call_count == 1
+        assert mock_database.add_workout_with_progress.call_count == 1
+        assert mock_database.revoke_workout_with_progress.call_count == 1
 
     async def test_add_revoke_add_database_level_detailed(self, mock_database):
         """데이터베이스 레벨에서 더 정교한 add -> revoke -> add 테스트"""
@@ -73,80 +73,63 @@ class TestWorkoutEdgeCases:
         today = datetime.now()
         week_start = today
 
-        # Supabase 응답 객체를 모킹
-        mock_response_with_data = MagicMock()
-        mock_response_with_data.data = [{"id": 1, "is_revoked": False}]
-
-        mock_response_no_data = MagicMock()
-        mock_response_no_data.data = []
-
-        mock_response_insert = MagicMock()
-        mock_response_insert.data = [{"id": 1}]
-
-        mock_response_update = MagicMock()
-        mock_response_update.data = [{"id": 1, "is_revoked": True}]
-
-        # Supabase 테이블 객체 모킹
-        mock_table = MagicMock()
-        mock_database.supabase.table.return_value = mock_table
-
-        # 첫 번째 add: 중복 검사 -> 없음, 삽입 -> 성공
-        mock_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.side_effect = [
-            mock_response_no_data,  # 중복 검사: 기존 기록 없음
+        def rpc_response(status, current_count):
+            response = MagicMock()
+            response.data = [
+                {"status": status, "current_count": current_count, "weekly_goal": 5}
+            ]
+            return response
+
+        # 모든 쓰기는 RPC 한 번 (조회 후 삽입/수정하지 않음)
+        mock_rpc = mock_database.supabase.rpc.return_value
+        mock_rpc.execute.side_effect = [
+            rpc_response("added", 1),
+            rpc_response("revoked", 0),
+            rpc_response("revived", 1),  # 취소된 기록 재활성화
         ]
-        mock_table.insert.return_value.execute.return_value = mock_response_insert
 
-        result1 = await mock_database.add_workout_record(
-            user_id, username, today, week_start
+        result1 = await mock_database.add_workout_with_progress(
+            GUILD_ID, user_id, username, today, week_start
         )
-        assert result1 is True
+        assert result1["status"] == "added"
 
-        # revoke: 기록 존재 -> 업데이트 성공
-        mock_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.side_effect = [
-            mock_response_with_data,  # 취소할 기록 존재
-        ]
-        mock_table.update.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_response_update
+        result2 = await mock_database.revoke_workout_with_progress(
+            GUILD_ID, user_id, today
         )
+        assert result2["status"] == "revoked"
+        assert result2["current_count"] == 0
 
-        result2 = await mock_database.revoke_workout_record(user_id, today)
-        assert result2 is True
+        result3 = await mock_database.add_workout_with_progress(
+            GUILD_ID, user_id, username, today, week_start
+        )
+        assert result3["status"] == "revived"
+        assert result3["current_count"] == 1
 
-        # 두 번째 add: 중복 검사 -> 없음 (revoke된 기록은 제외), 삽입 -> 성공
-        mock_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.side_effect = [
-            mock_response_no_data,  # 중복 검사: is_revoked=False인 기록 없음
+        rpc_names = [c.args[0] for c in mock_database.supabase.rpc.call_args_list]
+        assert rpc_names == [
+            "add_workout_with_progress",
+            "revoke_workout_with_progress",
+            "add_workout_with_progress",
         ]
-        mock_table.insert.return_value.execute.return_value = mock_response_insert
-
-        result3 = await mock_database.add_workout_record(
-            user_id, username, today, week_start
-        )
-        assert result3 is True
+        mock_database.supabase.table.assert_not_called()
 
     async def test_revoke_already_revoked_record(self, mock_database):
         """이미 취소된 기록을 다시 취소하려고 할 때의 테스트"""
         user_id = 123
         today = datetime.now()
 
-        # 취소할 기록이 없음 (이미 취소되었거나 존재하지 않음)
-        mock_response_no_data = MagicMock()
-        mock_response_no_data.data = []
-
-        mock_response_revoked_data = MagicMock()
-        mock_response_revoked_data.data = [{"id": 1, "is_revoked": True}]
-
-        mock_table = MagicMock()
-        mock_database.supabase.table.return_value = mock_table
-
-        # 첫 번째 쿼리: is_revoked=False인 기록 없음
-        # 두 번째 쿼리: 모든 기록 조회 (이미 취소된 기록 존재)
-        mock_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.side_effect = [
-            mock_response_no_data,  # is_revoked=False인 기록 없음
-            mock_response_revoked_data,  # 이미 취소된 기록 존재
+        # 활성 기록이 없으면 RPC가 not_found를 반환 (이미 취소되었거나 존재하지 않음)
+        mock_response = MagicMock()
+        mock_response.data = [
+            {"status": "not_found", "current_count": 0, "weekly_goal": 5}
         ]
+        mock_database.supabase.rpc.return_value.execute.return_value = mock_response
 
-        result = await mock_database.revoke_workout_record(user_id, today)
-        assert result is False
+        result = await mock_database.revoke_workout_with_progress(
+            GUILD_ID, user_id, today
+        )
+        assert result["status"] == "not_found"
+        mock_database.supabase.table.assert_not_called()
 
     async def test_multiple_revoke_same_record(self, mock_database):
         """같은 기록을 여러 번 revoke 시도하는 테스트"""
@@ -156,26 +139,20 @@ class TestWorkoutEdgeCases:
         user_id = 123
         today = datetime.now()
 
-        # 사용자 설정
-        mock_database.get_user_settings = AsyncMock(
-            return_value={
-                "user_id": user_id,
-                "username": "테스트유저",
-                "weekly_goal": 5,
-            }
-        )
-
         # 첫 번째 revoke: 성공
-        mock_database.revoke_workout_record = AsyncMock(return_value=True)
-        mock_database.get_weekly_workout_count = AsyncMock(return_value=0)
+        mock_database.revoke_workout_with_progress = AsyncMock(
+            return_value={"status": "revoked", "current_count": 0, "weekly_goal": 5}
+        )
 
-        result1 = await workout_service.revoke_workout_record(user_id, today)
+        result1 = await workout_service.revoke_workout_record(GUILD_ID, user_id, today)
         assert result1["success"] is True
 
         # 두 번째 revoke: 실패 (이미 revoke된 기록이므로)
-        mock_database.revoke_workout_record = AsyncMock(return_value=False)
+        mock_database.revoke_workout_with_progress = AsyncMock(
+            return_value={"status": "not_found", "current_count": 0, "weekly_goal": 0}
+        )
 
-        result2 = await workout_service.revoke_workout_record(user_id, today)
+        result2 = await workout_service.revoke_workout_record(GUILD_ID, user_id, today)
         assert result2["success"] is False
         assert "취소할 운동 기록이 없습니다" in result2["message"]
 
@@ -188,11 +165,6 @@ class TestWorkoutEdgeCases:
         username = "테스트유저"
         today = datetime.now()
 
-        # 사용자 설정
-        mock_database.get_user_settings = AsyncMock(
-            return_value={"user_id": user_id, "username": username, "weekly_goal": 5}
-        )
-
         # 시나리오: add -> revoke -> add -> revoke -> add
         operations = [
             ("add", True, 1),  # 첫 번째 추가 성공
@@ -204,15 +176,16 @@ class TestWorkoutEdgeCases:
 
         for i, (operation, expected_success, expected_count) in enumerate(operations):
             if operation == "add":
-                mock_database.add_workout_record = AsyncMock(
-                    return_value=expected_success
-                )
-                mock_database.get_weekly_workout_count = AsyncMock(
-                    return_value=expected_count
+                mock_database.add_workout_with_progress = AsyncMock(
+                    return_value={
+                        "status": "added" if expected_success else "duplicate",
+                        "current_count": expected_count,
+                        "weekly_goal": 5,
+                    }
                 )
 
                 result = await workout_service.add_workout_record(
-                    user_id, username, today
+                    GUILD_ID, user_id, username, today
                 )
                 assert (
                     result["success"] == expected_success
@@ -221,14 +194,17 @@ class TestWorkoutEdgeCases:
                     assert result["current_count"] == expected_count
 
             elif operation == "revoke":
-                mock_database.revoke_workout_record = AsyncMock(
-                    return_value=expected_success
-                )
-                mock_database.get_weekly_workout_count = AsyncMock(
-                    return_value=expected_count
+                mock_database.revoke_workout_with_progress = AsyncMock(
+                    return_value={
+                        "status": "revoked" if expected_success else "not_found",
+                        "current_count": expected_count,
+                        "weekly_goal": 5,
+                    }
                 )
 
-                result = await workout_service.revoke_workout_record(user_id, today)
+                result = await workout_service.revoke_workout_record(
+                    GUILD_ID, user_id, today
+                )
                 assert (
                     result["success"] == expected_success
                 ), f"작업 {i+1} 실패: {operation}"
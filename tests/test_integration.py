@@ -9,6 +9,9 @@ from database import Database
 from services import PenaltyService, WorkoutService, ReportService
 from config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
 
+# 테스트용 서버 ID (실제로는 존재하지 않을 높은 숫자)
+GUILD_ID = 999999999
+
 
 @pytest.mark.integration
 class TestDatabaseIntegration:
@@ -44,15 +47,17 @@ class TestDatabaseIntegration:
         await db.init_db()
 
         # 1. 목표 설정
-        success = await db.set_user_goal(self.test_user_id, self.test_username, 5)
+        success = await db.set_user_goal(
+            GUILD_ID, self.test_user_id, self.test_username, 5
+        )
         assert success is True
 
         # 2. 설정 조회
-        user_settings = await db.get_user_settings(self.test_user_id)
+        user_settings = await db.get_user_settings(GUILD_ID, self.test_user_id)
         assert user_settings is not None
-        assert user_settings["username"] == self.test_username
-        assert user_settings["weekly_goal"] == 5
-        assert user_settings["total_penalty"] == 0.0
+        assert user_settings.username == self.test_username
+        assert user_settings.weekly_goal == 5
+        assert user_settings.total_penalty == 0.0
 
     @pytest.mark.asyncio
     async def test_workout_record_workflow(self):
@@ -61,7 +66,7 @@ class TestDatabaseIntegration:
         await db.init_db()
 
         # 목표 설정
-        await db.set_user_goal(self.test_user_id, self.test_username, 5)
+        await db.set_user_goal(GUILD_ID, self.test_user_id, self.test_username, 5)
 
         from utils import get_week_start_end
 
@@ -69,28 +74,34 @@ class TestDatabaseIntegration:
         today = datetime.now()
 
         # 1. 운동 기록 추가
-        success = await db.add_workout_record(
-            self.test_user_id, self.test_username, today, week_start
+        result = await db.add_workout_with_progress(
+            GUILD_ID, self.test_user_id, self.test_username, today, week_start
         )
-        assert success is True
+        assert result["status"] in ("added", "revived")
 
         # 2. 중복 기록 시도 (실패해야 함)
-        duplicate_success = await db.add_workout_record(
-            self.test_user_id, self.test_username, today, week_start
+        duplicate = await db.add_workout_with_progress(
+            GUILD_ID, self.test_user_id, self.test_username, today, week_start
         )
-        assert duplicate_success is False
+        assert duplicate["status"] == "duplicate"
 
         # 3. 주간 운동 횟수 확인
-        count = await db.get_weekly_workout_count(self.test_user_id, week_start)
+        count = await db.get_weekly_workout_count(
+            GUILD_ID, self.test_user_id, week_start
+        )
         assert count >= 1
 
         # 4. 운동 기록 취소
-        revoke_success = await db.revoke_workout_record(self.test_user_id, today)
-        assert revoke_success is True
+        revoked = await db.revoke_workout_with_progress(
+            GUILD_ID, self.test_user_id, today
+        )
+        assert revoked["status"] == "revoked"
 
         # 5. 취소 후 중복 취소 시도 (실패해야 함)
-        duplicate_revoke = await db.revoke_workout_record(self.test_user_id, today)
-        assert duplicate_revoke is False
+        duplicate_revoke = await db.revoke_workout_with_progress(
+            GUILD_ID, self.test_user_id, today
+        )
+        assert duplicate_revoke["status"] == "not_found"
 
 
 @pytest.mark.integration
@@ -119,25 +130,29 @@ class TestServiceIntegration:
 
         # 1. 목표 설정
         result = await self.workout_service.set_user_goal(
-            self.test_user_id, self.test_username, 5
+            GUILD_ID, self.test_user_id, self.test_username, 5
         )
         assert result["success"] is True
 
         # 2. 운동 기록 추가
         result = await self.workout_service.add_workout_record(
-            self.test_user_id, self.test_username
+            GUILD_ID, self.test_user_id, self.test_username
         )
         assert result["success"] is True
         assert result["current_count"] >= 1
 
         # 3. 주간 진행 상황 조회
-        progress = await self.workout_service.get_weekly_progress(self.test_user_id)
+        progress = await self.workout_service.get_weekly_progress(
+            GUILD_ID, self.test_user_id
+        )
         assert progress is not None
         assert progress.weekly_goal == 5
         assert progress.current_count >= 1
 
         # 4. 사용자 주간 요약 조회
-        summary = await self.report_service.get_user_weekly_summary(self.test_user_id)
+        summary = await self.report_service.get_user_weekly_summary(
+            GUILD_ID, self.test_user_id
+        )
         assert summary["success"] is True
         assert summary["username"] == self.test_username
 
@@ -148,13 +163,13 @@ class TestServiceIntegration:
 
         # 목표 설정
         await self.workout_service.set_user_goal(
-            self.test_user_id, self.test_username, 5
+            GUILD_ID, self.test_user_id, self.test_username, 5
         )
 
         # 어제 날짜로 관리자 기록 추가
         yesterday = datetime.now() - timedelta(days=1)
         result = await self.workout_service.admin_add_workout_record(
-            self.test_user_id, self.test_username, yesterday
+            GUILD_ID, self.test_user_id, self.test_username, yesterday
         )
 
         assert result["success"] is True
@@ -183,7 +198,7 @@ class TestReportIntegration:
         await self.db.init_db()
 
         # 주간 리포트 생성
-        report = await self.report_service.generate_weekly_report()
+        report = await self.report_service.generate_weekly_report(GUILD_ID)
 
         assert report["success"] is True
         assert "user_reports" in report
@@ -240,7 +255,9 @@ class TestErrorHandling:
         workout_service = WorkoutService(db, penalty_service)
 
         # 존재하지 않는 사용자에 대한 운동 기록 추가 시도
-        result = await workout_service.add_workout_record(999999997, "존재안함")
+        result = await workout_service.add_workout_record(
+            GUILD_ID, 999999997, "존재안함"
+        )
         assert result["success"] is False
         assert "목표를 설정해주세요" in result["message"]
 
@@ -266,7 +283,7 @@ class TestPerformance:
         from utils import get_week_start_end
 
         week_start, _ = get_week_start_end()
-        all_users_data = await db.get_all_users_weekly_data(week_start)
+        all_users_data = await db.get_all_users_weekly_data(GUILD_ID, week_start)
 
         end_time = time.time()
         execution_time = end_time - start_time
@@ -290,7 +307,7 @@ class TestPerformance:
         user_ids = [999999991, 999999992, 999999993]
 
         async def get_user_setting(user_id):
-            return await db.get_user_settings(user_id)
+            return await db.get_user_settings(GUILD_ID, user_id)
 
         # 동시 실행
         tasks = [get_user_setting(user_id) for user_id in user_ids]
@@ -0,0 +1,334 @@
+"""스키마 마이그레이션 테스트"""
+
+import sqlite3
+import pytest
+
+from storage.migrations import MigrationError, MigrationRunner, load_migrations
+
+
+def index_names(conn) -> set:
+    return {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+
+
+class FakePostgresCursor:
+    """실행한 SQL을 기록하는 psycopg 커서 대역"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql.strip(), params))
+        if sql.strip() in self.conn.fail_on:
+            raise RuntimeError("syntax error")
+        if sql.startswith("SELECT version"):
+            self.result = [(v, "name", "checksum") for v in self.conn.versions]
+        elif sql.startswith("SELECT 1 FROM schema_migrations"):
+            self.result = [(1,)] if params[0] in self.conn.concurrent else []
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self.conn.pending_versions.append(params[0])
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+
+class FakePostgresConnection:
+    """트랜잭션 커밋/롤백만 흉내내는 Postgres 연결 대역"""
+
+    def __init__(self, versions=(), concurrent=(), fail_on=()):
+        self.versions = list(versions)
+        self.concurrent = set(concurrent)
+        self.fail_on = set(fail_on)
+        self.pending_versions = []
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakePostgresCursor(self)
+
+    def commit(self):
+        self.versions.extend(self.pending_versions)
+        self.pending_versions = []
+        self.commits += 1
+
+    def rollback(self):
+        self.pending_versions = []
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def sqlite_conn():
+    conn = sqlite3.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+class TestLoadMigrations:
+    """마이그레이션 파일 로드 테스트"""
+
+    @pytest.mark.parametrize("dialect", ["postgres", "sqlite"])
+    def test_versions_are_contiguous(self, dialect):
+        """버전이 1부터 빠짐없이 이어짐"""
+        versions = [m.version for m in load_migrations(dialect)]
+        assert versions == list(range(1, len(versions) + 1))
+
+    @pytest.mark.parametrize("dialect", ["postgres", "sqlite"])
+    def test_ships_active_partial_index(self, dialect):
+        """서버별 활성 기록 부분 인덱스가 마이그레이션에 포함됨"""
+        sql = "\n".join(m.sql for m in load_migrations(dialect))
+        assert "idx_workout_records_active_guild_user_week" in sql
+        assert "ON workout_records(guild_id, user_id, week_start_date)" in sql
+
+    def test_rejects_bad_filename(self, tmp_path):
+        """파일 이름 형식이 다르면 오류"""
+        (tmp_path / "1_init.sql").write_text("SELECT 1;")
+        with pytest.raises(MigrationError):
+            load_migrations("sqlite", tmp_path)
+
+    def test_rejects_unknown_dialect(self):
+        with pytest.raises(MigrationError):
+            load_migrations("mysql")
+
+
+class TestSQLiteMigrations:
+    """SQLite 마이그레이션 적용 테스트"""
+
+    def test_applies_all_and_records_versions(self, sqlite_conn):
+        """전체 적용 후 버전 기록"""
+        runner = MigrationRunner(sqlite_conn, "sqlite")
+        applied = runner.migrate()
+
+        assert [m.version for m in applied] == [m.version for m in runner.migrations]
+        assert set(runner.applied()) == {m.version for m in runner.migrations}
+        assert runner.pending() == []
+
+    def test_rerun_is_noop(self, sqlite_conn):
+        """다시 실행하면 아무것도 적용하지 않음"""
+        MigrationRunner(sqlite_conn, "sqlite").migrate()
+        assert MigrationRunner(sqlite_conn, "sqlite").migrate() == []
+
+    def test_target_version(self, sqlite_conn):
+        """target 버전까지만 적용"""
+        runner = MigrationRunner(sqlite_conn, "sqlite")
+        assert [m.version for m in runner.migrate(target=1)] == [1]
+        assert [m.version for m in runner.pending()] == [2, 3, 4, 5, 6, 7, 8]
+
+    def test_hot_query_indexes(self, sqlite_conn):
+        """부분 인덱스 생성, 중복 인덱스 제거"""
+        MigrationRunner(sqlite_conn, "sqlite").migrate()
+        indexes = index_names(sqlite_conn)
+
+        assert "idx_workout_records_active_guild_user_week" in indexes
+        assert "idx_workout_records_revoked_guild_user_date" in indexes
+        assert "idx_workout_records_active_user_week" not in indexes
+        assert "idx_workout_records_user_week" not in indexes
+        assert "idx_weekly_penalties_user_week" not in indexes
+
+    def test_active_count_uses_partial_index(self, sqlite_conn):
+        """활성 기록 수 조회가 부분 인덱스를 사용"""
+        MigrationRunner(sqlite_conn, "sqlite").migrate()
+        plan = sqlite_conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM workout_records "
+            "WHERE guild_id = ? AND user_id = ? AND week_start_date = ? "
+            "AND is_revoked = 0",
+            (1, 1, "2025-01-13"),
+        ).fetchall()
+
+        assert "idx_workout_records_active_guild_user_week" in plan[0][-1]
+
+    def test_adopts_existing_database(self, sqlite_conn):
+        """버전 기록 없이 만든 기존 DB에 적용해도 데이터 유지"""
+        sqlite_conn.executescript(load_migrations("sqlite")[0].sql)
+        sqlite_conn.execute(
+            "INSERT INTO user_settings (user_id, username) VALUES (1, '테스트유저')"
+        )
+        sqlite_conn.execute(
+            "INSERT INTO workout_records "
+            "(user_id, username, workout_date, week_start_date) "
+            "VALUES (1, '테스트유저', '2025-01-13', '2025-01-13')"
+        )
+        sqlite_conn.commit()
+
+        MigrationRunner(sqlite_conn, "sqlite").migrate()
+
+        # 카운터 테이블이 기존 기록으로 채워짐
+        row = sqlite_conn.execute(
+            "SELECT guild_id, active_count FROM weekly_progress WHERE user_id = 1"
+        ).fetchone()
+        assert row == (0, 1)
+
+    def test_legacy_rows_move_to_guild(self, sqlite_conn):
+        """guild_id 0으로 옮겨진 기존 행은 UPDATE 한 번으로 하위 테이블까지 이동"""
+        runner = MigrationRunner(sqlite_conn, "sqlite")
+        runner.migrate(target=3)
+        sqlite_conn.execute(
+            "INSERT INTO user_settings (user_id, username) VALUES (1, '테스트유저')"
+        )
+        sqlite_conn.execute(
+            "INSERT INTO workout_records "
+            "(user_id, username, workout_date, week_start_date) "
+            "VALUES (1, '테스트유저', '2025-01-13', '2025-01-13')"
+        )
+        sqlite_conn.commit()
+        runner.migrate()
+        sqlite_conn.execute("PRAGMA foreign_keys = ON")
+
+        sqlite_conn.execute("UPDATE user_settings SET guild_id = 42 WHERE guild_id = 0")
+
+        assert sqlite_conn.execute(
+            "SELECT guild_id FROM workout_records WHERE user_id = 1"
+        ).fetchall() == [(42,)]
+        assert sqlite_conn.execute(
+            "SELECT guild_id, active_count FROM weekly_progress WHERE user_id = 1"
+        ).fetchall() == [(42, 1)]
+
+    def test_unassigned_users(self, sqlite_conn):
+        """서버 분리 이전 사용자는 배정 전까지 guild_id = 0으로 집계"""
+        runner = MigrationRunner(sqlite_conn, "sqlite")
+        runner.migrate(target=3)
+        assert runner.unassigned_users() == 0
+
+        sqlite_conn.execute(
+            "INSERT INTO user_settings (user_id, username) VALUES (1, '테스트유저')"
+        )
+        sqlite_conn.commit()
+        runner.migrate()
+        assert runner.unassigned_users() == 1
+
+        sqlite_conn.execute("UPDATE user_settings SET guild_id = 42 WHERE guild_id = 0")
+        assert runner.unassigned_users() == 0
+
+    def test_cli_warns_about_unassigned_users(self, tmp_path, caplog):
+        """migrate.py는 배정되지 않은 기존 사용자가 있으면 UPDATE 문과 함께 경고"""
+        import migrate
+
+        path = str(tmp_path / "bot.db")
+        assert migrate.main(["--sqlite", path, "--target", "3"]) == 0
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "INSERT INTO user_settings (user_id, username) VALUES (1, '테스트유저')"
+        )
+        conn.commit()
+        conn.close()
+
+        assert migrate.main(["--sqlite", path]) == 0
+        assert "서버에 배정되지 않은 기존 사용자 1명" in caplog.text
+        assert "WHERE guild_id = 0" in caplog.text
+
+    def test_close_runs_upgrade_keeps_rows(self, sqlite_conn):
+        """정산 기록 -> 마감 기록 이름 변경과 기본값 제거 후에도 기존 행 유지"""
+        runner = MigrationRunner(sqlite_conn, "sqlite")
+        runner.migrate(target=6)
+        sqlite_conn.execute(
+            "INSERT INTO weekly_settlements (guild_id, week_start_date) "
+            "VALUES (42, '2025-01-13')"
+        )
+        sqlite_conn.commit()
+
+        runner.migrate()
+
+        row = sqlite_conn.execute(
+            "SELECT guild_id, week_start_date, broadcast_at IS NOT NULL "
+            "FROM weekly_close_runs"
+        ).fetchone()
+        assert row == (42, "2025-01-13", 1)
+
+        # 다른 단계만 기록한 행이 정산된 주로 보이지 않도록 기본값 없음
+        sqlite_conn.execute(
+            "INSERT INTO weekly_close_runs (guild_id, week_start_date, snapshot_at) "
+            "VALUES (42, '2025-01-20', CURRENT_TIMESTAMP)"
+        )
+        assert sqlite_conn.execute(
+            "SELECT settled_at FROM weekly_close_runs "
+            "WHERE week_start_date = '2025-01-20'"
+        ).fetchone() == (None,)
+
+    def test_failed_migration_rolls_back(self, sqlite_conn, tmp_path):
+        """실패한 마이그레이션은 변경과 버전 기록 모두 남지 않음"""
+        (tmp_path / "0001_create.sql").write_text("CREATE TABLE a (id INTEGER);")
+        (tmp_path / "0002_broken.sql").write_text(
+            "CREATE TABLE b (id INTEGER);\nINSERT INTO missing VALUES (1);"
+        )
+        runner = MigrationRunner(sqlite_conn, "sqlite", tmp_path)
+
+        with pytest.raises(MigrationError):
+            runner.migrate()
+
+        tables = {
+            row[0]
+            for row in sqlite_conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        assert "a" in tables
+        assert "b" not in tables
+        assert set(runner.applied()) == {1}
+
+    def test_checksum_change_warns(self, sqlite_conn, tmp_path, caplog):
+        """적용 후 수정된 파일은 경고만 남기고 다시 실행하지 않음"""
+        path = tmp_path / "0001_create.sql"
+        path.write_text("CREATE TABLE a (id INTEGER);")
+        MigrationRunner(sqlite_conn, "sqlite", tmp_path).migrate()
+
+        path.write_text("CREATE TABLE a (id INTEGER, name TEXT);")
+        assert MigrationRunner(sqlite_conn, "sqlite", tmp_path).migrate() == []
+        assert "적용 후 변경된 마이그레이션" in caplog.text
+
+
+class TestPostgresMigrations:
+    """Postgres 마이그레이션 적용 테스트 (연결 대역 사용)"""
+
+    def test_applies_in_order_with_version_record(self):
+        """버전 순서대로 적용하고 각 트랜잭션에서 버전 기록"""
+        conn = FakePostgresConnection()
+        runner = MigrationRunner(conn, "postgres")
+
+        applied = runner.migrate()
+
+        versions = [m.version for m in runner.migrations]
+        assert [m.version for m in applied] == versions
+        assert conn.versions == versions
+        inserts = [p for sql, p in conn.executed if sql.startswith("INSERT INTO")]
+        assert [p[0] for p in inserts] == versions
+
+    def test_skips_applied_versions(self):
+        """이미 적용된 버전은 건너뜀"""
+        conn = FakePostgresConnection(versions=[1, 2, 3])
+        applied = MigrationRunner(conn, "postgres").migrate()
+
+        assert [m.version for m in applied] == [4, 5, 6, 7, 8, 9, 10, 11, 12]
+
+    def test_skips_version_applied_concurrently(self):
+        """잠금 후 다른 인스턴스가 적용한 버전이면 롤백하고 건너뜀"""
+        conn = FakePostgresConnection(
+            versions=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11], concurrent={12}
+        )
+        applied = MigrationRunner(conn, "postgres").migrate()
+
+        assert applied == []
+        assert conn.rollbacks == 1
+
+    def test_failure_rolls_back(self):
+        """실패하면 롤백하고 버전을 기록하지 않음"""
+        broken = load_migrations("postgres")[1].sql.strip()
+        conn = FakePostgresConnection(fail_on={broken})
+        runner = MigrationRunner(conn, "postgres")
+
+        with pytest.raises(MigrationError):
+            runner.migrate()
+
+        assert conn.versions == [1]
+        assert conn.rollbacks == 1
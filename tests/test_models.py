@@ -2,7 +2,16 @@
 
 import pytest
 from datetime import datetime, date
-from models import UserSettings, WorkoutRecord, WeeklyProgress
+from models import (
+    UserSettings,
+    WorkoutRecord,
+    WeeklyProgress,
+    compile_row_mapper,
+    map_user_settings,
+    map_weekly_penalty,
+    map_weekly_progress,
+    map_workout_record,
+)
 
 
 class TestUserSettings:
@@ -278,3 +287,122 @@ class TestWeeklyProgress:
         assert progress_incomplete.is_completed is False
         assert progress_complete.is_completed is True
         assert progress_over_complete.is_completed is True
+
+
+class TestRowMappers:
+    """행 -> 모델 변환 테스트"""
+
+    def test_models_are_slotted(self):
+        """모델 인스턴스에 __dict__가 없음"""
+        progress = WeeklyProgress(
+            user_id=1,
+            username="테스트",
+            weekly_goal=5,
+            current_count=3,
+            week_start_date=date(2025, 1, 13),
+        )
+
+        assert not hasattr(progress, "__dict__")
+        with pytest.raises(AttributeError):
+            progress.unknown_field = 1
+
+    def test_map_user_settings_parses_postgrest_row(self):
+        """PostgREST 행의 DECIMAL 문자열과 타임스탬프 변환"""
+        settings = map_user_settings(
+            {
+                "guild_id": 42,
+                "user_id": 123,
+                "username": "테스트유저",
+                "weekly_goal": 5,
+                "total_penalty": "6048.00",
+                "created_at": "2025-01-13T09:00:00.123456Z",
+                "updated_at": "2025-01-14T10:30:00+09:00",
+            }
+        )
+
+        assert settings.guild_id == 42
+        assert settings.total_penalty == 6048.0
+        assert settings.created_at.year == 2025
+        assert settings.created_at.tzinfo is not None
+        assert settings.updated_at.hour == 10
+
+    def test_map_workout_record_parses_sqlite_row(self):
+        """SQLite 행의 날짜 문자열과 0/1 불리언 변환"""
+        record = map_workout_record(
+            {
+                "guild_id": 42,
+                "id": 1,
+                "user_id": 123,
+                "username": "테스트유저",
+                "workout_date": "2025-01-14",
+                "week_start_date": "2025-01-13",
+                "created_at": "2025-01-14 09:00:00",
+                "is_revoked": 1,
+            }
+        )
+
+        assert record.workout_date == date(2025, 1, 14)
+        assert record.week_start_date == date(2025, 1, 13)
+        assert record.created_at == datetime(2025, 1, 14, 9, 0)
+        assert record.is_revoked is True
+        assert record.is_active is False
+
+    def test_map_weekly_penalty(self):
+        """벌금 기록 변환"""
+        penalty = map_weekly_penalty(
+            {
+                "guild_id": 42,
+                "id": 1,
+                "user_id": 123,
+                "username": "테스트유저",
+                "week_start_date": "2025-01-13",
+                "goal_count": 5,
+                "actual_count": 3,
+                "penalty_amount": 4032,
+                "created_at": None,
+            }
+        )
+
+        assert penalty.penalty_amount == 4032.0
+        assert penalty.created_at is None
+        assert penalty.is_goal_achieved is False
+
+    def test_map_weekly_progress_with_extra_fields(self):
+        """행에 없는 필드는 키워드 인자로 전달"""
+        progress = map_weekly_progress(
+            {
+                "user_id": 123,
+                "username": "테스트유저",
+                "weekly_goal": 5,
+                "workout_count": None,
+                "total_penalty": "1000.50",
+            },
+            week_start_date=date(2025, 1, 13),
+            guild_id=42,
+        )
+
+        assert progress.guild_id == 42
+        assert progress.current_count == 0
+        assert progress.total_penalty == 1000.5
+        assert progress.week_start_date == date(2025, 1, 13)
+
+    def test_compile_row_mapper_renames_columns(self):
+        """모델 필드와 다른 컬럼 이름 매핑"""
+        mapper = compile_row_mapper(
+            WeeklyProgress,
+            {
+                "user_id": "uid",
+                "username": "name",
+                "weekly_goal": "goal",
+                "current_count": "count",
+                "week_start_date": "week",
+            },
+            {"week_start_date": date.fromisoformat},
+        )
+
+        progress = mapper(
+            {"uid": 1, "name": "테스트", "goal": 4, "count": 2, "week": "2025-01-13"}
+        )
+
+        assert progress.remaining_count == 2
+        assert progress.week_start_date == date(2025, 1, 13)
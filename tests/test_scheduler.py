@@ -0,0 +1,47 @@
+"""
+주간 정산 스케줄러 테스트
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import pytz
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.triggers.cron import CronTrigger
+
+from bot.scheduler import WEEKLY_REPORT_JOB_ID, create_scheduler, run_weekly_report
+
+
+@pytest.mark.asyncio
+async def test_weekly_job_defaults():
+    """작업은 메모리에 두고, 밀린 실행은 합쳐서 1회"""
+    bot = Mock()
+    scheduler = create_scheduler()
+    scheduler.start(paused=True)
+    scheduler.add_job(
+        run_weekly_report,
+        CronTrigger(day_of_week=0, hour=9, timezone=pytz.timezone("Asia/Seoul")),
+        id=WEEKLY_REPORT_JOB_ID,
+        kwargs={"bot": bot},
+    )
+    job = scheduler.get_job(WEEKLY_REPORT_JOB_ID)
+    store = scheduler._lookup_jobstore("default")
+    scheduler.shutdown(wait=False)
+
+    assert isinstance(store, MemoryJobStore)
+    assert job.func is run_weekly_report
+    assert job.kwargs == {"bot": bot}
+    assert job.coalesce is True
+    assert job.misfire_grace_time > 0
+    assert job.max_instances == 1
+
+
+@pytest.mark.asyncio
+async def test_run_weekly_report_uses_job_bot():
+    """작업 kwargs로 받은 봇의 자동 주간 마감 실행"""
+    bot = Mock()
+    bot.send_automated_weekly_report = AsyncMock()
+
+    await run_weekly_report(bot)
+
+    bot.send_automated_weekly_report.assert_awaited_once_with()
@@ -1,11 +1,42 @@
 """서비스 레이어 테스트"""
 
+import logging
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, date, timedelta
 
 from services import PenaltyService, WorkoutService, ReportService
-from models import UserSettings, WeeklyProgress
+from models import UserSettings, WeeklyCloseRun, WeeklyProgress, WeeklyResult
+
+GUILD_ID = 987654321
+
+
+def settings(user_id, username, weekly_goal, total_penalty=0.0):
+    """저장소가 반환하는 사용자 설정"""
+    now = datetime(2025, 1, 13, 9, 0)
+    return UserSettings(user_id, username, weekly_goal, total_penalty, now, now)
+
+
+def weekly(user_id, username, weekly_goal, workout_count, total_penalty=0.0):
+    """저장소가 반환하는 사용자별 주간 데이터"""
+    return WeeklyProgress(
+        user_id=user_id,
+        username=username,
+        weekly_goal=weekly_goal,
+        current_count=workout_count,
+        week_start_date=date(2025, 1, 13),
+        total_penalty=total_penalty,
+    )
+
+
+def stream(rows):
+    """저장소 스캔 API를 대신하는 비동기 제너레이터"""
+
+    async def scan(*args, **kwargs):
+        for row in rows:
+            yield row
+
+    return scan
 
 
 class TestPenaltyService:
@@ -61,16 +92,18 @@ class TestWorkoutService:
         """올바른 목표 설정 테스트"""
         mock_database.set_user_goal = AsyncMock(return_value=True)
 
-        result = await workout_service.set_user_goal(123, "테스트유저", 5)
+        result = await workout_service.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
 
         assert result["success"] is True
         assert "목표가 성공적으로 설정되었습니다" in result["message"]
-        mock_database.set_user_goal.assert_called_once_with(123, "테스트유저", 5)
+        mock_database.set_user_goal.assert_called_once_with(
+            GUILD_ID, 123, "테스트유저", 5
+        )
 
     @pytest.mark.asyncio
     async def test_set_user_goal_invalid(self, workout_service, mock_database):
         """잘못된 목표 설정 테스트"""
-        result = await workout_service.set_user_goal(123, "테스트유저", 8)
+        result = await workout_service.set_user_goal(GUILD_ID, 123, "테스트유저", 8)
 
         assert result["success"] is False
         assert "목표 횟수는 1회 이상 7회 이하여야 합니다" in result["message"]
@@ -80,7 +113,7 @@ class TestWorkoutService:
         """데이터베이스 오류 시 목표 설정 테스트"""
         mock_database.set_user_goal = AsyncMock(return_value=False)
 
-        result = await workout_service.set_user_goal(123, "테스트유저", 5)
+        result = await workout_service.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
 
         assert result["success"] is False
         assert "목표 설정 중 오류가 발생했습니다" in result["message"]
@@ -88,34 +121,44 @@ class TestWorkoutService:
     @pytest.mark.asyncio
     async def test_add_workout_record_success(self, workout_service, mock_database):
         """운동 기록 추가 성공 테스트"""
-        # Mock 설정
-        mock_database.get_user_settings = AsyncMock(
-            return_value={
-                "user_id": 123,
-                "username": "테스트유저",
-                "weekly_goal": 5,
-                "total_penalty": 0.0,
-            }
+        # Mock 설정 (RPC 한 번으로 기록 추가 + 진행 상황 반환)
+        mock_database.add_workout_with_progress = AsyncMock(
+            return_value={"status": "added", "current_count": 3, "weekly_goal": 5}
         )
-        mock_database.add_workout_record = AsyncMock(return_value=True)
-        mock_database.get_weekly_workout_count = AsyncMock(return_value=3)
 
         with patch("utils.get_week_start_end") as mock_get_week:
             mock_get_week.return_value = (datetime.now(), datetime.now())
 
-            result = await workout_service.add_workout_record(123, "테스트유저")
+            result = await workout_service.add_workout_record(
+                GUILD_ID, 123, "테스트유저"
+            )
 
         assert result["success"] is True
         assert result["current_count"] == 3
         assert result["weekly_goal"] == 5
         assert result["is_goal_achieved"] is False
+        mock_database.add_workout_with_progress.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_workout_record_revived(self, workout_service, mock_database):
+        """취소된 기록 재활성화도 성공으로 처리"""
+        mock_database.add_workout_with_progress = AsyncMock(
+            return_value={"status": "revived", "current_count": 5, "weekly_goal": 5}
+        )
+
+        result = await workout_service.add_workout_record(GUILD_ID, 123, "테스트유저")
+
+        assert result["success"] is True
+        assert result["is_goal_achieved"] is True
 
     @pytest.mark.asyncio
     async def test_add_workout_record_no_goal(self, workout_service, mock_database):
         """목표 미설정 시 운동 기록 추가 테스트"""
-        mock_database.get_user_settings = AsyncMock(return_value=None)
+        mock_database.add_workout_with_progress = AsyncMock(
+            return_value={"status": "no_settings", "current_count": 0, "weekly_goal": 0}
+        )
 
-        result = await workout_service.add_workout_record(123, "테스트유저")
+        result = await workout_service.add_workout_record(GUILD_ID, 123, "테스트유저")
 
         assert result["success"] is False
         assert "먼저 주간 목표를 설정해주세요" in result["message"]
@@ -123,20 +166,16 @@ class TestWorkoutService:
     @pytest.mark.asyncio
     async def test_add_workout_record_duplicate(self, workout_service, mock_database):
         """중복 운동 기록 추가 테스트"""
-        mock_database.get_user_settings = AsyncMock(
-            return_value={
-                "user_id": 123,
-                "username": "테스트유저",
-                "weekly_goal": 5,
-                "total_penalty": 0.0,
-            }
+        mock_database.add_workout_with_progress = AsyncMock(
+            return_value={"status": "duplicate", "current_count": 3, "weekly_goal": 5}
         )
-        mock_database.add_workout_record = AsyncMock(return_value=False)
 
         with patch("utils.get_week_start_end") as mock_get_week:
             mock_get_week.return_value = (datetime.now(), datetime.now())
 
-            result = await workout_service.add_workout_record(123, "테스트유저")
+            result = await workout_service.add_workout_record(
+                GUILD_ID, 123, "테스트유저"
+            )
 
         assert result["success"] is False
         assert "이미 오늘 운동을 기록했습니다" in result["message"]
@@ -145,19 +184,14 @@ class TestWorkoutService:
     async def test_get_weekly_progress(self, workout_service, mock_database):
         """주간 진행 상황 조회 테스트"""
         mock_database.get_user_settings = AsyncMock(
-            return_value={
-                "user_id": 123,
-                "username": "테스트유저",
-                "weekly_goal": 5,
-                "total_penalty": 1500.0,
-            }
+            return_value=settings(123, "테스트유저", 5, 1500.0)
         )
         mock_database.get_weekly_workout_count = AsyncMock(return_value=3)
 
         with patch("utils.get_week_start_end") as mock_get_week:
             mock_get_week.return_value = (datetime.now(), datetime.now())
 
-            progress = await workout_service.get_weekly_progress(123)
+            progress = await workout_service.get_weekly_progress(GUILD_ID, 123)
 
         assert progress is not None
         assert progress.user_id == 123
@@ -168,37 +202,56 @@ class TestWorkoutService:
     @pytest.mark.asyncio
     async def test_revoke_workout_record_success(self, workout_service, mock_database):
         """운동 기록 취소 성공 테스트"""
-        mock_database.revoke_workout_record = AsyncMock(return_value=True)
+        mock_database.revoke_workout_with_progress = AsyncMock(
+            return_value={"status": "revoked", "current_count": 2, "weekly_goal": 5}
+        )
 
-        result = await workout_service.revoke_workout_record(123, datetime.now())
+        result = await workout_service.revoke_workout_record(
+            GUILD_ID, 123, datetime.now()
+        )
 
         assert result["success"] is True
         assert "운동 기록이 취소되었습니다" in result["message"]
+        assert result["current_count"] == 2
+        assert result["weekly_goal"] == 5
 
     @pytest.mark.asyncio
     async def test_revoke_workout_record_not_found(
         self, workout_service, mock_database
     ):
         """취소할 운동 기록 없음 테스트"""
-        mock_database.revoke_workout_record = AsyncMock(return_value=False)
+        mock_database.revoke_workout_with_progress = AsyncMock(
+            return_value={"status": "not_found", "current_count": 0, "weekly_goal": 0}
+        )
 
-        result = await workout_service.revoke_workout_record(123, datetime.now())
+        result = await workout_service.revoke_workout_record(
+            GUILD_ID, 123, datetime.now()
+        )
 
         assert result["success"] is False
         assert "취소할 운동 기록을 찾을 수 없습니다" in result["message"]
 
+    @pytest.mark.asyncio
+    async def test_revoke_workout_record_storage_error(
+        self, workout_service, mock_database
+    ):
+        """저장소 오류는 기록 없음이 아니라 처리 오류로 안내"""
+        mock_database.revoke_workout_with_progress = AsyncMock(return_value=None)
+
+        result = await workout_service.revoke_workout_record(
+            GUILD_ID, 123, datetime.now()
+        )
+
+        assert result["success"] is False
+        assert "오류가 발생했습니다" in result["message"]
+
     @pytest.mark.asyncio
     async def test_admin_add_workout_record_success(
         self, workout_service, mock_database
     ):
         """관리자 운동 기록 추가 성공 테스트"""
         mock_database.get_user_settings = AsyncMock(
-            return_value={
-                "user_id": 456,
-                "username": "대상유저",
-                "weekly_goal": 5,
-                "total_penalty": 0.0,
-            }
+            return_value=settings(456, "대상유저", 5, 0.0)
         )
         mock_database.add_workout_record = AsyncMock(return_value=True)
         mock_database.get_weekly_workout_count = AsyncMock(
@@ -211,7 +264,7 @@ class TestWorkoutService:
             mock_get_week.return_value = (datetime.now(), datetime.now())
 
             result = await workout_service.admin_add_workout_record(
-                456, "대상유저", target_date
+                GUILD_ID, 456, "대상유저", target_date
             )
 
         assert result["success"] is True
@@ -226,12 +279,7 @@ class TestReportService:
     async def test_get_user_weekly_summary_success(self, report_service, mock_database):
         """사용자 주간 요약 성공 테스트"""
         mock_database.get_user_settings = AsyncMock(
-            return_value={
-                "user_id": 123,
-                "username": "테스트유저",
-                "weekly_goal": 5,
-                "total_penalty": 1500.0,
-            }
+            return_value=settings(123, "테스트유저", 5, 1500.0)
         )
         mock_database.get_weekly_workout_count = AsyncMock(return_value=3)
 
@@ -241,7 +289,7 @@ class TestReportService:
             mock_get_week.return_value = (datetime.now(), datetime.now())
             mock_progress_bar.return_value = "███▒▒ 60%"
 
-            summary = await report_service.get_user_weekly_summary(123)
+            summary = await report_service.get_user_weekly_summary(GUILD_ID, 123)
 
         assert summary["success"] is True
         assert summary["username"] == "테스트유저"
@@ -259,7 +307,7 @@ class TestReportService:
         """사용자 설정 없음 테스트"""
         mock_database.get_user_settings = AsyncMock(return_value=None)
 
-        summary = await report_service.get_user_weekly_summary(123)
+        summary = await report_service.get_user_weekly_summary(GUILD_ID, 123)
 
         assert summary["success"] is False
         assert "사용자 설정을 찾을 수 없습니다" in summary["message"]
@@ -292,7 +340,7 @@ class TestReportService:
             mock_get_week.return_value = (datetime.now(), datetime.now())
             mock_progress_bar.return_value = "███▒▒ 60%"
 
-            report = await report_service.generate_weekly_report()
+            report = await report_service.generate_weekly_report(GUILD_ID)
 
         assert report["success"] is True
         assert len(report["user_reports"]) == 2
@@ -323,7 +371,419 @@ class TestReportService:
         with patch("utils.get_week_start_end") as mock_get_week:
             mock_get_week.return_value = (datetime.now(), datetime.now())
 
-            result = await report_service.save_weekly_penalties(user_reports)
+            result = await report_service.save_weekly_penalties(GUILD_ID, user_reports)
 
         assert result["success"] is True
         assert result["saved_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_weekly_penalty_records_batched(
+        self, report_service, mock_database
+    ):
+        """벌금 대상자만 모아 한 번에 정산"""
+        mock_database.iter_users_weekly_data = stream(
+            [
+                weekly(123, "유저1", 5, 3, 1000.0),
+                weekly(456, "유저2", 4, 4, 500.0),
+            ]
+        )
+        mock_database.settle_weekly_penalties = AsyncMock(
+            return_value={"processed_count": 1, "total_penalty_added": 4032.0}
+        )
+        week_start = datetime(2025, 1, 13)
+
+        result = await report_service.process_weekly_penalty_records(
+            GUILD_ID, week_start
+        )
+
+        assert result["success"] is True
+        assert result["processed_count"] == 1
+        assert result["total_penalty_added"] == 4032.0
+        mock_database.settle_weekly_penalties.assert_awaited_once_with(
+            GUILD_ID,
+            week_start,
+            [
+                {
+                    "user_id": 123,
+                    "username": "유저1",
+                    "goal_count": 5,
+                    "actual_count": 3,
+                    "penalty_amount": 4032.0,
+                }
+            ],
+        )
+
+    @pytest.mark.asyncio
+    async def test_process_weekly_penalty_records_records_settled_stage(
+        self, report_service, mock_database
+    ):
+        """모든 배치가 끝나면 정산 단계 완료 기록, 실패하면 기록하지 않음"""
+        mock_database.iter_users_weekly_data = stream([weekly(123, "유저1", 5, 3)])
+        mock_database.settle_weekly_penalties = AsyncMock(
+            side_effect=[{"processed_count": 1, "total_penalty_added": 4032.0}, None]
+        )
+        mock_database.record_weekly_close_stage = AsyncMock(return_value=True)
+        week_start = datetime(2025, 1, 13)
+
+        await report_service.process_weekly_penalty_records(GUILD_ID, week_start)
+        failed = await report_service.process_weekly_penalty_records(
+            GUILD_ID, week_start
+        )
+
+        assert failed["success"] is False
+        mock_database.record_weekly_close_stage.assert_awaited_once_with(
+            GUILD_ID, week_start, "settled"
+        )
+
+    def test_get_due_week_date(self, report_service):
+        """이번 주 리포트 시각 전이면 지지난 주, 지나면 지난 주"""
+        with patch("services.report_service.REPORT_DAY_OF_WEEK", 0), patch(
+            "services.report_service.REPORT_HOUR", 9
+        ), patch("services.report_service.REPORT_MINUTE", 0):
+            before = report_service.get_due_week_date(datetime(2025, 1, 20, 8, 59))
+            after = report_service.get_due_week_date(datetime(2025, 1, 20, 9, 0))
+
+        assert before == datetime(2025, 1, 6)
+        assert after == datetime(2025, 1, 13)
+
+    @pytest.mark.asyncio
+    async def test_get_open_weeks(self, report_service, mock_database, caplog):
+        """마지막 마감 주 다음 주부터 오래된 순서로, 최대 주 수까지 (넘는 주는 경고)"""
+        due_week = datetime(2025, 2, 3)
+        mock_database.get_unclosed_weeks = AsyncMock(return_value=[])
+        mock_database.get_last_closed_week = AsyncMock(return_value=date(2025, 1, 13))
+
+        weeks = await report_service.get_open_weeks(GUILD_ID, due_week)
+        with caplog.at_level(logging.WARNING, logger="services.report_service"):
+            capped = await report_service.get_open_weeks(
+                GUILD_ID, due_week, max_weeks=2
+            )
+
+        assert weeks == [
+            datetime(2025, 1, 20),
+            datetime(2025, 1, 27),
+            datetime(2025, 2, 3),
+        ]
+        assert capped == [datetime(2025, 1, 27), datetime(2025, 2, 3)]
+        assert "2025-01-20" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_get_open_weeks_retries_unclosed(self, report_service, mock_database):
+        """이후 주가 마감됐어도 전송이 끝나지 않은 이전 주는 한도와 관계없이 다시 처리"""
+        due_week = datetime(2025, 2, 3)
+        mock_database.get_unclosed_weeks = AsyncMock(
+            return_value=[date(2024, 12, 2), date(2025, 1, 27)]
+        )
+        mock_database.get_last_closed_week = AsyncMock(return_value=date(2025, 1, 20))
+
+        weeks = await report_service.get_open_weeks(GUILD_ID, due_week, max_weeks=1)
+
+        assert weeks == [
+            datetime(2024, 12, 2),
+            datetime(2025, 1, 27),
+            datetime(2025, 2, 3),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_open_weeks_closed_or_new_guild(
+        self, report_service, mock_database
+    ):
+        """이미 마감됐으면 없음, 마감 기록이 없는 서버는 기준 주만"""
+        due_week = datetime(2025, 2, 3)
+        mock_database.get_unclosed_weeks = AsyncMock(return_value=[])
+
+        mock_database.get_last_closed_week = AsyncMock(return_value=date(2025, 2, 3))
+        assert await report_service.get_open_weeks(GUILD_ID, due_week) == []
+
+        mock_database.get_last_closed_week = AsyncMock(return_value=None)
+        assert await report_service.get_open_weeks(GUILD_ID, due_week) == [due_week]
+
+    @pytest.mark.asyncio
+    async def test_close_week_single_pass(self, report_service, mock_database):
+        """한 번 읽은 데이터로 정산/스냅샷/전송, 새로 정산된 사용자만 누적 벌금에 더함"""
+        week_start = datetime(2025, 1, 13)
+        scan = Mock(
+            side_effect=stream(
+                [weekly(123, "유저1", 5, 3, 1000.0), weekly(456, "유저2", 4, 1, 500.0)]
+            )
+        )
+        mock_database.iter_users_weekly_data = scan
+        mock_database.get_weekly_close_run = AsyncMock(return_value=None)
+        mock_database.reconcile_weekly_progress = AsyncMock(return_value=[])
+        mock_database.settle_weekly_penalties = AsyncMock(
+            return_value={
+                "processed_count": 1,
+                "total_penalty_added": 4032.0,
+                "settled_user_ids": [123],
+            }
+        )
+        mock_database.get_total_accumulated_penalty = AsyncMock(return_value=5532.0)
+        mock_database.save_weekly_report_snapshot = AsyncMock(return_value=True)
+        mock_database.record_weekly_close_stage = AsyncMock(return_value=True)
+        broadcast = AsyncMock(return_value=555)
+
+        result = await report_service.close_week(GUILD_ID, week_start, broadcast)
+
+        assert result == {
+            "success": True,
+            "stages": ["settled", "snapshot", "broadcast"],
+        }
+        scan.assert_called_once()
+        report_data = broadcast.await_args.args[0]
+        # 456은 이전 실행에서 이미 정산되어 읽은 값에 포함되어 있음
+        assert [row["total_penalty"] for row in report_data["report_data"]] == [
+            5032.0,
+            500.0,
+        ]
+        assert [
+            call.args[2]
+            for call in mock_database.record_weekly_close_stage.await_args_list
+        ] == ["settled", "snapshot", "broadcast"]
+        assert mock_database.record_weekly_close_stage.await_args.kwargs == {
+            "report_message_id": 555
+        }
+
+    @pytest.mark.asyncio
+    async def test_close_week_empty_week_is_closed(self, report_service, mock_database):
+        """사용자가 없는 주는 전송 없이 마감으로 기록 (이후 주가 막히지 않음)"""
+        week_start = datetime(2025, 1, 13)
+        mock_database.get_weekly_close_run = AsyncMock(return_value=None)
+        mock_database.reconcile_weekly_progress = AsyncMock(return_value=[])
+        mock_database.iter_users_weekly_data = stream([])
+        mock_database.record_weekly_close_stage = AsyncMock(return_value=True)
+        broadcast = AsyncMock()
+
+        result = await report_service.close_week(GUILD_ID, week_start, broadcast)
+
+        assert result == {
+            "success": True,
+            "stages": ["settled", "snapshot", "broadcast"],
+            "empty": True,
+        }
+        broadcast.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_close_week_stops_when_reconcile_fails(
+        self, report_service, mock_database
+    ):
+        """카운터 보정이 실패하면 정산하지 않음"""
+        mock_database.get_weekly_close_run = AsyncMock(return_value=None)
+        mock_database.reconcile_weekly_progress = AsyncMock(return_value=None)
+        mock_database.settle_weekly_penalties = AsyncMock()
+
+        result = await report_service.close_week(
+            GUILD_ID, datetime(2025, 1, 13), AsyncMock()
+        )
+
+        assert result["success"] is False
+        mock_database.settle_weekly_penalties.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_close_week_resumes_from_broadcast(
+        self, report_service, mock_database
+    ):
+        """정산/스냅샷이 끝난 주는 스냅샷으로 전송만 다시 시도"""
+        week_start = datetime(2025, 1, 13)
+        done = datetime(2025, 1, 20, 9, 0)
+        mock_database.get_weekly_close_run = AsyncMock(
+            return_value=WeeklyCloseRun(
+                GUILD_ID, week_start.date(), settled_at=done, snapshot_at=done
+            )
+        )
+        mock_database.get_weekly_report_snapshot = AsyncMock(
+            return_value={
+                "report_data": [],
+                "total_weekly_penalty": 0.0,
+                "total_accumulated_penalty": 0.0,
+                "participant_count": 0,
+            }
+        )
+        mock_database.iter_users_weekly_data = Mock()
+        mock_database.settle_weekly_penalties = AsyncMock()
+        mock_database.record_weekly_close_stage = AsyncMock(return_value=True)
+        broadcast = AsyncMock(side_effect=[None, 555])
+
+        failed = await report_service.close_week(GUILD_ID, week_start, broadcast)
+        resumed = await report_service.close_week(GUILD_ID, week_start, broadcast)
+
+        assert failed["success"] is False
+        assert failed["stages"] == []
+        assert resumed == {"success": True, "stages": ["broadcast"]}
+        mock_database.iter_users_weekly_data.assert_not_called()
+        mock_database.settle_weekly_penalties.assert_not_called()
+        mock_database.record_weekly_close_stage.assert_awaited_once_with(
+            GUILD_ID, week_start, "broadcast", report_message_id=555
+        )
+
+    @pytest.mark.asyncio
+    async def test_process_weekly_penalty_records_in_batches(
+        self, report_service, mock_database
+    ):
+        """스트리밍 중 배치 크기마다 나누어 정산"""
+        mock_database.iter_users_weekly_data = stream(
+            [weekly(user_id, f"유저{user_id}", 5, 4, 0.0) for user_id in range(1, 6)]
+        )
+        mock_database.settle_weekly_penalties = AsyncMock(
+            return_value={"processed_count": 2, "total_penalty_added": 4032.0}
+        )
+
+        with patch("services.report_service.DATABASE_SCAN_PAGE_SIZE", 2):
+            result = await report_service.process_weekly_penalty_records(
+                GUILD_ID, datetime(2025, 1, 13)
+            )
+
+        batch_sizes = [
+            len(call.args[2])
+            for call in mock_database.settle_weekly_penalties.await_args_list
+        ]
+        assert batch_sizes == [2, 2, 1]
+        assert result["processed_count"] == 6
+        assert result["total_penalty_added"] == 12096.0
+
+    @pytest.mark.asyncio
+    async def test_process_weekly_penalty_records_stops_on_failure(
+        self, report_service, mock_database
+    ):
+        """배치 정산이 실패하면 중단"""
+        mock_database.iter_users_weekly_data = stream(
+            [weekly(user_id, f"유저{user_id}", 5, 0, 0.0) for user_id in range(1, 6)]
+        )
+        mock_database.settle_weekly_penalties = AsyncMock(return_value=None)
+
+        with patch("services.report_service.DATABASE_SCAN_PAGE_SIZE", 2):
+            result = await report_service.process_weekly_penalty_records(
+                GUILD_ID, datetime(2025, 1, 13)
+            )
+
+        assert result["success"] is False
+        mock_database.settle_weekly_penalties.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_weekly_history_matrix(self, report_service, mock_database):
+        """주 × 사용자 행렬: 정산된 주는 저장된 벌금, 나머지는 계산한 벌금"""
+        first, second = date(2025, 1, 6), date(2025, 1, 13)
+        mock_database.get_weekly_history = AsyncMock(
+            return_value=[
+                WeeklyResult(123, "유저1", first, 5, 3, 4032.0),
+                WeeklyResult(123, "유저1", second, 5, 5),
+                WeeklyResult(456, "유저2", first, 4, 4),
+                WeeklyResult(456, "유저2", second, 4, 2),
+            ]
+        )
+
+        history = await report_service.get_weekly_history(
+            GUILD_ID, datetime(2025, 1, 6), datetime(2025, 1, 13)
+        )
+
+        assert history["success"] is True
+        assert history["weeks"] == [first, second]
+        assert history["users"] == {123: "유저1", 456: "유저2"}
+        assert history["matrix"][first][123] == {
+            "goal": 5,
+            "actual": 3,
+            "weekly_penalty": 4032.0,
+            "is_settled": True,
+        }
+        assert history["matrix"][second][456]["weekly_penalty"] == 5040  # 2 * 2520
+        assert history["weekly_totals"] == {first: 4032.0, second: 5040}
+        mock_database.get_weekly_history.assert_awaited_once_with(
+            GUILD_ID, datetime(2025, 1, 6), datetime(2025, 1, 13), None
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_weekly_report_data_from_snapshot(
+        self, report_service, mock_database
+    ):
+        """스냅샷이 있으면 집계 없이 그대로 반환"""
+        week_start = datetime(2025, 1, 13)
+        mock_database.get_weekly_report_snapshot = AsyncMock(
+            return_value={
+                "report_data": [{"user_id": 123, "actual": 3}],
+                "total_weekly_penalty": 4032.0,
+                "total_accumulated_penalty": 10000.0,
+                "participant_count": 1,
+            }
+        )
+        mock_database.iter_users_weekly_data = Mock()
+
+        report = await report_service.get_weekly_report_data(GUILD_ID, week_start)
+
+        assert report["success"] is True
+        assert report["week_start"] == week_start
+        assert report["week_end"] == datetime(2025, 1, 19)
+        assert report["total_weekly_penalty"] == 4032.0
+        mock_database.iter_users_weekly_data.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_weekly_report_data_unsettled_week_not_saved(
+        self, report_service, mock_database
+    ):
+        """정산 전인 주는 현재 기록으로 집계만 하고 스냅샷은 저장하지 않음"""
+        mock_database.get_weekly_report_snapshot = AsyncMock(return_value=None)
+        mock_database.get_weekly_close_run = AsyncMock(return_value=None)
+        mock_database.iter_users_weekly_data = stream([weekly(123, "유저1", 5, 3)])
+        mock_database.get_total_accumulated_penalty = AsyncMock(return_value=0.0)
+        mock_database.save_weekly_report_snapshot = AsyncMock(return_value=True)
+
+        report = await report_service.get_weekly_report_data(
+            GUILD_ID, datetime(2025, 1, 13)
+        )
+
+        assert report["participant_count"] == 1
+        mock_database.save_weekly_report_snapshot.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_weekly_report_data_rebuilds_settled_week(
+        self, report_service, mock_database
+    ):
+        """무효화된 정산 주는 정산 기록으로 다시 구성해 저장 (이후 주 벌금은 누적에서 제외)"""
+        week, next_week = date(2025, 1, 13), date(2025, 1, 20)
+        closed_week = datetime(2025, 1, 13)
+        mock_database.get_weekly_report_snapshot = AsyncMock(return_value=None)
+        mock_database.get_weekly_close_run = AsyncMock(
+            return_value=WeeklyCloseRun(
+                GUILD_ID, week, settled_at=datetime(2025, 1, 20, 9, 0)
+            )
+        )
+        # 정산 후 기록이 바뀌어 현재 횟수로 계산하면 벌금이 달라지는 상황
+        mock_database.get_weekly_history = AsyncMock(
+            return_value=[
+                WeeklyResult(123, "유저1", week, 5, 4, 4032.0),
+                WeeklyResult(123, "유저1", next_week, 5, 5, 1000.0),
+                WeeklyResult(456, "유저2", week, 4, 1),
+                WeeklyResult(456, "유저2", next_week, 4, 4),
+            ]
+        )
+        mock_database.iter_user_settings = stream(
+            [settings(123, "유저1", 5, 6032.0), settings(456, "유저2", 4, 500.0)]
+        )
+        # 서버 전체 누적 (목록에 없는 사용자의 벌금 2000원 포함)
+        mock_database.get_total_accumulated_penalty = AsyncMock(return_value=8532.0)
+        mock_database.iter_users_weekly_data = Mock()
+        mock_database.save_weekly_report_snapshot = AsyncMock(return_value=True)
+
+        report = await report_service.get_weekly_report_data(GUILD_ID, closed_week)
+
+        assert [
+            (
+                row["user_id"],
+                row["goal"],
+                row["actual"],
+                row["weekly_penalty"],
+                row["total_penalty"],
+            )
+            for row in report["report_data"]
+        ] == [(123, 5, 4, 4032.0, 5032.0), (456, 4, 1, 0.0, 500.0)]
+        assert report["total_weekly_penalty"] == 4032.0
+        assert report["total_accumulated_penalty"] == 7532.0
+        mock_database.iter_users_weekly_data.assert_not_called()
+        mock_database.save_weekly_report_snapshot.assert_awaited_once_with(
+            GUILD_ID,
+            closed_week,
+            {
+                "report_data": report["report_data"],
+                "total_weekly_penalty": 4032.0,
+                "total_accumulated_penalty": 7532.0,
+                "participant_count": 2,
+            },
+        )
@@ -0,0 +1,689 @@
+"""저장소 백엔드 테스트 (실제 쿼리 의미 검증)"""
+
+import asyncio
+import sqlite3
+import time
+import pytest
+import pytest_asyncio
+from datetime import datetime
+
+from services import PenaltyService, WorkoutService, ReportService
+from models import UserSettings
+from storage import InMemoryDatabase, SQLiteDatabase
+
+GUILD_ID = 987654321
+OTHER_GUILD_ID = 123456789
+WEEK_START = datetime(2025, 1, 13)
+MONDAY = datetime(2025, 1, 13)
+TUESDAY = datetime(2025, 1, 14)
+
+
+@pytest_asyncio.fixture(params=["sqlite", "memory"])
+async def storage(request, tmp_path):
+    """스키마가 생성된 저장소 (백엔드별로 같은 테스트 실행)"""
+    if request.param == "sqlite":
+        db = SQLiteDatabase(str(tmp_path / "workout_bot.db"))
+    else:
+        db = InMemoryDatabase()
+    await db.init_db()
+    yield db
+    await db.close()
+
+
+@pytest_asyncio.fixture
+async def sqlite_storage(tmp_path):
+    """SQLite 저장소"""
+    db = SQLiteDatabase(str(tmp_path / "workout_bot.db"))
+    await db.init_db()
+    yield db
+    await db.close()
+
+
+def corrupt_weekly_progress(storage, active_count: int):
+    """트리거/쓰기 경로를 우회해 주간 카운터를 어긋나게 만듦"""
+    if isinstance(storage, SQLiteDatabase):
+        storage.conn.execute(
+            "UPDATE weekly_progress SET active_count = ?", (active_count,)
+        )
+    else:
+        for progress in storage.weekly_progress.values():
+            for key in progress:
+                progress[key] = active_count
+
+
+def set_joined(storage, user_id: int, joined: datetime):
+    """사용자 가입 시각(user_settings.created_at) 변경"""
+    if isinstance(storage, SQLiteDatabase):
+        storage.conn.execute(
+            "UPDATE user_settings SET created_at = ? WHERE guild_id = ? AND user_id = ?",
+            (joined.isoformat(), GUILD_ID, user_id),
+        )
+    else:
+        storage.user_settings[GUILD_ID][user_id]["created_at"] = joined.isoformat()
+
+
+class TestStorageBackend:
+    """저장소 연산 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_set_and_get_user_goal(self, storage):
+        """목표 설정 후 조회"""
+        assert await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5) is True
+        assert await storage.set_user_goal(GUILD_ID, 123, "새이름", 6) is True
+
+        settings = await storage.get_user_settings(GUILD_ID, 123)
+
+        assert isinstance(settings, UserSettings)
+        assert settings.username == "새이름"
+        assert settings.weekly_goal == 6
+        assert settings.total_penalty == 0.0
+        assert isinstance(settings.created_at, datetime)
+        assert await storage.get_user_settings(GUILD_ID, 456) is None
+
+    @pytest.mark.asyncio
+    async def test_add_revoke_add_revives_record(self, storage):
+        """add -> revoke -> add 시 취소된 기록을 재활성화"""
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+
+        added = await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        duplicate = await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        revoked = await storage.revoke_workout_with_progress(GUILD_ID, 123, MONDAY)
+        revived = await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+
+        assert added == {"status": "added", "current_count": 1, "weekly_goal": 5}
+        assert duplicate["status"] == "duplicate"
+        assert revoked == {"status": "revoked", "current_count": 0, "weekly_goal": 5}
+        assert revived == {"status": "revived", "current_count": 1, "weekly_goal": 5}
+
+    @pytest.mark.asyncio
+    async def test_add_without_settings(self, storage):
+        """목표 미설정 사용자"""
+        result = await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+
+        assert result["status"] == "no_settings"
+
+    @pytest.mark.asyncio
+    async def test_revoke_not_found(self, storage):
+        """취소할 기록 없음"""
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+
+        result = await storage.revoke_workout_with_progress(GUILD_ID, 123, MONDAY)
+
+        assert result["status"] == "not_found"
+
+    @pytest.mark.asyncio
+    async def test_one_active_record_per_day(self, storage):
+        """하루에 활성 기록은 하나만 허용"""
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+
+        added = await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        duplicate = await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        revoked = await storage.revoke_workout_with_progress(GUILD_ID, 123, MONDAY)
+        revived = await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+
+        assert added["status"] == "added"
+        assert duplicate["status"] == "duplicate"
+        assert revoked["status"] == "revoked"
+        assert revived["status"] == "revived"
+        assert await storage.get_weekly_workout_count(GUILD_ID, 123, WEEK_START) == 1
+
+    @pytest.mark.asyncio
+    async def test_weekly_data_and_settlement(self, storage):
+        """주간 집계 및 벌금 정산 (중복 정산 방지)"""
+        await storage.set_user_goal(GUILD_ID, 123, "유저1", 5)
+        await storage.set_user_goal(GUILD_ID, 456, "유저2", 4)
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "유저1", MONDAY, WEEK_START
+        )
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "유저1", TUESDAY, WEEK_START
+        )
+
+        weekly_data = await storage.get_all_users_weekly_data(GUILD_ID, WEEK_START)
+        assert [(row.user_id, row.current_count) for row in weekly_data] == [
+            (123, 2),
+            (456, 0),
+        ]
+
+        penalties = [
+            {
+                "user_id": 123,
+                "username": "유저1",
+                "goal_count": 5,
+                "actual_count": 2,
+                "penalty_amount": 6048.0,
+            }
+        ]
+        first = await storage.settle_weekly_penalties(GUILD_ID, WEEK_START, penalties)
+        second = await storage.settle_weekly_penalties(GUILD_ID, WEEK_START, penalties)
+
+        assert first == {
+            "processed_count": 1,
+            "total_penalty_added": 6048.0,
+            "settled_user_ids": [123],
+        }
+        assert second == {
+            "processed_count": 0,
+            "total_penalty_added": 0.0,
+            "settled_user_ids": [],
+        }
+        assert (await storage.get_user_settings(GUILD_ID, 123)).total_penalty == 6048.0
+        assert await storage.get_total_accumulated_penalty(GUILD_ID) == 6048.0
+
+    @pytest.mark.asyncio
+    async def test_weekly_history_matrix(self, storage):
+        """주 범위 × 사용자 행렬 (기록 없는 주는 0회, 정산된 주는 정산 당시 목표)"""
+        next_week = datetime(2025, 1, 20)
+        await storage.set_user_goal(GUILD_ID, 123, "유저1", 5)
+        await storage.set_user_goal(GUILD_ID, 456, "유저2", 4)
+        set_joined(storage, 123, datetime(2025, 1, 1))
+        set_joined(storage, 456, datetime(2025, 1, 1))
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "유저1", MONDAY, WEEK_START
+        )
+        await storage.add_workout_with_progress(
+            GUILD_ID, 456, "유저2", datetime(2025, 1, 21), next_week
+        )
+        await storage.settle_weekly_penalties(
+            GUILD_ID,
+            WEEK_START,
+            [
+                {
+                    "user_id": 123,
+                    "username": "유저1",
+                    "goal_count": 5,
+                    "actual_count": 1,
+                    "penalty_amount": 8064.0,
+                }
+            ],
+        )
+        await storage.set_user_goal(GUILD_ID, 123, "유저1", 7)
+
+        history = await storage.get_weekly_history(
+            GUILD_ID, WEEK_START, datetime(2025, 1, 27)
+        )
+        single = await storage.get_weekly_history(
+            GUILD_ID, WEEK_START, next_week, user_id=456
+        )
+
+        assert [
+            (
+                row.user_id,
+                row.week_start_date.isoformat(),
+                row.goal_count,
+                row.actual_count,
+                row.penalty_amount,
+            )
+            for row in history
+        ] == [
+            (123, "2025-01-13", 5, 1, 8064.0),
+            (123, "2025-01-20", 7, 0, None),
+            (123, "2025-01-27", 7, 0, None),
+            (456, "2025-01-13", 4, 0, None),
+            (456, "2025-01-20", 4, 1, None),
+            (456, "2025-01-27", 4, 0, None),
+        ]
+        assert history[0].guild_id == GUILD_ID
+        assert [(row.user_id, row.actual_count) for row in single] == [
+            (456, 0),
+            (456, 1),
+        ]
+        assert await storage.get_weekly_history(GUILD_ID, next_week, WEEK_START) == []
+
+    @pytest.mark.asyncio
+    async def test_weekly_history_skips_weeks_before_joining(self, storage):
+        """가입 전 주는 이력에 없음 (새 사용자에게 지난 주 벌금을 매기지 않음)"""
+        await storage.set_user_goal(GUILD_ID, 123, "기존유저", 5)
+        await storage.set_user_goal(GUILD_ID, 456, "새유저", 5)
+        set_joined(storage, 123, datetime(2024, 12, 1))
+        set_joined(storage, 456, datetime(2025, 1, 22))  # 1/20 주 수요일 가입
+
+        history = await storage.get_weekly_history(
+            GUILD_ID, WEEK_START, datetime(2025, 1, 27)
+        )
+
+        assert [(row.user_id, row.week_start_date.isoformat()) for row in history] == [
+            (123, "2025-01-13"),
+            (123, "2025-01-20"),
+            (123, "2025-01-27"),
+            (456, "2025-01-20"),
+            (456, "2025-01-27"),
+        ]
+        # 범위가 끝난 뒤 가입한 사용자는 행이 없음
+        assert (
+            await storage.get_weekly_history(
+                GUILD_ID, WEEK_START, WEEK_START, user_id=456
+            )
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_weekly_history_settled_week_without_penalty(self, storage):
+        """정산된 주에 벌금 기록이 없으면 (목표 달성) 0원, 정산 전인 주는 None"""
+        next_week = datetime(2025, 1, 20)
+        await storage.set_user_goal(GUILD_ID, 123, "유저1", 4)
+        set_joined(storage, 123, datetime(2025, 1, 1))
+        for day in range(13, 17):
+            await storage.add_workout_with_progress(
+                GUILD_ID, 123, "유저1", datetime(2025, 1, day), WEEK_START
+            )
+        await storage.settle_weekly_penalties(GUILD_ID, WEEK_START, [])
+        await storage.record_weekly_close_stage(GUILD_ID, WEEK_START, "settled")
+
+        history = await storage.get_weekly_history(GUILD_ID, WEEK_START, next_week)
+
+        assert [
+            (row.week_start_date.isoformat(), row.actual_count, row.penalty_amount)
+            for row in history
+        ] == [("2025-01-13", 4, 0.0), ("2025-01-20", 0, None)]
+        assert history[0].is_settled
+        assert not history[1].is_settled
+
+    @pytest.mark.asyncio
+    async def test_report_snapshot_invalidated_by_backdated_change(self, storage):
+        """해당 주의 기록이 바뀌면 스냅샷이 지워지고 다른 주는 유지"""
+        next_week = datetime(2025, 1, 20)
+        report = {
+            "report_data": [{"user_id": 123, "actual": 1}],
+            "participant_count": 1,
+        }
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        assert await storage.save_weekly_report_snapshot(GUILD_ID, WEEK_START, report)
+        assert await storage.save_weekly_report_snapshot(GUILD_ID, next_week, report)
+
+        assert await storage.get_weekly_report_snapshot(GUILD_ID, WEEK_START) == report
+        assert (
+            await storage.get_weekly_report_snapshot(OTHER_GUILD_ID, WEEK_START) is None
+        )
+
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", TUESDAY, WEEK_START
+        )
+        assert await storage.get_weekly_report_snapshot(GUILD_ID, WEEK_START) is None
+        assert await storage.get_weekly_report_snapshot(GUILD_ID, next_week) == report
+
+        await storage.save_weekly_report_snapshot(GUILD_ID, WEEK_START, report)
+        await storage.revoke_workout_with_progress(GUILD_ID, 123, TUESDAY)
+        assert await storage.get_weekly_report_snapshot(GUILD_ID, WEEK_START) is None
+
+        await storage.reset_database(GUILD_ID)
+        assert await storage.get_weekly_report_snapshot(GUILD_ID, next_week) is None
+
+    @pytest.mark.asyncio
+    async def test_reconcile_weekly_progress(self, storage):
+        """카운터 불일치 보정"""
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        assert await storage.reconcile_weekly_progress(GUILD_ID) == []
+
+        corrupt_weekly_progress(storage, 7)
+        drift = await storage.reconcile_weekly_progress(GUILD_ID, WEEK_START)
+
+        assert drift == [
+            {
+                "guild_id": GUILD_ID,
+                "user_id": 123,
+                "week_start_date": "2025-01-13",
+                "stored_count": 7,
+                "actual_count": 1,
+            }
+        ]
+        assert await storage.get_weekly_workout_count(GUILD_ID, 123, WEEK_START) == 1
+
+    @pytest.mark.asyncio
+    async def test_scans_page_through_all_rows(self, storage):
+        """페이지 크기와 무관하게 모든 행을 키 순서대로 스트리밍"""
+        for user_id in (5, 3, 1, 4, 2):
+            await storage.set_user_goal(GUILD_ID, user_id, f"유저{user_id}", 4)
+            await storage.add_workout_with_progress(
+                GUILD_ID, user_id, f"유저{user_id}", MONDAY, WEEK_START
+            )
+        await storage.revoke_workout_with_progress(GUILD_ID, 3, MONDAY)
+
+        settings = [
+            row async for row in storage.iter_user_settings(GUILD_ID, page_size=2)
+        ]
+        weekly = [
+            row
+            async for row in storage.iter_users_weekly_data(
+                GUILD_ID, WEEK_START, page_size=2
+            )
+        ]
+        active = [
+            row async for row in storage.iter_workout_records(GUILD_ID, page_size=2)
+        ]
+        history = [
+            row
+            async for row in storage.iter_workout_records(
+                GUILD_ID, user_id=3, include_revoked=True, page_size=2
+            )
+        ]
+
+        assert [row.user_id for row in settings] == [1, 2, 3, 4, 5]
+        assert [(row.user_id, row.current_count) for row in weekly] == [
+            (1, 1),
+            (2, 1),
+            (3, 0),
+            (4, 1),
+            (5, 1),
+        ]
+        assert len(active) == 4
+        assert [row.id for row in active] == sorted(row.id for row in active)
+        assert active[0].workout_date == MONDAY.date()
+        assert len(history) == 1 and history[0].is_revoked is True
+
+    @pytest.mark.asyncio
+    async def test_reset_database(self, storage):
+        """전체 초기화"""
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+
+        await storage.set_user_goal(OTHER_GUILD_ID, 123, "테스트유저", 5)
+
+        assert await storage.reset_database(GUILD_ID) is True
+        assert await storage.get_user_settings(GUILD_ID, 123) is None
+        assert await storage.get_weekly_workout_count(GUILD_ID, 123, WEEK_START) == 0
+        assert await storage.get_user_settings(OTHER_GUILD_ID, 123) is not None
+
+    @pytest.mark.asyncio
+    async def test_guilds_are_isolated(self, storage):
+        """같은 사용자라도 서버마다 목표/기록/벌금이 따로 관리됨"""
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+        await storage.set_user_goal(OTHER_GUILD_ID, 123, "테스트유저", 3)
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        other = await storage.add_workout_with_progress(
+            OTHER_GUILD_ID, 123, "테스트유저", MONDAY, WEEK_START
+        )
+        await storage.settle_weekly_penalties(
+            GUILD_ID,
+            WEEK_START,
+            [
+                {
+                    "user_id": 123,
+                    "username": "테스트유저",
+                    "goal_count": 5,
+                    "actual_count": 1,
+                    "penalty_amount": 10080.0,
+                }
+            ],
+        )
+
+        assert other == {"status": "added", "current_count": 1, "weekly_goal": 3}
+        assert (await storage.get_user_settings(OTHER_GUILD_ID, 123)).weekly_goal == 3
+        assert await storage.get_total_accumulated_penalty(GUILD_ID) == 10080.0
+        assert await storage.get_total_accumulated_penalty(OTHER_GUILD_ID) == 0.0
+        assert [
+            row.guild_id
+            for row in await storage.get_all_users_weekly_data(
+                OTHER_GUILD_ID, WEEK_START
+            )
+        ] == [OTHER_GUILD_ID]
+
+    @pytest.mark.asyncio
+    async def test_weekly_close_run_stages(self, storage):
+        """단계별 완료 기록, 마지막 마감 주는 전송까지 끝난 주만, 나머지는 마감되지 않은 주 (서버별)"""
+        next_week = datetime(2025, 1, 20)
+        assert await storage.get_weekly_close_run(GUILD_ID, WEEK_START) is None
+        assert await storage.get_last_closed_week(GUILD_ID) is None
+
+        for stage in ("settled", "snapshot", "broadcast"):
+            assert await storage.record_weekly_close_stage(GUILD_ID, WEEK_START, stage)
+        assert await storage.record_weekly_close_stage(
+            GUILD_ID, WEEK_START, "broadcast", report_message_id=555
+        )
+        assert await storage.record_weekly_close_stage(GUILD_ID, next_week, "settled")
+        assert not await storage.record_weekly_close_stage(
+            GUILD_ID, next_week, "unknown"
+        )
+
+        closed = await storage.get_weekly_close_run(GUILD_ID, WEEK_START)
+        assert closed.is_closed
+        assert closed.report_message_id == 555
+
+        # 다시 기록해도 처음 시각과 메시지 ID 유지
+        assert await storage.record_weekly_close_stage(
+            GUILD_ID, WEEK_START, "broadcast", report_message_id=777
+        )
+        again = await storage.get_weekly_close_run(GUILD_ID, WEEK_START)
+        assert again.broadcast_at == closed.broadcast_at
+        assert again.report_message_id == 555
+        open_run = await storage.get_weekly_close_run(GUILD_ID, next_week)
+        assert open_run.next_stage == "snapshot"
+
+        assert await storage.get_last_closed_week(GUILD_ID) == WEEK_START.date()
+        assert await storage.get_last_closed_week(OTHER_GUILD_ID) is None
+        assert await storage.get_unclosed_weeks(GUILD_ID) == [next_week.date()]
+        assert await storage.get_unclosed_weeks(OTHER_GUILD_ID) == []
+
+        await storage.reset_database(GUILD_ID)
+        assert await storage.get_last_closed_week(GUILD_ID) is None
+        assert await storage.get_unclosed_weeks(GUILD_ID) == []
+
+
+class TestSQLiteDatabase:
+    """SQLite 전용 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_wal_mode(self, sqlite_storage):
+        """WAL 모드로 열림"""
+        mode = sqlite_storage.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    @pytest.mark.asyncio
+    async def test_partial_unique_index(self, sqlite_storage):
+        """스키마 수준에서 활성 기록 중복을 막음"""
+        storage = sqlite_storage
+        await storage.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+        insert = (
+            "INSERT INTO workout_records "
+            "(guild_id, user_id, username, workout_date, week_start_date, is_revoked) "
+            "VALUES (?, 123, '테스트유저', '2025-01-13', '2025-01-13', ?)"
+        )
+        storage.conn.execute(insert, (GUILD_ID, 1))
+        storage.conn.execute(insert, (GUILD_ID, 1))
+        storage.conn.execute(insert, (GUILD_ID, 0))
+
+        with pytest.raises(sqlite3.IntegrityError):
+            storage.conn.execute(insert, (GUILD_ID, 0))
+
+
+class TestInMemoryDatabase:
+    """인메모리 저장소 전용 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_call_counts(self):
+        """메서드별 호출 횟수 기록"""
+        db = InMemoryDatabase()
+        await db.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+        await db.get_user_settings(GUILD_ID, 123)
+        await db.get_user_settings(GUILD_ID, 123)
+
+        assert db.calls["set_user_goal"] == 1
+        assert db.calls["get_user_settings"] == 2
+
+    @pytest.mark.asyncio
+    async def test_latency_injection(self):
+        """호출마다 지연 시간 주입 (메서드별 설정 우선)"""
+        db = InMemoryDatabase(latency=0.05, method_latency={"get_user_settings": 0.0})
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(db.set_user_goal(GUILD_ID, i, f"유저{i}", 4) for i in range(5))
+        )
+        concurrent_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await db.get_user_settings(GUILD_ID, 0)
+        fast_elapsed = time.perf_counter() - start
+
+        assert 0.05 <= concurrent_elapsed < 0.25
+        assert fast_elapsed < 0.05
+
+    @pytest.mark.asyncio
+    async def test_unique_penalty_per_week(self):
+        """사용자/주당 벌금 기록은 하나만 허용"""
+        db = InMemoryDatabase()
+        await db.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+
+        penalties = [
+            {
+                "user_id": 123,
+                "username": "테스트유저",
+                "goal_count": 5,
+                "actual_count": 2,
+                "penalty_amount": 6048.0,
+            }
+        ]
+
+        first = await db.settle_weekly_penalties(GUILD_ID, WEEK_START, penalties)
+        second = await db.settle_weekly_penalties(GUILD_ID, WEEK_START, penalties)
+
+        assert first["processed_count"] == 1
+        assert second["processed_count"] == 0
+        assert len(db.weekly_penalties[GUILD_ID]) == 1
+
+    @pytest.mark.asyncio
+    async def test_settlement_requires_user_settings(self):
+        """외래키 위반 시 정산 전체를 반영하지 않음"""
+        db = InMemoryDatabase()
+        await db.set_user_goal(GUILD_ID, 123, "테스트유저", 5)
+        penalties = [
+            {
+                "user_id": user_id,
+                "username": "유저",
+                "goal_count": 5,
+                "actual_count": 0,
+                "penalty_amount": 10080.0,
+            }
+            for user_id in (123, 999)
+        ]
+
+        assert await db.settle_weekly_penalties(GUILD_ID, WEEK_START, penalties) is None
+        assert not db.weekly_penalties[GUILD_ID]
+        assert await db.get_total_accumulated_penalty(GUILD_ID) == 0.0
+
+
+class TestServicesOnStorage:
+    """실제 저장소 위에서 서비스 워크플로 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_complete_workout_cycle(self, storage):
+        """목표 설정 -> 기록 -> 취소 -> 정산"""
+        penalty_service = PenaltyService()
+        workout_service = WorkoutService(storage, penalty_service)
+        report_service = ReportService(storage, penalty_service)
+
+        await workout_service.set_user_goal(GUILD_ID, 123, "테스트유저", 4)
+        added = await workout_service.add_workout_record(
+            GUILD_ID, 123, "테스트유저", MONDAY
+        )
+        await workout_service.add_workout_record(GUILD_ID, 123, "테스트유저", TUESDAY)
+        revoked = await workout_service.revoke_workout_record(GUILD_ID, 123, TUESDAY)
+        settled = await report_service.process_weekly_penalty_records(
+            GUILD_ID, WEEK_START
+        )
+        report = await report_service.generate_weekly_report_data(GUILD_ID, WEEK_START)
+
+        assert added["current_count"] == 1
+        assert revoked["current_count"] == 1
+        assert settled["processed_count"] == 1
+        assert settled["total_penalty_added"] == 7560.0  # (4-1) * 2520
+        assert report["report_data"][0]["actual"] == 1
+        assert report["total_accumulated_penalty"] == 7560.0
+
+    @pytest.mark.asyncio
+    async def test_close_week_resumes_failed_broadcast(self, storage):
+        """한 번 읽어 정산/스냅샷 후 전송이 실패하면 다음 실행은 전송만 다시 시도"""
+        penalty_service = PenaltyService()
+        workout_service = WorkoutService(storage, penalty_service)
+        report_service = ReportService(storage, penalty_service)
+        await workout_service.set_user_goal(GUILD_ID, 123, "테스트유저", 4)
+        await workout_service.add_workout_record(GUILD_ID, 123, "테스트유저", MONDAY)
+
+        sent = []
+
+        async def broadcast(report_data):
+            sent.append(report_data)
+            return 555 if len(sent) > 1 else None
+
+        failed = await report_service.close_week(GUILD_ID, WEEK_START, broadcast)
+        resumed = await report_service.close_week(GUILD_ID, WEEK_START, broadcast)
+        repeated = await report_service.close_week(GUILD_ID, WEEK_START, broadcast)
+
+        assert failed["success"] is False
+        assert failed["stages"] == ["settled", "snapshot"]
+        assert resumed == {"success": True, "stages": ["broadcast"]}
+        assert repeated == {"success": True, "stages": []}
+        assert len(sent) == 2
+        assert sent[0]["report_data"][0]["total_penalty"] == 7560.0
+        assert sent[1]["total_accumulated_penalty"] == 7560.0
+        assert await storage.get_total_accumulated_penalty(GUILD_ID) == 7560.0
+        run = await storage.get_weekly_close_run(GUILD_ID, WEEK_START)
+        assert run.report_message_id == 555
+
+    @pytest.mark.asyncio
+    async def test_new_member_history_has_no_past_penalties(self, storage):
+        """방금 가입한 사용자의 최근 이력에는 지난 주 벌금이 없음"""
+        report_service = ReportService(storage, PenaltyService())
+        await storage.set_user_goal(GUILD_ID, 123, "새유저", 5)
+
+        history = await report_service.get_recent_weekly_history(GUILD_ID, 12)
+
+        assert history["success"] is False
+        assert "matrix" not in history
+
+    @pytest.mark.asyncio
+    async def test_settled_report_rebuilt_from_settlement(self, storage):
+        """정산 후 지난 기록이 바뀌어도 다시 만든 리포트는 정산 당시 값으로 구성"""
+        report_service = ReportService(storage, PenaltyService())
+        await storage.set_user_goal(GUILD_ID, 123, "유저1", 4)
+        await storage.set_user_goal(GUILD_ID, 456, "유저2", 4)
+        set_joined(storage, 123, datetime(2025, 1, 1))
+        set_joined(storage, 456, datetime(2025, 1, 1))
+        for day in range(13, 17):
+            await storage.add_workout_with_progress(
+                GUILD_ID, 456, "유저2", datetime(2025, 1, day), WEEK_START
+            )
+
+        async def broadcast(report_data):
+            return 555
+
+        closed = await report_service.close_week(GUILD_ID, WEEK_START, broadcast)
+        # 정산 이후: 지난 주 기록 추가(스냅샷 무효화) + 새 사용자 가입
+        await storage.add_workout_with_progress(
+            GUILD_ID, 123, "유저1", MONDAY, WEEK_START
+        )
+        await storage.set_user_goal(GUILD_ID, 789, "새유저", 3)
+        report = await report_service.get_weekly_report_data(GUILD_ID, WEEK_START)
+
+        assert closed["success"] is True
+        assert [
+            (row["user_id"], row["goal"], row["actual"], row["weekly_penalty"])
+            for row in report["report_data"]
+        ] == [(123, 4, 0, 10080.0), (456, 4, 4, 0.0)]
+        assert report["total_weekly_penalty"] == 10080.0
+        assert report["total_accumulated_penalty"] == 10080.0
+        assert report["participant_count"] == 2
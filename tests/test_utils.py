@@ -1,5 +1,6 @@
 """유틸리티 함수 테스트"""
 
+import asyncio
 import pytest
 from datetime import datetime, date, timedelta
 from unittest.mock import patch
@@ -12,7 +13,12 @@ from utils import (
     validate_date_format,
     format_date_korean,
     validate_user_id,
+    TTLCache,
+    KeyedLock,
+    SingleFlight,
+    WorkerPool,
 )
+from utils.metrics import LatencyHistogram, request_context, request_metrics
 
 
 class TestDateUtils:
@@ -91,3 +97,329 @@ class TestValidation:
         """잘못된 날짜 형식 검증 테스트"""
         result = validate_date_format("invalid-date")
         assert result is None
+
+
+class TestTTLCache:
+    """TTLCache 테스트"""
+
+    def setup_method(self):
+        self.now = 0.0
+        self.cache = TTLCache(max_size=2, ttl=10, clock=lambda: self.now)
+
+    def test_hit_and_miss(self):
+        """적중/실패 카운터 테스트"""
+        assert self.cache.get("a") is None
+        self.cache.set("a", 1)
+        assert self.cache.get("a") == 1
+
+        assert self.cache.hits == 1
+        assert self.cache.misses == 1
+        assert self.cache.hit_rate == 50.0
+
+    def test_lru_eviction(self):
+        """가장 오래 사용되지 않은 항목 제거 테스트"""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")  # a를 최근 사용으로 갱신
+        self.cache.set("c", 3)
+
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == 1
+        assert self.cache.get("c") == 3
+        assert self.cache.evictions == 1
+
+    def test_ttl_expiration(self):
+        """TTL 만료 테스트"""
+        self.cache.set("a", 1)
+        self.now = 10.0
+
+        assert self.cache.get("a") is None
+        assert self.cache.expirations == 1
+        assert len(self.cache) == 0
+
+    def test_invalidate_and_clear(self):
+        """무효화 테스트"""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.invalidate("a")
+        assert self.cache.get("a") is None
+
+        self.cache.clear()
+        assert self.cache.stats()["size"] == 0
+
+
+class TestSingleFlight:
+    """SingleFlight 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_coalesced(self):
+        """동시에 들어온 같은 요청은 한 번만 실행"""
+        flight = SingleFlight()
+        executions = 0
+
+        async def fetch():
+            nonlocal executions
+            executions += 1
+            await asyncio.sleep(0.01)
+            return {"value": 1}
+
+        results = await asyncio.gather(
+            *(flight.do("get", 123, fetch) for _ in range(5))
+        )
+
+        assert executions == 1
+        assert all(result == {"value": 1} for result in results)
+        assert flight.stats() == {
+            "calls": 5,
+            "executions": 1,
+            "coalesced": 4,
+            "in_flight": 0,
+            "coalesced_by_method": {"get": 4},
+        }
+
+    @pytest.mark.asyncio
+    async def test_different_args_not_coalesced(self):
+        """인자가 다르면 각각 실행"""
+        flight = SingleFlight()
+
+        async def fetch(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("get", 1, lambda: fetch(1)),
+            flight.do("get", 2, lambda: fetch(2)),
+        )
+
+        assert results == [1, 2]
+        assert flight.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self):
+        """실패도 합류한 모든 호출자에게 전달"""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("get", 1, fail),
+            flight.do("get", 1, fail),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight.executions == 1
+
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_does_not_cancel_shared_request(self):
+        """먼저 호출한 쪽이 취소되어도 합류한 호출자는 결과를 받음"""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        leader = asyncio.ensure_future(flight.do("get", 1, fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("get", 1, fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "ok"
+
+    @pytest.mark.asyncio
+    async def test_forget_starts_new_request(self):
+        """연결 해제 후의 호출은 새로 실행"""
+        flight = SingleFlight()
+        executions = 0
+
+        async def fetch():
+            nonlocal executions
+            executions += 1
+            current = executions
+            await asyncio.sleep(0.01)
+            return current
+
+        first = asyncio.ensure_future(flight.do("get", 1, fetch))
+        await asyncio.sleep(0)
+        flight.forget_all()
+        second = await flight.do("get", 1, fetch)
+
+        assert await first == 1
+        assert second == 2
+
+
+class TestWorkerPool:
+    """WorkerPool 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """동시에 실행되는 작업 수는 작업자 수 이하"""
+        pool = WorkerPool("test", concurrency=2, queue_size=10)
+        pool.start()
+        running = 0
+        peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for _ in range(6):
+            assert pool.submit(job)
+        await pool.join()
+        await pool.stop()
+
+        stats = pool.stats()
+        assert peak == 2
+        assert stats["submitted"] == 6
+        assert stats["latency"]["queue_wait"]["count"] == 6
+        assert stats["latency"]["process"]["count"] == 6
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        """대기열이 가득 차면 등록하지 않음"""
+        pool = WorkerPool("test", concurrency=1, queue_size=2)
+
+        async def job():
+            pass
+
+        assert pool.submit(job)
+        assert pool.submit(job)
+        assert not pool.submit(job)
+        assert pool.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_job_does_not_stop_worker(self):
+        """작업이 실패해도 작업자는 다음 작업을 처리"""
+        pool = WorkerPool("test", concurrency=1, queue_size=10)
+        pool.start()
+        done = []
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def ok():
+            done.append(True)
+
+        pool.submit(fail)
+        pool.submit(ok)
+        await pool.join()
+        await pool.stop()
+
+        assert done == [True]
+        assert pool.metrics.stats()["process"]["errors"] == 1
+
+
+class TestKeyedLock:
+    """KeyedLock 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_same_key_runs_in_order(self):
+        """같은 키는 도착 순서대로 하나씩 실행"""
+        lanes = KeyedLock()
+        events = []
+
+        async def write(name):
+            async with lanes.hold("user"):
+                events.append(f"{name}:start")
+                await asyncio.sleep(0.01)
+                events.append(f"{name}:end")
+
+        await asyncio.gather(write("a"), write("b"), write("c"))
+
+        assert events == [
+            "a:start",
+            "a:end",
+            "b:start",
+            "b:end",
+            "c:start",
+            "c:end",
+        ]
+        stats = lanes.stats()
+        assert stats["contended"] == 2
+        assert stats["max_waiters"] == 2
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_in_parallel(self):
+        """다른 키는 서로 기다리지 않음"""
+        lanes = KeyedLock()
+        running = 0
+        peak = 0
+
+        async def write(key):
+            nonlocal running, peak
+            async with lanes.hold(key):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(write(key) for key in range(3)))
+
+        assert peak == 3
+        assert lanes.stats()["contended"] == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_lanes_are_evicted(self):
+        """사용이 끝난 레인은 제거 (예외/취소 포함)"""
+        lanes = KeyedLock()
+
+        async with lanes.hold(1):
+            assert lanes.lanes == 1
+
+        with pytest.raises(RuntimeError):
+            async with lanes.hold(2):
+                raise RuntimeError("boom")
+
+        async def hold_forever():
+            async with lanes.hold(3):
+                await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(hold_forever())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert lanes.lanes == 0
+        assert lanes.evictions == 3
+
+
+class TestLatencyHistogram:
+    """LatencyHistogram 테스트"""
+
+    def test_percentiles(self):
+        """백분위수는 실제 값의 버킷 상한 근처로 추정"""
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.010)
+        for _ in range(10):
+            histogram.record(0.200, error=True)
+
+        stats = histogram.stats()
+
+        assert stats["count"] == 100
+        assert stats["errors"] == 10
+        assert 10 <= stats["p50_ms"] < 12
+        assert 200 <= stats["p95_ms"] < 240
+        assert stats["p99_ms"] == stats["max_ms"] == 200
+
+    def test_empty(self):
+        """기록이 없으면 0"""
+        assert LatencyHistogram().stats()["p99_ms"] == 0.0
+
+    def test_request_context_recorded(self):
+        """요청 컨텍스트 종료 시 왕복 수와 함께 기록"""
+        request_metrics.reset()
+
+        with request_context("command:test") as context:
+            context.add_round_trip(0.01)
+            context.add_round_trip(0.02)
+
+        stats = request_metrics.stats()["command:test"]
+        assert stats["count"] == 1
+        assert stats["avg_round_trips"] == 2
@@ -6,6 +6,8 @@
 from .date_utils import get_week_start_end, get_today_date, format_date_korean
 from .formatting import format_currency, create_progress_bar
 from .validation import validate_date_format, validate_goal_range, validate_user_id
+from .cache import TTLCache
+from .concurrency import KeyedLock, SingleFlight, WorkerPool
 
 __all__ = [
     "get_week_start_end",
@@ -16,4 +18,8 @@ __all__ = [
     "validate_date_format",
     "validate_goal_range",
     "validate_user_id",
+    "TTLCache",
+    "KeyedLock",
+    "SingleFlight",
+    "WorkerPool",
 ]
@@ -0,0 +1,95 @@
+"""
+캐시 관련 유틸리티
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    TTL과 LRU 제거를 지원하는 크기 제한 인메모리 캐시
+
+    Args:
+        max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+        ttl: 항목 유효 시간 (초)
+        clock: 현재 시각 함수 (테스트용 주입)
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size <= 0:
+            raise ValueError("캐시 크기는 1 이상이어야 합니다.")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """캐시 저장 (기존 항목은 갱신)"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (value, self._clock() + self.ttl)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """특정 항목 무효화"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """전체 항목 무효화"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (0-100)"""
+        total = self.hits + self.misses
+        return (self.hits / total * 100) if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hit_rate,
+        }
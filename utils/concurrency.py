@@ -0,0 +1,256 @@
+"""
+동시성 관련 유틸리티
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Tuple,
+    TypeVar,
+)
+
+from utils.metrics import LatencyHistogram, LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    동일한 요청 합치기 (single-flight)
+
+    같은 메서드/인자의 호출이 동시에 진행 중이면 새로 실행하지 않고
+    진행 중인 요청의 결과를 함께 받습니다. 호출자 중 하나가 취소되어도
+    공유 요청은 다른 호출자를 위해 계속 진행됩니다.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.coalesced_by_method: Counter = Counter()
+
+    async def do(
+        self, method: str, args: Hashable, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        """진행 중인 같은 요청이 있으면 합류하고, 없으면 fn()을 실행"""
+        key = (method, args)
+        self.calls += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            self.coalesced_by_method[method] += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Tuple[str, Hashable], task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # 모든 호출자가 취소된 경우에도 예외가 처리된 것으로 표시
+        if not task.cancelled():
+            task.exception()
+
+    def forget(self, method: str, args: Hashable) -> None:
+        """
+        진행 중인 요청과의 연결 해제
+
+        쓰기 직후의 조회가 쓰기 이전에 시작된 요청에 합류하지 않도록 합니다.
+        """
+        self._in_flight.pop((method, args), None)
+
+    def forget_all(self) -> None:
+        """진행 중인 모든 요청과의 연결 해제"""
+        self._in_flight.clear()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def stats(self) -> Dict[str, Any]:
+        """요청 합치기 통계"""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+            "coalesced_by_method": dict(self.coalesced_by_method),
+        }
+
+
+class WorkerPool:
+    """
+    큐 기반 고정 크기 작업자 풀 (배압 지원)
+
+    작업은 최대 queue_size개까지 대기열에 쌓이고 concurrency개의 작업자가 순서대로
+    처리합니다. 대기열이 가득 차면 submit()이 False를 반환하므로 호출자가 직접
+    부하를 덜어내야 합니다. 대기 시간(queue_wait)과 처리 시간(process)을 기록합니다.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(1, queue_size)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers: List[asyncio.Task] = []
+
+        self.metrics = LatencyRecorder()
+        self.submitted = 0
+        self.rejected = 0
+        self.active = 0
+
+    def start(self) -> None:
+        """작업자 시작 (실행 중인 이벤트 루프에서 호출)"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.ensure_future(self._worker()) for _ in range(self.concurrency)
+        ]
+        logger.info(
+            f"{self.name} 작업자 풀 시작: 작업자 {self.concurrency}개, "
+            f"대기열 {self.queue_size}"
+        )
+
+    def submit(self, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """작업 등록 (대기열이 가득 차면 등록하지 않고 False)"""
+        try:
+            self._queue.put_nowait((fn, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.submitted += 1
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            fn, enqueued_at = await self._queue.get()
+            started_at = time.perf_counter()
+            self.metrics.record("queue_wait", started_at - enqueued_at)
+            self.active += 1
+            error = False
+            try:
+                await fn()
+            except Exception as e:
+                error = True
+                logger.error(f"{self.name} 작업 처리 중 오류: {e}")
+            finally:
+                self.active -= 1
+                self.metrics.record("process", time.perf_counter() - started_at, error)
+                self._queue.task_done()
+
+    async def join(self) -> None:
+        """대기열의 모든 작업이 끝날 때까지 대기"""
+        await self._queue.join()
+
+    async def stop(self) -> None:
+        """작업자 종료 (대기 중인 작업은 버림)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """작업자 풀 통계"""
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "queued": self.queued,
+            "active": self.active,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "latency": self.metrics.stats(),
+        }
+
+
+class _Lane:
+    """키 하나의 레인 (잠금과 보유/대기 중인 작업 수)"""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class KeyedLock:
+    """
+    키별 직렬화 레인 (keyed async lock)
+
+    같은 키의 작업은 도착 순서대로 하나씩 실행되고, 다른 키의 작업은 병렬로 실행됩니다.
+    마지막 사용자가 나가면 레인을 바로 제거하므로 레인 수는 진행 중인 키 수를 넘지 않습니다.
+    """
+
+    def __init__(self):
+        self._lanes: Dict[Hashable, _Lane] = {}
+
+        self.acquisitions = 0
+        self.contended = 0
+        self.evictions = 0
+        self.max_waiters = 0
+        self.wait = LatencyHistogram()
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        """with 블록 동안 키의 레인 점유"""
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane()
+
+        self.acquisitions += 1
+        if lane.users:
+            self.contended += 1
+            self.max_waiters = max(self.max_waiters, lane.users)
+        lane.users += 1
+
+        start = time.perf_counter()
+        try:
+            async with lane.lock:
+                self.wait.record(time.perf_counter() - start)
+                yield
+        finally:
+            lane.users -= 1
+            if not lane.users and self._lanes.get(key) is lane:
+                del self._lanes[key]
+                self.evictions += 1
+
+    @property
+    def lanes(self) -> int:
+        return len(self._lanes)
+
+    def stats(self) -> Dict[str, Any]:
+        """레인 경합 통계"""
+        wait = self.wait.stats()
+        return {
+            "lanes": self.lanes,
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "contention_rate": (
+                self.contended / self.acquisitions * 100 if self.acquisitions else 0.0
+            ),
+            "evictions": self.evictions,
+            "max_waiters": self.max_waiters,
+            "wait_p95_ms": wait["p95_ms"],
+            "wait_max_ms": wait["max_ms"],
+        }
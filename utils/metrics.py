@@ -0,0 +1,200 @@
+"""
+지연 시간/왕복 계측 유틸리티
+"""
+
+import functools
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (초): 0.5ms부터 2^(1/4)배씩 증가, 약 2분까지
+BUCKET_BOUNDS: List[float] = [0.0005 * 2 ** (i / 4) for i in range(72)]
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램 (메모리 사용량 일정)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.round_trips = 0
+
+    def record(self, seconds: float, error: bool = False, round_trips: int = 0):
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.round_trips += round_trips
+        if error:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """백분위수 (초, 해당 버킷 상한 기준 추정치)"""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index < len(BUCKET_BOUNDS):
+                    return min(BUCKET_BOUNDS[index], self.max)
+                return self.max
+        return self.max
+
+    def stats(self) -> Dict[str, Any]:
+        """통계 (지연 시간은 ms)"""
+        stats = {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "avg_ms": (self.total / self.count * 1000) if self.count else 0.0,
+        }
+        if self.round_trips:
+            stats["avg_round_trips"] = self.round_trips / self.count
+        return stats
+
+
+class LatencyRecorder:
+    """이름별 지연 시간 히스토그램 모음"""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def record(
+        self, name: str, seconds: float, error: bool = False, round_trips: int = 0
+    ):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds, error, round_trips)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """이름별 통계 (호출 수 내림차순)"""
+        return {
+            name: histogram.stats()
+            for name, histogram in sorted(
+                self.histograms.items(), key=lambda item: -item[1].count
+            )
+        }
+
+    def reset(self):
+        self.histograms.clear()
+
+
+class RequestContext:
+    """인터랙션/메시지 하나를 처리하는 동안의 DB 왕복 집계"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = time.perf_counter()
+        self.round_trips = 0
+        self.db_time = 0.0
+
+    def add_round_trip(self, seconds: float):
+        self.round_trips += 1
+        self.db_time += seconds
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+# 요청 종류별 전체 처리 시간/왕복 수
+request_metrics = LatencyRecorder()
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "current_request", default=None
+)
+# 진행 중인 계측 메서드 호출의 실패 여부 (중첩 호출은 각자 기록)
+_current_call: ContextVar[Optional[Dict[str, bool]]] = ContextVar(
+    "current_call", default=None
+)
+
+
+def current_request() -> Optional[RequestContext]:
+    """현재 태스크에서 처리 중인 요청 컨텍스트"""
+    return _current_request.get()
+
+
+def begin_request(label: str) -> RequestContext:
+    """
+    요청 컨텍스트 시작
+
+    현재 태스크의 컨텍스트에 설정되므로, 같은 태스크에서 이어지는 DB 호출이 모두
+    이 요청으로 집계됩니다. 처리가 끝나면 finish_request()로 기록합니다.
+    """
+    context = RequestContext(label)
+    _current_request.set(context)
+    return context
+
+
+def finish_request(context: RequestContext, error: bool = False):
+    """요청 컨텍스트 기록 및 로그"""
+    elapsed = context.elapsed
+    request_metrics.record(context.label, elapsed, error, context.round_trips)
+    logger.info(
+        f"{context.label}: DB 왕복 {context.round_trips}회 "
+        f"({context.db_time * 1000:.1f}ms) / 전체 {elapsed * 1000:.1f}ms"
+    )
+
+
+@contextmanager
+def request_context(label: str) -> Iterator[RequestContext]:
+    """with 블록 동안 요청 컨텍스트 유지"""
+    context = RequestContext(label)
+    token = _current_request.set(context)
+    error = False
+    try:
+        yield context
+    except Exception:
+        error = True
+        raise
+    finally:
+        _current_request.reset(token)
+        finish_request(context, error)
+
+
+def mark_call_failed():
+    """진행 중인 계측 메서드 호출을 실패로 표시 (예외를 내부에서 처리하는 경우)"""
+    call = _current_call.get()
+    if call is not None:
+        call["error"] = True
+
+
+def timed(method):
+    """
+    비동기 메서드 계측 데코레이터
+
+    self.metrics(LatencyRecorder)에 메서드 이름으로 지연 시간과 실패 여부를 기록합니다.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        call = {"error": False}
+        token = _current_call.set(call)
+        start = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        except Exception:
+            call["error"] = True
+            raise
+        finally:
+            _current_call.reset(token)
+            self.metrics.record(
+                method.__name__, time.perf_counter() - start, call["error"]
+            )
+
+    return wrapper